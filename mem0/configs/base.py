@@ -59,6 +59,14 @@ class MemoryConfig(BaseModel):
         description="Custom prompt for the update memory",
         default=None,
     )
+    executor_max_workers: int = Field(
+        description="Number of threads used to run vector store and graph operations in parallel",
+        default=4,
+    )
+    executor_max_pending: Optional[int] = Field(
+        description="Maximum number of queued or running operations before new requests wait (4x workers if unset)",
+        default=None,
+    )
 
 
 class AzureConfig(BaseModel):
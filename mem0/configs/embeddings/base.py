@@ -19,6 +19,7 @@ class BaseEmbedderConfig(ABC):
         embedding_dims: Optional[int] = None,
         # Ollama specific
         ollama_base_url: Optional[str] = None,
+        ollama_use_embed_endpoint: bool = False,
         # Openai specific
         openai_base_url: Optional[str] = None,
         # Huggingface specific
@@ -52,6 +53,9 @@ class BaseEmbedderConfig(ABC):
         :type embedding_dims: Optional[int], optional
         :param ollama_base_url: Base URL for the Ollama API, defaults to None
         :type ollama_base_url: Optional[str], optional
+        :param ollama_use_embed_endpoint: Embed through Ollama's /api/embed endpoint, which batches texts but returns
+            vectors that differ from the legacy /api/embeddings ones, defaults to False
+        :type ollama_use_embed_endpoint: bool, optional
         :param model_kwargs: key-value arguments for the huggingface embedding model, defaults a dict inside init
         :type model_kwargs: Optional[Dict[str, Any]], defaults a dict inside init
         :param huggingface_base_url: Huggingface base URL to be use, defaults to None
@@ -84,6 +88,7 @@ class BaseEmbedderConfig(ABC):
 
         # Ollama specific
         self.ollama_base_url = ollama_base_url
+        self.ollama_use_embed_endpoint = ollama_use_embed_endpoint
 
         # Huggingface specific
         self.model_kwargs = model_kwargs or {}
@@ -13,6 +13,29 @@ class FAISSConfig(BaseModel):
         False, description="Whether to normalize L2 vectors (only applicable for euclidean distance)"
     )
     embedding_model_dims: int = Field(1536, description="Dimension of the embedding vector")
+    compaction_threshold: float = Field(
+        0.2,
+        description="Fraction of tombstoned vectors above which the index is rebuilt in the background from the live "
+        "vectors",
+    )
+    write_behind: bool = Field(
+        False, description="Append mutations to a log and snapshot periodically instead of saving on every change"
+    )
+    snapshot_interval_ops: int = Field(1000, description="Logged mutations between snapshots in write-behind mode")
+    snapshot_interval_seconds: float = Field(
+        60.0, description="Seconds after which the next mutation triggers a snapshot in write-behind mode"
+    )
+    index_type: str = Field("flat", description="Index structure to use. Options: 'flat', 'hnsw', 'ivf'")
+    compression: Optional[str] = Field(None, description="Vector compression to use. Options: 'sq8', 'pq'")
+    hnsw_m: int = Field(32, description="Number of neighbors per node for HNSW indexes")
+    hnsw_ef_construction: int = Field(40, description="Search depth used while building HNSW indexes")
+    hnsw_ef_search: int = Field(64, description="Search depth used at query time for HNSW indexes")
+    ivf_nlist: int = Field(1024, description="Number of inverted lists for IVF indexes")
+    ivf_nprobe: int = Field(16, description="Number of inverted lists visited at query time for IVF indexes")
+    pq_m: int = Field(16, description="Number of sub-quantizers for product quantization")
+    train_min_vectors: Optional[int] = Field(
+        None, description="Vectors to collect before training index types that need it (derived when unset)"
+    )
 
     @model_validator(mode="before")
     @classmethod
@@ -22,6 +45,17 @@ class FAISSConfig(BaseModel):
             raise ValueError("Invalid distance_strategy. Must be one of: 'euclidean', 'inner_product', 'cosine'")
         return values
 
+    @model_validator(mode="before")
+    @classmethod
+    def validate_index_type(cls, values: Dict[str, Any]) -> Dict[str, Any]:
+        index_type = values.get("index_type")
+        if index_type and index_type not in ["flat", "hnsw", "ivf"]:
+            raise ValueError("Invalid index_type. Must be one of: 'flat', 'hnsw', 'ivf'")
+        compression = values.get("compression")
+        if compression and compression not in ["sq8", "pq"]:
+            raise ValueError("Invalid compression. Must be one of: 'sq8', 'pq'")
+        return values
+
     @model_validator(mode="before")
     @classmethod
     def validate_extra_fields(cls, values: Dict[str, Any]) -> Dict[str, Any]:
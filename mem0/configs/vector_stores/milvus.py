@@ -26,6 +26,7 @@ class MilvusDBConfig(BaseModel):
     embedding_model_dims: int = Field(1536, description="Dimensions of the embedding model")
     metric_type: str = Field("L2", description="Metric type for similarity search")
     db_name: str = Field("", description="Name of the database")
+    batch_size: int = Field(1000, description="Number of vectors sent to Milvus per insert request")
 
     @model_validator(mode="before")
     @classmethod
@@ -10,6 +10,9 @@ class MongoDBConfig(BaseModel):
     collection_name: str = Field("mem0", description="Name of the MongoDB collection")
     embedding_model_dims: Optional[int] = Field(1536, description="Dimensions of the embedding vectors")
     mongo_uri: str = Field("mongodb://localhost:27017", description="MongoDB URI. Default is mongodb://localhost:27017")
+    num_candidates_multiplier: int = Field(
+        10, description="Nearest neighbors $vectorSearch considers per requested result, capped at 10000"
+    )
 
     @model_validator(mode="before")
     @classmethod
@@ -1,4 +1,4 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Literal, Optional
 
 from pydantic import BaseModel, Field, model_validator
 
@@ -19,6 +19,15 @@ class PGVectorConfig(BaseModel):
     sslmode: Optional[str] = Field(None, description="SSL mode for PostgreSQL connection (e.g., 'require', 'prefer', 'disable')")
     connection_string: Optional[str] = Field(None, description="PostgreSQL connection string (overrides individual connection parameters)")
     connection_pool: Optional[Any] = Field(None, description="psycopg connection pool object (overrides connection string and individual parameters)")
+    hnsw_ef_search: Optional[int] = Field(
+        None, description="Size of the HNSW candidate list per search. Raised to the search limit when lower"
+    )
+    hnsw_iterative_scan: Optional[Literal["off", "strict_order", "relaxed_order"]] = Field(
+        "strict_order", description="pgvector iterative index scan mode for filtered searches (pgvector 0.8+)"
+    )
+    copy_threshold: Optional[int] = Field(
+        32, description="Inserts of at least this many vectors use a binary COPY (psycopg 3). None disables COPY"
+    )
 
     @model_validator(mode="before")
     def check_auth_and_connection(cls, values):
@@ -0,0 +1,133 @@
+import hashlib
+import os
+from array import array
+from typing import Dict, List, Literal, Optional, Tuple
+
+from mem0.embeddings.base import EmbeddingBase
+from mem0.embeddings.configs import EmbeddingCacheConfig
+from mem0.memory.cache import TieredCache, get_shared
+from mem0.memory.setup import mem0_dir
+
+
+class EmbeddingCache(TieredCache):
+    """
+    Content-addressed store for embedding vectors.
+
+    Vectors are kept in an in-process LRU bounded by `max_bytes` and, when `db_path` is given,
+    in a SQLite table bounded by `max_persistent_entries` that survives restarts. Hit and miss
+    counters are kept for both tiers.
+    """
+
+    table = "embeddings"
+    columns = ("vector",)
+    schema = ("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)",)
+    description = "embeddings"
+
+    def __init__(self, max_bytes: int, db_path: Optional[str] = None, max_persistent_entries: Optional[int] = None):
+        self.max_bytes = max_bytes
+        super().__init__(max_bytes, db_path, max_persistent_entries)
+
+    def get(self, key: str) -> Optional[list]:
+        vector = self._lookup(key)
+        return None if vector is None else vector.tolist()
+
+    def set_many(self, items: List[Tuple[str, list]]):
+        self._store([(key, array("d", vector)) for key, vector in items])
+
+    def set(self, key: str, vector: list):
+        self.set_many([(key, vector)])
+
+    def _entry_size(self, vector: array) -> int:
+        return len(vector) * vector.itemsize
+
+    def _to_row(self, vector: array) -> tuple:
+        return (vector.tobytes(),)
+
+    def _from_row(self, row: tuple) -> array:
+        vector = array("d")
+        vector.frombytes(row[0])
+        return vector
+
+    def stats(self) -> Dict[str, int]:
+        stats = super().stats()
+        with self._lock:
+            stats["bytes"] = self._size
+        return stats
+
+
+def get_shared_cache(config: EmbeddingCacheConfig) -> EmbeddingCache:
+    """Return the process-wide cache for the given settings, so every embedder with the same settings shares it."""
+    db_path = None
+    if config.persistent:
+        db_path = config.path or os.path.join(mem0_dir, "embedding_cache.db")
+    return get_shared(EmbeddingCache, config.max_bytes, db_path, config.max_persistent_entries)
+
+
+class CachedEmbedding(EmbeddingBase):
+    """
+    Wraps any embedder and serves repeated texts from an `EmbeddingCache`.
+
+    Cache keys combine the provider, model, embedding dimensions, memory action and a SHA-256
+    of the text, so embedders with different settings never share vectors.
+    """
+
+    def __init__(self, embedder: EmbeddingBase, provider: str, cache: EmbeddingCache):
+        self.embedder = embedder
+        self.provider = provider
+        self.cache = cache
+        self.config = embedder.config
+
+    def _cache_key(self, text, memory_action) -> str:
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        return f"{self.provider}:{self.config.model}:{self.config.embedding_dims}:{memory_action}:{text_hash}"
+
+    def embed(self, text, memory_action: Optional[Literal["add", "search", "update"]] = None):
+        """
+        Get the embedding for the given text, calling the wrapped embedder only on a cache miss.
+
+        Args:
+            text (str): The text to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+        Returns:
+            list: The embedding vector.
+        """
+        key = self._cache_key(text, memory_action)
+        vector = self.cache.get(key)
+        if vector is None:
+            vector = self.embedder.embed(text, memory_action)
+            self.cache.set(key, vector)
+        return vector
+
+    def embed_batch(self, texts, memory_action: Optional[Literal["add", "search", "update"]] = None):
+        """
+        Get the embeddings for a list of texts, sending only the cache misses to the wrapped embedder.
+
+        Args:
+            texts (list): The texts to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+        Returns:
+            list: The embedding vectors, in the same order as `texts`.
+        """
+        keys = [self._cache_key(text, memory_action) for text in texts]
+        vectors = {}
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key in vectors or key in missing:
+                continue
+            vector = self.cache.get(key)
+            if vector is None:
+                missing[key] = text
+            else:
+                vectors[key] = vector
+
+        if missing:
+            embedded = self.embedder.embed_batch(list(missing.values()), memory_action)
+            new_items = list(zip(missing.keys(), embedded))
+            self.cache.set_many(new_items)
+            vectors.update(new_items)
+
+        return [vectors[key] for key in keys]
+
+    def stats(self) -> Dict[str, int]:
+        """Return the hit/miss counters of the underlying cache."""
+        return self.cache.stats()
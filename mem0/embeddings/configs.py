@@ -3,12 +3,32 @@ from typing import Optional
 from pydantic import BaseModel, Field, field_validator
 
 
+class EmbeddingCacheConfig(BaseModel):
+    enabled: bool = Field(description="Whether embeddings are cached", default=True)
+    max_bytes: int = Field(
+        description="Maximum size in bytes of the in-process LRU cache",
+        default=64 * 1024 * 1024,
+    )
+    persistent: bool = Field(description="Whether to also persist embeddings in a SQLite database", default=False)
+    max_persistent_entries: Optional[int] = Field(
+        description="Maximum number of embeddings kept in the SQLite database (None for no limit)", default=100000
+    )
+    path: Optional[str] = Field(
+        description="Path to the SQLite cache database (defaults to embedding_cache.db in the mem0 directory)",
+        default=None,
+    )
+
+
 class EmbedderConfig(BaseModel):
     provider: str = Field(
         description="Provider of the embedding model (e.g., 'ollama', 'openai')",
         default="openai",
     )
     config: Optional[dict] = Field(description="Configuration for the specific embedding model", default={})
+    cache: Optional[EmbeddingCacheConfig] = Field(
+        description="Configuration for the content-addressed embedding cache",
+        default=None,
+    )
 
     @field_validator("config")
     def validate_config(cls, v, values):
@@ -49,5 +49,33 @@ class OllamaEmbedding(EmbeddingBase):
         Returns:
             list: The embedding vector.
         """
+        if self._use_embed_endpoint():
+            response = self.client.embed(model=self.config.model, input=text)
+            return response["embeddings"][0]
         response = self.client.embeddings(model=self.config.model, prompt=text)
         return response["embedding"]
+
+    def embed_batch(self, texts, memory_action: Optional[Literal["add", "search", "update"]] = None):
+        """
+        Get the embeddings for a list of texts using a single Ollama request.
+
+        Args:
+            texts (list): The texts to embed.
+            memory_action (optional): The type of embedding to use. Must be one of "add", "search", or "update". Defaults to None.
+        Returns:
+            list: The embedding vectors, in the same order as `texts`.
+        """
+        if not texts:
+            return []
+        if not self._use_embed_endpoint():
+            # Stay on the endpoint `embed` uses, so batched and single vectors can be compared
+            return super().embed_batch(texts, memory_action)
+        response = self.client.embed(model=self.config.model, input=texts)
+        return response["embeddings"]
+
+    def _use_embed_endpoint(self) -> bool:
+        """
+        Whether to use the batching /api/embed endpoint. It returns normalized vectors that differ from those of the
+        legacy /api/embeddings endpoint, so it is opt-in and older ollama clients do not expose it.
+        """
+        return self.config.ollama_use_embed_endpoint and hasattr(self.client, "embed")
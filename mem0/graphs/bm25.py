@@ -0,0 +1,113 @@
+from typing import Any, Dict, List
+
+import numpy as np
+
+from mem0.memory.lexical import tokenize
+
+
+class BM25Scorer:
+    """
+    BM25 (Okapi) scorer over a small corpus, vectorized with NumPy.
+
+    The corpus is held as a dense term-frequency matrix and the IDF of every term is computed once when the
+    scorer is built, so scoring a query is a few array operations instead of a Python loop per document.
+    IDF follows `rank_bm25.BM25Okapi`: terms found in more than half the documents get a small positive
+    weight, a fraction of the average IDF, instead of a negative one.
+    """
+
+    def __init__(self, corpus: List[List[str]], k1: float = 1.5, b: float = 0.75, epsilon: float = 0.25):
+        """
+        Build the scorer.
+
+        Args:
+            corpus (List[List[str]]): Tokens of each document.
+            k1 (float, optional): Term frequency saturation. Defaults to 1.5.
+            b (float, optional): Length normalization. Defaults to 0.75.
+            epsilon (float, optional): Fraction of the average IDF given to very common terms. Defaults to 0.25.
+        """
+        self.vocabulary = {}
+        rows, columns = [], []
+        for row, document in enumerate(corpus):
+            for term in document:
+                rows.append(row)
+                columns.append(self.vocabulary.setdefault(term, len(self.vocabulary)))
+
+        term_frequencies = np.zeros((len(corpus), len(self.vocabulary)), dtype=np.float32)
+        np.add.at(term_frequencies, (rows, columns), 1.0)
+
+        lengths = term_frequencies.sum(axis=1)
+        average_length = lengths.mean() if len(corpus) else 0.0
+        document_frequencies = np.count_nonzero(term_frequencies, axis=0)
+        idf = np.log(len(corpus) - document_frequencies + 0.5) - np.log(document_frequencies + 0.5)
+        if idf.size:
+            idf[idf < 0] = epsilon * idf.mean()
+
+        self.idf = idf
+        self.term_frequencies = term_frequencies
+        # Per-document denominator term of BM25, so scoring only touches the query's columns
+        self.length_norms = k1 * (1 - b + b * lengths / (average_length or 1.0))
+        self.k1 = k1
+
+    def get_scores(self, query: List[str]) -> np.ndarray:
+        """
+        Score every document of the corpus for a query.
+
+        Args:
+            query (List[str]): Query tokens. Repeated tokens count once per occurrence.
+
+        Returns:
+            np.ndarray: BM25 score of each document, in corpus order.
+        """
+        term_ids = [self.vocabulary[term] for term in query if term in self.vocabulary]
+        if not term_ids:
+            return np.zeros(len(self.term_frequencies), dtype=np.float32)
+
+        term_frequencies = self.term_frequencies[:, term_ids]
+        weights = term_frequencies * (self.k1 + 1) / (term_frequencies + self.length_norms[:, None])
+        return weights @ self.idf[term_ids]
+
+    def top_n(self, query: List[str], n: int) -> List[int]:
+        """
+        Find the documents that score highest for a query.
+
+        Args:
+            query (List[str]): Query tokens.
+            n (int): Maximum number of documents to return.
+
+        Returns:
+            List[int]: Corpus positions of the best documents, best first. Ties keep corpus order.
+        """
+        scores = self.get_scores(query)
+        n = min(n, len(scores))
+        if n <= 0:
+            return []
+
+        candidates = np.arange(len(scores)) if n == len(scores) else np.argpartition(-scores, n - 1)[:n]
+        return candidates[np.lexsort((candidates, -scores[candidates]))].tolist()
+
+
+def rerank_relations(query: str, relations: List[Dict[str, Any]], n: int) -> List[Dict[str, str]]:
+    """
+    Rank graph relations by how well their source, relationship and destination match a query.
+
+    Args:
+        query (str): Search query.
+        relations (List[Dict[str, Any]]): Relations with "source", "relationship" and "destination" keys.
+        n (int): Maximum number of relations to return.
+
+    Returns:
+        List[Dict[str, str]]: The best relations, best first.
+    """
+    corpus = [
+        tokenize(relation["source"]) + tokenize(relation["relationship"]) + tokenize(relation["destination"])
+        for relation in relations
+    ]
+    positions = BM25Scorer(corpus).top_n(tokenize(query), n)
+    return [
+        {
+            "source": relations[position]["source"],
+            "relationship": relations[position]["relationship"],
+            "destination": relations[position]["destination"],
+        }
+        for position in positions
+    ]
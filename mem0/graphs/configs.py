@@ -11,6 +11,12 @@ class Neo4jConfig(BaseModel):
     password: Optional[str] = Field(None, description="Password for the graph database")
     database: Optional[str] = Field(None, description="Database for the graph database")
     base_label: Optional[bool] = Field(None, description="Whether to use base node label __Entity__ for all entities")
+    vector_index: bool = Field(
+        True, description="Whether to search entity embeddings through a vector index (requires base_label)"
+    )
+    vector_index_candidates: int = Field(
+        100, description="Number of nearest entities fetched from the vector index before filtering by user/agent/run"
+    )
 
     @model_validator(mode="before")
     def check_host_port_or_path(cls, values):
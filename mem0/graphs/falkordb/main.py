@@ -56,6 +56,7 @@ class FalkorDB:
             config.embedder.provider,
             config.embedder.config,
             {"enable_embeddings": True},
+            config.embedder.cache,
         )
     
     @staticmethod
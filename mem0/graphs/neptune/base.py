@@ -1,13 +1,7 @@
 import logging
 from abc import ABC, abstractmethod
 
-from mem0.memory.utils import format_entities
-
-try:
-    from rank_bm25 import BM25Okapi
-except ImportError:
-    raise ImportError("rank_bm25 is not installed. Please install it using pip install rank-bm25")
-
+from mem0.graphs.bm25 import rerank_relations
 from mem0.graphs.tools import (
     DELETE_MEMORY_STRUCT_TOOL_GRAPH,
     DELETE_MEMORY_TOOL_GRAPH,
@@ -17,6 +11,7 @@ from mem0.graphs.tools import (
     RELATIONS_TOOL,
 )
 from mem0.graphs.utils import EXTRACT_RELATIONS_PROMPT, get_delete_messages
+from mem0.memory.utils import embed_entity_names, format_entities
 from mem0.utils.factory import EmbedderFactory, LlmFactory
 
 logger = logging.getLogger(__name__)
@@ -37,6 +32,7 @@ class NeptuneBase(ABC):
             config.embedder.provider,
             config.embedder.config,
             {"enable_embeddings": True},
+            config.embedder.cache,
         )
 
     @staticmethod
@@ -210,6 +206,7 @@ class NeptuneBase(ABC):
         """
 
         results = []
+        entity_embeddings = embed_entity_names(self.embedding_model, to_be_added)
         for item in to_be_added:
             # entities
             source = item["source"]
@@ -221,8 +218,8 @@ class NeptuneBase(ABC):
             destination_type = entity_type_map.get(destination, "__User__")
 
             # embeddings
-            source_embedding = self.embedding_model.embed(source)
-            dest_embedding = self.embedding_model.embed(destination)
+            source_embedding = entity_embeddings[source]
+            dest_embedding = entity_embeddings[destination]
 
             # search for the nodes with the closest embeddings
             source_node_search_result = self._search_source_node(source_embedding, user_id, threshold=0.9)
@@ -284,17 +281,7 @@ class NeptuneBase(ABC):
         if not search_output:
             return []
 
-        search_outputs_sequence = [
-            [item["source"], item["relationship"], item["destination"]] for item in search_output
-        ]
-        bm25 = BM25Okapi(search_outputs_sequence)
-
-        tokenized_query = query.split(" ")
-        reranked_results = bm25.get_top_n(tokenized_query, search_outputs_sequence, n=5)
-
-        search_results = []
-        for item in reranked_results:
-            search_results.append({"source": item[0], "relationship": item[1], "destination": item[2]})
+        search_results = rerank_relations(query, search_output, n=5)
 
         return search_results
 
@@ -377,8 +364,8 @@ class NeptuneBase(ABC):
         """
         result_relations = []
 
-        for node in node_list:
-            n_embedding = self.embedding_model.embed(node)
+        node_embeddings = self.embedding_model.embed_batch(node_list) if node_list else []
+        for n_embedding in node_embeddings:
             cypher_query, params = self._search_graph_db_cypher(n_embedding, filters, limit)
             ans = self.graph.query(cypher_query, params=params)
             result_relations.extend(ans)
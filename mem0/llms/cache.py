@@ -0,0 +1,93 @@
+import hashlib
+import json
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+from mem0.llms.configs import LlmCacheConfig
+from mem0.memory.cache import TieredCache, get_shared
+from mem0.memory.setup import mem0_dir
+
+
+class LLMResponseCache(TieredCache):
+    """
+    Store for LLM responses to repeated requests.
+
+    Responses expire `ttl_seconds` after they are stored. They are kept in an in-process LRU bounded by
+    `max_entries` and, when `db_path` is given, in a SQLite table bounded by `max_persistent_entries` that
+    survives restarts. Hit and miss counters are kept for both tiers.
+    """
+
+    table = "llm_responses"
+    columns = ("response", "expires_at")
+    schema = (
+        """
+        CREATE TABLE IF NOT EXISTS llm_responses (
+            key        TEXT PRIMARY KEY,
+            response   TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS llm_responses_expires_at_idx ON llm_responses (expires_at)",
+    )
+    description = "LLM response"
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        db_path: Optional[str] = None,
+        max_persistent_entries: Optional[int] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        super().__init__(max_entries, db_path, max_persistent_entries)
+
+    @staticmethod
+    def make_key(provider: str, model: Optional[str], messages: List[Dict[str, str]], response_format=None) -> str:
+        """
+        Build the cache key of a request.
+
+        Args:
+            provider (str): LLM provider.
+            model (str, optional): Model name.
+            messages (list): Request messages. Surrounding whitespace of each content is ignored.
+            response_format (dict, optional): Requested response format. Defaults to None.
+
+        Returns:
+            str: SHA-256 of the normalized request.
+        """
+        normalized = [{"role": message["role"], "content": message["content"].strip()} for message in messages]
+        request = json.dumps(
+            {"provider": provider, "model": model, "messages": normalized, "response_format": response_format},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(request.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self._lookup(key)
+        return None if entry is None else entry[0]
+
+    def set(self, key: str, response: str):
+        self._store([(key, (response, time.time() + self.ttl_seconds))])
+
+    def _is_fresh(self, entry: Tuple[str, float]) -> bool:
+        return entry[1] > time.time()
+
+    def _to_row(self, entry: Tuple[str, float]) -> tuple:
+        return entry
+
+    def _from_row(self, row: tuple) -> Tuple[str, float]:
+        return row[0], row[1]
+
+    def _purge_expired(self):
+        self.connection.execute("DELETE FROM llm_responses WHERE expires_at <= ?", (time.time(),))
+
+
+def get_shared_cache(config: LlmCacheConfig) -> LLMResponseCache:
+    """Return the process-wide cache for the given settings, so every Memory with the same settings shares it."""
+    db_path = None
+    if config.persistent:
+        db_path = config.path or os.path.join(mem0_dir, "llm_cache.db")
+    return get_shared(LLMResponseCache, config.max_entries, config.ttl_seconds, db_path, config.max_persistent_entries)
@@ -3,9 +3,29 @@ from typing import Optional
 from pydantic import BaseModel, Field, field_validator
 
 
+class LlmCacheConfig(BaseModel):
+    enabled: bool = Field(description="Whether fact extraction and memory update responses are cached", default=True)
+    ttl_seconds: float = Field(
+        description="Time in seconds after which a cached response expires", default=24 * 60 * 60
+    )
+    max_entries: int = Field(description="Maximum number of responses in the in-process LRU cache", default=10000)
+    persistent: bool = Field(description="Whether to also persist responses in a SQLite database", default=False)
+    max_persistent_entries: Optional[int] = Field(
+        description="Maximum number of responses kept in the SQLite database (None for no limit)", default=100000
+    )
+    path: Optional[str] = Field(
+        description="Path to the SQLite cache database (defaults to llm_cache.db in the mem0 directory)",
+        default=None,
+    )
+
+
 class LlmConfig(BaseModel):
     provider: str = Field(description="Provider of the LLM (e.g., 'ollama', 'openai')", default="openai")
     config: Optional[dict] = Field(description="Configuration for the specific LLM", default={})
+    cache: Optional[LlmCacheConfig] = Field(
+        description="Configuration for the cache of fact extraction and memory update responses",
+        default=None,
+    )
 
     @field_validator("config")
     def validate_config(cls, v, values):
@@ -0,0 +1,305 @@
+import hashlib
+import logging
+import uuid
+from copy import deepcopy
+from datetime import datetime
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import pytz
+
+logger = logging.getLogger(__name__)
+
+# Largest number of texts sent to the embedding model in a single call
+EMBEDDING_CHUNK_SIZE = 256
+
+
+def embed_in_chunks(embedding_model, texts: List[str], memory_action: str) -> Dict[str, List[float]]:
+    """
+    Embed many texts with as few embedding calls as possible.
+
+    Args:
+        embedding_model: Embedding model to use.
+        texts (List[str]): Texts to embed. Duplicates are embedded once.
+        memory_action (str): Memory action the embeddings are for ("add", "search" or "update").
+
+    Returns:
+        Dict[str, List[float]]: Mapping of each text to its embedding.
+    """
+    unique_texts = list(dict.fromkeys(texts))
+    embeddings = {}
+    for start in range(0, len(unique_texts), EMBEDDING_CHUNK_SIZE):
+        chunk = unique_texts[start : start + EMBEDDING_CHUNK_SIZE]
+        embeddings.update(zip(chunk, embedding_model.embed_batch(chunk, memory_action)))
+    return embeddings
+
+
+def build_updated_payload(existing_payload: Dict[str, Any], data: str, metadata: Optional[Dict[str, Any]] = None):
+    """
+    Build the payload of a memory whose text is being replaced.
+
+    Session and actor identifiers and the creation time are carried over from the existing payload.
+
+    Args:
+        existing_payload (dict): Payload currently stored for the memory.
+        data (str): New memory text.
+        metadata (dict, optional): Metadata to store with the new text. Defaults to None.
+
+    Returns:
+        dict: The new payload.
+    """
+    new_metadata = deepcopy(metadata) if metadata is not None else {}
+
+    new_metadata["data"] = data
+    new_metadata["hash"] = hashlib.md5(data.encode()).hexdigest()
+    new_metadata["created_at"] = existing_payload.get("created_at")
+    new_metadata["updated_at"] = datetime.now(pytz.timezone("US/Pacific")).isoformat()
+
+    for key in ("user_id", "agent_id", "run_id", "actor_id", "role"):
+        if key in existing_payload:
+            new_metadata[key] = existing_payload[key]
+
+    return new_metadata
+
+
+class BatchWriter:
+    """
+    Collects the memory writes of many `add` operations and applies them together.
+
+    Texts without a precomputed vector are embedded in bulk, all new memories go to the vector store in a
+    single insert and all history rows are written in one transaction. Writes are grouped by a
+    caller-chosen key (the position of the item in the batch) so failures can be reported per item.
+    """
+
+    def __init__(self, vector_store, db, embedding_model, lexical_index=None):
+        """
+        Initialize the writer.
+
+        Args:
+            vector_store: Vector store the memories are written to.
+            db: History database.
+            embedding_model: Embedding model used for texts without a precomputed vector.
+            lexical_index (LexicalIndex, optional): Lexical index kept in sync with the writes. Defaults to None.
+        """
+        self.vector_store = vector_store
+        self.db = db
+        self.embedding_model = embedding_model
+        self.lexical_index = lexical_index
+        self._ops = []
+
+    def add(
+        self,
+        key: Hashable,
+        data: str,
+        metadata: Dict[str, Any],
+        embeddings: Optional[List[float]] = None,
+        result: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Queue the creation of a memory.
+
+        Args:
+            key (Hashable): Item the write belongs to.
+            data (str): Memory text.
+            metadata (dict): Metadata to store with the memory.
+            embeddings (List[float], optional): Vector of the text, embedded on flush if missing.
+            result (dict, optional): Fields reported for this write alongside the memory id.
+        """
+        self._ops.append(
+            {
+                "key": key,
+                "event": "ADD",
+                "memory_id": str(uuid.uuid4()),
+                "data": data,
+                "metadata": metadata,
+                "embeddings": embeddings,
+                "result": result or {},
+            }
+        )
+
+    def update(
+        self,
+        key: Hashable,
+        memory_id: str,
+        data: str,
+        metadata: Dict[str, Any],
+        embeddings: Optional[List[float]] = None,
+        result: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Queue the replacement of an existing memory's text.
+
+        Args:
+            key (Hashable): Item the write belongs to.
+            memory_id (str): ID of the memory to update.
+            data (str): New memory text.
+            metadata (dict): Metadata to store with the new text.
+            embeddings (List[float], optional): Vector of the new text, embedded on flush if missing.
+            result (dict, optional): Fields reported for this write alongside the memory id.
+        """
+        self._ops.append(
+            {
+                "key": key,
+                "event": "UPDATE",
+                "memory_id": memory_id,
+                "data": data,
+                "metadata": metadata,
+                "embeddings": embeddings,
+                "result": result or {},
+            }
+        )
+
+    def delete(self, key: Hashable, memory_id: str, result: Optional[Dict[str, Any]] = None):
+        """
+        Queue the deletion of an existing memory.
+
+        Args:
+            key (Hashable): Item the write belongs to.
+            memory_id (str): ID of the memory to delete.
+            result (dict, optional): Fields reported for this write alongside the memory id.
+        """
+        self._ops.append({"key": key, "event": "DELETE", "memory_id": memory_id, "result": result or {}})
+
+    def flush(self) -> Tuple[Dict[Hashable, List[Dict[str, Any]]], Dict[Hashable, str]]:
+        """
+        Apply all queued writes.
+
+        An item whose new memories cannot be embedded or inserted is reported as failed and its updates
+        and deletes are skipped. A single update or delete that fails is logged and left out of the item's
+        results, as `Memory.add` does.
+
+        Returns:
+            tuple: The written memories per key, in the order they were queued, and the error message of
+                each failed key.
+        """
+        ops, self._ops = self._ops, []
+        failed = {}
+        history = []
+
+        self._embed_missing(ops, failed)
+        self._insert([op for op in ops if op["event"] == "ADD" and op["key"] not in failed], failed, history)
+
+        for op in ops:
+            if op["event"] == "ADD" or op["key"] in failed:
+                continue
+            try:
+                if op["event"] == "UPDATE":
+                    self._update(op, history)
+                else:
+                    self._delete(op, history)
+            except Exception as e:
+                logger.error(f"Error processing memory action: {op['event']} {op['memory_id']}, Error: {e}")
+                op["skipped"] = True
+
+        if history:
+            try:
+                self.db.add_history_batch(history)
+            except Exception as e:
+                logger.error(f"Failed to write {len(history)} history records: {e}")
+
+        results = {}
+        for op in ops:
+            if op["key"] in failed or op.get("skipped"):
+                continue
+            if self.lexical_index is not None:
+                if op["event"] == "DELETE":
+                    self.lexical_index.remove(op["memory_id"])
+                else:
+                    self.lexical_index.add(op["memory_id"], op["metadata"])
+            results.setdefault(op["key"], []).append({"id": op["memory_id"], **op["result"]})
+        return results, failed
+
+    def _embed_missing(self, ops, failed):
+        for memory_action, event in (("add", "ADD"), ("update", "UPDATE")):
+            pending = [op for op in ops if op["event"] == event and op["embeddings"] is None]
+            if not pending:
+                continue
+            try:
+                embeddings = embed_in_chunks(self.embedding_model, [op["data"] for op in pending], memory_action)
+            except Exception as e:
+                logger.error(f"Error embedding {len(pending)} memories: {e}")
+                for op in pending:
+                    failed.setdefault(op["key"], str(e))
+                continue
+            for op in pending:
+                op["embeddings"] = embeddings[op["data"]]
+
+    def _insert(self, adds, failed, history):
+        if not adds:
+            return
+
+        created_at = datetime.now(pytz.timezone("US/Pacific")).isoformat()
+        for op in adds:
+            op["metadata"]["data"] = op["data"]
+            op["metadata"]["hash"] = hashlib.md5(op["data"].encode()).hexdigest()
+            op["metadata"]["created_at"] = created_at
+
+        try:
+            self._insert_ops(adds)
+            inserted = adds
+        except Exception as e:
+            # Retry item by item so one bad item does not fail the whole batch
+            logger.warning(f"Batch insert of {len(adds)} memories failed, retrying per item: {e}")
+            by_key = {}
+            for op in adds:
+                by_key.setdefault(op["key"], []).append(op)
+            inserted = []
+            for key, key_ops in by_key.items():
+                try:
+                    self._insert_ops(key_ops)
+                    inserted.extend(key_ops)
+                except Exception as item_error:
+                    logger.error(f"Error inserting memories for batch item {key}: {item_error}")
+                    failed[key] = str(item_error)
+
+        for op in inserted:
+            history.append(
+                {
+                    "memory_id": op["memory_id"],
+                    "old_memory": None,
+                    "new_memory": op["data"],
+                    "event": "ADD",
+                    "created_at": op["metadata"]["created_at"],
+                    "actor_id": op["metadata"].get("actor_id"),
+                    "role": op["metadata"].get("role"),
+                }
+            )
+
+    def _insert_ops(self, ops):
+        self.vector_store.insert(
+            vectors=[op["embeddings"] for op in ops],
+            ids=[op["memory_id"] for op in ops],
+            payloads=[op["metadata"] for op in ops],
+        )
+
+    def _update(self, op, history):
+        existing_memory = self.vector_store.get(vector_id=op["memory_id"])
+        new_metadata = build_updated_payload(existing_memory.payload, op["data"], op["metadata"])
+        self.vector_store.update(vector_id=op["memory_id"], vector=op["embeddings"], payload=new_metadata)
+        op["metadata"] = new_metadata
+        history.append(
+            {
+                "memory_id": op["memory_id"],
+                "old_memory": existing_memory.payload.get("data"),
+                "new_memory": op["data"],
+                "event": "UPDATE",
+                "created_at": new_metadata["created_at"],
+                "updated_at": new_metadata["updated_at"],
+                "actor_id": new_metadata.get("actor_id"),
+                "role": new_metadata.get("role"),
+            }
+        )
+
+    def _delete(self, op, history):
+        existing_memory = self.vector_store.get(vector_id=op["memory_id"])
+        self.vector_store.delete(vector_id=op["memory_id"])
+        history.append(
+            {
+                "memory_id": op["memory_id"],
+                "old_memory": existing_memory.payload["data"],
+                "new_memory": None,
+                "event": "DELETE",
+                "actor_id": existing_memory.payload.get("actor_id"),
+                "role": existing_memory.payload.get("role"),
+                "is_deleted": 1,
+            }
+        )
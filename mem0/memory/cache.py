@@ -0,0 +1,181 @@
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Number of writes between two purges of expired and surplus rows from the SQLite tier
+PURGE_INTERVAL = 1000
+
+
+class TieredCache:
+    """
+    In-process LRU in front of an optional SQLite table that survives restarts.
+
+    The LRU holds at most `max_size`, as measured by `_entry_size`, and the table, when `db_path` is given,
+    at most `max_rows` rows; expired and surplus rows are purged every `PURGE_INTERVAL` writes. Hit and miss
+    counters are kept for both tiers. Subclasses describe their table and convert entries to and from its rows.
+    """
+
+    # Name of the SQLite table and of the columns holding an entry, after the key
+    table = ""
+    columns: Tuple[str, ...] = ()
+    # Statements creating the table and its indexes
+    schema: Tuple[str, ...] = ()
+    # What the entries are, for log messages
+    description = "entries"
+
+    def __init__(self, max_size: int, db_path: Optional[str] = None, max_rows: Optional[int] = None):
+        self.max_size = max_size
+        self.db_path = db_path
+        self.max_rows = max_rows
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._size = 0
+        self._writes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.persistent_hits = 0
+
+        self.connection = None
+        if db_path:
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            self.connection = sqlite3.connect(db_path, check_same_thread=False)
+            with self._lock:
+                self.connection.execute("PRAGMA journal_mode=WAL")
+                for statement in self.schema:
+                    self.connection.execute(statement)
+                self._purge()
+                self.connection.commit()
+
+    def _entry_size(self, entry) -> int:
+        return 1
+
+    def _is_fresh(self, entry) -> bool:
+        return True
+
+    def _to_row(self, entry) -> tuple:
+        raise NotImplementedError
+
+    def _from_row(self, row: tuple):
+        raise NotImplementedError
+
+    def _purge_expired(self):
+        """Delete the expired rows of the SQLite tier; called with the lock held."""
+
+    def _lookup(self, key: str):
+        """Return the fresh entry stored under `key`, or None, counting the hit or miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self._is_fresh(entry):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry
+                self._forget(key)
+
+            if self.connection is not None:
+                row = self.connection.execute(
+                    f"SELECT {', '.join(self.columns)} FROM {self.table} WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    entry = self._from_row(row)
+                    if self._is_fresh(entry):
+                        self._remember(key, entry)
+                        self.hits += 1
+                        self.persistent_hits += 1
+                        return entry
+
+            self.misses += 1
+            return None
+
+    def _store(self, items: List[Tuple[str, Any]]):
+        """Store entries in both tiers; a failure to persist them is logged, not raised."""
+        if not items:
+            return
+        with self._lock:
+            for key, entry in items:
+                self._remember(key, entry)
+            if self.connection is None:
+                return
+            try:
+                placeholders = ", ".join("?" * (len(self.columns) + 1))
+                self.connection.executemany(
+                    f"INSERT OR REPLACE INTO {self.table} (key, {', '.join(self.columns)}) VALUES ({placeholders})",
+                    [(key, *self._to_row(entry)) for key, entry in items],
+                )
+                self._writes += len(items)
+                if self._writes >= PURGE_INTERVAL:
+                    self._writes = 0
+                    self._purge()
+                self.connection.commit()
+            except Exception as e:
+                logger.warning(f"Failed to persist {self.description} to cache: {e}")
+
+    def _purge(self):
+        self._purge_expired()
+        if self.max_rows is not None:
+            # Rows are rewritten on replace, so the lowest rowids are the least recently written
+            self.connection.execute(
+                f"DELETE FROM {self.table} WHERE rowid <= "
+                f"(SELECT rowid FROM {self.table} ORDER BY rowid DESC LIMIT 1 OFFSET ?)",
+                (self.max_rows,),
+            )
+
+    def _remember(self, key: str, entry):
+        size = self._entry_size(entry)
+        if size > self.max_size:
+            return
+        self._forget(key)
+        self._entries[key] = entry
+        self._size += size
+        while self._size > self.max_size:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= self._entry_size(evicted)
+
+    def _forget(self, key: str):
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= self._entry_size(previous)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "persistent_hits": self.persistent_hits,
+                "entries": len(self._entries),
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            if self.connection is not None:
+                self.connection.execute(f"DELETE FROM {self.table}")
+                self.connection.commit()
+
+    def close(self):
+        with self._lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+
+
+_shared_caches: Dict[Tuple[Hashable, ...], TieredCache] = {}
+_shared_caches_lock = threading.Lock()
+
+
+def get_shared(cache_class, *args) -> TieredCache:
+    """Return the process-wide `cache_class` built from `args`, so every user of the same settings shares it."""
+    key = (cache_class, *args)
+    with _shared_caches_lock:
+        cache = _shared_caches.get(key)
+        if cache is None:
+            cache = cache_class(*args)
+            _shared_caches[key] = cache
+        return cache
@@ -0,0 +1,98 @@
+import concurrent.futures
+import threading
+from typing import Any, Callable, Dict, Optional
+
+
+class MemoryExecutor:
+    """
+    Long-lived, bounded thread pool used by a Memory instance to run its vector store and graph
+    operations in parallel.
+
+    Submissions block once `max_pending` tasks are queued or running, so callers are slowed down
+    instead of piling up unbounded work under load.
+    """
+
+    def __init__(self, max_workers: int, max_pending: Optional[int] = None, thread_name_prefix: str = "mem0"):
+        """
+        Initialize the executor.
+
+        Args:
+            max_workers (int): Maximum number of worker threads.
+            max_pending (int, optional): Maximum number of tasks queued or running at once.
+                Defaults to four times max_workers.
+            thread_name_prefix (str, optional): Prefix for worker thread names. Defaults to "mem0".
+        """
+        self.max_workers = max_workers
+        self.max_pending = max_pending or max_workers * 4
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=thread_name_prefix
+        )
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._max_queue_depth = 0
+
+    def submit(self, fn: Callable, *args, **kwargs) -> concurrent.futures.Future:
+        """
+        Schedule a callable, blocking while the executor is at capacity.
+
+        Args:
+            fn (Callable): Callable to run.
+            *args: Positional arguments for the callable.
+            **kwargs: Keyword arguments for the callable.
+
+        Returns:
+            concurrent.futures.Future: Future for the callable's result.
+        """
+        self._slots.acquire()
+        with self._lock:
+            self._queued += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._queued)
+
+        def run() -> Any:
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+                self._slots.release()
+
+        try:
+            return self._executor.submit(run)
+        except Exception:
+            with self._lock:
+                self._queued -= 1
+            self._slots.release()
+            raise
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Report queue depth and throughput counters.
+
+        Returns:
+            Dict[str, int]: Worker limit, tasks waiting for a worker, tasks running, tasks completed and the
+                highest number of waiting tasks seen so far.
+        """
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "queued": self._queued,
+                "running": self._running,
+                "completed": self._completed,
+                "max_queue_depth": self._max_queue_depth,
+            }
+
+    def shutdown(self, wait: bool = True):
+        """
+        Stop accepting new tasks and release the worker threads.
+
+        Args:
+            wait (bool, optional): Whether to wait for pending tasks to finish. Defaults to True.
+        """
+        self._executor.shutdown(wait=wait)
@@ -1,17 +1,18 @@
 import logging
 
-from mem0.memory.utils import format_entities, sanitize_relationship_for_cypher
+from mem0.memory.utils import (
+    embed_entity_names,
+    format_entities,
+    plan_entity_writes,
+    sanitize_relationship_for_cypher,
+)
 
 try:
     from langchain_neo4j import Neo4jGraph
 except ImportError:
     raise ImportError("langchain_neo4j is not installed. Please install it using pip install langchain-neo4j")
 
-try:
-    from rank_bm25 import BM25Okapi
-except ImportError:
-    raise ImportError("rank_bm25 is not installed. Please install it using pip install rank-bm25")
-
+from mem0.graphs.bm25 import rerank_relations
 from mem0.graphs.tools import (
     DELETE_MEMORY_STRUCT_TOOL_GRAPH,
     DELETE_MEMORY_TOOL_GRAPH,
@@ -25,6 +26,13 @@ from mem0.utils.factory import EmbedderFactory, LlmFactory
 
 logger = logging.getLogger(__name__)
 
+# Neo4j error codes raised by db.index.vector.queryNodes when vector indexes are unsupported or the index is unusable
+_PROCEDURE_NOT_FOUND = "Neo.ClientError.Procedure.ProcedureNotFound"
+_PROCEDURE_CALL_FAILED = "Neo.ClientError.Procedure.ProcedureCallFailed"
+
+# Most nearest entities fetched from the vector index for one lookup before its user's entities are scanned instead
+MAX_INDEX_CANDIDATES = 10000
+
 
 class MemoryGraph:
     def __init__(self, config):
@@ -38,7 +46,10 @@ class MemoryGraph:
             driver_config={"notifications_min_severity": "OFF"},
         )
         self.embedding_model = EmbedderFactory.create(
-            self.config.embedder.provider, self.config.embedder.config, self.config.vector_store.config
+            self.config.embedder.provider,
+            self.config.embedder.config,
+            self.config.vector_store.config,
+            self.config.embedder.cache,
         )
         self.node_label = ":`__Entity__`" if self.config.graph_store.config.base_label else ""
 
@@ -55,6 +66,15 @@ class MemoryGraph:
             except Exception:
                 pass
 
+        # A vector index needs a single label to cover every entity, so it is only used with base_label
+        self.vector_index_name = "entity_embedding"
+        self.vector_index_candidates = self.config.graph_store.config.vector_index_candidates
+        self.use_vector_index = bool(
+            self.config.graph_store.config.base_label and self.config.graph_store.config.vector_index
+        )
+        if self.use_vector_index:
+            self.use_vector_index = self._create_vector_index()
+
         # Default to openai if no specific provider is configured
         self.llm_provider = "openai"
         if self.config.llm and self.config.llm.provider:
@@ -85,7 +105,6 @@ class MemoryGraph:
         search_output = self._search_graph_db(node_list=list(entity_type_map.keys()), filters=filters)
         to_be_deleted = self._get_delete_entities_from_search_output(search_output, data, filters)
 
-        # TODO: Batch queries with APOC plugin
         # TODO: Add more filter support
         deleted_entities = self._delete_entities(to_be_deleted, filters)
         added_entities = self._add_entities(to_be_added, filters, entity_type_map)
@@ -112,17 +131,7 @@ class MemoryGraph:
         if not search_output:
             return []
 
-        search_outputs_sequence = [
-            [item["source"], item["relationship"], item["destination"]] for item in search_output
-        ]
-        bm25 = BM25Okapi(search_outputs_sequence)
-
-        tokenized_query = query.split(" ")
-        reranked_results = bm25.get_top_n(tokenized_query, search_outputs_sequence, n=5)
-
-        search_results = []
-        for item in reranked_results:
-            search_results.append({"source": item[0], "relationship": item[1], "destination": item[2]})
+        search_results = rerank_relations(query, search_output, n=5)
 
         logger.info(f"Returned {len(search_results)} search results")
 
@@ -267,56 +276,244 @@ class MemoryGraph:
         logger.debug(f"Extracted entities: {entities}")
         return entities
 
+    def _create_vector_index(self):
+        """
+        Create the vector index on entity embeddings if it does not exist yet.
+
+        Returns:
+            bool: Whether the index can be used for similarity searches.
+        """
+        dims = getattr(self.embedding_model.config, "embedding_dims", None)
+        if not dims:
+            logger.warning("Embedding dimensions are unknown, graph searches will scan entity embeddings")
+            return False
+
+        try:
+            self.graph.query(
+                f"CREATE VECTOR INDEX {self.vector_index_name} IF NOT EXISTS "
+                f"FOR (n {self.node_label}) ON (n.embedding) "
+                f"OPTIONS {{indexConfig: {{`vector.dimensions`: {int(dims)}, `vector.similarity_function`: 'cosine'}}}}"
+            )
+        except Exception as e:
+            logger.warning(f"Could not create the entity vector index, graph searches will scan embeddings: {e}")
+            return False
+        return True
+
+    def _similar_nodes_cypher(self, node, embedding, similarity, conditions, use_index):
+        """
+        Build the Cypher that binds `node` to the entities closest to the `embedding` expression.
+
+        The matched entities satisfy `conditions` and carry their cosine similarity, denormalized to
+        [-1, 1] for backward compatibility, as `similarity`. With the vector index the nearest
+        `$index_candidates` entities are fetched and then filtered; otherwise every matching entity is scanned.
+        """
+        where_clause = " AND ".join(conditions)
+        if use_index:
+            return f"""
+            CALL db.index.vector.queryNodes($index_name, $index_candidates, {embedding})
+            YIELD node AS {node}, score
+            WHERE {where_clause}
+            WITH {node}, round(2 * score - 1, 4) AS {similarity}"""
+
+        return f"""
+            MATCH ({node} {self.node_label})
+            WHERE {node}.embedding IS NOT NULL AND {where_clause}
+            WITH {node},
+            round(2 * vector.similarity.cosine({node}.embedding, {embedding}) - 1, 4) AS {similarity}"""
+
+    def _query_similar_nodes(self, build_query, params, candidates, resolved, entity_key):
+        """
+        Run a similarity query through the vector index, falling back to a scan when the index cannot be used.
+
+        The index returns the nearest entities of every user before the user/agent/run conditions apply, so in a
+        shared database a user's own entities can fall outside them. Entities left unresolved are queried again
+        with twice as many candidates, but only while the index returned a full page whose farthest entity still
+        reaches the threshold; past `MAX_INDEX_CANDIDATES` the remaining entities are scanned.
+
+        Args:
+            build_query (callable): Returns the Cypher query given whether the vector index is used.
+            params (dict): Query parameters, with the looked up entities under "entities".
+            candidates (int): Number of nearest entities to fetch from the index.
+            resolved (callable): Given query results, returns the keys of the entities they answer.
+            entity_key (str): Entity field holding the key returned by `resolved`.
+
+        Returns:
+            list: Query results, in the order of the queries that produced them.
+        """
+        if self.use_vector_index:
+            try:
+                return self._query_index_widening(build_query, params, candidates, resolved, entity_key)
+            except Exception as e:
+                if not self._vector_index_unusable(e):
+                    raise
+
+        return self.graph.query(build_query(False), params=params)
+
+    def _query_index_widening(self, build_query, params, candidates, resolved, entity_key):
+        results = []
+        while True:
+            index_params = {**params, "index_name": self.vector_index_name, "index_candidates": candidates}
+            result = self.graph.query(build_query(True), params=index_params)
+            results.extend(result)
+
+            found = resolved(result)
+            missing = [entity for entity in params["entities"] if entity[entity_key] not in found]
+            truncated = self._truncated_index_lookups(missing, params["threshold"], candidates, entity_key)
+            if not truncated:
+                return results
+
+            params = {**params, "entities": truncated}
+            if candidates >= MAX_INDEX_CANDIDATES:
+                return results + self.graph.query(build_query(False), params=params)
+            candidates = min(candidates * 2, MAX_INDEX_CANDIDATES)
+
+    def _truncated_index_lookups(self, entities, threshold, candidates, entity_key):
+        """
+        Find the entities whose nearest index candidates may have crowded out matching entities of their user.
+
+        That is the case only when the index returned all `candidates` entities and the farthest of them still
+        reaches the threshold; otherwise every entity beyond them is below the threshold too.
+
+        Args:
+            entities (list): Entities left unresolved by the index query.
+            threshold (float): Minimum similarity of a match.
+            candidates (int): Number of nearest entities the index query fetched.
+            entity_key (str): Entity field identifying each entity.
+
+        Returns:
+            list: The entities worth querying again with more candidates.
+        """
+        if not entities:
+            return []
+
+        rows = self.graph.query(
+            """
+            UNWIND $entities AS entity
+            CALL db.index.vector.queryNodes($index_name, $index_candidates, entity.embedding)
+            YIELD score
+            WITH entity, count(score) AS hits, min(score) AS farthest
+            WHERE hits = $index_candidates AND round(2 * farthest - 1, 4) >= $threshold
+            RETURN entity.key AS key
+            """,
+            params={
+                "entities": [{"key": entity[entity_key], "embedding": entity["embedding"]} for entity in entities],
+                "index_name": self.vector_index_name,
+                "index_candidates": candidates,
+                "threshold": threshold,
+            },
+        )
+        truncated = {row["key"] for row in rows}
+        return [entity for entity in entities if entity[entity_key] in truncated]
+
+    def _vector_index_unusable(self, error):
+        """
+        Check whether a failed index query should be answered by a scan, and stop using the index if it is gone.
+
+        Args:
+            error (Exception): Error raised by the index query.
+
+        Returns:
+            bool: True if the vector index is missing, unsupported or still being populated.
+        """
+        code = getattr(error, "code", None)
+        if code == _PROCEDURE_NOT_FOUND:
+            state = None
+        elif code == _PROCEDURE_CALL_FAILED:
+            try:
+                indexes = self.graph.query(
+                    "SHOW INDEXES YIELD name, state WHERE name = $name RETURN state",
+                    params={"name": self.vector_index_name},
+                )
+            except Exception:
+                return False
+            state = indexes[0]["state"] if indexes else None
+            if state == "ONLINE":
+                return False
+        else:
+            return False
+
+        if state is None:
+            logger.warning(f"Entity vector index unavailable, falling back to embedding scans: {error}")
+            self.use_vector_index = False
+        return True
+
     def _search_graph_db(self, node_list, filters, limit=100):
-        """Search similar nodes among and their respective incoming and outgoing relations."""
-        result_relations = []
+        """
+        Search similar nodes among and their respective incoming and outgoing relations.
+
+        All entities are searched with a single query. Each entity contributes at most `limit` relations and a
+        relation reached from several entities is returned once, with its highest similarity.
+        """
+        if not node_list:
+            return []
 
         # Build node properties for filtering
         node_props = ["user_id: $user_id"]
+        node_conditions = ["n.user_id = $user_id"]
         if filters.get("agent_id"):
             node_props.append("agent_id: $agent_id")
+            node_conditions.append("n.agent_id = $agent_id")
         if filters.get("run_id"):
             node_props.append("run_id: $run_id")
+            node_conditions.append("n.run_id = $run_id")
         node_props_str = ", ".join(node_props)
 
-        for node in node_list:
-            n_embedding = self.embedding_model.embed(node)
-
-            cypher_query = f"""
-            MATCH (n {self.node_label} {{{node_props_str}}})
-            WHERE n.embedding IS NOT NULL
-            WITH n, round(2 * vector.similarity.cosine(n.embedding, $n_embedding) - 1, 4) AS similarity // denormalize for backward compatibility
-            WHERE similarity >= $threshold
+        def build_query(use_index):
+            similar_nodes = self._similar_nodes_cypher(
+                "n", "entity.embedding", "similarity", node_conditions, use_index
+            )
+            return f"""
+            UNWIND $entities AS entity
             CALL {{
-                WITH n
-                MATCH (n)-[r]->(m {self.node_label} {{{node_props_str}}})
-                RETURN n.name AS source, elementId(n) AS source_id, type(r) AS relationship, elementId(r) AS relation_id, m.name AS destination, elementId(m) AS destination_id
-                UNION
-                WITH n  
-                MATCH (n)<-[r]-(m {self.node_label} {{{node_props_str}}})
-                RETURN m.name AS source, elementId(m) AS source_id, type(r) AS relationship, elementId(r) AS relation_id, n.name AS destination, elementId(n) AS destination_id
+                WITH entity{similar_nodes}
+                WHERE similarity >= $threshold
+                CALL {{
+                    WITH n
+                    MATCH (n)-[r]->(m {self.node_label} {{{node_props_str}}})
+                    RETURN n.name AS source, elementId(n) AS source_id, type(r) AS relationship, elementId(r) AS relation_id, m.name AS destination, elementId(m) AS destination_id
+                    UNION
+                    WITH n
+                    MATCH (n)<-[r]-(m {self.node_label} {{{node_props_str}}})
+                    RETURN m.name AS source, elementId(m) AS source_id, type(r) AS relationship, elementId(r) AS relation_id, n.name AS destination, elementId(n) AS destination_id
+                }}
+                WITH distinct source, source_id, relationship, relation_id, destination, destination_id, similarity
+                RETURN source, source_id, relationship, relation_id, destination, destination_id, similarity
+                ORDER BY similarity DESC
+                LIMIT $limit
             }}
-            WITH distinct source, source_id, relationship, relation_id, destination, destination_id, similarity
-            RETURN source, source_id, relationship, relation_id, destination, destination_id, similarity
+            WITH source, source_id, relationship, relation_id, destination, destination_id,
+                max(similarity) AS similarity, collect(entity.idx) AS entity_idx
+            RETURN source, source_id, relationship, relation_id, destination, destination_id, similarity, entity_idx
             ORDER BY similarity DESC
-            LIMIT $limit
             """
 
-            params = {
-                "n_embedding": n_embedding,
-                "threshold": self.threshold,
-                "user_id": filters["user_id"],
-                "limit": limit,
-            }
-            if filters.get("agent_id"):
-                params["agent_id"] = filters["agent_id"]
-            if filters.get("run_id"):
-                params["run_id"] = filters["run_id"]
+        def resolved(result):
+            return {idx for record in result for idx in record.get("entity_idx", ())}
+
+        node_embeddings = self.embedding_model.embed_batch(node_list)
+        params = {
+            "entities": [{"idx": idx, "embedding": n_embedding} for idx, n_embedding in enumerate(node_embeddings)],
+            "threshold": self.threshold,
+            "user_id": filters["user_id"],
+            "limit": limit,
+        }
+        if filters.get("agent_id"):
+            params["agent_id"] = filters["agent_id"]
+        if filters.get("run_id"):
+            params["run_id"] = filters["run_id"]
 
-            ans = self.graph.query(cypher_query, params=params)
-            result_relations.extend(ans)
+        result = self._query_similar_nodes(
+            build_query, params, max(self.vector_index_candidates, limit), resolved, "idx"
+        )
 
-        return result_relations
+        # Relations reached by several queries are kept once, with their highest similarity
+        relations = {}
+        for record in result:
+            record = {key: value for key, value in record.items() if key != "entity_idx"}
+            previous = relations.get(record.get("relation_id"))
+            if previous is None or record["similarity"] > previous["similarity"]:
+                relations[record.get("relation_id")] = record
+        return sorted(relations.values(), key=lambda record: record["similarity"], reverse=True)
 
     def _get_delete_entities_from_search_output(self, search_output, data, filters):
         """Get the entities to be deleted from the search output."""
@@ -356,327 +553,219 @@ class MemoryGraph:
 
     def _delete_entities(self, to_be_deleted, filters):
         """Delete the entities from the graph."""
+        if not to_be_deleted:
+            return []
+
         user_id = filters["user_id"]
         agent_id = filters.get("agent_id", None)
         run_id = filters.get("run_id", None)
-        results = []
 
-        for item in to_be_deleted:
-            source = item["source"]
-            destination = item["destination"]
-            relationship = item["relationship"]
-
-            # Build the agent filter for the query
-
-            params = {
-                "source_name": source,
-                "dest_name": destination,
-                "user_id": user_id,
-            }
-
-            if agent_id:
-                params["agent_id"] = agent_id
-            if run_id:
-                params["run_id"] = run_id
-
-            # Build node properties for filtering
-            source_props = ["name: $source_name", "user_id: $user_id"]
-            dest_props = ["name: $dest_name", "user_id: $user_id"]
-            if agent_id:
-                source_props.append("agent_id: $agent_id")
-                dest_props.append("agent_id: $agent_id")
-            if run_id:
-                source_props.append("run_id: $run_id")
-                dest_props.append("run_id: $run_id")
-            source_props_str = ", ".join(source_props)
-            dest_props_str = ", ".join(dest_props)
-
-            # Delete the specific relationship between nodes
-            cypher = f"""
-            MATCH (n {self.node_label} {{{source_props_str}}})
-            -[r:{relationship}]->
-            (m {self.node_label} {{{dest_props_str}}})
-            
-            DELETE r
-            RETURN 
-                n.name AS source,
-                m.name AS target,
-                type(r) AS relationship
-            """
+        params = {"user_id": user_id}
+        if agent_id:
+            params["agent_id"] = agent_id
+        if run_id:
+            params["run_id"] = run_id
 
-            result = self.graph.query(cypher, params=params)
-            results.append(result)
+        # Build node properties for filtering
+        source_props = ["name: row.source", "user_id: $user_id"]
+        dest_props = ["name: row.destination", "user_id: $user_id"]
+        if agent_id:
+            source_props.append("agent_id: $agent_id")
+            dest_props.append("agent_id: $agent_id")
+        if run_id:
+            source_props.append("run_id: $run_id")
+            dest_props.append("run_id: $run_id")
+        source_props_str = ", ".join(source_props)
+        dest_props_str = ", ".join(dest_props)
+
+        rows_by_relationship = {}
+        for key, item in enumerate(to_be_deleted):
+            rows_by_relationship.setdefault(item["relationship"], []).append(
+                {"key": key, "source": item["source"], "destination": item["destination"]}
+            )
 
+        # Relationship types cannot be parameters, so each type gets its own UNWIND in the same statement
+        delete_queries = []
+        for i, (relationship, rows) in enumerate(rows_by_relationship.items()):
+            params[f"rows_{i}"] = rows
+            delete_queries.append(
+                f"""
+                UNWIND $rows_{i} AS row
+                MATCH (n {self.node_label} {{{source_props_str}}})
+                -[r:{relationship}]->
+                (m {self.node_label} {{{dest_props_str}}})
+                DELETE r
+                RETURN row.key AS key, n.name AS source, m.name AS target, type(r) AS relationship"""
+            )
+
+        cypher = f"""
+        CALL {{{" UNION ALL".join(delete_queries)}
+        }}
+        RETURN key, source, target, relationship
+        """
+
+        results = [[] for _ in to_be_deleted]
+        for record in self.graph.query(cypher, params=params):
+            results[record["key"]].append(
+                {"source": record["source"], "target": record["target"], "relationship": record["relationship"]}
+            )
         return results
 
     def _add_entities(self, to_be_added, filters, entity_type_map):
         """Add the new entities to the graph. Merge the nodes if they already exist."""
+        if not to_be_added:
+            return []
+
         user_id = filters["user_id"]
         agent_id = filters.get("agent_id", None)
         run_id = filters.get("run_id", None)
-        results = []
-        for item in to_be_added:
-            # entities
-            source = item["source"]
-            destination = item["destination"]
-            relationship = item["relationship"]
-
-            # types
-            source_type = entity_type_map.get(source, "__User__")
-            source_label = self.node_label if self.node_label else f":`{source_type}`"
-            source_extra_set = f", source:`{source_type}`" if self.node_label else ""
-            destination_type = entity_type_map.get(destination, "__User__")
-            destination_label = self.node_label if self.node_label else f":`{destination_type}`"
-            destination_extra_set = f", destination:`{destination_type}`" if self.node_label else ""
-
-            # embeddings
-            source_embedding = self.embedding_model.embed(source)
-            dest_embedding = self.embedding_model.embed(destination)
-
-            # search for the nodes with the closest embeddings
-            source_node_search_result = self._search_source_node(source_embedding, filters, threshold=0.9)
-            destination_node_search_result = self._search_destination_node(dest_embedding, filters, threshold=0.9)
-
-            # TODO: Create a cypher query and common params for all the cases
-            if not destination_node_search_result and source_node_search_result:
-                # Build destination MERGE properties
-                merge_props = ["name: $destination_name", "user_id: $user_id"]
-                if agent_id:
-                    merge_props.append("agent_id: $agent_id")
-                if run_id:
-                    merge_props.append("run_id: $run_id")
-                merge_props_str = ", ".join(merge_props)
-
-                cypher = f"""
-                MATCH (source)
-                WHERE elementId(source) = $source_id
-                SET source.mentions = coalesce(source.mentions, 0) + 1
-                WITH source
-                MERGE (destination {destination_label} {{{merge_props_str}}})
-                ON CREATE SET
-                    destination.created = timestamp(),
-                    destination.mentions = 1
-                    {destination_extra_set}
-                ON MATCH SET
-                    destination.mentions = coalesce(destination.mentions, 0) + 1
-                WITH source, destination
-                CALL db.create.setNodeVectorProperty(destination, 'embedding', $destination_embedding)
-                WITH source, destination
-                MERGE (source)-[r:{relationship}]->(destination)
-                ON CREATE SET 
-                    r.created = timestamp(),
-                    r.mentions = 1
-                ON MATCH SET
-                    r.mentions = coalesce(r.mentions, 0) + 1
-                RETURN source.name AS source, type(r) AS relationship, destination.name AS target
+
+        entity_embeddings = embed_entity_names(self.embedding_model, to_be_added)
+        resolved = self._resolve_entity_nodes(entity_embeddings, filters, threshold=0.9)
+        nodes, rows, item_keys = plan_entity_writes(to_be_added, resolved)
+
+        params = {"user_id": user_id}
+        if agent_id:
+            params["agent_id"] = agent_id
+        if run_id:
+            params["run_id"] = run_id
+
+        # Build MERGE properties for new nodes
+        merge_props = ["name: node.name", "user_id: $user_id"]
+        if agent_id:
+            merge_props.append("agent_id: $agent_id")
+        if run_id:
+            merge_props.append("run_id: $run_id")
+        merge_props_str = ", ".join(merge_props)
+
+        # Labels and relationship types cannot be parameters, so each label and each type gets its own UNWIND
+        node_queries = []
+        existing_nodes = [
+            {"idx": node["idx"], "node_id": node["node_id"], "mentions": node["mentions"]}
+            for node in nodes
+            if node["node_id"] is not None
+        ]
+        if existing_nodes:
+            params["existing_nodes"] = existing_nodes
+            node_queries.append(
                 """
+                UNWIND $existing_nodes AS node
+                MATCH (n)
+                WHERE elementId(n) = node.node_id
+                SET n.mentions = coalesce(n.mentions, 0) + node.mentions
+                RETURN node.idx AS idx, n"""
+            )
 
-                params = {
-                    "source_id": source_node_search_result[0]["elementId(source_candidate)"],
-                    "destination_name": destination,
-                    "destination_embedding": dest_embedding,
-                    "user_id": user_id,
-                }
-                if agent_id:
-                    params["agent_id"] = agent_id
-                if run_id:
-                    params["run_id"] = run_id
-
-            elif destination_node_search_result and not source_node_search_result:
-                # Build source MERGE properties
-                merge_props = ["name: $source_name", "user_id: $user_id"]
-                if agent_id:
-                    merge_props.append("agent_id: $agent_id")
-                if run_id:
-                    merge_props.append("run_id: $run_id")
-                merge_props_str = ", ".join(merge_props)
-
-                cypher = f"""
-                MATCH (destination)
-                WHERE elementId(destination) = $destination_id
-                SET destination.mentions = coalesce(destination.mentions, 0) + 1
-                WITH destination
-                MERGE (source {source_label} {{{merge_props_str}}})
+        new_nodes_by_type = {}
+        for node in nodes:
+            if node["node_id"] is None:
+                new_nodes_by_type.setdefault(entity_type_map.get(node["name"], "__User__"), []).append(
+                    {
+                        "idx": node["idx"],
+                        "name": node["name"],
+                        "mentions": node["mentions"],
+                        "embedding": entity_embeddings[node["name"]],
+                    }
+                )
+        for i, (entity_type, new_nodes) in enumerate(new_nodes_by_type.items()):
+            label = self.node_label if self.node_label else f":`{entity_type}`"
+            extra_set = f", n:`{entity_type}`" if self.node_label else ""
+            params[f"new_nodes_{i}"] = new_nodes
+            node_queries.append(
+                f"""
+                UNWIND $new_nodes_{i} AS node
+                MERGE (n {label} {{{merge_props_str}}})
                 ON CREATE SET
-                    source.created = timestamp(),
-                    source.mentions = 1
-                    {source_extra_set}
+                    n.created = timestamp(),
+                    n.mentions = node.mentions
+                    {extra_set}
                 ON MATCH SET
-                    source.mentions = coalesce(source.mentions, 0) + 1
-                WITH source, destination
-                CALL db.create.setNodeVectorProperty(source, 'embedding', $source_embedding)
-                WITH source, destination
+                    n.mentions = coalesce(n.mentions, 0) + node.mentions
+                WITH node, n
+                CALL db.create.setNodeVectorProperty(n, 'embedding', node.embedding)
+                RETURN node.idx AS idx, n"""
+            )
+
+        rows_by_relationship = {}
+        for row in rows:
+            rows_by_relationship.setdefault(row["relationship"], []).append(row)
+        relation_queries = []
+        for i, (relationship, relation_rows) in enumerate(rows_by_relationship.items()):
+            params[f"rows_{i}"] = relation_rows
+            relation_queries.append(
+                f"""
+                WITH nodes
+                UNWIND $rows_{i} AS row
+                WITH row,
+                    [entry IN nodes WHERE entry.idx = row.source | entry.node][0] AS source,
+                    [entry IN nodes WHERE entry.idx = row.destination | entry.node][0] AS destination
+                WHERE source IS NOT NULL AND destination IS NOT NULL
                 MERGE (source)-[r:{relationship}]->(destination)
-                ON CREATE SET 
+                ON CREATE SET
                     r.created = timestamp(),
-                    r.mentions = 1
+                    r.mentions = row.mentions
                 ON MATCH SET
-                    r.mentions = coalesce(r.mentions, 0) + 1
-                RETURN source.name AS source, type(r) AS relationship, destination.name AS target
-                """
-
-                params = {
-                    "destination_id": destination_node_search_result[0]["elementId(destination_candidate)"],
-                    "source_name": source,
-                    "source_embedding": source_embedding,
-                    "user_id": user_id,
-                }
-                if agent_id:
-                    params["agent_id"] = agent_id
-                if run_id:
-                    params["run_id"] = run_id
-
-            elif source_node_search_result and destination_node_search_result:
-                cypher = f"""
-                MATCH (source)
-                WHERE elementId(source) = $source_id
-                SET source.mentions = coalesce(source.mentions, 0) + 1
-                WITH source
-                MATCH (destination)
-                WHERE elementId(destination) = $destination_id
-                SET destination.mentions = coalesce(destination.mentions, 0) + 1
-                MERGE (source)-[r:{relationship}]->(destination)
-                ON CREATE SET 
-                    r.created_at = timestamp(),
-                    r.updated_at = timestamp(),
-                    r.mentions = 1
-                ON MATCH SET r.mentions = coalesce(r.mentions, 0) + 1
-                RETURN source.name AS source, type(r) AS relationship, destination.name AS target
-                """
-
-                params = {
-                    "source_id": source_node_search_result[0]["elementId(source_candidate)"],
-                    "destination_id": destination_node_search_result[0]["elementId(destination_candidate)"],
-                    "user_id": user_id,
-                }
-                if agent_id:
-                    params["agent_id"] = agent_id
-                if run_id:
-                    params["run_id"] = run_id
-
-            else:
-                # Build dynamic MERGE props for both source and destination
-                source_props = ["name: $source_name", "user_id: $user_id"]
-                dest_props = ["name: $dest_name", "user_id: $user_id"]
-                if agent_id:
-                    source_props.append("agent_id: $agent_id")
-                    dest_props.append("agent_id: $agent_id")
-                if run_id:
-                    source_props.append("run_id: $run_id")
-                    dest_props.append("run_id: $run_id")
-                source_props_str = ", ".join(source_props)
-                dest_props_str = ", ".join(dest_props)
-
-                cypher = f"""
-                MERGE (source {source_label} {{{source_props_str}}})
-                ON CREATE SET source.created = timestamp(),
-                            source.mentions = 1
-                            {source_extra_set}
-                ON MATCH SET source.mentions = coalesce(source.mentions, 0) + 1
-                WITH source
-                CALL db.create.setNodeVectorProperty(source, 'embedding', $source_embedding)
-                WITH source
-                MERGE (destination {destination_label} {{{dest_props_str}}})
-                ON CREATE SET destination.created = timestamp(),
-                            destination.mentions = 1
-                            {destination_extra_set}
-                ON MATCH SET destination.mentions = coalesce(destination.mentions, 0) + 1
-                WITH source, destination
-                CALL db.create.setNodeVectorProperty(destination, 'embedding', $dest_embedding)
-                WITH source, destination
-                MERGE (source)-[rel:{relationship}]->(destination)
-                ON CREATE SET rel.created = timestamp(), rel.mentions = 1
-                ON MATCH SET rel.mentions = coalesce(rel.mentions, 0) + 1
-                RETURN source.name AS source, type(rel) AS relationship, destination.name AS target
-                """
-
-                params = {
-                    "source_name": source,
-                    "dest_name": destination,
-                    "source_embedding": source_embedding,
-                    "dest_embedding": dest_embedding,
-                    "user_id": user_id,
-                }
-                if agent_id:
-                    params["agent_id"] = agent_id
-                if run_id:
-                    params["run_id"] = run_id
-            result = self.graph.query(cypher, params=params)
-            results.append(result)
-        return results
-
-    def _remove_spaces_from_entities(self, entity_list):
-        for item in entity_list:
-            item["source"] = item["source"].lower().replace(" ", "_")
-            # Use the sanitization function for relationships to handle special characters
-            item["relationship"] = sanitize_relationship_for_cypher(item["relationship"].lower().replace(" ", "_"))
-            item["destination"] = item["destination"].lower().replace(" ", "_")
-        return entity_list
-
-    def _search_source_node(self, source_embedding, filters, threshold=0.9):
-        # Build WHERE conditions
-        where_conditions = ["source_candidate.embedding IS NOT NULL", "source_candidate.user_id = $user_id"]
-        if filters.get("agent_id"):
-            where_conditions.append("source_candidate.agent_id = $agent_id")
-        if filters.get("run_id"):
-            where_conditions.append("source_candidate.run_id = $run_id")
-        where_clause = " AND ".join(where_conditions)
+                    r.mentions = coalesce(r.mentions, 0) + row.mentions
+                RETURN row.key AS key, source.name AS source, type(r) AS relationship, destination.name AS target"""
+            )
 
         cypher = f"""
-            MATCH (source_candidate {self.node_label})
-            WHERE {where_clause}
-
-            WITH source_candidate,
-            round(2 * vector.similarity.cosine(source_candidate.embedding, $source_embedding) - 1, 4) AS source_similarity // denormalize for backward compatibility
-            WHERE source_similarity >= $threshold
+        CALL {{{" UNION ALL".join(node_queries)}
+        }}
+        WITH collect({{idx: idx, node: n}}) AS nodes
+        CALL {{{" UNION ALL".join(relation_queries)}
+        }}
+        RETURN key, source, relationship, target
+        """
 
-            WITH source_candidate, source_similarity
-            ORDER BY source_similarity DESC
-            LIMIT 1
+        rows_by_key = {}
+        for record in self.graph.query(cypher, params=params):
+            rows_by_key.setdefault(record["key"], []).append(
+                {"source": record["source"], "relationship": record["relationship"], "target": record["target"]}
+            )
+        return [rows_by_key.get(key, []) for key in item_keys]
 
-            RETURN elementId(source_candidate)
-            """
+    def _resolve_entity_nodes(self, entity_embeddings, filters, threshold=0.9):
+        """
+        Find the existing node closest to each entity name with a single query.
 
-        params = {
-            "source_embedding": source_embedding,
-            "user_id": filters["user_id"],
-            "threshold": threshold,
-        }
-        if filters.get("agent_id"):
-            params["agent_id"] = filters["agent_id"]
-        if filters.get("run_id"):
-            params["run_id"] = filters["run_id"]
+        Args:
+            entity_embeddings (dict): Embedding of each entity name.
+            filters (dict): Filters the nodes must match.
+            threshold (float): Minimum similarity for a node to be reused. Defaults to 0.9.
 
-        result = self.graph.query(cypher, params=params)
-        return result
+        Returns:
+            dict: Element ID of the closest node for each entity name that has one above the threshold.
+        """
+        if not entity_embeddings:
+            return {}
 
-    def _search_destination_node(self, destination_embedding, filters, threshold=0.9):
         # Build WHERE conditions
-        where_conditions = ["destination_candidate.embedding IS NOT NULL", "destination_candidate.user_id = $user_id"]
+        where_conditions = ["candidate.user_id = $user_id"]
         if filters.get("agent_id"):
-            where_conditions.append("destination_candidate.agent_id = $agent_id")
+            where_conditions.append("candidate.agent_id = $agent_id")
         if filters.get("run_id"):
-            where_conditions.append("destination_candidate.run_id = $run_id")
-        where_clause = " AND ".join(where_conditions)
-
-        cypher = f"""
-            MATCH (destination_candidate {self.node_label})
-            WHERE {where_clause}
+            where_conditions.append("candidate.run_id = $run_id")
 
-            WITH destination_candidate,
-            round(2 * vector.similarity.cosine(destination_candidate.embedding, $destination_embedding) - 1, 4) AS destination_similarity // denormalize for backward compatibility
-
-            WHERE destination_similarity >= $threshold
-
-            WITH destination_candidate, destination_similarity
-            ORDER BY destination_similarity DESC
-            LIMIT 1
-
-            RETURN elementId(destination_candidate)
+        def build_query(use_index):
+            similar_nodes = self._similar_nodes_cypher(
+                "candidate", "entity.embedding", "similarity", where_conditions, use_index
+            )
+            return f"""
+            UNWIND $entities AS entity
+            CALL {{
+                WITH entity{similar_nodes}
+                WHERE similarity >= $threshold
+                WITH candidate, similarity
+                ORDER BY similarity DESC
+                LIMIT 1
+                RETURN elementId(candidate) AS node_id
+            }}
+            RETURN entity.name AS name, node_id
             """
 
         params = {
-            "destination_embedding": destination_embedding,
+            "entities": [{"name": name, "embedding": embedding} for name, embedding in entity_embeddings.items()],
             "user_id": filters["user_id"],
             "threshold": threshold,
         }
@@ -685,8 +774,19 @@ class MemoryGraph:
         if filters.get("run_id"):
             params["run_id"] = filters["run_id"]
 
-        result = self.graph.query(cypher, params=params)
-        return result
+        def resolved(result):
+            return {record["name"] for record in result}
+
+        result = self._query_similar_nodes(build_query, params, self.vector_index_candidates, resolved, "name")
+        return {record["name"]: record["node_id"] for record in result}
+
+    def _remove_spaces_from_entities(self, entity_list):
+        for item in entity_list:
+            item["source"] = item["source"].lower().replace(" ", "_")
+            # Use the sanitization function for relationships to handle special characters
+            item["relationship"] = sanitize_relationship_for_cypher(item["relationship"].lower().replace(" ", "_"))
+            item["destination"] = item["destination"].lower().replace(" ", "_")
+        return entity_list
 
     # Reset is not defined in base.py
     def reset(self):
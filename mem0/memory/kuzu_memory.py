@@ -1,17 +1,13 @@
 import logging
 
-from mem0.memory.utils import format_entities
+from mem0.memory.utils import embed_entity_names, format_entities, plan_entity_writes
 
 try:
     import kuzu
 except ImportError:
     raise ImportError("kuzu is not installed. Please install it using pip install kuzu")
 
-try:
-    from rank_bm25 import BM25Okapi
-except ImportError:
-    raise ImportError("rank_bm25 is not installed. Please install it using pip install rank-bm25")
-
+from mem0.graphs.bm25 import rerank_relations
 from mem0.graphs.tools import (
     DELETE_MEMORY_STRUCT_TOOL_GRAPH,
     DELETE_MEMORY_TOOL_GRAPH,
@@ -34,6 +30,7 @@ class MemoryGraph:
             self.config.embedder.provider,
             self.config.embedder.config,
             self.config.vector_store.config,
+            self.config.embedder.cache,
         )
         self.embedding_dims = self.embedding_model.config.embedding_dims
 
@@ -129,17 +126,7 @@ class MemoryGraph:
         if not search_output:
             return []
 
-        search_outputs_sequence = [
-            [item["source"], item["relationship"], item["destination"]] for item in search_output
-        ]
-        bm25 = BM25Okapi(search_outputs_sequence)
-
-        tokenized_query = query.split(" ")
-        reranked_results = bm25.get_top_n(tokenized_query, search_outputs_sequence, n=limit)
-
-        search_results = []
-        for item in reranked_results:
-            search_results.append({"source": item[0], "relationship": item[1], "destination": item[2]})
+        search_results = rerank_relations(query, search_output, n=limit)
 
         logger.info(f"Returned {len(search_results)} search results")
 
@@ -291,13 +278,18 @@ class MemoryGraph:
         return entities
 
     def _search_graph_db(self, node_list, filters, limit=100, threshold=None):
-        """Search similar nodes among and their respective incoming and outgoing relations."""
-        result_relations = []
+        """
+        Search similar nodes among and their respective incoming and outgoing relations.
+
+        All entities are searched with a single query. Each entity contributes at most `limit` relations and a
+        relation reached from several entities is returned once, with its highest similarity.
+        """
+        if not node_list:
+            return []
 
         params = {
             "threshold": threshold if threshold else self.threshold,
             "user_id": filters["user_id"],
-            "limit": limit,
         }
         # Build node properties for filtering
         node_props = ["user_id: $user_id"]
@@ -309,38 +301,52 @@ class MemoryGraph:
             params["run_id"] = filters["run_id"]
         node_props_str = ", ".join(node_props)
 
-        for node in node_list:
-            n_embedding = self.embedding_model.embed(node)
-            params["n_embedding"] = n_embedding
-
-            results = []
-            for match_fragment in [
-                f"(n)-[r]->(m {self.node_label} {{{node_props_str}}}) WITH n as src, r, m as dst, similarity",
-                f"(m {self.node_label} {{{node_props_str}}})-[r]->(n) WITH m as src, r, n as dst, similarity"
-            ]:
-                results.extend(self.kuzu_execute(
-                    f"""
-                    MATCH (n {self.node_label} {{{node_props_str}}})
-                    WHERE n.embedding IS NOT NULL
-                    WITH n, array_cosine_similarity(n.embedding, CAST($n_embedding,'FLOAT[{self.embedding_dims}]')) AS similarity
-                    WHERE similarity >= CAST($threshold, 'DOUBLE')
-                    MATCH {match_fragment}
-                    RETURN
-                        src.name AS source,
-                        id(src) AS source_id,
-                        r.name AS relationship,
-                        id(r) AS relation_id,
-                        dst.name AS destination,
-                        id(dst) AS destination_id,
-                        similarity
-                    LIMIT $limit
-                    """,
-                    parameters=params))
-
-            # Kuzu does not support sort/limit over unions. Do it manually for now.
-            result_relations.extend(sorted(results, key=lambda x: x["similarity"], reverse=True)[:limit])
-
-        return result_relations
+        node_embeddings = self.embedding_model.embed_batch(node_list)
+        params["entities"] = [{"idx": idx, "embedding": n_embedding} for idx, n_embedding in enumerate(node_embeddings)]
+
+        queries = []
+        for match_fragment in [
+            f"(n)-[r]->(m {self.node_label} {{{node_props_str}}}) WITH entity, n as src, r, m as dst, similarity",
+            f"(m {self.node_label} {{{node_props_str}}})-[r]->(n) WITH entity, m as src, r, n as dst, similarity",
+        ]:
+            queries.append(
+                f"""
+                UNWIND $entities AS entity
+                MATCH (n {self.node_label} {{{node_props_str}}})
+                WHERE n.embedding IS NOT NULL
+                WITH entity, n, array_cosine_similarity(
+                    n.embedding, CAST(entity.embedding,'FLOAT[{self.embedding_dims}]')
+                ) AS similarity
+                WHERE similarity >= CAST($threshold, 'DOUBLE')
+                MATCH {match_fragment}
+                RETURN
+                    entity.idx AS entity_idx,
+                    src.name AS source,
+                    id(src) AS source_id,
+                    r.name AS relationship,
+                    id(r) AS relation_id,
+                    dst.name AS destination,
+                    id(dst) AS destination_id,
+                    similarity
+                """
+            )
+        results = self.kuzu_execute(" UNION ALL ".join(queries), parameters=params)
+
+        # Kuzu cannot limit per group, so the per-entity top relations and the dedup are picked here
+        results_by_entity = {}
+        for result in results:
+            results_by_entity.setdefault(result.pop("entity_idx"), []).append(result)
+        result_relations = {}
+        for entity_results in results_by_entity.values():
+            for result in sorted(entity_results, key=lambda x: x["similarity"], reverse=True)[:limit]:
+                relation_id = (result["relation_id"]["table"], result["relation_id"]["offset"])
+                if (
+                    relation_id not in result_relations
+                    or result["similarity"] > result_relations[relation_id]["similarity"]
+                ):
+                    result_relations[relation_id] = result
+
+        return sorted(result_relations.values(), key=lambda x: x["similarity"], reverse=True)
 
     def _get_delete_entities_from_search_output(self, search_output, data, filters):
         """Get the entities to be deleted from the search output."""
@@ -380,325 +386,231 @@ class MemoryGraph:
 
     def _delete_entities(self, to_be_deleted, filters):
         """Delete the entities from the graph."""
+        if not to_be_deleted:
+            return []
+
         user_id = filters["user_id"]
         agent_id = filters.get("agent_id", None)
         run_id = filters.get("run_id", None)
-        results = []
-
-        for item in to_be_deleted:
-            source = item["source"]
-            destination = item["destination"]
-            relationship = item["relationship"]
-
-            params = {
-                "source_name": source,
-                "dest_name": destination,
-                "user_id": user_id,
-                "relationship_name": relationship,
-            }
-            # Build node properties for filtering
-            source_props = ["name: $source_name", "user_id: $user_id"]
-            dest_props = ["name: $dest_name", "user_id: $user_id"]
-            if agent_id:
-                source_props.append("agent_id: $agent_id")
-                dest_props.append("agent_id: $agent_id")
-                params["agent_id"] = agent_id
-            if run_id:
-                source_props.append("run_id: $run_id")
-                dest_props.append("run_id: $run_id")
-                params["run_id"] = run_id
-            source_props_str = ", ".join(source_props)
-            dest_props_str = ", ".join(dest_props)
-
-            # Delete the specific relationship between nodes
-            cypher = f"""
-            MATCH (n {self.node_label} {{{source_props_str}}})
-            -[r {self.rel_label} {{name: $relationship_name}}]->
-            (m {self.node_label} {{{dest_props_str}}})
-            DELETE r
-            RETURN
-                n.name AS source,
-                r.name AS relationship,
-                m.name AS target
-            """
 
-            result = self.kuzu_execute(cypher, parameters=params)
-            results.append(result)
+        params = {
+            "rows": [
+                {
+                    "key": key,
+                    "source": item["source"],
+                    "destination": item["destination"],
+                    "relationship": item["relationship"],
+                }
+                for key, item in enumerate(to_be_deleted)
+            ],
+            "user_id": user_id,
+        }
+        # Build node properties for filtering
+        source_props = ["name: row.source", "user_id: $user_id"]
+        dest_props = ["name: row.destination", "user_id: $user_id"]
+        if agent_id:
+            source_props.append("agent_id: $agent_id")
+            dest_props.append("agent_id: $agent_id")
+            params["agent_id"] = agent_id
+        if run_id:
+            source_props.append("run_id: $run_id")
+            dest_props.append("run_id: $run_id")
+            params["run_id"] = run_id
+        source_props_str = ", ".join(source_props)
+        dest_props_str = ", ".join(dest_props)
+
+        # Delete the specific relationships between nodes
+        cypher = f"""
+        UNWIND $rows AS row
+        MATCH (n {self.node_label} {{{source_props_str}}})
+        -[r {self.rel_label} {{name: row.relationship}}]->
+        (m {self.node_label} {{{dest_props_str}}})
+        DELETE r
+        RETURN
+            row.key AS key,
+            n.name AS source,
+            r.name AS relationship,
+            m.name AS target
+        """
 
+        results = [[] for _ in to_be_deleted]
+        for record in self.kuzu_execute(cypher, parameters=params):
+            results[record["key"]].append(
+                {"source": record["source"], "relationship": record["relationship"], "target": record["target"]}
+            )
         return results
 
     def _add_entities(self, to_be_added, filters, entity_type_map):
         """Add the new entities to the graph. Merge the nodes if they already exist."""
+        if not to_be_added:
+            return []
+
         user_id = filters["user_id"]
         agent_id = filters.get("agent_id", None)
         run_id = filters.get("run_id", None)
-        results = []
-        for item in to_be_added:
-            # entities
-            source = item["source"]
-            source_label = self.node_label
-
-            destination = item["destination"]
-            destination_label = self.node_label
-
-            relationship = item["relationship"]
-            relationship_label = self.rel_label
-
-            # embeddings
-            source_embedding = self.embedding_model.embed(source)
-            dest_embedding = self.embedding_model.embed(destination)
-
-            # search for the nodes with the closest embeddings
-            source_node_search_result = self._search_source_node(source_embedding, filters, threshold=0.9)
-            destination_node_search_result = self._search_destination_node(dest_embedding, filters, threshold=0.9)
-
-            if not destination_node_search_result and source_node_search_result:
-                params = {
-                    "table_id": source_node_search_result[0]["id"]["table"],
-                    "offset_id": source_node_search_result[0]["id"]["offset"],
-                    "destination_name": destination,
-                    "destination_embedding": dest_embedding,
-                    "relationship_name": relationship,
-                    "user_id": user_id,
-                }
-                # Build source MERGE properties
-                merge_props = ["name: $destination_name", "user_id: $user_id"]
-                if agent_id:
-                    merge_props.append("agent_id: $agent_id")
-                    params["agent_id"] = agent_id
-                if run_id:
-                    merge_props.append("run_id: $run_id")
-                    params["run_id"] = run_id
-                merge_props_str = ", ".join(merge_props)
+        entity_embeddings = embed_entity_names(self.embedding_model, to_be_added)
+        resolved = self._resolve_entity_nodes(entity_embeddings, filters, threshold=0.9)
+        nodes, rows, item_keys = plan_entity_writes(to_be_added, resolved)
+
+        params = {"user_id": user_id}
+        # Build MERGE properties for new nodes
+        merge_props = ["name: node.name", "user_id: $user_id"]
+        if agent_id:
+            merge_props.append("agent_id: $agent_id")
+            params["agent_id"] = agent_id
+        if run_id:
+            merge_props.append("run_id: $run_id")
+            params["run_id"] = run_id
+        merge_props_str = ", ".join(merge_props)
+
+        existing_nodes = [
+            {
+                "idx": node["idx"],
+                "node_table": node["node_id"][0],
+                "node_offset": node["node_id"][1],
+                "mentions": node["mentions"],
+            }
+            for node in nodes
+            if node["node_id"] is not None
+        ]
+        new_nodes = [
+            {
+                "idx": node["idx"],
+                "name": node["name"],
+                "mentions": node["mentions"],
+                "embedding": entity_embeddings[node["name"]],
+            }
+            for node in nodes
+            if node["node_id"] is None
+        ]
 
+        self.kuzu_execute("BEGIN TRANSACTION")
+        try:
+            node_ids = {}
+            if existing_nodes:
                 cypher = f"""
-                MATCH (source)
-                WHERE id(source) = internal_id($table_id, $offset_id)
-                SET source.mentions = coalesce(source.mentions, 0) + 1
-                WITH source
-                MERGE (destination {destination_label} {{{merge_props_str}}})
-                ON CREATE SET
-                    destination.created = current_timestamp(),
-                    destination.mentions = 1,
-                    destination.embedding = CAST($destination_embedding,'FLOAT[{self.embedding_dims}]')
-                ON MATCH SET
-                    destination.mentions = coalesce(destination.mentions, 0) + 1,
-                    destination.embedding = CAST($destination_embedding,'FLOAT[{self.embedding_dims}]')
-                WITH source, destination
-                MERGE (source)-[r {relationship_label} {{name: $relationship_name}}]->(destination)
-                ON CREATE SET
-                    r.created = current_timestamp(),
-                    r.mentions = 1
-                ON MATCH SET
-                    r.mentions = coalesce(r.mentions, 0) + 1
-                RETURN
-                    source.name AS source,
-                    r.name AS relationship,
-                    destination.name AS target
+                UNWIND $nodes AS node
+                MATCH (n {self.node_label})
+                WHERE id(n) = internal_id(node.node_table, node.node_offset)
+                SET n.mentions = coalesce(n.mentions, 0) + node.mentions
+                RETURN node.idx AS idx, id(n) AS id
                 """
-            elif destination_node_search_result and not source_node_search_result:
-                params = {
-                    "table_id": destination_node_search_result[0]["id"]["table"],
-                    "offset_id": destination_node_search_result[0]["id"]["offset"],
-                    "source_name": source,
-                    "source_embedding": source_embedding,
-                    "user_id": user_id,
-                    "relationship_name": relationship,
-                }
-                # Build source MERGE properties
-                merge_props = ["name: $source_name", "user_id: $user_id"]
-                if agent_id:
-                    merge_props.append("agent_id: $agent_id")
-                    params["agent_id"] = agent_id
-                if run_id:
-                    merge_props.append("run_id: $run_id")
-                    params["run_id"] = run_id
-                merge_props_str = ", ".join(merge_props)
+                for record in self.kuzu_execute(cypher, parameters={"nodes": existing_nodes}):
+                    node_ids[record["idx"]] = record["id"]
 
+            if new_nodes:
                 cypher = f"""
-                MATCH (destination)
-                WHERE id(destination) = internal_id($table_id, $offset_id)
-                SET destination.mentions = coalesce(destination.mentions, 0) + 1
-                WITH destination
-                MERGE (source {source_label} {{{merge_props_str}}})
+                UNWIND $nodes AS node
+                MERGE (n {self.node_label} {{{merge_props_str}}})
                 ON CREATE SET
-                source.created = current_timestamp(),
-                source.mentions = 1,
-                source.embedding = CAST($source_embedding,'FLOAT[{self.embedding_dims}]')
+                    n.created = current_timestamp(),
+                    n.mentions = node.mentions,
+                    n.embedding = CAST(node.embedding,'FLOAT[{self.embedding_dims}]')
                 ON MATCH SET
-                source.mentions = coalesce(source.mentions, 0) + 1,
-                source.embedding = CAST($source_embedding,'FLOAT[{self.embedding_dims}]')
-                WITH source, destination
-                MERGE (source)-[r {relationship_label} {{name: $relationship_name}}]->(destination)
-                ON CREATE SET
-                    r.created = current_timestamp(),
-                    r.mentions = 1
-                ON MATCH SET
-                    r.mentions = coalesce(r.mentions, 0) + 1
-                RETURN
-                    source.name AS source,
-                    r.name AS relationship,
-                    destination.name AS target
-                """
-            elif source_node_search_result and destination_node_search_result:
-                cypher = f"""
-                MATCH (source)
-                WHERE id(source) = internal_id($src_table, $src_offset)
-                SET source.mentions = coalesce(source.mentions, 0) + 1
-                WITH source
-                MATCH (destination)
-                WHERE id(destination) = internal_id($dst_table, $dst_offset)
-                SET destination.mentions = coalesce(destination.mentions, 0) + 1
-                MERGE (source)-[r {relationship_label} {{name: $relationship_name}}]->(destination)
-                ON CREATE SET
-                    r.created = current_timestamp(),
-                    r.updated = current_timestamp(),
-                    r.mentions = 1
-                ON MATCH SET r.mentions = coalesce(r.mentions, 0) + 1
-                RETURN
-                    source.name AS source,
-                    r.name AS relationship,
-                    destination.name AS target
+                    n.mentions = coalesce(n.mentions, 0) + node.mentions,
+                    n.embedding = CAST(node.embedding,'FLOAT[{self.embedding_dims}]')
+                RETURN node.idx AS idx, id(n) AS id
                 """
+                for record in self.kuzu_execute(cypher, parameters={**params, "nodes": new_nodes}):
+                    node_ids[record["idx"]] = record["id"]
 
-                params = {
-                    "src_table": source_node_search_result[0]["id"]["table"],
-                    "src_offset": source_node_search_result[0]["id"]["offset"],
-                    "dst_table": destination_node_search_result[0]["id"]["table"],
-                    "dst_offset": destination_node_search_result[0]["id"]["offset"],
-                    "relationship_name": relationship,
-                }
-            else:
-                params = {
-                    "source_name": source,
-                    "dest_name": destination,
-                    "relationship_name": relationship,
-                    "source_embedding": source_embedding,
-                    "dest_embedding": dest_embedding,
-                    "user_id": user_id,
+            relation_rows = [
+                {
+                    "key": row["key"],
+                    "source_table": node_ids[row["source"]]["table"],
+                    "source_offset": node_ids[row["source"]]["offset"],
+                    "destination_table": node_ids[row["destination"]]["table"],
+                    "destination_offset": node_ids[row["destination"]]["offset"],
+                    "relationship": row["relationship"],
+                    "mentions": row["mentions"],
                 }
-                # Build dynamic MERGE props for both source and destination
-                source_props = ["name: $source_name", "user_id: $user_id"]
-                dest_props = ["name: $dest_name", "user_id: $user_id"]
-                if agent_id:
-                    source_props.append("agent_id: $agent_id")
-                    dest_props.append("agent_id: $agent_id")
-                    params["agent_id"] = agent_id
-                if run_id:
-                    source_props.append("run_id: $run_id")
-                    dest_props.append("run_id: $run_id")
-                    params["run_id"] = run_id
-                source_props_str = ", ".join(source_props)
-                dest_props_str = ", ".join(dest_props)
-
-                cypher = f"""
-                MERGE (source {source_label} {{{source_props_str}}})
-                ON CREATE SET
-                    source.created = current_timestamp(),
-                    source.mentions = 1,
-                    source.embedding = CAST($source_embedding,'FLOAT[{self.embedding_dims}]')
-                ON MATCH SET
-                    source.mentions = coalesce(source.mentions, 0) + 1,
-                    source.embedding = CAST($source_embedding,'FLOAT[{self.embedding_dims}]')
-                WITH source
-                MERGE (destination {destination_label} {{{dest_props_str}}})
-                ON CREATE SET
-                    destination.created = current_timestamp(),
-                    destination.mentions = 1,
-                    destination.embedding = CAST($dest_embedding,'FLOAT[{self.embedding_dims}]')
-                ON MATCH SET
-                    destination.mentions = coalesce(destination.mentions, 0) + 1,
-                    destination.embedding = CAST($dest_embedding,'FLOAT[{self.embedding_dims}]')
-                WITH source, destination
-                MERGE (source)-[rel {relationship_label} {{name: $relationship_name}}]->(destination)
-                ON CREATE SET
-                    rel.created = current_timestamp(),
-                    rel.mentions = 1
-                ON MATCH SET
-                    rel.mentions = coalesce(rel.mentions, 0) + 1
-                RETURN
-                    source.name AS source,
-                    rel.name AS relationship,
-                    destination.name AS target
-                """
+                for row in rows
+                if row["source"] in node_ids and row["destination"] in node_ids
+            ]
+            cypher = f"""
+            UNWIND $rows AS row
+            MATCH (source {self.node_label}), (destination {self.node_label})
+            WHERE id(source) = internal_id(row.source_table, row.source_offset)
+                AND id(destination) = internal_id(row.destination_table, row.destination_offset)
+            MERGE (source)-[r {self.rel_label} {{name: row.relationship}}]->(destination)
+            ON CREATE SET
+                r.created = current_timestamp(),
+                r.mentions = row.mentions
+            ON MATCH SET
+                r.mentions = coalesce(r.mentions, 0) + row.mentions
+            RETURN
+                row.key AS key,
+                source.name AS source,
+                r.name AS relationship,
+                destination.name AS target
+            """
+            records = self.kuzu_execute(cypher, parameters={"rows": relation_rows}) if relation_rows else []
+            self.kuzu_execute("COMMIT")
+        except Exception:
+            self.kuzu_execute("ROLLBACK")
+            raise
+
+        rows_by_key = {}
+        for record in records:
+            rows_by_key.setdefault(record["key"], []).append(
+                {"source": record["source"], "relationship": record["relationship"], "target": record["target"]}
+            )
+        return [rows_by_key.get(key, []) for key in item_keys]
 
-            result = self.kuzu_execute(cypher, parameters=params)
-            results.append(result)
+    def _resolve_entity_nodes(self, entity_embeddings, filters, threshold=0.9):
+        """
+        Find the existing node closest to each entity name with a single query.
 
-        return results
+        Args:
+            entity_embeddings (dict): Embedding of each entity name.
+            filters (dict): Filters the nodes must match.
+            threshold (float): Minimum similarity for a node to be reused. Defaults to 0.9.
 
-    def _remove_spaces_from_entities(self, entity_list):
-        for item in entity_list:
-            item["source"] = item["source"].lower().replace(" ", "_")
-            item["relationship"] = item["relationship"].lower().replace(" ", "_")
-            item["destination"] = item["destination"].lower().replace(" ", "_")
-        return entity_list
+        Returns:
+            dict: (table, offset) ID of the closest node for each entity name that has one above the threshold.
+        """
+        if not entity_embeddings:
+            return {}
 
-    def _search_source_node(self, source_embedding, filters, threshold=0.9):
         params = {
-            "source_embedding": source_embedding,
+            "entities": [{"name": name, "embedding": embedding} for name, embedding in entity_embeddings.items()],
             "user_id": filters["user_id"],
             "threshold": threshold,
         }
-        where_conditions = ["source_candidate.embedding IS NOT NULL", "source_candidate.user_id = $user_id"]
+        where_conditions = ["candidate.embedding IS NOT NULL", "candidate.user_id = $user_id"]
         if filters.get("agent_id"):
-            where_conditions.append("source_candidate.agent_id = $agent_id")
+            where_conditions.append("candidate.agent_id = $agent_id")
             params["agent_id"] = filters["agent_id"]
         if filters.get("run_id"):
-            where_conditions.append("source_candidate.run_id = $run_id")
+            where_conditions.append("candidate.run_id = $run_id")
             params["run_id"] = filters["run_id"]
         where_clause = " AND ".join(where_conditions)
 
         cypher = f"""
-            MATCH (source_candidate {self.node_label})
+            UNWIND $entities AS entity
+            MATCH (candidate {self.node_label})
             WHERE {where_clause}
-
-            WITH source_candidate,
-            array_cosine_similarity(source_candidate.embedding, CAST($source_embedding,'FLOAT[{self.embedding_dims}]')) AS source_similarity
-
-            WHERE source_similarity >= $threshold
-
-            WITH source_candidate, source_similarity
-            ORDER BY source_similarity DESC
-            LIMIT 2
-
-            RETURN id(source_candidate) as id, source_similarity
+            WITH entity, candidate,
+            array_cosine_similarity(
+                candidate.embedding, CAST(entity.embedding,'FLOAT[{self.embedding_dims}]')
+            ) AS similarity
+            WHERE similarity >= $threshold
+            RETURN entity.name AS name, id(candidate) AS id, similarity
             """
 
-        return self.kuzu_execute(cypher, parameters=params)
-
-    def _search_destination_node(self, destination_embedding, filters, threshold=0.9):
-        params = {
-            "destination_embedding": destination_embedding,
-            "user_id": filters["user_id"],
-            "threshold": threshold,
-        }
-        where_conditions = ["destination_candidate.embedding IS NOT NULL", "destination_candidate.user_id = $user_id"]
-        if filters.get("agent_id"):
-            where_conditions.append("destination_candidate.agent_id = $agent_id")
-            params["agent_id"] = filters["agent_id"]
-        if filters.get("run_id"):
-            where_conditions.append("destination_candidate.run_id = $run_id")
-            params["run_id"] = filters["run_id"]
-        where_clause = " AND ".join(where_conditions)
+        # Keep the most similar node of each entity
+        best = {}
+        for record in self.kuzu_execute(cypher, parameters=params):
+            if record["name"] not in best or record["similarity"] > best[record["name"]]["similarity"]:
+                best[record["name"]] = record
+        return {name: (record["id"]["table"], record["id"]["offset"]) for name, record in best.items()}
 
-        cypher = f"""
-            MATCH (destination_candidate {self.node_label})
-            WHERE {where_clause}
-
-            WITH destination_candidate,
-            array_cosine_similarity(destination_candidate.embedding, CAST($destination_embedding,'FLOAT[{self.embedding_dims}]')) AS destination_similarity
-
-            WHERE destination_similarity >= $threshold
-
-            WITH destination_candidate, destination_similarity
-            ORDER BY destination_similarity DESC
-            LIMIT 2
-
-            RETURN id(destination_candidate) as id, destination_similarity
-            """
-
-        return self.kuzu_execute(cypher, parameters=params)
+    def _remove_spaces_from_entities(self, entity_list):
+        for item in entity_list:
+            item["source"] = item["source"].lower().replace(" ", "_")
+            item["relationship"] = item["relationship"].lower().replace(" ", "_")
+            item["destination"] = item["destination"].lower().replace(" ", "_")
+        return entity_list
 
     # Reset is not defined in base.py
     def reset(self):
@@ -0,0 +1,303 @@
+import logging
+import math
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, Hashable, Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Payload fields that identify the scope a memory belongs to
+SCOPE_KEYS = ("user_id", "agent_id", "run_id")
+
+# Constant of reciprocal-rank fusion; larger values flatten the difference between top ranks
+RRF_K = 60
+
+# Number of memories read per page when a scope is loaded from the vector store
+LOAD_PAGE_SIZE = 1000
+
+# Number of loaded scopes kept in the index; the least recently searched ones are evicted beyond it
+MAX_LOADED_SCOPES = 1000
+
+_TOKEN_PATTERN = re.compile(r"[^\W_]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens, so IDs and names like "SKU-4711" or "new_york" match token by token."""
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def reciprocal_rank_fusion(rankings: Iterable[List[Hashable]], k: int = RRF_K) -> List[Tuple[Hashable, float]]:
+    """
+    Fuse several rankings of the same items with reciprocal-rank fusion.
+
+    Args:
+        rankings (Iterable[List[Hashable]]): Item ids, best first, one list per retriever.
+        k (int, optional): Fusion constant. Defaults to 60.
+
+    Returns:
+        List[Tuple[Hashable, float]]: Item ids with their fused scores, best first.
+    """
+    scores = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            scores[item] = scores.get(item, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+def _scope_of(payload: Dict[str, Any]) -> Tuple:
+    return tuple(payload.get(key) for key in SCOPE_KEYS)
+
+
+def _scope_payload(scope: Tuple) -> Dict[str, Any]:
+    return dict(zip(SCOPE_KEYS, scope))
+
+
+def payload_matches(payload: Dict[str, Any], filters: Dict[str, Any]) -> bool:
+    """Check whether a payload has the value, or one of the values, of every filter."""
+    for key, value in filters.items():
+        if isinstance(value, list):
+            if payload.get(key) not in value:
+                return False
+        elif payload.get(key) != value:
+            return False
+    return True
+
+
+class _ScopeIndex:
+    """Postings and BM25 statistics of the memories of one scope."""
+
+    def __init__(self):
+        self.lengths = {}
+        self.postings = {}
+        self.total_length = 0
+
+    def add(self, memory_id: str, tokens: List[str]):
+        term_counts = Counter(tokens)
+        self.lengths[memory_id] = len(tokens)
+        self.total_length += len(tokens)
+        for term, count in term_counts.items():
+            self.postings.setdefault(term, {})[memory_id] = count
+
+    def remove(self, memory_id: str, tokens: List[str]):
+        self.total_length -= self.lengths.pop(memory_id, 0)
+        for term in set(tokens):
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.pop(memory_id, None)
+                if not postings:
+                    del self.postings[term]
+
+    def score(self, terms: List[str], k1: float, b: float) -> Dict[str, float]:
+        num_docs = len(self.lengths)
+        if not num_docs:
+            return {}
+        avg_length = self.total_length / num_docs or 1.0
+        scores = {}
+        for term in set(terms):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (num_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for memory_id, count in postings.items():
+                norm = count + k1 * (1 - b + b * self.lengths[memory_id] / avg_length)
+                scores[memory_id] = scores.get(memory_id, 0.0) + idf * count * (k1 + 1) / norm
+        return scores
+
+
+class LexicalIndex:
+    """
+    In-process BM25 index over memory texts, maintained incrementally as memories are written.
+
+    Memories are grouped by scope (their user, agent and run ids) and each scope keeps its own postings and
+    statistics, so one tenant's vocabulary does not skew another's scores. A scope is loaded from the vector
+    store the first time it is searched; writes to scopes that have not been loaded are ignored, since the
+    load picks them up. Writes made by other processes are not seen.
+
+    Only memory ids and their tokens are kept, never payloads: callers fetch the memories they return from the
+    vector store, so a memory deleted or changed elsewhere is never served from here. At most `max_scopes`
+    loaded scopes are kept, evicting the least recently searched one.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75, max_scopes: int = MAX_LOADED_SCOPES):
+        """
+        Initialize the index.
+
+        Args:
+            k1 (float, optional): BM25 term frequency saturation. Defaults to 1.5.
+            b (float, optional): BM25 length normalization. Defaults to 0.75.
+            max_scopes (int, optional): Number of loaded scopes kept before the least recently searched one is
+                evicted. Defaults to 1000.
+        """
+        self.k1 = k1
+        self.b = b
+        self.max_scopes = max_scopes
+        self._lock = threading.Lock()
+        self._scopes = {}
+        self._memories = {}
+        # Scope filters that have been loaded, least recently searched first
+        self._loaded = []
+        # Scope filters still being loaded, with the event set once their load ends
+        self._loading = []
+
+    def _covers(self, scope: Tuple) -> bool:
+        return any(payload_matches(_scope_payload(scope), loaded) for loaded in self._loaded)
+
+    def ensure_loaded(self, vector_store, filters: Dict[str, Any]):
+        """
+        Load the memories in the scope of the filters from the vector store, unless already loaded.
+
+        Calls for a scope that another thread is loading wait for that load. A failed load is undone and its
+        error raised, so the next call loads the scope again instead of searching a partial index.
+
+        Args:
+            vector_store: Vector store to read the memories from.
+            filters (Dict[str, Any]): Search filters. Only the scoping ids are used for loading.
+        """
+        scope_filters = {key: filters[key] for key in SCOPE_KEYS if key in filters}
+        while True:
+            with self._lock:
+                covering = self._covering_locked(scope_filters)
+                if covering is None:
+                    # Mark the scope first so writes made while it loads are applied too
+                    done = threading.Event()
+                    self._loading.append((scope_filters, done))
+                    self._loaded.append(scope_filters)
+                    while len(self._loaded) > self.max_scopes:
+                        self._evict_locked(self._loaded.pop(0))
+                    break
+                loading = next((event for pending, event in self._loading if pending is covering), None)
+                if loading is None:
+                    return
+            loading.wait()
+
+        try:
+            loaded = 0
+            cursor = None
+            while True:
+                page, cursor = vector_store.list_page(filters=scope_filters, limit=LOAD_PAGE_SIZE, cursor=cursor)
+                for memory in page:
+                    self.add(memory.id, memory.payload)
+                loaded += len(page)
+                if cursor is None:
+                    break
+        except Exception:
+            with self._lock:
+                self._loaded = [loaded for loaded in self._loaded if loaded is not scope_filters]
+                self._evict_locked(scope_filters)
+            raise
+        finally:
+            with self._lock:
+                self._loading = [(pending, event) for pending, event in self._loading if event is not done]
+            done.set()
+        logger.debug(f"Loaded {loaded} memories into the lexical index for {scope_filters}")
+
+    def _covering_locked(self, scope_filters: Dict[str, Any]):
+        """Return the loaded scope filters covering `scope_filters`, marking them as the most recently searched."""
+        for position, loaded in enumerate(self._loaded):
+            if loaded.items() <= scope_filters.items():
+                self._loaded.append(self._loaded.pop(position))
+                return loaded
+        return None
+
+    def _evict_locked(self, evicted: Dict[str, Any]):
+        for scope in [scope for scope in self._scopes if payload_matches(_scope_payload(scope), evicted)]:
+            if self._covers(scope):
+                continue
+            for memory_id in self._scopes.pop(scope).lengths:
+                del self._memories[memory_id]
+
+    def add(self, memory_id: str, payload: Dict[str, Any]):
+        """
+        Index a new or updated memory.
+
+        Args:
+            memory_id (str): ID of the memory.
+            payload (Dict[str, Any]): Payload of the memory, with its text under "data".
+        """
+        tokens = tokenize(payload.get("data") or "")
+        scope = _scope_of(payload)
+        with self._lock:
+            if not self._covers(scope):
+                return
+            self._remove_locked(memory_id)
+            self._scopes.setdefault(scope, _ScopeIndex()).add(memory_id, tokens)
+            self._memories[memory_id] = (scope, tokens)
+
+    def remove(self, memory_id: str):
+        """
+        Drop a memory from the index.
+
+        Args:
+            memory_id (str): ID of the memory.
+        """
+        with self._lock:
+            self._remove_locked(memory_id)
+
+    def remove_matching(self, filters: Dict[str, Any]):
+        """
+        Drop every memory whose scope matches the filters.
+
+        Args:
+            filters (Dict[str, Any]): Scoping ids to match.
+        """
+        with self._lock:
+            for scope in [scope for scope in self._scopes if payload_matches(_scope_payload(scope), filters)]:
+                for memory_id in self._scopes.pop(scope).lengths:
+                    del self._memories[memory_id]
+
+    def _remove_locked(self, memory_id: str):
+        entry = self._memories.pop(memory_id, None)
+        if entry is None:
+            return
+        scope, tokens = entry
+        scope_index = self._scopes[scope]
+        scope_index.remove(memory_id, tokens)
+        if not scope_index.lengths:
+            del self._scopes[scope]
+
+    def search(self, query: str, filters: Dict[str, Any], limit: int) -> List[Tuple[str, float]]:
+        """
+        Find the memories in the scope of the filters that score highest for the query.
+
+        Only the scoping ids of the filters are applied; callers check the other filters on the payloads they
+        fetch.
+
+        Args:
+            query (str): Query text.
+            filters (Dict[str, Any]): Search filters.
+            limit (int): Maximum number of memories to return.
+
+        Returns:
+            List[Tuple[str, float]]: Memory ids with their BM25 scores, best first.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        scope_filters = {key: filters[key] for key in SCOPE_KEYS if key in filters}
+        results = []
+        with self._lock:
+            for scope, scope_index in self._scopes.items():
+                if payload_matches(_scope_payload(scope), scope_filters):
+                    results.extend(scope_index.score(terms, self.k1, self.b).items())
+
+        results.sort(key=lambda result: result[1], reverse=True)
+        return results[:limit]
+
+    def clear(self):
+        """Drop all indexed memories and forget which scopes were loaded."""
+        with self._lock:
+            self._scopes = {}
+            self._memories = {}
+            self._loaded = []
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Report the size of the index.
+
+        Returns:
+            Dict[str, int]: Number of indexed memories, scopes and loaded scope filters.
+        """
+        with self._lock:
+            return {"memories": len(self._memories), "scopes": len(self._scopes), "loaded": len(self._loaded)}
@@ -5,22 +5,28 @@ import hashlib
 import json
 import logging
 import os
+import threading
+import time
 import uuid
 import warnings
 from copy import deepcopy
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
 
 import pytz
 from pydantic import ValidationError
 
-from mem0.configs.base import MemoryConfig, MemoryItem
+from mem0.configs.base import MemoryConfig
 from mem0.configs.enums import MemoryType
 from mem0.configs.prompts import (
     PROCEDURAL_MEMORY_SYSTEM_PROMPT,
     get_update_memory_messages,
 )
+from mem0.llms.cache import get_shared_cache as get_shared_llm_cache
 from mem0.memory.base import MemoryBase
+from mem0.memory.batch import BatchWriter, build_updated_payload, embed_in_chunks
+from mem0.memory.executor import MemoryExecutor
+from mem0.memory.lexical import LexicalIndex, payload_matches, reciprocal_rank_fusion
 from mem0.memory.setup import mem0_dir, setup_config
 from mem0.memory.storage import SQLiteManager
 from mem0.memory.telemetry import capture_event
@@ -37,6 +43,7 @@ from mem0.utils.factory import (
     LlmFactory,
     VectorStoreFactory,
 )
+from mem0.vector_stores.base import VectorStoreBase, _unwrap_listed
 
 
 def _build_filters_and_metadata(
@@ -118,6 +125,498 @@ def _build_filters_and_metadata(
 setup_config()
 logger = logging.getLogger(__name__)
 
+# Number of memories read, deleted and recorded in the history per round of delete_all
+DELETE_ALL_PAGE_SIZE = 1000
+
+# Times delete_all lists again, after a doubling pause starting at DELETE_ALL_STALE_DELAY seconds, when a full page
+# only holds memories it already deleted, as stores that apply deletes late (Elasticsearch, Milvus) still list them
+DELETE_ALL_STALE_RETRIES = 3
+DELETE_ALL_STALE_DELAY = 0.5
+
+# Search modes: dense retrieval only, or dense and lexical retrieval fused with reciprocal-rank fusion
+SEARCH_MODES = ("dense", "hybrid")
+
+# In hybrid mode each retriever returns this many candidates per requested result before fusion
+HYBRID_CANDIDATE_FACTOR = 2
+
+
+def _supports_search_batch(vector_store) -> bool:
+    """Whether the vector store overrides search_batch with a native multi-query search."""
+    search_batch = getattr(type(vector_store), "search_batch", None)
+    return search_batch is not None and search_batch is not VectorStoreBase.search_batch
+
+
+def _search_memories_for_facts(vector_store, fact_embeddings, filters, get_executor=None):
+    """
+    Look up the existing memories closest to each new fact.
+
+    Uses a single multi-query search when the vector store supports one, and otherwise runs the
+    per-fact searches concurrently on the executor returned by `get_executor`.
+
+    Args:
+        vector_store: Vector store to search.
+        fact_embeddings (dict): Mapping of fact text to its embedding.
+        filters (dict): Filters scoping the search.
+        get_executor (Callable, optional): Returns the executor of the Memory instance. Only called when
+            several facts are searched one by one, so the executor is not created otherwise. Defaults to None,
+            which searches one fact after the other.
+
+    Returns:
+        list: One list of search results per fact, in the order of fact_embeddings.
+    """
+    facts = list(fact_embeddings)
+    if not facts:
+        return []
+
+    if len(facts) > 1 and _supports_search_batch(vector_store):
+        return vector_store.search_batch(
+            queries=facts,
+            vectors=[fact_embeddings[fact] for fact in facts],
+            limit=5,
+            filters=filters,
+        )
+
+    def search_fact(fact):
+        return vector_store.search(query=fact, vectors=fact_embeddings[fact], limit=5, filters=filters)
+
+    if len(facts) == 1 or get_executor is None:
+        return [search_fact(fact) for fact in facts]
+    executor = get_executor()
+    futures = [executor.submit(search_fact, fact) for fact in facts]
+    return [future.result() for future in futures]
+
+
+def _generate_json_response(llm, config, messages, llm_cache=None, cache_hits=None, cache_name=None):
+    """
+    Ask the LLM for a JSON response, serving repeated requests from the response cache.
+
+    Args:
+        llm: LLM to call.
+        config (MemoryConfig): Memory configuration, for the provider and model of the cache key.
+        messages (list): Request messages.
+        llm_cache (LLMResponseCache, optional): Response cache. Defaults to None.
+        cache_hits (dict, optional): Receives whether the response came from the cache under `cache_name`.
+        cache_name (str, optional): Name of the request in `cache_hits`.
+
+    Returns:
+        tuple: The response and the key to cache it under once it has been parsed, None if it came from
+            the cache or caching is disabled.
+    """
+    response_format = {"type": "json_object"}
+    if llm_cache is None:
+        return llm.generate_response(messages=messages, response_format=response_format), None
+
+    cache_key = llm_cache.make_key(config.llm.provider, getattr(llm.config, "model", None), messages, response_format)
+    response = llm_cache.get(cache_key)
+    if cache_hits is not None:
+        cache_hits[cache_name] = response is not None
+    if response is not None:
+        return response, None
+    return llm.generate_response(messages=messages, response_format=response_format), cache_key
+
+
+def _extract_facts(llm, config, messages, llm_cache=None, cache_hits=None) -> List[str]:
+    """
+    Ask the LLM for the facts contained in a conversation.
+
+    Args:
+        llm: LLM used for extraction.
+        config (MemoryConfig): Memory configuration, for the custom extraction prompt.
+        messages (list): Conversation messages.
+        llm_cache (LLMResponseCache, optional): Response cache. Defaults to None.
+        cache_hits (dict, optional): Receives whether the response came from the cache under "fact_extraction".
+
+    Returns:
+        List[str]: Extracted facts, empty if the response could not be parsed.
+    """
+    parsed_messages = parse_messages(messages)
+
+    if config.custom_fact_extraction_prompt:
+        system_prompt = config.custom_fact_extraction_prompt
+        user_prompt = f"Input:\n{parsed_messages}"
+    else:
+        system_prompt, user_prompt = get_fact_retrieval_messages(parsed_messages)
+
+    response, cache_key = _generate_json_response(
+        llm,
+        config,
+        [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt},
+        ],
+        llm_cache,
+        cache_hits,
+        "fact_extraction",
+    )
+
+    try:
+        facts = json.loads(remove_code_blocks(response))["facts"]
+    except Exception as e:
+        logger.error(f"Error in new_retrieved_facts: {e}")
+        return []
+
+    if cache_key is not None:
+        llm_cache.set(cache_key, response)
+    return facts
+
+
+def _index_old_memories(search_results):
+    """
+    Deduplicate the memories found for a set of facts and give them short integer ids.
+
+    The LLM is shown integer ids instead of UUIDs, which it tends to hallucinate.
+
+    Args:
+        search_results (list): One list of search results per fact.
+
+    Returns:
+        tuple: The memories as `{"id", "text"}` dicts keyed by integer id, and the mapping of integer ids
+            back to memory ids.
+    """
+    unique_data = {}
+    for existing_memories in search_results:
+        for mem in existing_memories:
+            unique_data[mem.id] = {"id": mem.id, "text": mem.payload["data"]}
+    retrieved_old_memory = list(unique_data.values())
+    logger.info(f"Total existing memories: {len(retrieved_old_memory)}")
+
+    temp_uuid_mapping = {}
+    for idx, item in enumerate(retrieved_old_memory):
+        temp_uuid_mapping[str(idx)] = item["id"]
+        retrieved_old_memory[idx]["id"] = str(idx)
+    return retrieved_old_memory, temp_uuid_mapping
+
+
+def _get_memory_actions(
+    llm, config, retrieved_old_memory, new_retrieved_facts, llm_cache=None, cache_hits=None
+) -> Dict[str, Any]:
+    """
+    Ask the LLM how new facts change the existing memories.
+
+    Args:
+        llm: LLM used to decide the actions.
+        config (MemoryConfig): Memory configuration, for the custom update prompt.
+        retrieved_old_memory (list): Existing memories related to the facts.
+        new_retrieved_facts (list): Newly extracted facts.
+        llm_cache (LLMResponseCache, optional): Response cache. Defaults to None.
+        cache_hits (dict, optional): Receives whether the response came from the cache under "memory_update".
+
+    Returns:
+        Dict[str, Any]: The parsed response, with the actions under "memory"; empty if there are no facts
+            or the response could not be parsed.
+    """
+    if not new_retrieved_facts:
+        return {}
+
+    function_calling_prompt = get_update_memory_messages(
+        retrieved_old_memory, new_retrieved_facts, config.custom_update_memory_prompt
+    )
+
+    cache_key = None
+    try:
+        response, cache_key = _generate_json_response(
+            llm,
+            config,
+            [{"role": "user", "content": function_calling_prompt}],
+            llm_cache,
+            cache_hits,
+            "memory_update",
+        )
+    except Exception as e:
+        logger.error(f"Error in new memory actions response: {e}")
+        response = ""
+
+    try:
+        actions = json.loads(remove_code_blocks(response))
+    except Exception as e:
+        logger.error(f"Invalid JSON response: {e}")
+        return {}
+
+    if cache_key is not None:
+        llm_cache.set(cache_key, response)
+    return actions
+
+
+def _prepare_batch_item(item) -> Dict[str, Any]:
+    """
+    Validate one `add_batch` item and normalize its messages.
+
+    Args:
+        item (dict): Item with "messages" and the session ids and metadata accepted by `add`.
+
+    Returns:
+        Dict[str, Any]: The item's messages, metadata template and filters.
+    """
+    if not isinstance(item, dict) or "messages" not in item:
+        raise ValueError("Each batch item must be a dict with a 'messages' key")
+
+    metadata, filters = _build_filters_and_metadata(
+        user_id=item.get("user_id"),
+        agent_id=item.get("agent_id"),
+        run_id=item.get("run_id"),
+        input_metadata=item.get("metadata"),
+    )
+
+    messages = item["messages"]
+    if isinstance(messages, str):
+        messages = [{"role": "user", "content": messages}]
+    elif isinstance(messages, dict):
+        messages = [messages]
+    elif not isinstance(messages, list):
+        raise ValueError("messages must be str, dict, or list[dict]")
+
+    return {"messages": messages, "metadata": metadata, "filters": filters}
+
+
+def _extract_batch_item(memory, entry, infer):
+    """
+    First `add_batch` stage for one item: parse its messages and collect the texts to embed.
+
+    With inference the texts are the facts extracted by the LLM, otherwise the raw message contents.
+    """
+    if memory.config.llm.config.get("enable_vision"):
+        messages = parse_vision_messages(entry["messages"], memory.llm, memory.config.llm.config.get("vision_details"))
+    else:
+        messages = parse_vision_messages(entry["messages"])
+    entry["messages"] = messages
+
+    if infer:
+        entry["cache_hits"] = {}
+        entry["texts"] = _extract_facts(memory.llm, memory.config, messages, memory.llm_cache, entry["cache_hits"])
+        if not entry["texts"]:
+            logger.debug("No new facts retrieved from input. Skipping memory update LLM call.")
+        return
+
+    valid_messages = []
+    for message_dict in messages:
+        if (
+            not isinstance(message_dict, dict)
+            or message_dict.get("role") is None
+            or message_dict.get("content") is None
+        ):
+            logger.warning(f"Skipping invalid message format: {message_dict}")
+            continue
+        if message_dict["role"] != "system":
+            valid_messages.append(message_dict)
+    entry["valid_messages"] = valid_messages
+    entry["texts"] = [message_dict["content"] for message_dict in valid_messages]
+
+
+def _plan_batch_item(memory, entry, embeddings):
+    """
+    Second `add_batch` stage for one item with inference: find the related memories and ask the LLM for
+    the actions to take.
+    """
+    entry["fact_embeddings"] = {fact: embeddings[fact] for fact in entry["texts"]}
+    # AsyncMemory has no executor; its add_batch already runs items concurrently
+    get_executor = getattr(memory, "_get_executor", None)
+    search_results = _search_memories_for_facts(
+        memory.vector_store, entry["fact_embeddings"], entry["filters"], get_executor
+    )
+    retrieved_old_memory, entry["temp_uuid_mapping"] = _index_old_memories(search_results)
+    entry["actions"] = _get_memory_actions(
+        memory.llm, memory.config, retrieved_old_memory, entry["texts"], memory.llm_cache, entry["cache_hits"]
+    ).get("memory", [])
+
+
+def _queue_batch_item_writes(writer, key, entry, embeddings, infer):
+    """Queue the memory writes of one `add_batch` item on a BatchWriter."""
+    metadata = entry["metadata"]
+
+    if not infer:
+        for message_dict in entry["valid_messages"]:
+            per_msg_meta = deepcopy(metadata)
+            per_msg_meta["role"] = message_dict["role"]
+
+            actor_name = message_dict.get("name")
+            if actor_name:
+                per_msg_meta["actor_id"] = actor_name
+
+            msg_content = message_dict["content"]
+            writer.add(
+                key,
+                msg_content,
+                per_msg_meta,
+                embeddings=embeddings[msg_content],
+                result={
+                    "memory": msg_content,
+                    "event": "ADD",
+                    "actor_id": actor_name if actor_name else None,
+                    "role": message_dict["role"],
+                },
+            )
+        return
+
+    temp_uuid_mapping = entry["temp_uuid_mapping"]
+    for resp in entry["actions"]:
+        try:
+            action_text = resp.get("text")
+            if not action_text:
+                logger.info("Skipping memory entry because of empty `text` field.")
+                continue
+
+            event_type = resp.get("event")
+            if event_type == "ADD":
+                writer.add(
+                    key,
+                    action_text,
+                    deepcopy(metadata),
+                    embeddings=entry["fact_embeddings"].get(action_text),
+                    result={"memory": action_text, "event": event_type},
+                )
+            elif event_type == "UPDATE":
+                writer.update(
+                    key,
+                    temp_uuid_mapping[resp.get("id")],
+                    action_text,
+                    deepcopy(metadata),
+                    embeddings=entry["fact_embeddings"].get(action_text),
+                    result={"memory": action_text, "event": event_type, "previous_memory": resp.get("old_memory")},
+                )
+            elif event_type == "DELETE":
+                writer.delete(
+                    key, temp_uuid_mapping[resp.get("id")], result={"memory": action_text, "event": event_type}
+                )
+            elif event_type == "NONE":
+                logger.info("NOOP for Memory.")
+        except Exception as e:
+            logger.error(f"Error processing memory action: {resp}, Error: {e}")
+
+
+def _batch_item_result(
+    memories, error, relations, enable_graph, cache_hits=None, relations_error=None
+) -> Dict[str, Any]:
+    """Build the result reported for one `add_batch` item."""
+    result = {"results": memories}
+    if enable_graph:
+        result["relations"] = relations
+    if relations_error is not None:
+        result["relations_error"] = relations_error
+    if cache_hits:
+        result["cache"] = cache_hits
+    if error is not None:
+        result["error"] = error
+    return result
+
+
+_PROMOTED_PAYLOAD_KEYS = ("user_id", "agent_id", "run_id", "actor_id", "role")
+_CORE_AND_PROMOTED_KEYS = frozenset({"data", "hash", "created_at", "updated_at", "id", *_PROMOTED_PAYLOAD_KEYS})
+
+
+def _format_memory(mem, include_score: bool = False, score: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Format a vector store record the way the API reports a memory.
+
+    Builds the same dict as `MemoryItem(...).model_dump()` without going through pydantic, since this runs
+    for every returned memory and the values come from payloads mem0 wrote itself.
+
+    Args:
+        mem: Record with `id` and `payload` attributes.
+        include_score (bool, optional): Whether the result has a "score" key. Defaults to False.
+        score (float, optional): Score reported when `include_score` is set. Defaults to None.
+
+    Returns:
+        dict: The formatted memory.
+    """
+    payload = mem.payload
+    item = {"id": mem.id, "memory": payload["data"], "hash": payload.get("hash"), "metadata": None}
+    if include_score:
+        item["score"] = score
+    item["created_at"] = payload.get("created_at")
+    item["updated_at"] = payload.get("updated_at")
+
+    for key in _PROMOTED_PAYLOAD_KEYS:
+        if key in payload:
+            item[key] = payload[key]
+
+    additional_metadata = {k: v for k, v in payload.items() if k not in _CORE_AND_PROMOTED_KEYS}
+    if additional_metadata:
+        item["metadata"] = additional_metadata
+
+    return item
+
+
+def _fuse_hybrid_results(dense_memories, lexical_memories, limit, fetch) -> List[Dict[str, Any]]:
+    """
+    Fuse dense and lexical hits with reciprocal-rank fusion.
+
+    Lexical hits carry no payload, so the ones the dense search did not return are fetched with `fetch`, in fused
+    order and only until `limit` memories are found. Hits it cannot resolve are skipped.
+
+    Args:
+        dense_memories (list): Vector store hits, best first.
+        lexical_memories (list): Lexical index hits as `(memory_id, score)`, best first.
+        limit (int): Maximum number of memories to return.
+        fetch (Callable): Returns the current record of a memory id, or None if it is gone or filtered out.
+
+    Returns:
+        list: Formatted memories scored with their fused score, best first.
+    """
+    records = {mem.id: mem for mem in dense_memories}
+    fused = reciprocal_rank_fusion(
+        [[mem.id for mem in dense_memories], [memory_id for memory_id, _ in lexical_memories]]
+    )
+    results = []
+    for memory_id, score in fused:
+        record = records[memory_id] if memory_id in records else fetch(memory_id)
+        if record is None:
+            continue
+        results.append(_format_memory(record, include_score=True, score=score))
+        if len(results) == limit:
+            break
+    return results
+
+
+def _fetch_lexical_hit(vector_store, lexical_index, memory_id, filters):
+    """
+    Fetch a memory matched only by the lexical index, dropping it from the index if it no longer exists.
+
+    Returns:
+        The memory's record, or None if it was deleted or does not match the filters.
+    """
+    memory = vector_store.get(vector_id=memory_id)
+    if memory is None:
+        lexical_index.remove(memory_id)
+        return None
+    return memory if payload_matches(memory.payload or {}, filters) else None
+
+
+def _undeleted_page(listed, deleted: set) -> Tuple[list, bool]:
+    """
+    Return the listed memories that `delete_all` has not deleted yet.
+
+    Args:
+        listed: Result of the vector store's `list`.
+        deleted (set): IDs of the memories already deleted.
+
+    Returns:
+        tuple: The memories left to delete, and whether the page was full of already deleted memories, which may
+            hide others the store has not listed yet.
+    """
+    memories = _unwrap_listed(listed)
+    page = [memory for memory in memories if memory.id not in deleted]
+    return page, not page and len(memories) >= DELETE_ALL_PAGE_SIZE
+
+
+def _log_stale_listing(deleted_count: int):
+    logger.warning(
+        f"delete_all stopped after deleting {deleted_count} memories because the vector store still lists only "
+        "deleted ones; memories past them may remain, run delete_all again once the store applies its deletes"
+    )
+
+
+def _deletion_history_record(memory) -> Dict[str, Any]:
+    """Build the history record of a deleted memory for `add_history_batch`."""
+    return {
+        "memory_id": memory.id,
+        "old_memory": memory.payload["data"],
+        "new_memory": None,
+        "event": "DELETE",
+        "actor_id": memory.payload.get("actor_id"),
+        "role": memory.payload.get("role"),
+        "is_deleted": 1,
+    }
+
 
 class Memory(MemoryBase):
     def __init__(self, config: MemoryConfig = MemoryConfig()):
@@ -129,11 +628,16 @@ class Memory(MemoryBase):
             self.config.embedder.provider,
             self.config.embedder.config,
             self.config.vector_store.config,
+            self.config.embedder.cache,
         )
         self.vector_store = VectorStoreFactory.create(
             self.config.vector_store.provider, self.config.vector_store.config
         )
         self.llm = LlmFactory.create(self.config.llm.provider, self.config.llm.config)
+        self.llm_cache = None
+        if self.config.llm.cache is not None and self.config.llm.cache.enabled:
+            self.llm_cache = get_shared_llm_cache(self.config.llm.cache)
+        self.lexical_index = LexicalIndex()
         self.db = SQLiteManager(self.config.history_db_path)
         self.collection_name = self.config.vector_store.config.collection_name
         self.api_version = self.config.version
@@ -147,6 +651,12 @@ class Memory(MemoryBase):
         else:
             self.graph = None
 
+        # Created on first use, by graph operations running alongside the vector store and by per-fact searches
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._executor_max_workers = self.config.executor_max_workers
+        self._executor_max_pending = self.config.executor_max_pending
+
         telemetry_config = deepcopy(self.config.vector_store.config)
         telemetry_config.collection_name = "mem0migrations"
         if self.config.vector_store.provider in ["faiss", "qdrant"]:
@@ -158,6 +668,71 @@ class Memory(MemoryBase):
         )
         capture_event("mem0.init", self, {"sync_type": "sync"})
 
+    def _get_executor(self) -> MemoryExecutor:
+        """Return this instance's executor, creating it on first use."""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = MemoryExecutor(
+                    max_workers=self._executor_max_workers,
+                    max_pending=self._executor_max_pending,
+                    thread_name_prefix="mem0-memory",
+                )
+            return self._executor
+
+    def _run_with_graph(self, vector_fn, graph_fn):
+        """
+        Run the vector store and graph parts of an operation.
+
+        With the graph enabled, the graph part runs on the instance executor while the vector store part
+        runs on the calling thread. Without it, only the vector store part runs and no thread is involved.
+
+        Args:
+            vector_fn (callable): Vector store part of the operation.
+            graph_fn (callable): Graph part of the operation.
+
+        Returns:
+            tuple: The vector store result and the graph result (None when the graph is disabled).
+        """
+        if not self.enable_graph:
+            return vector_fn(), None
+
+        graph_future = self._get_executor().submit(graph_fn)
+        try:
+            vector_result = vector_fn()
+        finally:
+            # Wait for the graph part even if the vector store part failed, so no work outlives the call
+            concurrent.futures.wait([graph_future])
+        return vector_result, graph_future.result()
+
+    def executor_stats(self) -> Dict[str, int]:
+        """
+        Report queue depth and throughput of the executor running graph operations and per-fact searches.
+
+        Returns:
+            Dict[str, int]: Executor counters, all zero if no operation has used the executor yet.
+        """
+        if self._executor is None:
+            return {
+                "max_workers": self._executor_max_workers,
+                "queued": 0,
+                "running": 0,
+                "completed": 0,
+                "max_queue_depth": 0,
+            }
+        return self._executor.stats()
+
+    def close(self):
+        """
+        Release the resources held by this instance: the executor threads and the history database.
+        """
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+        if hasattr(self.db, "close"):
+            self.db.close()
+
     @classmethod
     def from_config(cls, config_dict: Dict[str, Any]):
         try:
@@ -255,14 +830,13 @@ class Memory(MemoryBase):
         else:
             messages = parse_vision_messages(messages)
 
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            future1 = executor.submit(self._add_to_vector_store, messages, processed_metadata, effective_filters, infer)
-            future2 = executor.submit(self._add_to_graph, messages, effective_filters)
-
-            concurrent.futures.wait([future1, future2])
-
-            vector_store_result = future1.result()
-            graph_result = future2.result()
+        # Cache hits are only tracked when the LLM response cache is enabled
+        cache_hits = {}
+        cache_kwargs = {"cache_hits": cache_hits} if self.llm_cache is not None else {}
+        vector_store_result, graph_result = self._run_with_graph(
+            lambda: self._add_to_vector_store(messages, processed_metadata, effective_filters, infer, **cache_kwargs),
+            lambda: self._add_to_graph(messages, effective_filters),
+        )
 
         if self.api_version == "v1.0":
             warnings.warn(
@@ -274,17 +848,121 @@ class Memory(MemoryBase):
             )
             return vector_store_result
 
+        result = {"results": vector_store_result}
         if self.enable_graph:
-            return {
-                "results": vector_store_result,
-                "relations": graph_result,
-            }
+            result["relations"] = graph_result
+        if cache_hits:
+            result["cache"] = cache_hits
+        return result
+
+    def add_batch(self, items: List[Dict[str, Any]], *, infer: bool = True, concurrency: int = 8):
+        """
+        Create memories from many independent conversations in one call.
+
+        Fact extraction and memory update decisions run concurrently across items, all facts are embedded
+        together, new memories are written with a single vector store insert and history is recorded in
+        one transaction. Items are independent: facts from one item are not compared with memories added
+        by another item of the same batch.
+
+        Args:
+            items (List[Dict[str, Any]]): Conversations to add. Each item is a dict with "messages" and
+                the `user_id`, `agent_id`, `run_id` and `metadata` accepted by `add`.
+            infer (bool, optional): Whether to extract facts with the LLM, as in `add`. Defaults to True.
+            concurrency (int, optional): Maximum number of items processed at once. Defaults to 8.
+
+        Returns:
+            list: One result per item, in order. Each result has the memories written under "results"
+                (and "relations" if graph store is enabled). An item whose memories could not be written has
+                empty "results" and its error message under "error". An item whose memories were written but
+                whose graph update failed keeps its "results" and has the graph error under "relations_error",
+                so it must not be retried as a whole.
+                Example:
+                `[{"results": [{"id": "...", "memory": "...", "event": "ADD"}]}, {"results": [], "error": "..."}]`
+        """
+        errors = {}
+        entries = {}
+        for index, item in enumerate(items):
+            try:
+                entries[index] = _prepare_batch_item(item)
+            except Exception as e:
+                errors[index] = str(e)
+
+        relations = {}
+        relation_errors = {}
+        memories = {}
+        if entries:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=max(1, min(concurrency, len(entries))), thread_name_prefix="mem0-batch"
+            ) as executor:
+
+                def run_stage(stage, *args):
+                    futures = {executor.submit(stage, self, entries[index], *args): index for index in entries}
+                    for future in concurrent.futures.as_completed(futures):
+                        index = futures[future]
+                        try:
+                            future.result()
+                        except Exception as e:
+                            logger.error(f"Error processing batch item {index}: {e}")
+                            errors[index] = str(e)
+                            del entries[index]
+
+                run_stage(_extract_batch_item, infer)
+
+                graph_futures = {}
+                if self.enable_graph:
+                    graph_futures = {
+                        index: executor.submit(self._add_to_graph, entry["messages"], dict(entry["filters"]))
+                        for index, entry in entries.items()
+                    }
+
+                try:
+                    embeddings = embed_in_chunks(
+                        self.embedding_model, [text for entry in entries.values() for text in entry["texts"]], "add"
+                    )
+                except Exception as e:
+                    logger.error(f"Error embedding batch: {e}")
+                    errors.update({index: str(e) for index in entries})
+                    entries.clear()
+                    embeddings = {}
+
+                if infer:
+                    run_stage(_plan_batch_item, embeddings)
+
+                writer = BatchWriter(self.vector_store, self.db, self.embedding_model, self.lexical_index)
+                for index, entry in entries.items():
+                    _queue_batch_item_writes(writer, index, entry, embeddings, infer)
+                memories, write_errors = writer.flush()
+                errors.update(write_errors)
+
+                for index, future in graph_futures.items():
+                    try:
+                        relations[index] = future.result()
+                    except Exception as e:
+                        logger.error(f"Error adding batch item {index} to graph: {e}")
+                        relation_errors[index] = str(e)
 
-        return {"results": vector_store_result}
+        capture_event(
+            "mem0.add_batch",
+            self,
+            {"version": self.api_version, "items": len(items), "failed": len(errors), "sync_type": "sync"},
+        )
+        # Memories already written are always reported, so a caller retrying failed items does not add them twice
+        return [
+            _batch_item_result(
+                memories.get(index, []),
+                errors.get(index),
+                relations.get(index, []),
+                self.enable_graph,
+                (entries.get(index) or {}).get("cache_hits"),
+                relation_errors.get(index),
+            )
+            for index in range(len(items))
+        ]
 
-    def _add_to_vector_store(self, messages, metadata, filters, infer):
+    def _add_to_vector_store(self, messages, metadata, filters, infer, cache_hits=None):
         if not infer:
             returned_memories = []
+            valid_messages = []
             for message_dict in messages:
                 if (
                     not isinstance(message_dict, dict)
@@ -297,6 +975,15 @@ class Memory(MemoryBase):
                 if message_dict["role"] == "system":
                     continue
 
+                valid_messages.append(message_dict)
+
+            msg_embeddings_list = (
+                self.embedding_model.embed_batch([message_dict["content"] for message_dict in valid_messages], "add")
+                if valid_messages
+                else []
+            )
+
+            for message_dict, msg_embeddings in zip(valid_messages, msg_embeddings_list):
                 per_msg_meta = deepcopy(metadata)
                 per_msg_meta["role"] = message_dict["role"]
 
@@ -305,8 +992,7 @@ class Memory(MemoryBase):
                     per_msg_meta["actor_id"] = actor_name
 
                 msg_content = message_dict["content"]
-                msg_embeddings = self.embedding_model.embed(msg_content, "add")
-                mem_id = self._create_memory(msg_content, msg_embeddings, per_msg_meta)
+                mem_id = self._create_memory(msg_content, {msg_content: msg_embeddings}, per_msg_meta)
 
                 returned_memories.append(
                     {
@@ -319,80 +1005,20 @@ class Memory(MemoryBase):
                 )
             return returned_memories
 
-        parsed_messages = parse_messages(messages)
-
-        if self.config.custom_fact_extraction_prompt:
-            system_prompt = self.config.custom_fact_extraction_prompt
-            user_prompt = f"Input:\n{parsed_messages}"
-        else:
-            system_prompt, user_prompt = get_fact_retrieval_messages(parsed_messages)
-
-        response = self.llm.generate_response(
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            response_format={"type": "json_object"},
-        )
-
-        try:
-            response = remove_code_blocks(response)
-            new_retrieved_facts = json.loads(response)["facts"]
-        except Exception as e:
-            logger.error(f"Error in new_retrieved_facts: {e}")
-            new_retrieved_facts = []
+        new_retrieved_facts = _extract_facts(self.llm, self.config, messages, self.llm_cache, cache_hits)
 
         if not new_retrieved_facts:
             logger.debug("No new facts retrieved from input. Skipping memory update LLM call.")
 
-        retrieved_old_memory = []
-        new_message_embeddings = {}
-        for new_mem in new_retrieved_facts:
-            messages_embeddings = self.embedding_model.embed(new_mem, "add")
-            new_message_embeddings[new_mem] = messages_embeddings
-            existing_memories = self.vector_store.search(
-                query=new_mem,
-                vectors=messages_embeddings,
-                limit=5,
-                filters=filters,
-            )
-            for mem in existing_memories:
-                retrieved_old_memory.append({"id": mem.id, "text": mem.payload["data"]})
-
-        unique_data = {}
-        for item in retrieved_old_memory:
-            unique_data[item["id"]] = item
-        retrieved_old_memory = list(unique_data.values())
-        logger.info(f"Total existing memories: {len(retrieved_old_memory)}")
-
-        # mapping UUIDs with integers for handling UUID hallucinations
-        temp_uuid_mapping = {}
-        for idx, item in enumerate(retrieved_old_memory):
-            temp_uuid_mapping[str(idx)] = item["id"]
-            retrieved_old_memory[idx]["id"] = str(idx)
-
-        if new_retrieved_facts:
-            function_calling_prompt = get_update_memory_messages(
-                retrieved_old_memory, new_retrieved_facts, self.config.custom_update_memory_prompt
-            )
-
-            try:
-                response: str = self.llm.generate_response(
-                    messages=[{"role": "user", "content": function_calling_prompt}],
-                    response_format={"type": "json_object"},
-                )
-            except Exception as e:
-                logger.error(f"Error in new memory actions response: {e}")
-                response = ""
+        fact_embeddings = self.embedding_model.embed_batch(new_retrieved_facts, "add") if new_retrieved_facts else []
+        new_message_embeddings = dict(zip(new_retrieved_facts, fact_embeddings))
+        retrieved_old_memory, temp_uuid_mapping = _index_old_memories(
+            _search_memories_for_facts(self.vector_store, new_message_embeddings, filters, self._get_executor)
+        )
 
-            try:
-                response = remove_code_blocks(response)
-                new_memories_with_actions = json.loads(response)
-            except Exception as e:
-                logger.error(f"Invalid JSON response: {e}")
-                new_memories_with_actions = {}
-        else:
-            new_memories_with_actions = {}
+        new_memories_with_actions = _get_memory_actions(
+            self.llm, self.config, retrieved_old_memory, new_retrieved_facts, self.llm_cache, cache_hits
+        )
 
         returned_memories = []
         try:
@@ -477,33 +1103,7 @@ class Memory(MemoryBase):
         if not memory:
             return None
 
-        promoted_payload_keys = [
-            "user_id",
-            "agent_id",
-            "run_id",
-            "actor_id",
-            "role",
-        ]
-
-        core_and_promoted_keys = {"data", "hash", "created_at", "updated_at", "id", *promoted_payload_keys}
-
-        result_item = MemoryItem(
-            id=memory.id,
-            memory=memory.payload["data"],
-            hash=memory.payload.get("hash"),
-            created_at=memory.payload.get("created_at"),
-            updated_at=memory.payload.get("updated_at"),
-        ).model_dump()
-
-        for key in promoted_payload_keys:
-            if key in memory.payload:
-                result_item[key] = memory.payload[key]
-
-        additional_metadata = {k: v for k, v in memory.payload.items() if k not in core_and_promoted_keys}
-        if additional_metadata:
-            result_item["metadata"] = additional_metadata
-
-        return result_item
+        return _format_memory(memory, include_score=True)
 
     def get_all(
         self,
@@ -545,18 +1145,10 @@ class Memory(MemoryBase):
             "mem0.get_all", self, {"limit": limit, "keys": keys, "encoded_ids": encoded_ids, "sync_type": "sync"}
         )
 
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            future_memories = executor.submit(self._get_all_from_vector_store, effective_filters, limit)
-            future_graph_entities = (
-                executor.submit(self.graph.get_all, effective_filters, limit) if self.enable_graph else None
-            )
-
-            concurrent.futures.wait(
-                [future_memories, future_graph_entities] if future_graph_entities else [future_memories]
-            )
-
-            all_memories_result = future_memories.result()
-            graph_entities_result = future_graph_entities.result() if future_graph_entities else None
+        all_memories_result, graph_entities_result = self._run_with_graph(
+            lambda: self._get_all_from_vector_store(effective_filters, limit),
+            lambda: self.graph.get_all(effective_filters, limit),
+        )
 
         if self.enable_graph:
             return {"results": all_memories_result, "relations": graph_entities_result}
@@ -581,36 +1173,59 @@ class Memory(MemoryBase):
             else memories_result
         )
 
-        promoted_payload_keys = [
-            "user_id",
-            "agent_id",
-            "run_id",
-            "actor_id",
-            "role",
-        ]
-        core_and_promoted_keys = {"data", "hash", "created_at", "updated_at", "id", *promoted_payload_keys}
+        return [_format_memory(mem) for mem in actual_memories]
 
-        formatted_memories = []
-        for mem in actual_memories:
-            memory_item_dict = MemoryItem(
-                id=mem.id,
-                memory=mem.payload["data"],
-                hash=mem.payload.get("hash"),
-                created_at=mem.payload.get("created_at"),
-                updated_at=mem.payload.get("updated_at"),
-            ).model_dump(exclude={"score"})
+    def iter_all(
+        self,
+        *,
+        user_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        page_size: int = 100,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all memories, one page at a time.
 
-            for key in promoted_payload_keys:
-                if key in mem.payload:
-                    memory_item_dict[key] = mem.payload[key]
+        Unlike `get_all`, the number of memories is not capped, so exports and audits can walk very large
+        memory sets. Graph relations are not included. Vector stores with a native `list_page` (Chroma, FAISS,
+        Milvus, MongoDB, pgvector, Qdrant and Redis) read each page where the previous one stopped and hold only
+        that page. Other stores fall back to `VectorStoreBase.list_page`, which re-lists every memory up to the
+        end of the requested page on each call: a full walk costs O(N^2 / page_size) reads, holds up to N
+        memories at once, and stops working past the store's own listing limits.
 
-            additional_metadata = {k: v for k, v in mem.payload.items() if k not in core_and_promoted_keys}
-            if additional_metadata:
-                memory_item_dict["metadata"] = additional_metadata
+        Args:
+            user_id (str, optional): user id
+            agent_id (str, optional): agent id
+            run_id (str, optional): run id
+            filters (dict, optional): Additional custom key-value filters, merged with the ID-based
+                scoping filters.
+            page_size (int, optional): Number of memories fetched from the vector store at once. Defaults to 100.
+
+        Yields:
+            dict: Each memory, formatted as in the results of `get_all`.
+        """
+        _, effective_filters = _build_filters_and_metadata(
+            user_id=user_id, agent_id=agent_id, run_id=run_id, input_filters=filters
+        )
 
-            formatted_memories.append(memory_item_dict)
+        if not any(key in effective_filters for key in ("user_id", "agent_id", "run_id")):
+            raise ValueError("At least one of 'user_id', 'agent_id', or 'run_id' must be specified.")
+
+        keys, encoded_ids = process_telemetry_filters(effective_filters)
+        capture_event(
+            "mem0.iter_all",
+            self,
+            {"page_size": page_size, "keys": keys, "encoded_ids": encoded_ids, "sync_type": "sync"},
+        )
 
-        return formatted_memories
+        cursor = None
+        while True:
+            page, cursor = self.vector_store.list_page(filters=effective_filters, limit=page_size, cursor=cursor)
+            for mem in page:
+                yield _format_memory(mem)
+            if cursor is None:
+                return
 
     def search(
         self,
@@ -622,6 +1237,7 @@ class Memory(MemoryBase):
         limit: int = 100,
         filters: Optional[Dict[str, Any]] = None,
         threshold: Optional[float] = None,
+        mode: str = "dense",
     ):
         """
         Searches for memories based on a query
@@ -633,6 +1249,9 @@ class Memory(MemoryBase):
             limit (int, optional): Limit the number of results. Defaults to 100.
             filters (dict, optional): Filters to apply to the search. Defaults to None..
             threshold (float, optional): Minimum score for a memory to be included in the results. Defaults to None.
+            mode (str, optional): "dense" for vector search, or "hybrid" to also match the query's exact
+                tokens with BM25 and fuse both rankings with reciprocal-rank fusion. In hybrid mode scores are
+                fused scores and the threshold only applies to vector hits. Defaults to "dense".
 
         Returns:
             dict: A dictionary containing the search results, typically under a "results" key,
@@ -646,6 +1265,9 @@ class Memory(MemoryBase):
         if not any(key in effective_filters for key in ("user_id", "agent_id", "run_id")):
             raise ValueError("At least one of 'user_id', 'agent_id', or 'run_id' must be specified.")
 
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Invalid search mode {mode!r}. Expected one of {', '.join(SEARCH_MODES)}.")
+
         keys, encoded_ids = process_telemetry_filters(effective_filters)
         capture_event(
             "mem0.search",
@@ -657,21 +1279,14 @@ class Memory(MemoryBase):
                 "encoded_ids": encoded_ids,
                 "sync_type": "sync",
                 "threshold": threshold,
+                "mode": mode,
             },
         )
 
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            future_memories = executor.submit(self._search_vector_store, query, effective_filters, limit, threshold)
-            future_graph_entities = (
-                executor.submit(self.graph.search, query, effective_filters, limit) if self.enable_graph else None
-            )
-
-            concurrent.futures.wait(
-                [future_memories, future_graph_entities] if future_graph_entities else [future_memories]
-            )
-
-            original_memories = future_memories.result()
-            graph_entities = future_graph_entities.result() if future_graph_entities else None
+        original_memories, graph_entities = self._run_with_graph(
+            lambda: self._search_vector_store(query, effective_filters, limit, threshold, mode),
+            lambda: self.graph.search(query, effective_filters, limit),
+        )
 
         if self.enable_graph:
             return {"results": original_memories, "relations": graph_entities}
@@ -688,43 +1303,23 @@ class Memory(MemoryBase):
         else:
             return {"results": original_memories}
 
-    def _search_vector_store(self, query, filters, limit, threshold: Optional[float] = None):
+    def _search_vector_store(self, query, filters, limit, threshold: Optional[float] = None, mode: str = "dense"):
+        candidates = limit * HYBRID_CANDIDATE_FACTOR if mode == "hybrid" else limit
         embeddings = self.embedding_model.embed(query, "search")
-        memories = self.vector_store.search(query=query, vectors=embeddings, limit=limit, filters=filters)
-
-        promoted_payload_keys = [
-            "user_id",
-            "agent_id",
-            "run_id",
-            "actor_id",
-            "role",
-        ]
-
-        core_and_promoted_keys = {"data", "hash", "created_at", "updated_at", "id", *promoted_payload_keys}
-
-        original_memories = []
-        for mem in memories:
-            memory_item_dict = MemoryItem(
-                id=mem.id,
-                memory=mem.payload["data"],
-                hash=mem.payload.get("hash"),
-                created_at=mem.payload.get("created_at"),
-                updated_at=mem.payload.get("updated_at"),
-                score=mem.score,
-            ).model_dump()
-
-            for key in promoted_payload_keys:
-                if key in mem.payload:
-                    memory_item_dict[key] = mem.payload[key]
-
-            additional_metadata = {k: v for k, v in mem.payload.items() if k not in core_and_promoted_keys}
-            if additional_metadata:
-                memory_item_dict["metadata"] = additional_metadata
-
-            if threshold is None or mem.score >= threshold:
-                original_memories.append(memory_item_dict)
+        memories = self.vector_store.search(query=query, vectors=embeddings, limit=candidates, filters=filters)
+        memories = [mem for mem in memories if threshold is None or mem.score >= threshold]
+
+        if mode == "hybrid":
+            self.lexical_index.ensure_loaded(self.vector_store, filters)
+            lexical_memories = self.lexical_index.search(query, filters, candidates)
+            return _fuse_hybrid_results(
+                memories,
+                lexical_memories,
+                limit,
+                lambda memory_id: _fetch_lexical_hit(self.vector_store, self.lexical_index, memory_id, filters),
+            )
 
-        return original_memories
+        return [_format_memory(mem, include_score=True, score=mem.score) for mem in memories]
 
     def update(self, memory_id, data):
         """
@@ -783,11 +1378,32 @@ class Memory(MemoryBase):
 
         keys, encoded_ids = process_telemetry_filters(filters)
         capture_event("mem0.delete_all", self, {"keys": keys, "encoded_ids": encoded_ids, "sync_type": "sync"})
-        memories = self.vector_store.list(filters=filters)[0]
-        for memory in memories:
-            self._delete_memory(memory.id)
-
-        logger.info(f"Deleted {len(memories)} memories")
+        # Delete a page of listed memories at a time and record exactly those in the history. Every round lists
+        # from the start, so no offset grows past the store's listing limits, and memories added meanwhile are
+        # either picked up by a later round or left alone, never deleted without a history row.
+        deleted_count = 0
+        deleted = set()
+        stale_rounds = 0
+        while True:
+            listed = self.vector_store.list(filters=filters, limit=DELETE_ALL_PAGE_SIZE)
+            page, stale = _undeleted_page(listed, deleted)
+            if stale and stale_rounds < DELETE_ALL_STALE_RETRIES:
+                time.sleep(DELETE_ALL_STALE_DELAY * 2**stale_rounds)
+                stale_rounds += 1
+                continue
+            if not page:
+                if stale:
+                    _log_stale_listing(deleted_count)
+                break
+            stale_rounds = 0
+            page_ids = [memory.id for memory in page]
+            self.vector_store.delete_batch(page_ids)
+            self.db.add_history_batch([_deletion_history_record(memory) for memory in page])
+            deleted.update(page_ids)
+            deleted_count += len(page)
+        self.lexical_index.remove_matching(filters)
+
+        logger.info(f"Deleted {deleted_count} memories")
 
         if self.enable_graph:
             self.graph.delete_all(filters)
@@ -833,6 +1449,7 @@ class Memory(MemoryBase):
             actor_id=metadata.get("actor_id"),
             role=metadata.get("role"),
         )
+        self.lexical_index.add(memory_id, metadata)
         capture_event("mem0._create_memory", self, {"memory_id": memory_id, "sync_type": "sync"})
         return memory_id
 
@@ -884,24 +1501,7 @@ class Memory(MemoryBase):
             raise ValueError(f"Error getting memory with ID {memory_id}. Please provide a valid 'memory_id'")
 
         prev_value = existing_memory.payload.get("data")
-
-        new_metadata = deepcopy(metadata) if metadata is not None else {}
-
-        new_metadata["data"] = data
-        new_metadata["hash"] = hashlib.md5(data.encode()).hexdigest()
-        new_metadata["created_at"] = existing_memory.payload.get("created_at")
-        new_metadata["updated_at"] = datetime.now(pytz.timezone("US/Pacific")).isoformat()
-
-        if "user_id" in existing_memory.payload:
-            new_metadata["user_id"] = existing_memory.payload["user_id"]
-        if "agent_id" in existing_memory.payload:
-            new_metadata["agent_id"] = existing_memory.payload["agent_id"]
-        if "run_id" in existing_memory.payload:
-            new_metadata["run_id"] = existing_memory.payload["run_id"]
-        if "actor_id" in existing_memory.payload:
-            new_metadata["actor_id"] = existing_memory.payload["actor_id"]
-        if "role" in existing_memory.payload:
-            new_metadata["role"] = existing_memory.payload["role"]
+        new_metadata = build_updated_payload(existing_memory.payload, data, metadata)
 
         if data in existing_embeddings:
             embeddings = existing_embeddings[data]
@@ -925,6 +1525,7 @@ class Memory(MemoryBase):
             actor_id=new_metadata.get("actor_id"),
             role=new_metadata.get("role"),
         )
+        self.lexical_index.add(memory_id, new_metadata)
         capture_event("mem0._update_memory", self, {"memory_id": memory_id, "sync_type": "sync"})
         return memory_id
 
@@ -942,6 +1543,7 @@ class Memory(MemoryBase):
             role=existing_memory.payload.get("role"),
             is_deleted=1,
         )
+        self.lexical_index.remove(memory_id)
         capture_event("mem0._delete_memory", self, {"memory_id": memory_id, "sync_type": "sync"})
         return memory_id
 
@@ -956,7 +1558,7 @@ class Memory(MemoryBase):
 
         if hasattr(self.db, "connection") and self.db.connection:
             self.db.connection.execute("DROP TABLE IF EXISTS history")
-            self.db.connection.close()
+            self.db.close()
 
         self.db = SQLiteManager(self.config.history_db_path)
 
@@ -968,6 +1570,7 @@ class Memory(MemoryBase):
             self.vector_store = VectorStoreFactory.create(
                 self.config.vector_store.provider, self.config.vector_store.config
             )
+        self.lexical_index.clear()
         capture_event("mem0.reset", self, {"sync_type": "sync"})
 
     def chat(self, query):
@@ -982,11 +1585,16 @@ class AsyncMemory(MemoryBase):
             self.config.embedder.provider,
             self.config.embedder.config,
             self.config.vector_store.config,
+            self.config.embedder.cache,
         )
         self.vector_store = VectorStoreFactory.create(
             self.config.vector_store.provider, self.config.vector_store.config
         )
         self.llm = LlmFactory.create(self.config.llm.provider, self.config.llm.config)
+        self.llm_cache = None
+        if self.config.llm.cache is not None and self.config.llm.cache.enabled:
+            self.llm_cache = get_shared_llm_cache(self.config.llm.cache)
+        self.lexical_index = LexicalIndex()
         self.db = SQLiteManager(self.config.history_db_path)
         self.collection_name = self.config.vector_store.config.collection_name
         self.api_version = self.config.version
@@ -1095,8 +1703,11 @@ class AsyncMemory(MemoryBase):
         else:
             messages = parse_vision_messages(messages)
 
+        # Cache hits are only tracked when the LLM response cache is enabled
+        cache_hits = {}
+        cache_kwargs = {"cache_hits": cache_hits} if self.llm_cache is not None else {}
         vector_store_task = asyncio.create_task(
-            self._add_to_vector_store(messages, processed_metadata, effective_filters, infer)
+            self._add_to_vector_store(messages, processed_metadata, effective_filters, infer, **cache_kwargs)
         )
         graph_task = asyncio.create_task(self._add_to_graph(messages, effective_filters))
 
@@ -1112,13 +1723,111 @@ class AsyncMemory(MemoryBase):
             )
             return vector_store_result
 
+        result = {"results": vector_store_result}
         if self.enable_graph:
-            return {
-                "results": vector_store_result,
-                "relations": graph_result,
-            }
+            result["relations"] = graph_result
+        if cache_hits:
+            result["cache"] = cache_hits
+        return result
 
-        return {"results": vector_store_result}
+    async def add_batch(self, items: List[Dict[str, Any]], *, infer: bool = True, concurrency: int = 8):
+        """
+        Create memories from many independent conversations in one call asynchronously.
+
+        Works like `Memory.add_batch`: at most `concurrency` items are processed at once, all facts are
+        embedded together, new memories are written with a single vector store insert and history is
+        recorded in one transaction.
+
+        Args:
+            items (List[Dict[str, Any]]): Conversations to add. Each item is a dict with "messages" and
+                the `user_id`, `agent_id`, `run_id` and `metadata` accepted by `add`.
+            infer (bool, optional): Whether to extract facts with the LLM, as in `add`. Defaults to True.
+            concurrency (int, optional): Maximum number of items processed at once. Defaults to 8.
+
+        Returns:
+            list: One result per item, in order, as returned by `Memory.add_batch`.
+        """
+        errors = {}
+        entries = {}
+        for index, item in enumerate(items):
+            try:
+                entries[index] = _prepare_batch_item(item)
+            except Exception as e:
+                errors[index] = str(e)
+
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def run_item(stage, index, *args):
+            async with semaphore:
+                try:
+                    await asyncio.to_thread(stage, self, entries[index], *args)
+                except Exception as e:
+                    logger.error(f"Error processing batch item {index}: {e}")
+                    errors[index] = str(e)
+
+        async def run_stage(stage, *args):
+            await asyncio.gather(*(run_item(stage, index, *args) for index in list(entries)))
+            for index in errors:
+                entries.pop(index, None)
+
+        async def add_to_graph(entry):
+            async with semaphore:
+                return await self._add_to_graph(entry["messages"], dict(entry["filters"]))
+
+        await run_stage(_extract_batch_item, infer)
+
+        graph_tasks = {}
+        if self.enable_graph:
+            graph_tasks = {index: asyncio.create_task(add_to_graph(entry)) for index, entry in entries.items()}
+
+        try:
+            embeddings = await asyncio.to_thread(
+                embed_in_chunks,
+                self.embedding_model,
+                [text for entry in entries.values() for text in entry["texts"]],
+                "add",
+            )
+        except Exception as e:
+            logger.error(f"Error embedding batch: {e}")
+            errors.update({index: str(e) for index in entries})
+            entries.clear()
+            embeddings = {}
+
+        if infer:
+            await run_stage(_plan_batch_item, embeddings)
+
+        writer = BatchWriter(self.vector_store, self.db, self.embedding_model, self.lexical_index)
+        for index, entry in entries.items():
+            _queue_batch_item_writes(writer, index, entry, embeddings, infer)
+        memories, write_errors = await asyncio.to_thread(writer.flush)
+        errors.update(write_errors)
+
+        relations = {}
+        relation_errors = {}
+        for index, task in graph_tasks.items():
+            try:
+                relations[index] = await task
+            except Exception as e:
+                logger.error(f"Error adding batch item {index} to graph: {e}")
+                relation_errors[index] = str(e)
+
+        capture_event(
+            "mem0.add_batch",
+            self,
+            {"version": self.api_version, "items": len(items), "failed": len(errors), "sync_type": "async"},
+        )
+        # Memories already written are always reported, so a caller retrying failed items does not add them twice
+        return [
+            _batch_item_result(
+                memories.get(index, []),
+                errors.get(index),
+                relations.get(index, []),
+                self.enable_graph,
+                (entries.get(index) or {}).get("cache_hits"),
+                relation_errors.get(index),
+            )
+            for index in range(len(items))
+        ]
 
     async def _add_to_vector_store(
         self,
@@ -1126,9 +1835,11 @@ class AsyncMemory(MemoryBase):
         metadata: dict,
         effective_filters: dict,
         infer: bool,
+        cache_hits: Optional[dict] = None,
     ):
         if not infer:
             returned_memories = []
+            valid_messages = []
             for message_dict in messages:
                 if (
                     not isinstance(message_dict, dict)
@@ -1141,6 +1852,19 @@ class AsyncMemory(MemoryBase):
                 if message_dict["role"] == "system":
                     continue
 
+                valid_messages.append(message_dict)
+
+            msg_embeddings_list = (
+                await asyncio.to_thread(
+                    self.embedding_model.embed_batch,
+                    [message_dict["content"] for message_dict in valid_messages],
+                    "add",
+                )
+                if valid_messages
+                else []
+            )
+
+            for message_dict, msg_embeddings in zip(valid_messages, msg_embeddings_list):
                 per_msg_meta = deepcopy(metadata)
                 per_msg_meta["role"] = message_dict["role"]
 
@@ -1149,8 +1873,7 @@ class AsyncMemory(MemoryBase):
                     per_msg_meta["actor_id"] = actor_name
 
                 msg_content = message_dict["content"]
-                msg_embeddings = await asyncio.to_thread(self.embedding_model.embed, msg_content, "add")
-                mem_id = await self._create_memory(msg_content, msg_embeddings, per_msg_meta)
+                mem_id = await self._create_memory(msg_content, {msg_content: msg_embeddings}, per_msg_meta)
 
                 returned_memories.append(
                     {
@@ -1163,34 +1886,22 @@ class AsyncMemory(MemoryBase):
                 )
             return returned_memories
 
-        parsed_messages = parse_messages(messages)
-        if self.config.custom_fact_extraction_prompt:
-            system_prompt = self.config.custom_fact_extraction_prompt
-            user_prompt = f"Input:\n{parsed_messages}"
-        else:
-            system_prompt, user_prompt = get_fact_retrieval_messages(parsed_messages)
-
-        response = await asyncio.to_thread(
-            self.llm.generate_response,
-            messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": user_prompt}],
-            response_format={"type": "json_object"},
+        new_retrieved_facts = await asyncio.to_thread(
+            _extract_facts, self.llm, self.config, messages, self.llm_cache, cache_hits
         )
-        try:
-            response = remove_code_blocks(response)
-            new_retrieved_facts = json.loads(response)["facts"]
-        except Exception as e:
-            logger.error(f"Error in new_retrieved_facts: {e}")
-            new_retrieved_facts = []
 
         if not new_retrieved_facts:
             logger.debug("No new facts retrieved from input. Skipping memory update LLM call.")
 
         retrieved_old_memory = []
-        new_message_embeddings = {}
+        fact_embeddings = (
+            await asyncio.to_thread(self.embedding_model.embed_batch, new_retrieved_facts, "add")
+            if new_retrieved_facts
+            else []
+        )
+        new_message_embeddings = dict(zip(new_retrieved_facts, fact_embeddings))
 
-        async def process_fact_for_search(new_mem_content):
-            embeddings = await asyncio.to_thread(self.embedding_model.embed, new_mem_content, "add")
-            new_message_embeddings[new_mem_content] = embeddings
+        async def process_fact_for_search(new_mem_content, embeddings):
             existing_mems = await asyncio.to_thread(
                 self.vector_store.search,
                 query=new_mem_content,
@@ -1200,8 +1911,23 @@ class AsyncMemory(MemoryBase):
             )
             return [{"id": mem.id, "text": mem.payload["data"]} for mem in existing_mems]
 
-        search_tasks = [process_fact_for_search(fact) for fact in new_retrieved_facts]
-        search_results_list = await asyncio.gather(*search_tasks)
+        if len(new_message_embeddings) > 1 and _supports_search_batch(self.vector_store):
+            batch_results = await asyncio.to_thread(
+                self.vector_store.search_batch,
+                queries=list(new_message_embeddings),
+                vectors=list(new_message_embeddings.values()),
+                limit=5,
+                filters=effective_filters,
+            )
+            search_results_list = [
+                [{"id": mem.id, "text": mem.payload["data"]} for mem in existing_mems]
+                for existing_mems in batch_results
+            ]
+        else:
+            search_tasks = [
+                process_fact_for_search(fact, embeddings) for fact, embeddings in new_message_embeddings.items()
+            ]
+            search_results_list = await asyncio.gather(*search_tasks)
         for result_group in search_results_list:
             retrieved_old_memory.extend(result_group)
 
@@ -1215,27 +1941,15 @@ class AsyncMemory(MemoryBase):
             temp_uuid_mapping[str(idx)] = item["id"]
             retrieved_old_memory[idx]["id"] = str(idx)
 
-        if new_retrieved_facts:
-            function_calling_prompt = get_update_memory_messages(
-                retrieved_old_memory, new_retrieved_facts, self.config.custom_update_memory_prompt
-            )
-            try:
-                response = await asyncio.to_thread(
-                    self.llm.generate_response,
-                    messages=[{"role": "user", "content": function_calling_prompt}],
-                    response_format={"type": "json_object"},
-                )
-            except Exception as e:
-                logger.error(f"Error in new memory actions response: {e}")
-                response = ""
-            try:
-                response = remove_code_blocks(response)
-                new_memories_with_actions = json.loads(response)
-            except Exception as e:
-                logger.error(f"Invalid JSON response: {e}")
-                new_memories_with_actions = {}
-        else:
-            new_memories_with_actions = {}
+        new_memories_with_actions = await asyncio.to_thread(
+            _get_memory_actions,
+            self.llm,
+            self.config,
+            retrieved_old_memory,
+            new_retrieved_facts,
+            self.llm_cache,
+            cache_hits,
+        )
 
         returned_memories = []
         try:
@@ -1330,33 +2044,7 @@ class AsyncMemory(MemoryBase):
         if not memory:
             return None
 
-        promoted_payload_keys = [
-            "user_id",
-            "agent_id",
-            "run_id",
-            "actor_id",
-            "role",
-        ]
-
-        core_and_promoted_keys = {"data", "hash", "created_at", "updated_at", "id", *promoted_payload_keys}
-
-        result_item = MemoryItem(
-            id=memory.id,
-            memory=memory.payload["data"],
-            hash=memory.payload.get("hash"),
-            created_at=memory.payload.get("created_at"),
-            updated_at=memory.payload.get("updated_at"),
-        ).model_dump()
-
-        for key in promoted_payload_keys:
-            if key in memory.payload:
-                result_item[key] = memory.payload[key]
-
-        additional_metadata = {k: v for k, v in memory.payload.items() if k not in core_and_promoted_keys}
-        if additional_metadata:
-            result_item["metadata"] = additional_metadata
-
-        return result_item
+        return _format_memory(memory, include_score=True)
 
     async def get_all(
         self,
@@ -1439,36 +2127,61 @@ class AsyncMemory(MemoryBase):
             else memories_result
         )
 
-        promoted_payload_keys = [
-            "user_id",
-            "agent_id",
-            "run_id",
-            "actor_id",
-            "role",
-        ]
-        core_and_promoted_keys = {"data", "hash", "created_at", "updated_at", "id", *promoted_payload_keys}
+        return [_format_memory(mem) for mem in actual_memories]
+
+    async def iter_all(
+        self,
+        *,
+        user_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        page_size: int = 100,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over all memories, one page at a time.
+
+        Unlike `get_all`, the number of memories is not capped, so exports and audits can walk very large
+        memory sets. Graph relations are not included. Vector stores with a native `list_page` (Chroma, FAISS,
+        Milvus, MongoDB, pgvector, Qdrant and Redis) read each page where the previous one stopped and hold only
+        that page. Other stores fall back to `VectorStoreBase.list_page`, which re-lists every memory up to the
+        end of the requested page on each call: a full walk costs O(N^2 / page_size) reads, holds up to N
+        memories at once, and stops working past the store's own listing limits.
 
-        formatted_memories = []
-        for mem in actual_memories:
-            memory_item_dict = MemoryItem(
-                id=mem.id,
-                memory=mem.payload["data"],
-                hash=mem.payload.get("hash"),
-                created_at=mem.payload.get("created_at"),
-                updated_at=mem.payload.get("updated_at"),
-            ).model_dump(exclude={"score"})
+        Args:
+            user_id (str, optional): user id
+            agent_id (str, optional): agent id
+            run_id (str, optional): run id
+            filters (dict, optional): Additional custom key-value filters, merged with the ID-based
+                scoping filters.
+            page_size (int, optional): Number of memories fetched from the vector store at once. Defaults to 100.
 
-            for key in promoted_payload_keys:
-                if key in mem.payload:
-                    memory_item_dict[key] = mem.payload[key]
+        Yields:
+            dict: Each memory, formatted as in the results of `get_all`.
+        """
+        _, effective_filters = _build_filters_and_metadata(
+            user_id=user_id, agent_id=agent_id, run_id=run_id, input_filters=filters
+        )
 
-            additional_metadata = {k: v for k, v in mem.payload.items() if k not in core_and_promoted_keys}
-            if additional_metadata:
-                memory_item_dict["metadata"] = additional_metadata
+        if not any(key in effective_filters for key in ("user_id", "agent_id", "run_id")):
+            raise ValueError("At least one of 'user_id', 'agent_id', or 'run_id' must be specified.")
 
-            formatted_memories.append(memory_item_dict)
+        keys, encoded_ids = process_telemetry_filters(effective_filters)
+        capture_event(
+            "mem0.iter_all",
+            self,
+            {"page_size": page_size, "keys": keys, "encoded_ids": encoded_ids, "sync_type": "async"},
+        )
 
-        return formatted_memories
+        cursor = None
+        while True:
+            page, cursor = await asyncio.to_thread(
+                self.vector_store.list_page, filters=effective_filters, limit=page_size, cursor=cursor
+            )
+            for mem in page:
+                yield _format_memory(mem)
+            if cursor is None:
+                return
 
     async def search(
         self,
@@ -1480,6 +2193,7 @@ class AsyncMemory(MemoryBase):
         limit: int = 100,
         filters: Optional[Dict[str, Any]] = None,
         threshold: Optional[float] = None,
+        mode: str = "dense",
     ):
         """
         Searches for memories based on a query
@@ -1491,6 +2205,9 @@ class AsyncMemory(MemoryBase):
             limit (int, optional): Limit the number of results. Defaults to 100.
             filters (dict, optional): Filters to apply to the search. Defaults to None.
             threshold (float, optional): Minimum score for a memory to be included in the results. Defaults to None.
+            mode (str, optional): "dense" for vector search, or "hybrid" to also match the query's exact
+                tokens with BM25 and fuse both rankings with reciprocal-rank fusion. In hybrid mode scores are
+                fused scores and the threshold only applies to vector hits. Defaults to "dense".
 
         Returns:
             dict: A dictionary containing the search results, typically under a "results" key,
@@ -1505,6 +2222,9 @@ class AsyncMemory(MemoryBase):
         if not any(key in effective_filters for key in ("user_id", "agent_id", "run_id")):
             raise ValueError("at least one of 'user_id', 'agent_id', or 'run_id' must be specified ")
 
+        if mode not in SEARCH_MODES:
+            raise ValueError(f"Invalid search mode {mode!r}. Expected one of {', '.join(SEARCH_MODES)}.")
+
         keys, encoded_ids = process_telemetry_filters(effective_filters)
         capture_event(
             "mem0.search",
@@ -1516,10 +2236,13 @@ class AsyncMemory(MemoryBase):
                 "encoded_ids": encoded_ids,
                 "sync_type": "async",
                 "threshold": threshold,
+                "mode": mode,
             },
         )
 
-        vector_store_task = asyncio.create_task(self._search_vector_store(query, effective_filters, limit, threshold))
+        vector_store_task = asyncio.create_task(
+            self._search_vector_store(query, effective_filters, limit, threshold, mode)
+        )
 
         graph_task = None
         if self.enable_graph:
@@ -1549,45 +2272,26 @@ class AsyncMemory(MemoryBase):
         else:
             return {"results": original_memories}
 
-    async def _search_vector_store(self, query, filters, limit, threshold: Optional[float] = None):
+    async def _search_vector_store(self, query, filters, limit, threshold: Optional[float] = None, mode: str = "dense"):
+        candidates = limit * HYBRID_CANDIDATE_FACTOR if mode == "hybrid" else limit
         embeddings = await asyncio.to_thread(self.embedding_model.embed, query, "search")
         memories = await asyncio.to_thread(
-            self.vector_store.search, query=query, vectors=embeddings, limit=limit, filters=filters
+            self.vector_store.search, query=query, vectors=embeddings, limit=candidates, filters=filters
         )
+        memories = [mem for mem in memories if threshold is None or mem.score >= threshold]
+
+        if mode == "hybrid":
+            await asyncio.to_thread(self.lexical_index.ensure_loaded, self.vector_store, filters)
+            lexical_memories = await asyncio.to_thread(self.lexical_index.search, query, filters, candidates)
+            return await asyncio.to_thread(
+                _fuse_hybrid_results,
+                memories,
+                lexical_memories,
+                limit,
+                lambda memory_id: _fetch_lexical_hit(self.vector_store, self.lexical_index, memory_id, filters),
+            )
 
-        promoted_payload_keys = [
-            "user_id",
-            "agent_id",
-            "run_id",
-            "actor_id",
-            "role",
-        ]
-
-        core_and_promoted_keys = {"data", "hash", "created_at", "updated_at", "id", *promoted_payload_keys}
-
-        original_memories = []
-        for mem in memories:
-            memory_item_dict = MemoryItem(
-                id=mem.id,
-                memory=mem.payload["data"],
-                hash=mem.payload.get("hash"),
-                created_at=mem.payload.get("created_at"),
-                updated_at=mem.payload.get("updated_at"),
-                score=mem.score,
-            ).model_dump()
-
-            for key in promoted_payload_keys:
-                if key in mem.payload:
-                    memory_item_dict[key] = mem.payload[key]
-
-            additional_metadata = {k: v for k, v in mem.payload.items() if k not in core_and_promoted_keys}
-            if additional_metadata:
-                memory_item_dict["metadata"] = additional_metadata
-
-            if threshold is None or mem.score >= threshold:
-                original_memories.append(memory_item_dict)
-
-        return original_memories
+        return [_format_memory(mem, include_score=True, score=mem.score) for mem in memories]
 
     async def update(self, memory_id, data):
         """
@@ -1647,15 +2351,30 @@ class AsyncMemory(MemoryBase):
 
         keys, encoded_ids = process_telemetry_filters(filters)
         capture_event("mem0.delete_all", self, {"keys": keys, "encoded_ids": encoded_ids, "sync_type": "async"})
-        memories = await asyncio.to_thread(self.vector_store.list, filters=filters)
-
-        delete_tasks = []
-        for memory in memories[0]:
-            delete_tasks.append(self._delete_memory(memory.id))
-
-        await asyncio.gather(*delete_tasks)
-
-        logger.info(f"Deleted {len(memories[0])} memories")
+        # Delete a page of listed memories at a time and record exactly those in the history (see Memory.delete_all)
+        deleted_count = 0
+        deleted = set()
+        stale_rounds = 0
+        while True:
+            listed = await asyncio.to_thread(self.vector_store.list, filters=filters, limit=DELETE_ALL_PAGE_SIZE)
+            page, stale = _undeleted_page(listed, deleted)
+            if stale and stale_rounds < DELETE_ALL_STALE_RETRIES:
+                await asyncio.sleep(DELETE_ALL_STALE_DELAY * 2**stale_rounds)
+                stale_rounds += 1
+                continue
+            if not page:
+                if stale:
+                    _log_stale_listing(deleted_count)
+                break
+            stale_rounds = 0
+            page_ids = [memory.id for memory in page]
+            await asyncio.to_thread(self.vector_store.delete_batch, page_ids)
+            await asyncio.to_thread(self.db.add_history_batch, [_deletion_history_record(memory) for memory in page])
+            deleted.update(page_ids)
+            deleted_count += len(page)
+        self.lexical_index.remove_matching(filters)
+
+        logger.info(f"Deleted {deleted_count} memories")
 
         if self.enable_graph:
             await asyncio.to_thread(self.graph.delete_all, filters)
@@ -1706,6 +2425,7 @@ class AsyncMemory(MemoryBase):
             role=metadata.get("role"),
         )
 
+        self.lexical_index.add(memory_id, metadata)
         capture_event("mem0._create_memory", self, {"memory_id": memory_id, "sync_type": "async"})
         return memory_id
 
@@ -1770,25 +2490,7 @@ class AsyncMemory(MemoryBase):
             raise ValueError(f"Error getting memory with ID {memory_id}. Please provide a valid 'memory_id'")
 
         prev_value = existing_memory.payload.get("data")
-
-        new_metadata = deepcopy(metadata) if metadata is not None else {}
-
-        new_metadata["data"] = data
-        new_metadata["hash"] = hashlib.md5(data.encode()).hexdigest()
-        new_metadata["created_at"] = existing_memory.payload.get("created_at")
-        new_metadata["updated_at"] = datetime.now(pytz.timezone("US/Pacific")).isoformat()
-
-        if "user_id" in existing_memory.payload:
-            new_metadata["user_id"] = existing_memory.payload["user_id"]
-        if "agent_id" in existing_memory.payload:
-            new_metadata["agent_id"] = existing_memory.payload["agent_id"]
-        if "run_id" in existing_memory.payload:
-            new_metadata["run_id"] = existing_memory.payload["run_id"]
-
-        if "actor_id" in existing_memory.payload:
-            new_metadata["actor_id"] = existing_memory.payload["actor_id"]
-        if "role" in existing_memory.payload:
-            new_metadata["role"] = existing_memory.payload["role"]
+        new_metadata = build_updated_payload(existing_memory.payload, data, metadata)
 
         if data in existing_embeddings:
             embeddings = existing_embeddings[data]
@@ -1814,6 +2516,7 @@ class AsyncMemory(MemoryBase):
             actor_id=new_metadata.get("actor_id"),
             role=new_metadata.get("role"),
         )
+        self.lexical_index.add(memory_id, new_metadata)
         capture_event("mem0._update_memory", self, {"memory_id": memory_id, "sync_type": "async"})
         return memory_id
 
@@ -1834,6 +2537,7 @@ class AsyncMemory(MemoryBase):
             is_deleted=1,
         )
 
+        self.lexical_index.remove(memory_id)
         capture_event("mem0._delete_memory", self, {"memory_id": memory_id, "sync_type": "async"})
         return memory_id
 
@@ -1854,13 +2558,14 @@ class AsyncMemory(MemoryBase):
 
         if hasattr(self.db, "connection") and self.db.connection:
             await asyncio.to_thread(lambda: self.db.connection.execute("DROP TABLE IF EXISTS history"))
-            await asyncio.to_thread(self.db.connection.close)
+            await asyncio.to_thread(self.db.close)
 
         self.db = SQLiteManager(self.config.history_db_path)
 
         self.vector_store = VectorStoreFactory.create(
             self.config.vector_store.provider, self.config.vector_store.config
         )
+        self.lexical_index.clear()
         capture_event("mem0.reset", self, {"sync_type": "async"})
 
     async def chat(self, query):
@@ -1,17 +1,18 @@
 import logging
 
-from mem0.memory.utils import format_entities, sanitize_relationship_for_cypher
+from mem0.memory.utils import (
+    embed_entity_names,
+    format_entities,
+    plan_entity_writes,
+    sanitize_relationship_for_cypher,
+)
 
 try:
     from langchain_memgraph.graphs.memgraph import Memgraph
 except ImportError:
     raise ImportError("langchain_memgraph is not installed. Please install it using pip install langchain-memgraph")
 
-try:
-    from rank_bm25 import BM25Okapi
-except ImportError:
-    raise ImportError("rank_bm25 is not installed. Please install it using pip install rank-bm25")
-
+from mem0.graphs.bm25 import rerank_relations
 from mem0.graphs.tools import (
     DELETE_MEMORY_STRUCT_TOOL_GRAPH,
     DELETE_MEMORY_TOOL_GRAPH,
@@ -38,6 +39,7 @@ class MemoryGraph:
             self.config.embedder.provider,
             self.config.embedder.config,
             {"enable_embeddings": True},
+            self.config.embedder.cache,
         )
 
         # Default to openai if no specific provider is configured
@@ -92,7 +94,6 @@ class MemoryGraph:
         search_output = self._search_graph_db(node_list=list(entity_type_map.keys()), filters=filters)
         to_be_deleted = self._get_delete_entities_from_search_output(search_output, data, filters)
 
-        # TODO: Batch queries with APOC plugin
         # TODO: Add more filter support
         deleted_entities = self._delete_entities(to_be_deleted, filters)
         added_entities = self._add_entities(to_be_added, filters, entity_type_map)
@@ -119,17 +120,7 @@ class MemoryGraph:
         if not search_output:
             return []
 
-        search_outputs_sequence = [
-            [item["source"], item["relationship"], item["destination"]] for item in search_output
-        ]
-        bm25 = BM25Okapi(search_outputs_sequence)
-
-        tokenized_query = query.split(" ")
-        reranked_results = bm25.get_top_n(tokenized_query, search_outputs_sequence, n=5)
-
-        search_results = []
-        for item in reranked_results:
-            search_results.append({"source": item[0], "relationship": item[1], "destination": item[2]})
+        search_results = rerank_relations(query, search_output, n=5)
 
         logger.info(f"Returned {len(search_results)} search results")
 
@@ -272,79 +263,54 @@ class MemoryGraph:
         return entities
 
     def _search_graph_db(self, node_list, filters, limit=100):
-        """Search similar nodes among and their respective incoming and outgoing relations."""
-        result_relations = []
-
-        for node in node_list:
-            n_embedding = self.embedding_model.embed(node)
-
-            # Build query based on whether agent_id is provided
-            if filters.get("agent_id"):
-                cypher_query = """
-                MATCH (n:Entity {user_id: $user_id, agent_id: $agent_id})
-                WHERE n.embedding IS NOT NULL
-                WITH n, $n_embedding as n_embedding
-                CALL node_similarity.cosine_pairwise("embedding", [n_embedding], [n.embedding])
-                YIELD node1, node2, similarity
-                WITH n, similarity
-                WHERE similarity >= $threshold
-                MATCH (n)-[r]->(m:Entity)
-                RETURN n.name AS source, id(n) AS source_id, type(r) AS relationship, id(r) AS relation_id, m.name AS destination, id(m) AS destination_id, similarity
-                UNION
-                MATCH (n:Entity {user_id: $user_id, agent_id: $agent_id})
-                WHERE n.embedding IS NOT NULL
-                WITH n, $n_embedding as n_embedding
-                CALL node_similarity.cosine_pairwise("embedding", [n_embedding], [n.embedding])
-                YIELD node1, node2, similarity
-                WITH n, similarity
-                WHERE similarity >= $threshold
-                MATCH (m:Entity)-[r]->(n)
-                RETURN m.name AS source, id(m) AS source_id, type(r) AS relationship, id(r) AS relation_id, n.name AS destination, id(n) AS destination_id, similarity
-                ORDER BY similarity DESC
-                LIMIT $limit;
-                """
-                params = {
-                    "n_embedding": n_embedding,
-                    "threshold": self.threshold,
-                    "user_id": filters["user_id"],
-                    "agent_id": filters["agent_id"],
-                    "limit": limit,
-                }
-            else:
-                cypher_query = """
-                MATCH (n:Entity {user_id: $user_id})
-                WHERE n.embedding IS NOT NULL
-                WITH n, $n_embedding as n_embedding
-                CALL node_similarity.cosine_pairwise("embedding", [n_embedding], [n.embedding])
-                YIELD node1, node2, similarity
-                WITH n, similarity
-                WHERE similarity >= $threshold
-                MATCH (n)-[r]->(m:Entity)
-                RETURN n.name AS source, id(n) AS source_id, type(r) AS relationship, id(r) AS relation_id, m.name AS destination, id(m) AS destination_id, similarity
-                UNION
-                MATCH (n:Entity {user_id: $user_id})
-                WHERE n.embedding IS NOT NULL
-                WITH n, $n_embedding as n_embedding
-                CALL node_similarity.cosine_pairwise("embedding", [n_embedding], [n.embedding])
-                YIELD node1, node2, similarity
-                WITH n, similarity
-                WHERE similarity >= $threshold
-                MATCH (m:Entity)-[r]->(n)
-                RETURN m.name AS source, id(m) AS source_id, type(r) AS relationship, id(r) AS relation_id, n.name AS destination, id(n) AS destination_id, similarity
-                ORDER BY similarity DESC
-                LIMIT $limit;
-                """
-                params = {
-                    "n_embedding": n_embedding,
-                    "threshold": self.threshold,
-                    "user_id": filters["user_id"],
-                    "limit": limit,
-                }
+        """
+        Search similar nodes among and their respective incoming and outgoing relations.
 
-            ans = self.graph.query(cypher_query, params=params)
-            result_relations.extend(ans)
+        All entities are searched with a single query. Each entity contributes at most `limit` relations and a
+        relation reached from several entities is returned once, with its highest similarity.
+        """
+        if not node_list:
+            return []
 
-        return result_relations
+        params = {
+            "threshold": self.threshold,
+            "user_id": filters["user_id"],
+            "limit": limit,
+        }
+        # Build query based on whether agent_id is provided
+        agent_id_clause = ""
+        if filters.get("agent_id"):
+            agent_id_clause = ", agent_id: $agent_id"
+            params["agent_id"] = filters["agent_id"]
+
+        node_embeddings = self.embedding_model.embed_batch(node_list)
+        params["entities"] = [{"idx": idx, "embedding": n_embedding} for idx, n_embedding in enumerate(node_embeddings)]
+
+        cypher_query = f"""
+        UNWIND $entities AS entity
+        MATCH (n:Entity {{user_id: $user_id{agent_id_clause}}})
+        WHERE n.embedding IS NOT NULL
+        WITH entity, n, entity.embedding as n_embedding
+        CALL node_similarity.cosine_pairwise("embedding", [n_embedding], [n.embedding])
+        YIELD node1, node2, similarity
+        WITH entity, n, similarity
+        WHERE similarity >= $threshold
+        MATCH (n)-[r]-(m:Entity)
+        WITH entity, r, startNode(r) AS src, endNode(r) AS dst, similarity
+        ORDER BY similarity DESC
+        WITH entity.idx AS entity_idx, collect({{
+            source: src.name, source_id: id(src), relationship: type(r), relation_id: id(r),
+            destination: dst.name, destination_id: id(dst), similarity: similarity
+        }}) AS relations
+        UNWIND relations[0..$limit] AS relation
+        WITH relation.source AS source, relation.source_id AS source_id, relation.relationship AS relationship,
+            relation.relation_id AS relation_id, relation.destination AS destination,
+            relation.destination_id AS destination_id, max(relation.similarity) AS similarity
+        RETURN source, source_id, relationship, relation_id, destination, destination_id, similarity
+        ORDER BY similarity DESC;
+        """
+
+        return self.graph.query(cypher_query, params=params)
 
     def _get_delete_entities_from_search_output(self, search_output, data, filters):
         """Get the entities to be deleted from the search output."""
@@ -377,167 +343,148 @@ class MemoryGraph:
         """Delete the entities from the graph."""
         user_id = filters["user_id"]
         agent_id = filters.get("agent_id", None)
-        results = []
-
-        for item in to_be_deleted:
-            source = item["source"]
-            destination = item["destination"]
-            relationship = item["relationship"]
-
-            # Build the agent filter for the query
-            agent_filter = ""
-            params = {
-                "source_name": source,
-                "dest_name": destination,
-                "user_id": user_id,
-            }
-
-            if agent_id:
-                agent_filter = "AND n.agent_id = $agent_id AND m.agent_id = $agent_id"
-                params["agent_id"] = agent_id
-
-            # Delete the specific relationship between nodes
+        results = [[] for _ in to_be_deleted]
+
+        params = {"user_id": user_id}
+        agent_id_clause = ""
+        if agent_id:
+            agent_id_clause = ", agent_id: $agent_id"
+            params["agent_id"] = agent_id
+
+        rows_by_relationship = {}
+        for key, item in enumerate(to_be_deleted):
+            rows_by_relationship.setdefault(item["relationship"], []).append(
+                {"key": key, "source": item["source"], "destination": item["destination"]}
+            )
+
+        # Relationship types cannot be parameters, so there is one UNWIND query per type
+        for relationship, rows in rows_by_relationship.items():
             cypher = f"""
-            MATCH (n:Entity {{name: $source_name, user_id: $user_id}})
+            UNWIND $rows AS row
+            MATCH (n:Entity {{name: row.source, user_id: $user_id{agent_id_clause}}})
             -[r:{relationship}]->
-            (m:Entity {{name: $dest_name, user_id: $user_id}})
-            WHERE 1=1 {agent_filter}
+            (m:Entity {{name: row.destination, user_id: $user_id{agent_id_clause}}})
             DELETE r
-            RETURN 
+            RETURN
+                row.key AS key,
                 n.name AS source,
                 m.name AS target,
                 type(r) AS relationship
             """
 
-            result = self.graph.query(cypher, params=params)
-            results.append(result)
+            for record in self.graph.query(cypher, params={**params, "rows": rows}):
+                results[record["key"]].append(
+                    {"source": record["source"], "target": record["target"], "relationship": record["relationship"]}
+                )
 
         return results
 
     # added Entity label to all nodes for vector search to work
     def _add_entities(self, to_be_added, filters, entity_type_map):
         """Add the new entities to the graph. Merge the nodes if they already exist."""
+        if not to_be_added:
+            return []
+
         user_id = filters["user_id"]
         agent_id = filters.get("agent_id", None)
-        results = []
-
-        for item in to_be_added:
-            # entities
-            source = item["source"]
-            destination = item["destination"]
-            relationship = item["relationship"]
-
-            # types
-            source_type = entity_type_map.get(source, "__User__")
-            destination_type = entity_type_map.get(destination, "__User__")
-
-            # embeddings
-            source_embedding = self.embedding_model.embed(source)
-            dest_embedding = self.embedding_model.embed(destination)
-
-            # search for the nodes with the closest embeddings
-            source_node_search_result = self._search_source_node(source_embedding, filters, threshold=0.9)
-            destination_node_search_result = self._search_destination_node(dest_embedding, filters, threshold=0.9)
-
-            # Prepare agent_id for node creation
-            agent_id_clause = ""
-            if agent_id:
-                agent_id_clause = ", agent_id: $agent_id"
-
-            # TODO: Create a cypher query and common params for all the cases
-            if not destination_node_search_result and source_node_search_result:
-                cypher = f"""
-                    MATCH (source:Entity)
-                    WHERE id(source) = $source_id
-                    MERGE (destination:{destination_type}:Entity {{name: $destination_name, user_id: $user_id{agent_id_clause}}})
-                    ON CREATE SET
-                        destination.created = timestamp(),
-                        destination.embedding = $destination_embedding,
-                        destination:Entity
-                    MERGE (source)-[r:{relationship}]->(destination)
-                    ON CREATE SET 
-                        r.created = timestamp()
-                    RETURN source.name AS source, type(r) AS relationship, destination.name AS target
-                    """
-
-                params = {
-                    "source_id": source_node_search_result[0]["id(source_candidate)"],
-                    "destination_name": destination,
-                    "destination_embedding": dest_embedding,
-                    "user_id": user_id,
-                }
-                if agent_id:
-                    params["agent_id"] = agent_id
-
-            elif destination_node_search_result and not source_node_search_result:
-                cypher = f"""
-                    MATCH (destination:Entity)
-                    WHERE id(destination) = $destination_id
-                    MERGE (source:{source_type}:Entity {{name: $source_name, user_id: $user_id{agent_id_clause}}})
-                    ON CREATE SET
-                        source.created = timestamp(),
-                        source.embedding = $source_embedding,
-                        source:Entity
-                    MERGE (source)-[r:{relationship}]->(destination)
-                    ON CREATE SET 
-                        r.created = timestamp()
-                    RETURN source.name AS source, type(r) AS relationship, destination.name AS target
-                    """
-
-                params = {
-                    "destination_id": destination_node_search_result[0]["id(destination_candidate)"],
-                    "source_name": source,
-                    "source_embedding": source_embedding,
-                    "user_id": user_id,
-                }
-                if agent_id:
-                    params["agent_id"] = agent_id
-
-            elif source_node_search_result and destination_node_search_result:
-                cypher = f"""
-                    MATCH (source:Entity)
-                    WHERE id(source) = $source_id
-                    MATCH (destination:Entity)
-                    WHERE id(destination) = $destination_id
-                    MERGE (source)-[r:{relationship}]->(destination)
-                    ON CREATE SET 
-                        r.created_at = timestamp(),
-                        r.updated_at = timestamp()
-                    RETURN source.name AS source, type(r) AS relationship, destination.name AS target
-                    """
-                params = {
-                    "source_id": source_node_search_result[0]["id(source_candidate)"],
-                    "destination_id": destination_node_search_result[0]["id(destination_candidate)"],
-                    "user_id": user_id,
-                }
-                if agent_id:
-                    params["agent_id"] = agent_id
-
-            else:
-                cypher = f"""
-                    MERGE (n:{source_type}:Entity {{name: $source_name, user_id: $user_id{agent_id_clause}}})
-                    ON CREATE SET n.created = timestamp(), n.embedding = $source_embedding, n:Entity
-                    ON MATCH SET n.embedding = $source_embedding
-                    MERGE (m:{destination_type}:Entity {{name: $dest_name, user_id: $user_id{agent_id_clause}}})
-                    ON CREATE SET m.created = timestamp(), m.embedding = $dest_embedding, m:Entity
-                    ON MATCH SET m.embedding = $dest_embedding
-                    MERGE (n)-[rel:{relationship}]->(m)
-                    ON CREATE SET rel.created = timestamp()
-                    RETURN n.name AS source, type(rel) AS relationship, m.name AS target
-                    """
-                params = {
-                    "source_name": source,
-                    "dest_name": destination,
-                    "source_embedding": source_embedding,
-                    "dest_embedding": dest_embedding,
-                    "user_id": user_id,
+        entity_embeddings = embed_entity_names(self.embedding_model, to_be_added)
+        resolved = self._resolve_entity_nodes(entity_embeddings, filters, threshold=0.9)
+        nodes, rows, item_keys = plan_entity_writes(to_be_added, resolved)
+
+        params = {"user_id": user_id}
+        agent_id_clause = ""
+        if agent_id:
+            agent_id_clause = ", agent_id: $agent_id"
+            params["agent_id"] = agent_id
+
+        node_ids = {node["idx"]: node["node_id"] for node in nodes if node["node_id"] is not None}
+
+        new_nodes_by_type = {}
+        for node in nodes:
+            if node["node_id"] is None:
+                new_nodes_by_type.setdefault(entity_type_map.get(node["name"], "__User__"), []).append(
+                    {"idx": node["idx"], "name": node["name"], "embedding": entity_embeddings[node["name"]]}
+                )
+
+        # Labels and relationship types cannot be parameters, so there is one UNWIND query per label and per type
+        for entity_type, new_nodes in new_nodes_by_type.items():
+            cypher = f"""
+                UNWIND $nodes AS node
+                MERGE (n:{entity_type}:Entity {{name: node.name, user_id: $user_id{agent_id_clause}}})
+                ON CREATE SET n.created = timestamp(), n.embedding = node.embedding, n:Entity
+                ON MATCH SET n.embedding = node.embedding
+                RETURN node.idx AS idx, id(n) AS node_id
+                """
+            for record in self.graph.query(cypher, params={**params, "nodes": new_nodes}):
+                node_ids[record["idx"]] = record["node_id"]
+
+        rows_by_relationship = {}
+        for row in rows:
+            rows_by_relationship.setdefault(row["relationship"], []).append(
+                {
+                    "key": row["key"],
+                    "source_id": node_ids[row["source"]],
+                    "destination_id": node_ids[row["destination"]],
                 }
-                if agent_id:
-                    params["agent_id"] = agent_id
+            )
 
-            result = self.graph.query(cypher, params=params)
-            results.append(result)
-        return results
+        rows_by_key = {}
+        for relationship, relation_rows in rows_by_relationship.items():
+            cypher = f"""
+                UNWIND $rows AS row
+                MATCH (source:Entity)
+                WHERE id(source) = row.source_id
+                MATCH (destination:Entity)
+                WHERE id(destination) = row.destination_id
+                MERGE (source)-[r:{relationship}]->(destination)
+                ON CREATE SET
+                    r.created = timestamp()
+                RETURN row.key AS key, source.name AS source, type(r) AS relationship, destination.name AS target
+                """
+            for record in self.graph.query(cypher, params={**params, "rows": relation_rows}):
+                rows_by_key.setdefault(record["key"], []).append(
+                    {"source": record["source"], "relationship": record["relationship"], "target": record["target"]}
+                )
+
+        return [rows_by_key.get(key, []) for key in item_keys]
+
+    def _resolve_entity_nodes(self, entity_embeddings, filters, threshold=0.9):
+        """
+        Find the existing node closest to each entity name with a single query.
+
+        Args:
+            entity_embeddings (dict): Embedding of each entity name.
+            filters (dict): Filters the nodes must match.
+            threshold (float): Minimum similarity for a node to be reused. Defaults to 0.9.
+
+        Returns:
+            dict: ID of the closest node for each entity name that has one above the threshold.
+        """
+        if not entity_embeddings:
+            return {}
+
+        params = {
+            "entities": [{"name": name, "embedding": embedding} for name, embedding in entity_embeddings.items()],
+            "user_id": filters["user_id"],
+            "threshold": threshold,
+        }
+        agent_filter = ""
+        if filters.get("agent_id"):
+            agent_filter = "AND candidate.agent_id = $agent_id"
+            params["agent_id"] = filters["agent_id"]
+
+        cypher = f"""
+            UNWIND $entities AS entity
+            CALL vector_search.search("memzero", 1, entity.embedding)
+            YIELD distance, node, similarity
+            WITH entity, node AS candidate, similarity
+            WHERE candidate.user_id = $user_id
+            {agent_filter}
+            AND similarity >= $threshold
+            RETURN entity.name AS name, id(candidate) AS node_id;
+            """
+
+        return {record["name"]: record["node_id"] for record in self.graph.query(cypher, params=params)}
 
     def _remove_spaces_from_entities(self, entity_list):
         for item in entity_list:
@@ -547,84 +494,6 @@ class MemoryGraph:
             item["destination"] = item["destination"].lower().replace(" ", "_")
         return entity_list
 
-    def _search_source_node(self, source_embedding, filters, threshold=0.9):
-        """Search for source nodes with similar embeddings."""
-        user_id = filters["user_id"]
-        agent_id = filters.get("agent_id", None)
-
-        if agent_id:
-            cypher = """
-                CALL vector_search.search("memzero", 1, $source_embedding) 
-                YIELD distance, node, similarity
-                WITH node AS source_candidate, similarity
-                WHERE source_candidate.user_id = $user_id 
-                AND source_candidate.agent_id = $agent_id 
-                AND similarity >= $threshold
-                RETURN id(source_candidate);
-                """
-            params = {
-                "source_embedding": source_embedding,
-                "user_id": user_id,
-                "agent_id": agent_id,
-                "threshold": threshold,
-            }
-        else:
-            cypher = """
-                CALL vector_search.search("memzero", 1, $source_embedding) 
-                YIELD distance, node, similarity
-                WITH node AS source_candidate, similarity
-                WHERE source_candidate.user_id = $user_id 
-                AND similarity >= $threshold
-                RETURN id(source_candidate);
-                """
-            params = {
-                "source_embedding": source_embedding,
-                "user_id": user_id,
-                "threshold": threshold,
-            }
-
-        result = self.graph.query(cypher, params=params)
-        return result
-
-    def _search_destination_node(self, destination_embedding, filters, threshold=0.9):
-        """Search for destination nodes with similar embeddings."""
-        user_id = filters["user_id"]
-        agent_id = filters.get("agent_id", None)
-
-        if agent_id:
-            cypher = """
-                CALL vector_search.search("memzero", 1, $destination_embedding) 
-                YIELD distance, node, similarity
-                WITH node AS destination_candidate, similarity
-                WHERE node.user_id = $user_id 
-                AND node.agent_id = $agent_id 
-                AND similarity >= $threshold
-                RETURN id(destination_candidate);
-                """
-            params = {
-                "destination_embedding": destination_embedding,
-                "user_id": user_id,
-                "agent_id": agent_id,
-                "threshold": threshold,
-            }
-        else:
-            cypher = """
-                CALL vector_search.search("memzero", 1, $destination_embedding) 
-                YIELD distance, node, similarity
-                WITH node AS destination_candidate, similarity
-                WHERE node.user_id = $user_id 
-                AND similarity >= $threshold
-                RETURN id(destination_candidate);
-                """
-            params = {
-                "destination_embedding": destination_embedding,
-                "user_id": user_id,
-                "threshold": threshold,
-            }
-
-        result = self.graph.query(cypher, params=params)
-        return result
-
     def _fetch_existing_indexes(self):
         """
         Retrieves information about existing indexes and vector indexes in the Memgraph database.
@@ -1,4 +1,5 @@
 import logging
+import queue
 import sqlite3
 import threading
 import uuid
@@ -6,12 +7,42 @@ from typing import Any, Dict, List, Optional
 
 logger = logging.getLogger(__name__)
 
+_INSERT_HISTORY_SQL = """
+    INSERT INTO history (
+        id, memory_id, old_memory, new_memory, event,
+        created_at, updated_at, is_deleted, actor_id, role
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
 
 class SQLiteManager:
-    def __init__(self, db_path: str = ":memory:"):
+    """
+    History store backed by SQLite.
+
+    File databases run in WAL mode: writes go through a single writer connection and reads use a small
+    pool of reader connections, so `get_history` does not wait for writers. Concurrent `add_history` calls
+    are group-committed: rows that arrive while a transaction is in flight are written together by the
+    next one.
+    """
+
+    def __init__(self, db_path: str = ":memory:", reader_pool_size: int = 4):
         self.db_path = db_path
         self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
         self._lock = threading.Lock()
+        self._pending = []
+        self._pending_lock = threading.Lock()
+
+        # An in-memory database is private to its connection, so reads share the writer there
+        self._use_readers = db_path != ":memory:" and reader_pool_size > 0
+        self._readers = queue.LifoQueue()
+        self._reader_slots = threading.BoundedSemaphore(max(reader_pool_size, 1))
+        self._reader_connections = []
+
+        if self._use_readers:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+
         self._migrate_history_table()
         self._create_history_table()
 
@@ -99,29 +130,116 @@ class SQLiteManager:
 
     def _create_history_table(self) -> None:
         with self._lock:
-            try:
-                self.connection.execute("BEGIN")
-                self.connection.execute(
-                    """
-                    CREATE TABLE IF NOT EXISTS history (
-                        id           TEXT PRIMARY KEY,
-                        memory_id    TEXT,
-                        old_memory   TEXT,
-                        new_memory   TEXT,
-                        event        TEXT,
-                        created_at   DATETIME,
-                        updated_at   DATETIME,
-                        is_deleted   INTEGER,
-                        actor_id     TEXT,
-                        role         TEXT
-                    )
+            self._create_history_table_locked()
+
+    def _create_history_table_locked(self) -> None:
+        try:
+            self.connection.execute("BEGIN")
+            self.connection.execute(
                 """
+                CREATE TABLE IF NOT EXISTS history (
+                    id           TEXT PRIMARY KEY,
+                    memory_id    TEXT,
+                    old_memory   TEXT,
+                    new_memory   TEXT,
+                    event        TEXT,
+                    created_at   DATETIME,
+                    updated_at   DATETIME,
+                    is_deleted   INTEGER,
+                    actor_id     TEXT,
+                    role         TEXT
                 )
-                self.connection.execute("COMMIT")
-            except Exception as e:
-                self.connection.execute("ROLLBACK")
-                logger.error(f"Failed to create history table: {e}")
-                raise
+            """
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS idx_history_memory_id ON history (memory_id)")
+            self.connection.execute("COMMIT")
+        except Exception as e:
+            self.connection.execute("ROLLBACK")
+            logger.error(f"Failed to create history table: {e}")
+            raise
+
+    def _write_rows(self, rows: List[tuple]) -> None:
+        """
+        Insert history rows, committing them together with rows from concurrent callers.
+
+        The caller queues its rows and then takes the writer lock. Whoever holds the lock commits every
+        queued row in one transaction, so callers that queued meanwhile usually find their rows already
+        committed. Returns once the caller's rows are committed and raises if they could not be.
+        """
+        pending = {"rows": rows, "done": False, "error": None}
+        with self._pending_lock:
+            self._pending.append(pending)
+
+        with self._lock:
+            if not pending["done"]:
+                with self._pending_lock:
+                    group, self._pending = self._pending, []
+                self._commit_group(group)
+
+        if pending["error"] is not None:
+            raise pending["error"]
+
+    def _commit_group(self, group: List[Dict[str, Any]]) -> None:
+        try:
+            self._insert_rows([row for pending in group for row in pending["rows"]])
+            error = None
+        except Exception as e:
+            error = e
+
+        if error is not None and len(group) > 1:
+            # Retry each caller on its own so one bad row does not fail the others
+            for pending in group:
+                try:
+                    self._insert_rows(pending["rows"])
+                    pending["error"] = None
+                except Exception as e:
+                    pending["error"] = e
+                pending["done"] = True
+            return
+
+        for pending in group:
+            pending["error"] = error
+            pending["done"] = True
+
+    def _insert_rows(self, rows: List[tuple]) -> None:
+        try:
+            self.connection.execute("BEGIN")
+            self.connection.executemany(_INSERT_HISTORY_SQL, rows)
+            self.connection.execute("COMMIT")
+        except Exception as e:
+            self.connection.execute("ROLLBACK")
+            logger.error(f"Failed to add {len(rows)} history records: {e}")
+            raise
+
+    def _acquire_reader(self) -> sqlite3.Connection:
+        self._reader_slots.acquire()
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            reader = sqlite3.connect(self.db_path, check_same_thread=False)
+        except Exception:
+            self._reader_slots.release()
+            raise
+        with self._pending_lock:
+            self._reader_connections.append(reader)
+        return reader
+
+    def _release_reader(self, reader: sqlite3.Connection) -> None:
+        self._readers.put(reader)
+        self._reader_slots.release()
+
+    def _read(self, sql: str, params: tuple) -> List[tuple]:
+        if not self._use_readers:
+            with self._lock:
+                return self.connection.execute(sql, params).fetchall()
+
+        reader = self._acquire_reader()
+        try:
+            return reader.execute(sql, params).fetchall()
+        finally:
+            self._release_reader(reader)
 
     def add_history(
         self,
@@ -136,49 +254,61 @@ class SQLiteManager:
         actor_id: Optional[str] = None,
         role: Optional[str] = None,
     ) -> None:
-        with self._lock:
-            try:
-                self.connection.execute("BEGIN")
-                self.connection.execute(
-                    """
-                    INSERT INTO history (
-                        id, memory_id, old_memory, new_memory, event,
-                        created_at, updated_at, is_deleted, actor_id, role
-                    )
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                    (
-                        str(uuid.uuid4()),
-                        memory_id,
-                        old_memory,
-                        new_memory,
-                        event,
-                        created_at,
-                        updated_at,
-                        is_deleted,
-                        actor_id,
-                        role,
-                    ),
+        self._write_rows(
+            [
+                (
+                    str(uuid.uuid4()),
+                    memory_id,
+                    old_memory,
+                    new_memory,
+                    event,
+                    created_at,
+                    updated_at,
+                    is_deleted,
+                    actor_id,
+                    role,
                 )
-                self.connection.execute("COMMIT")
-            except Exception as e:
-                self.connection.execute("ROLLBACK")
-                logger.error(f"Failed to add history record: {e}")
-                raise
+            ]
+        )
 
-    def get_history(self, memory_id: str) -> List[Dict[str, Any]]:
-        with self._lock:
-            cur = self.connection.execute(
-                """
-                SELECT id, memory_id, old_memory, new_memory, event,
-                       created_at, updated_at, is_deleted, actor_id, role
-                FROM history
-                WHERE memory_id = ?
-                ORDER BY created_at ASC, DATETIME(updated_at) ASC
-            """,
-                (memory_id,),
+    def add_history_batch(self, records: List[Dict[str, Any]]) -> None:
+        """
+        Insert many history records in a single transaction.
+
+        Args:
+            records (List[Dict[str, Any]]): Records with the keyword arguments of `add_history`.
+        """
+        if not records:
+            return
+
+        rows = [
+            (
+                str(uuid.uuid4()),
+                record["memory_id"],
+                record.get("old_memory"),
+                record.get("new_memory"),
+                record["event"],
+                record.get("created_at"),
+                record.get("updated_at"),
+                record.get("is_deleted", 0),
+                record.get("actor_id"),
+                record.get("role"),
             )
-            rows = cur.fetchall()
+            for record in records
+        ]
+        self._write_rows(rows)
+
+    def get_history(self, memory_id: str) -> List[Dict[str, Any]]:
+        rows = self._read(
+            """
+            SELECT id, memory_id, old_memory, new_memory, event,
+                   created_at, updated_at, is_deleted, actor_id, role
+            FROM history
+            WHERE memory_id = ?
+            ORDER BY created_at ASC, DATETIME(updated_at) ASC
+        """,
+            (memory_id,),
+        )
 
         return [
             {
@@ -203,13 +333,18 @@ class SQLiteManager:
                 self.connection.execute("BEGIN")
                 self.connection.execute("DROP TABLE IF EXISTS history")
                 self.connection.execute("COMMIT")
-                self._create_history_table()
             except Exception as e:
                 self.connection.execute("ROLLBACK")
                 logger.error(f"Failed to reset history table: {e}")
                 raise
+            self._create_history_table_locked()
 
     def close(self) -> None:
+        with self._pending_lock:
+            readers, self._reader_connections = self._reader_connections, []
+        for reader in readers:
+            reader.close()
+
         if self.connection:
             self.connection.close()
             self.connection = None
@@ -1,7 +1,11 @@
+import atexit
+import functools
 import logging
 import os
 import platform
+import queue
 import sys
+import threading
 
 from posthog import Posthog
 
@@ -18,9 +22,29 @@ if isinstance(MEM0_TELEMETRY, str):
 if not isinstance(MEM0_TELEMETRY, bool):
     raise ValueError("MEM0_TELEMETRY must be a boolean value.")
 
+# Events captured while this many are still waiting to be sent are dropped
+TELEMETRY_QUEUE_SIZE = 1000
+
 logging.getLogger("posthog").setLevel(logging.CRITICAL + 1)
 logging.getLogger("urllib3").setLevel(logging.CRITICAL + 1)
 
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=None)
+def _environment_properties():
+    """Properties describing the running environment, computed once per process."""
+    return {
+        "client_source": "python",
+        "client_version": mem0.__version__,
+        "python_version": sys.version,
+        "os": sys.platform,
+        "os_version": platform.version(),
+        "os_release": platform.release(),
+        "processor": platform.processor(),
+        "machine": platform.machine(),
+    }
+
 
 class AnonymousTelemetry:
     def __init__(self, vector_store=None):
@@ -34,17 +58,7 @@ class AnonymousTelemetry:
     def capture_event(self, event_name, properties=None, user_email=None):
         if properties is None:
             properties = {}
-        properties = {
-            "client_source": "python",
-            "client_version": mem0.__version__,
-            "python_version": sys.version,
-            "os": sys.platform,
-            "os_version": platform.version(),
-            "os_release": platform.release(),
-            "processor": platform.processor(),
-            "machine": platform.machine(),
-            **properties,
-        }
+        properties = {**_environment_properties(), **properties}
         distinct_id = self.user_id if user_email is None else user_email
         self.posthog.capture(distinct_id=distinct_id, event=event_name, properties=properties)
 
@@ -52,15 +66,135 @@ class AnonymousTelemetry:
         self.posthog.shutdown()
 
 
-client_telemetry = AnonymousTelemetry()
+class TelemetryPipeline:
+    """
+    Process-wide telemetry sender.
+
+    Capturing an event only puts it on a bounded in-memory queue; a background thread owns the single
+    PostHog client, resolves and caches the anonymous user id and sends the events. Nothing on the
+    caller's path does I/O, and when the queue is full new events are dropped rather than waited on.
+    """
+
+    _STOP = object()
+
+    def __init__(self, max_queue_size: int = TELEMETRY_QUEUE_SIZE, enabled: bool = MEM0_TELEMETRY):
+        """
+        Initialize the pipeline. The background thread starts with the first captured event.
+
+        Args:
+            max_queue_size (int, optional): Maximum number of events waiting to be sent.
+            enabled (bool, optional): Whether events are captured at all. Defaults to MEM0_TELEMETRY.
+        """
+        self.enabled = enabled
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queue_size)
+        self._thread = None
+        self._lock = threading.Lock()
+        self._telemetry = None
+        self._user_ids = {}
+
+    def capture(self, event_name, properties=None, distinct_id=None, vector_store=None):
+        """
+        Queue an event for sending.
+
+        Args:
+            event_name (str): Name of the event.
+            properties (dict, optional): Event properties.
+            distinct_id (str, optional): ID to report the event under. Defaults to the anonymous user id
+                stored in `vector_store`.
+            vector_store (VectorStoreBase, optional): Store holding the anonymous user id.
+        """
+        if not self.enabled:
+            return
+
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((event_name, properties, distinct_id, vector_store))
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Wait until the events queued so far have been handed to the PostHog client.
+
+        Args:
+            timeout (float, optional): Maximum number of seconds to wait. Defaults to 5.0.
+
+        Returns:
+            bool: Whether the queue was drained in time.
+        """
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def shutdown(self, timeout: float = 5.0):
+        """
+        Send the queued events and stop the background thread.
+
+        Args:
+            timeout (float, optional): Maximum number of seconds to wait for each step. Defaults to 5.0.
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        try:
+            self._queue.put(self._STOP, timeout=timeout)
+        except queue.Full:
+            return
+        thread.join(timeout)
+        if self._telemetry is not None:
+            self._telemetry.close()
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="mem0-telemetry", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is self._STOP:
+                return
+            if isinstance(item, threading.Event):
+                item.set()
+                continue
+            try:
+                self._send(*item)
+            except Exception as e:
+                logger.debug(f"Failed to send telemetry event: {e}")
+
+    def _send(self, event_name, properties, distinct_id, vector_store):
+        if self._telemetry is None:
+            self._telemetry = AnonymousTelemetry()
+        if distinct_id is None:
+            distinct_id = self._user_id(vector_store)
+        self._telemetry.capture_event(event_name, properties, user_email=distinct_id)
+
+    def _user_id(self, vector_store):
+        if vector_store is None:
+            return self._telemetry.user_id
+        key = id(vector_store)
+        if key not in self._user_ids:
+            self._user_ids[key] = get_or_create_user_id(vector_store)
+        return self._user_ids[key]
+
+
+telemetry_pipeline = TelemetryPipeline()
+atexit.register(telemetry_pipeline.shutdown)
 
 
 def capture_event(event_name, memory_instance, additional_data=None):
-    oss_telemetry = AnonymousTelemetry(
-        vector_store=memory_instance._telemetry_vector_store
-        if hasattr(memory_instance, "_telemetry_vector_store")
-        else None,
-    )
+    if not telemetry_pipeline.enabled:
+        return
 
     event_data = {
         "collection": memory_instance.collection_name,
@@ -77,14 +211,19 @@ def capture_event(event_name, memory_instance, additional_data=None):
     if additional_data:
         event_data.update(additional_data)
 
-    oss_telemetry.capture_event(event_name, event_data)
+    telemetry_pipeline.capture(
+        event_name, event_data, vector_store=getattr(memory_instance, "_telemetry_vector_store", None)
+    )
 
 
 def capture_client_event(event_name, instance, additional_data=None):
+    if not telemetry_pipeline.enabled:
+        return
+
     event_data = {
         "function": f"{instance.__class__.__module__}.{instance.__class__.__name__}",
     }
     if additional_data:
         event_data.update(additional_data)
 
-    client_telemetry.capture_event(event_name, event_data, instance.user_email)
+    telemetry_pipeline.capture(event_name, event_data, distinct_id=instance.user_email)
@@ -182,3 +182,60 @@ def sanitize_relationship_for_cypher(relationship) -> str:
         sanitized = sanitized.replace(old, new)
 
     return re.sub(r"_+", "_", sanitized).strip("_")
+
+
+def embed_entity_names(embedding_model, entities):
+    """
+    Embed the unique source and destination names of a list of relations in a single batch.
+
+    Returns a dict mapping each entity name to its embedding.
+    """
+    names = list(dict.fromkeys(name for item in entities for name in (item["source"], item["destination"])))
+    if not names:
+        return {}
+    return dict(zip(names, embedding_model.embed_batch(names)))
+
+
+def plan_entity_writes(relations, resolved):
+    """
+    Plan the node and relationship writes for a batch of relations.
+
+    Entity names that resolve to the same existing node share that node, names that did not resolve become
+    new nodes, and relations that end up connecting the same two nodes with the same relationship are merged.
+
+    Args:
+        relations (list): Relations with "source", "relationship" and "destination" entity names.
+        resolved (dict): Existing node ID of each entity name that matched a node. IDs must be hashable.
+
+    Returns:
+        tuple: The nodes, the relationship rows and the key of the row each relation was merged into.
+            Nodes have an "idx", the entity "name", the existing "node_id" (None for new nodes) and their
+            number of "mentions" in the batch. Rows have a "key", the "source" and "destination" node idx,
+            the "relationship" and their number of "mentions" in the batch.
+    """
+    nodes = {}
+    node_of = {}
+    for item in relations:
+        for name in (item["source"], item["destination"]):
+            node_key = ("id", resolved[name]) if name in resolved else ("name", name)
+            if node_key not in nodes:
+                nodes[node_key] = {"idx": len(nodes), "name": name, "node_id": resolved.get(name), "mentions": 0}
+            nodes[node_key]["mentions"] += 1
+            node_of[name] = nodes[node_key]["idx"]
+
+    rows = {}
+    item_keys = []
+    for item in relations:
+        row_key = (node_of[item["source"]], item["relationship"], node_of[item["destination"]])
+        if row_key not in rows:
+            rows[row_key] = {
+                "key": len(rows),
+                "source": row_key[0],
+                "relationship": row_key[1],
+                "destination": row_key[2],
+                "mentions": 0,
+            }
+        rows[row_key]["mentions"] += 1
+        item_keys.append(rows[row_key]["key"])
+
+    return list(nodes.values()), list(rows.values()), item_keys
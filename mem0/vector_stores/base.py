@@ -1,6 +1,39 @@
 from abc import ABC, abstractmethod
 
 
+class OutputData:
+    """A vector store hit or listed vector.
+
+    A plain slotted class rather than a pydantic model: stores build one per returned row, so validation
+    would run on every search hit. Values are expected to already have the right types.
+    """
+
+    __slots__ = ("id", "score", "payload")
+
+    def __init__(self, id=None, score=None, payload=None):
+        self.id = id
+        self.score = score
+        self.payload = payload
+
+    def __eq__(self, other):
+        if not isinstance(other, OutputData):
+            return NotImplemented
+        return (self.id, self.score, self.payload) == (other.id, other.score, other.payload)
+
+    def __repr__(self):
+        return f"OutputData(id={self.id!r}, score={self.score!r}, payload={self.payload!r})"
+
+    def model_dump(self):
+        return {"id": self.id, "score": self.score, "payload": self.payload}
+
+
+def _unwrap_listed(listed):
+    """Return the memories of a `list` result, which several backends wrap in an outer list or tuple."""
+    if isinstance(listed, (tuple, list)) and listed and isinstance(listed[0], (tuple, list)):
+        return listed[0]
+    return listed or []
+
+
 class VectorStoreBase(ABC):
     @abstractmethod
     def create_col(self, name, vector_size, distance):
@@ -17,11 +50,50 @@ class VectorStoreBase(ABC):
         """Search for similar vectors."""
         pass
 
+    def search_batch(self, queries, vectors, limit=5, filters=None):
+        """Search for similar vectors for several queries at once.
+
+        Returns one result list per query, in the same order. Backends that can run several queries in a
+        single round trip override this; the default runs the searches one after another.
+        """
+        return [
+            self.search(query=query, vectors=query_vectors, limit=limit, filters=filters)
+            for query, query_vectors in zip(queries, vectors)
+        ]
+
     @abstractmethod
     def delete(self, vector_id):
         """Delete a vector by ID."""
         pass
 
+    def delete_batch(self, vector_ids):
+        """Delete several vectors by ID.
+
+        Backends that can delete many ids in one request override this; the default deletes them one by one.
+        """
+        for vector_id in vector_ids:
+            self.delete(vector_id)
+
+    def delete_by_filter(self, filters):
+        """Delete every vector whose payload matches all the filters.
+
+        The filters must not be empty; use `reset` to delete everything. Backends with a native filtered
+        delete override this; the default repeatedly lists the first page of matches and deletes exactly those
+        ids with `delete_batch`, so every listing starts from the beginning and none needs an offset.
+        """
+        if not filters:
+            raise ValueError("Filters are required to delete by filter. Use reset() to delete everything.")
+
+        deleted = set()
+        while True:
+            # Ids deleted by the previous round are skipped, so a store that still lists them cannot loop forever
+            page = [memory.id for memory in _unwrap_listed(self.list(filters=filters, limit=1000))]
+            page = [vector_id for vector_id in page if vector_id not in deleted]
+            if not page:
+                break
+            self.delete_batch(page)
+            deleted = set(page)
+
     @abstractmethod
     def update(self, vector_id, vector=None, payload=None):
         """Update a vector and its payload."""
@@ -52,6 +124,20 @@ class VectorStoreBase(ABC):
         """List all memories."""
         pass
 
+    def list_page(self, filters=None, limit=100, cursor=None):
+        """List one page of memories, resuming after `cursor`.
+
+        Returns the page and the cursor of the next page, or None once the listing is exhausted. Cursors are
+        opaque to callers. Backends that can resume a scan override this; the default lists from the start on
+        every call and uses the number of memories already returned as the cursor. That makes a full walk
+        quadratic in the number of memories, holds every memory up to the end of the page in memory, and fails
+        once offset + limit exceeds the largest listing the backend allows.
+        """
+        offset = cursor or 0
+        memories = _unwrap_listed(self.list(filters=filters, limit=offset + limit))
+        page = list(memories[offset : offset + limit])
+        return page, (offset + limit if len(page) == limit else None)
+
     @abstractmethod
     def reset(self):
         """Reset by delete the collection and recreate it."""
@@ -1,7 +1,5 @@
 import logging
-from typing import Dict, List, Optional
-
-from pydantic import BaseModel
+from typing import Dict, List, Optional, Tuple
 
 try:
     import chromadb
@@ -9,17 +7,11 @@ try:
 except ImportError:
     raise ImportError("The 'chromadb' library is required. Please install it using 'pip install chromadb'.")
 
-from mem0.vector_stores.base import VectorStoreBase
+from mem0.vector_stores.base import OutputData, VectorStoreBase
 
 logger = logging.getLogger(__name__)
 
 
-class OutputData(BaseModel):
-    id: Optional[str]  # memory id
-    score: Optional[float]  # distance
-    payload: Optional[Dict]  # metadata
-
-
 class ChromaDB(VectorStoreBase):
     def __init__(
         self,
@@ -147,6 +139,33 @@ class ChromaDB(VectorStoreBase):
         final_results = self._parse_output(results)
         return final_results
 
+    def search_batch(
+        self, queries: List[str], vectors: List[list], limit: int = 5, filters: Optional[Dict] = None
+    ) -> List[List[OutputData]]:
+        """
+        Search for similar vectors for several queries in a single request.
+
+        Args:
+            queries (List[str]): Queries.
+            vectors (List[list]): One query vector per query.
+            limit (int, optional): Number of results to return per query. Defaults to 5.
+            filters (Optional[Dict], optional): Filters to apply to every query. Defaults to None.
+
+        Returns:
+            List[List[OutputData]]: Search results for each query.
+        """
+        if not vectors:
+            return []
+
+        where_clause = self._generate_where_clause(filters) if filters else None
+        results = self.collection.query(query_embeddings=vectors, where=where_clause, n_results=limit)
+
+        keys = ["ids", "distances", "metadatas"]
+        return [
+            self._parse_output({key: (results.get(key) or [[]] * len(vectors))[i] for key in keys})
+            for i in range(len(vectors))
+        ]
+
     def delete(self, vector_id: str):
         """
         Delete a vector by ID.
@@ -156,6 +175,28 @@ class ChromaDB(VectorStoreBase):
         """
         self.collection.delete(ids=vector_id)
 
+    def delete_batch(self, vector_ids: List[str]):
+        """
+        Delete several vectors by ID in one request.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to delete.
+        """
+        self.collection.delete(ids=list(vector_ids))
+
+    def delete_by_filter(self, filters: Dict):
+        """
+        Delete every vector whose metadata matches the filters.
+
+        Args:
+            filters (Dict): Filters to apply. Must not be empty.
+        """
+        if not filters:
+            raise ValueError("Filters are required to delete by filter. Use reset() to delete everything.")
+        # Built here rather than with _generate_where_clause, which drops non-string conditions
+        where = filters if len(filters) == 1 else {"$and": [{k: v} for k, v in filters.items()]}
+        self.collection.delete(where=where)
+
     def update(
         self,
         vector_id: str,
@@ -224,6 +265,27 @@ class ChromaDB(VectorStoreBase):
         results = self.collection.get(where=where_clause, limit=limit)
         return [self._parse_output(results)]
 
+    def list_page(
+        self, filters: Optional[Dict] = None, limit: int = 100, cursor: Optional[int] = None
+    ) -> Tuple[List[OutputData], Optional[int]]:
+        """
+        List one page of vectors using Chroma's offset.
+
+        Args:
+            filters (Optional[Dict], optional): Filters to apply to the list. Defaults to None.
+            limit (int, optional): Number of vectors to return. Defaults to 100.
+            cursor (Optional[int], optional): Cursor returned with the previous page. Defaults to None.
+
+        Returns:
+            Tuple[List[OutputData], Optional[int]]: The vectors and the cursor of the next page, or None after
+                the last page.
+        """
+        offset = cursor or 0
+        where_clause = self._generate_where_clause(filters) if filters else None
+        results = self.collection.get(where=where_clause, limit=limit, offset=offset)
+        page = self._parse_output(results)
+        return page, (offset + limit if len(page) == limit else None)
+
     def reset(self):
         """Reset the index by deleting and recreating it."""
         logger.warning(f"Resetting index {self.collection_name}...")
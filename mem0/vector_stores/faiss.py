@@ -1,12 +1,17 @@
+import atexit
+import functools
+import heapq
 import logging
 import os
 import pickle
+import threading
+import time
 import uuid
+import weakref
 from pathlib import Path
 from typing import Dict, List, Optional
 
 import numpy as np
-from pydantic import BaseModel
 
 try:
     logging.getLogger("faiss").setLevel(logging.WARNING)
@@ -20,15 +25,23 @@ except ImportError:
         "or `pip install faiss-cpu` (depending on Python version)."
     )
 
-from mem0.vector_stores.base import VectorStoreBase
+from mem0.vector_stores.base import OutputData, VectorStoreBase
 
 logger = logging.getLogger(__name__)
 
+# Payload fields that are unique per memory or never used as filters, so they are left out of the payload index
+_UNINDEXED_PAYLOAD_FIELDS = {"data", "hash", "created_at", "updated_at"}
 
-class OutputData(BaseModel):
-    id: Optional[str]  # memory id
-    score: Optional[float]  # distance
-    payload: Optional[Dict]  # metadata
+# Filtered searches on graph or inverted-list indexes score at most this many candidates exactly, because
+# those indexes can miss matches when the filter is very selective
+_EXACT_SEARCH_MAX_CANDIDATES = 4096
+
+
+def _close_at_exit(close_ref: weakref.WeakMethod):
+    """Close a write-behind store at interpreter exit if it is still alive."""
+    close = close_ref()
+    if close is not None:
+        close()
 
 
 class FAISS(VectorStoreBase):
@@ -39,6 +52,19 @@ class FAISS(VectorStoreBase):
         distance_strategy: str = "euclidean",
         normalize_L2: bool = False,
         embedding_model_dims: int = 1536,
+        compaction_threshold: float = 0.2,
+        write_behind: bool = False,
+        snapshot_interval_ops: int = 1000,
+        snapshot_interval_seconds: float = 60.0,
+        index_type: str = "flat",
+        compression: Optional[str] = None,
+        hnsw_m: int = 32,
+        hnsw_ef_construction: int = 40,
+        hnsw_ef_search: int = 64,
+        ivf_nlist: int = 1024,
+        ivf_nprobe: int = 16,
+        pq_m: int = 16,
+        train_min_vectors: Optional[int] = None,
     ):
         """
         Initialize the FAISS vector store.
@@ -50,17 +76,81 @@ class FAISS(VectorStoreBase):
                 Defaults to "euclidean".
             normalize_L2 (bool, optional): Whether to normalize L2 vectors. Only applicable for euclidean distance.
                 Defaults to False.
+            compaction_threshold (float, optional): Fraction of tombstoned rows in the index above which it is
+                rebuilt from the live vectors on a background thread. Only used by index types that cannot remove
+                vectors in place. Defaults to 0.2.
+            write_behind (bool, optional): Append mutations to a log instead of rewriting the index and docstore on
+                every change. Snapshots are taken periodically and on close. Defaults to False.
+            snapshot_interval_ops (int, optional): Number of logged mutations after which a snapshot is taken in
+                write-behind mode. Defaults to 1000.
+            snapshot_interval_seconds (float, optional): Seconds since the last snapshot after which the next
+                mutation triggers a snapshot in write-behind mode. Defaults to 60.0.
+            index_type (str, optional): Index structure to use. Options: 'flat', 'hnsw', 'ivf'. Defaults to "flat".
+            compression (str, optional): Vector compression to use. Options: None, 'sq8', 'pq'. Defaults to None.
+            hnsw_m (int, optional): Number of neighbors per node for HNSW indexes. Defaults to 32.
+            hnsw_ef_construction (int, optional): Search depth used while building HNSW indexes. Defaults to 40.
+            hnsw_ef_search (int, optional): Search depth used at query time for HNSW indexes. Defaults to 64.
+            ivf_nlist (int, optional): Number of inverted lists for IVF indexes. Defaults to 1024.
+            ivf_nprobe (int, optional): Number of inverted lists visited at query time for IVF indexes.
+                Defaults to 16.
+            pq_m (int, optional): Number of sub-quantizers for product quantization. Must divide
+                embedding_model_dims. Defaults to 16.
+            train_min_vectors (int, optional): Number of vectors to collect in a flat index before training index
+                types that need it. Defaults to None, which derives it from ivf_nlist and the compression.
         """
         self.collection_name = collection_name
         self.path = path or f"/tmp/faiss/{collection_name}"
         self.distance_strategy = distance_strategy
         self.normalize_L2 = normalize_L2
         self.embedding_model_dims = embedding_model_dims
+        self.compaction_threshold = compaction_threshold
+        self.write_behind = write_behind
+        self.snapshot_interval_ops = snapshot_interval_ops
+        self.snapshot_interval_seconds = snapshot_interval_seconds
+        self.index_type = index_type
+        self.compression = compression
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construction = hnsw_ef_construction
+        self.hnsw_ef_search = hnsw_ef_search
+        self.ivf_nlist = ivf_nlist
+        self.ivf_nprobe = ivf_nprobe
+        self.pq_m = pq_m
+
+        # Index types that need training are staged in a flat index until enough vectors exist.
+        # active_index_spec is the factory spec of the index currently in use.
+        self.index_spec = self._index_factory_spec()
+        if faiss.index_factory(self.embedding_model_dims, self.index_spec).is_trained:
+            self.train_min_vectors = 0
+        elif train_min_vectors is not None:
+            self.train_min_vectors = train_min_vectors
+        else:
+            self.train_min_vectors = max(
+                1000,
+                39 * ivf_nlist if index_type == "ivf" else 0,
+                39 * 256 if compression == "pq" else 0,
+            )
+        self.active_index_spec = "Flat"
 
-        # Initialize storage structures
+        # Initialize storage structures. Vectors are stored in an IndexIDMap2 under int64 row ids;
+        # index_to_id and id_to_index map those rows to memory ids in both directions.
         self.index = None
         self.docstore = {}
         self.index_to_id = {}
+        self.id_to_index = {}
+        self.tombstones = set()
+        self.next_row_id = 0
+
+        # Inverted payload index: (field, value) -> memory ids, kept in insertion order
+        self.payload_index = {}
+
+        # Write-behind state: open handle on the mutation log and progress since the last snapshot
+        self._log_file = None
+        self._ops_since_snapshot = 0
+        self._last_snapshot = time.monotonic()
+
+        # Serializes mutations with the start and end of a background compaction. Searches read without it.
+        self._lock = threading.RLock()
+        self._compaction_thread = None
 
         # Create directory if it doesn't exist
         if self.path:
@@ -69,10 +159,17 @@ class FAISS(VectorStoreBase):
             # Try to load existing index if available
             index_path = f"{self.path}/{collection_name}.faiss"
             docstore_path = f"{self.path}/{collection_name}.pkl"
-            if os.path.exists(index_path) and os.path.exists(docstore_path):
-                self._load(index_path, docstore_path)
-            else:
-                self.create_col(collection_name)
+            with self._lock:
+                if os.path.exists(index_path) and os.path.exists(docstore_path):
+                    self._load(index_path, docstore_path)
+                else:
+                    self.create_col(collection_name)
+
+        # The exit hook only holds a weak reference, so it does not keep discarded stores alive
+        self._exit_hook = None
+        if self.write_behind:
+            self._exit_hook = functools.partial(_close_at_exit, weakref.WeakMethod(self.close))
+            atexit.register(self._exit_hook)
 
     def _load(self, index_path: str, docstore_path: str):
         """
@@ -85,16 +182,150 @@ class FAISS(VectorStoreBase):
         try:
             self.index = faiss.read_index(index_path)
             with open(docstore_path, "rb") as f:
-                self.docstore, self.index_to_id = pickle.load(f)
+                state = pickle.load(f)
+
+            if isinstance(state, dict):
+                self.docstore = state["docstore"]
+                self.index_to_id = state["index_to_id"]
+                self.tombstones = set(state.get("tombstones", ()))
+                self.next_row_id = state.get("next_row_id", max(self.index_to_id, default=-1) + 1)
+                self.active_index_spec = state.get("index_spec", "Flat")
+            else:
+                self.docstore, self.index_to_id = state
+                self.tombstones = set()
+                self.next_row_id = max(self.index_to_id, default=-1) + 1
+
+            if not isinstance(self.index, faiss.IndexIDMap2) and faiss.try_extract_index_ivf(self.index) is None:
+                self._migrate_positional_index()
+
+            self.id_to_index = {vector_id: row_id for row_id, vector_id in self.index_to_id.items()}
+            self.payload_index = {}
+            for vector_id, payload in self.docstore.items():
+                self._index_payload(vector_id, payload)
+            self._configure_search(self.index)
             logger.info(f"Loaded FAISS index from {index_path} with {self.index.ntotal} vectors")
+
+            replayed = self._replay_log()
+            # Move an index built with different settings over to the configured index type
+            migrated = self._maybe_train()
+            if replayed or migrated:
+                # Fold the recovered or migrated state into a fresh snapshot
+                self._save()
         except Exception as e:
             logger.warning(f"Failed to load FAISS index: {e}")
 
             self.docstore = {}
             self.index_to_id = {}
+            self.id_to_index = {}
+            self.tombstones = set()
+            self.next_row_id = 0
+            self.payload_index = {}
+
+    def _migrate_positional_index(self):
+        """
+        Convert an index written by older versions, where rows were addressed by insertion position and
+        deleted vectors were left in place, into an id-addressable index holding only the live vectors.
+        """
+        legacy_index = self.index
+        live_rows = sorted(row_id for row_id in self.index_to_id if row_id < legacy_index.ntotal)
+
+        self.index = self._build_index(self.distance_strategy)
+        self.active_index_spec = "Flat"
+        if live_rows:
+            vectors = legacy_index.reconstruct_n(0, legacy_index.ntotal)[live_rows]
+            self.index.add_with_ids(vectors, np.array(live_rows, dtype=np.int64))
+
+        self.index_to_id = {row_id: self.index_to_id[row_id] for row_id in live_rows}
+        self.next_row_id = max(self.next_row_id, legacy_index.ntotal)
+        logger.info(
+            f"Migrated FAISS index {self.collection_name}: kept {len(live_rows)} of {legacy_index.ntotal} vectors"
+        )
+
+    def _replay_log(self) -> int:
+        """
+        Re-apply mutations logged since the last snapshot.
+
+        Returns:
+            int: Number of mutations replayed.
+        """
+        log_path = f"{self.path}/{self.collection_name}.log"
+        if not os.path.exists(log_path):
+            return 0
+
+        replayed = 0
+        with open(log_path, "rb") as f:
+            while True:
+                try:
+                    record = pickle.load(f)
+                except EOFError:
+                    break
+                except Exception as e:
+                    # A crash mid-append leaves a torn record at the tail; everything before it is intact
+                    logger.warning(f"Stopped replaying FAISS mutation log at a truncated record: {e}")
+                    break
+                self._apply_record(record)
+                replayed += 1
+
+        logger.info(f"Replayed {replayed} mutations from {log_path}")
+        return replayed
+
+    def _apply_record(self, record: tuple):
+        """
+        Apply a logged mutation to the in-memory state.
+
+        Args:
+            record (tuple): Mutation record as written by _persist.
+        """
+        op = record[0]
+        if op == "insert":
+            _, vectors_np, ids, payloads = record
+            self._apply_insert(vectors_np, ids, payloads)
+        elif op == "delete":
+            self._apply_delete(record[1])
+        elif op == "delete_many":
+            self._apply_delete_many(record[1])
+        elif op == "payload":
+            self._set_payload(record[1], record[2])
+        else:
+            logger.warning(f"Skipping unknown FAISS mutation log record: {op}")
+
+    def _persist(self, record: tuple):
+        """
+        Persist a mutation, either by rewriting the snapshot or by appending it to the mutation log.
+
+        Args:
+            record (tuple): Mutation record to log in write-behind mode.
+        """
+        if not self.write_behind or not self.path:
+            self._save()
+            return
+
+        try:
+            if self._log_file is None:
+                os.makedirs(self.path, exist_ok=True)
+                self._log_file = open(f"{self.path}/{self.collection_name}.log", "ab")
+            pickle.dump(record, self._log_file, protocol=pickle.HIGHEST_PROTOCOL)
+            self._log_file.flush()
+        except Exception as e:
+            logger.warning(f"Failed to append to FAISS mutation log, taking a snapshot instead: {e}")
+            self._save()
+            return
+
+        self._ops_since_snapshot += 1
+        if (
+            self._ops_since_snapshot >= self.snapshot_interval_ops
+            or time.monotonic() - self._last_snapshot >= self.snapshot_interval_seconds
+        ):
+            self._save()
+
+    def _close_log(self):
+        """Close the mutation log handle if it is open."""
+        if self._log_file is not None:
+            self._log_file.close()
+            self._log_file = None
 
     def _save(self):
-        """Save FAISS index and docstore to disk."""
+        """Save FAISS index and docstore to disk and truncate the mutation log."""
         if not self.path or not self.index:
             return
 
@@ -102,13 +333,41 @@ class FAISS(VectorStoreBase):
             os.makedirs(self.path, exist_ok=True)
             index_path = f"{self.path}/{self.collection_name}.faiss"
             docstore_path = f"{self.path}/{self.collection_name}.pkl"
-
-            faiss.write_index(self.index, index_path)
-            with open(docstore_path, "wb") as f:
-                pickle.dump((self.docstore, self.index_to_id), f)
+            log_path = f"{self.path}/{self.collection_name}.log"
+
+            # Write to temporary files first so a crash never leaves a half-written snapshot behind
+            faiss.write_index(self.index, f"{index_path}.tmp")
+            state = {
+                "docstore": self.docstore,
+                "index_to_id": self.index_to_id,
+                "tombstones": self.tombstones,
+                "next_row_id": self.next_row_id,
+                "index_spec": self.active_index_spec,
+            }
+            with open(f"{docstore_path}.tmp", "wb") as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(f"{index_path}.tmp", index_path)
+            os.replace(f"{docstore_path}.tmp", docstore_path)
+
+            # Every logged mutation is now part of the snapshot
+            self._close_log()
+            if os.path.exists(log_path):
+                os.remove(log_path)
+            self._ops_since_snapshot = 0
+            self._last_snapshot = time.monotonic()
         except Exception as e:
             logger.warning(f"Failed to save FAISS index: {e}")
 
+    def close(self):
+        """Flush pending write-behind mutations into a snapshot and release the mutation log."""
+        with self._lock:
+            if self._ops_since_snapshot:
+                self._save()
+            self._close_log()
+        if self._exit_hook is not None:
+            atexit.unregister(self._exit_hook)
+            self._exit_hook = None
+
     def _parse_output(self, scores, ids, limit=None) -> List[OutputData]:
         """
         Parse the output data.
@@ -125,7 +384,9 @@ class FAISS(VectorStoreBase):
             limit = len(ids)
 
         results = []
-        for i in range(min(len(ids), limit)):
+        for i in range(len(ids)):
+            if len(results) >= limit:
+                break
             if ids[i] == -1:  # FAISS returns -1 for empty results
                 continue
 
@@ -150,6 +411,212 @@ class FAISS(VectorStoreBase):
 
         return results
 
+    def _index_factory_spec(self) -> str:
+        """
+        Build the faiss index factory spec for the configured index type and compression.
+
+        Returns:
+            str: Index factory spec, e.g. "HNSW32", "IVF1024,PQ16" or "SQ8".
+        """
+        if self.compression == "sq8":
+            storage = "SQ8"
+        elif self.compression == "pq":
+            storage = f"PQ{self.pq_m}"
+        else:
+            storage = "Flat"
+
+        if self.index_type == "hnsw":
+            return f"HNSW{self.hnsw_m}" if storage == "Flat" else f"HNSW{self.hnsw_m}_{storage}"
+        if self.index_type == "ivf":
+            return f"IVF{self.ivf_nlist},{storage}"
+        return storage
+
+    def _build_index(self, distance_strategy: str, index_spec: str = "Flat"):
+        """
+        Build an empty id-addressable index for the given distance strategy.
+
+        Args:
+            distance_strategy (str): Distance strategy to use.
+            index_spec (str, optional): Faiss index factory spec. Defaults to "Flat".
+
+        Returns:
+            faiss.Index: The new index. IVF indexes store ids natively, everything else is wrapped in an IndexIDMap2.
+        """
+        if distance_strategy.lower() == "inner_product" or distance_strategy.lower() == "cosine":
+            metric = faiss.METRIC_INNER_PRODUCT
+        else:
+            metric = faiss.METRIC_L2
+
+        base_index = faiss.index_factory(self.embedding_model_dims, index_spec, metric)
+        if isinstance(base_index, faiss.IndexHNSW):
+            base_index.hnsw.efConstruction = self.hnsw_ef_construction
+
+        ivf_index = faiss.try_extract_index_ivf(base_index)
+        if ivf_index is not None:
+            # A hashtable direct map lets IVF indexes reconstruct and remove vectors by id
+            ivf_index.set_direct_map_type(faiss.DirectMap.Hashtable)
+            index = base_index
+        else:
+            index = faiss.IndexIDMap2(base_index)
+
+        self._configure_search(index)
+        return index
+
+    def _configure_search(self, index):
+        """
+        Apply the query-time parameters of approximate index types.
+
+        Args:
+            index (faiss.Index): Index to configure.
+        """
+        base_index = faiss.downcast_index(index.index) if isinstance(index, faiss.IndexIDMap2) else index
+        if isinstance(base_index, faiss.IndexHNSW):
+            base_index.hnsw.efSearch = self.hnsw_ef_search
+
+        ivf_index = faiss.try_extract_index_ivf(index)
+        if ivf_index is not None:
+            ivf_index.nprobe = self.ivf_nprobe
+
+    def _rebuild_index(self, index_spec: str):
+        """
+        Rebuild the index from the live vectors, training it first if the index type requires it.
+        Index types that need more training vectors than are available are staged in a flat index.
+
+        Args:
+            index_spec (str): Faiss index factory spec to rebuild with.
+        """
+        live_rows = sorted(self.index_to_id)
+        new_index = self._build_index(self.distance_strategy, index_spec)
+        if not new_index.is_trained and len(live_rows) < max(self.train_min_vectors, 1):
+            index_spec = "Flat"
+            new_index = self._build_index(self.distance_strategy, index_spec)
+
+        if live_rows:
+            row_ids = np.array(live_rows, dtype=np.int64)
+            vectors = self.index.reconstruct_batch(row_ids)
+            if not new_index.is_trained:
+                new_index.train(vectors)
+            new_index.add_with_ids(vectors, row_ids)
+
+        self.index = new_index
+        self.active_index_spec = index_spec
+        self.tombstones = set()
+
+    def _maybe_train(self) -> bool:
+        """
+        Switch from the staging index to the configured index type once enough vectors exist.
+
+        Returns:
+            bool: True if the index was rebuilt.
+        """
+        if self.active_index_spec == self.index_spec or len(self.index_to_id) < self.train_min_vectors:
+            return False
+
+        previous_spec = self.active_index_spec
+        self._rebuild_index(self.index_spec)
+        if self.active_index_spec == previous_spec:
+            return False
+
+        logger.info(
+            f"Rebuilt collection {self.collection_name} as {self.active_index_spec} "
+            f"(was {previous_spec}) with {len(self.index_to_id)} vectors"
+        )
+        return True
+
+    def _add_vectors(self, vectors_np: np.ndarray, vector_ids: List[str]):
+        """
+        Add vectors to the index under fresh row ids and record the id mappings.
+
+        Args:
+            vectors_np (np.ndarray): Vectors to add.
+            vector_ids (List[str]): Memory ids of the vectors.
+        """
+        row_ids = np.arange(self.next_row_id, self.next_row_id + len(vector_ids), dtype=np.int64)
+        self.next_row_id += len(vector_ids)
+        self.index.add_with_ids(vectors_np, row_ids)
+
+        for row_id, vector_id in zip(row_ids.tolist(), vector_ids):
+            self.index_to_id[row_id] = vector_id
+            self.id_to_index[vector_id] = row_id
+
+    def _remove_rows(self, row_ids: List[int]):
+        """
+        Remove rows from the index. Index types that cannot remove vectors in place keep them as
+        tombstones until the next compaction.
+
+        Args:
+            row_ids (List[int]): Row ids to remove.
+        """
+        if not row_ids:
+            return
+
+        for row_id in row_ids:
+            vector_id = self.index_to_id.pop(row_id, None)
+            if vector_id is not None and self.id_to_index.get(vector_id) == row_id:
+                self.id_to_index.pop(vector_id)
+
+        try:
+            self.index.remove_ids(np.array(row_ids, dtype=np.int64))
+        except RuntimeError:
+            self.tombstones.update(row_ids)
+            if self.index.ntotal and len(self.tombstones) / self.index.ntotal > self.compaction_threshold:
+                self._schedule_compaction()
+
+    def _schedule_compaction(self):
+        """Start a background compaction unless one is already running."""
+        if self._compaction_thread is not None and self._compaction_thread.is_alive():
+            return
+        self._compaction_thread = threading.Thread(
+            target=self.compact, name=f"faiss-compaction-{self.collection_name}", daemon=True
+        )
+        self._compaction_thread.start()
+
+    def compact(self):
+        """
+        Rebuild the index from the live vectors, dropping tombstoned rows.
+
+        The new index is filled without holding the lock, so writes and searches continue meanwhile; rows added or
+        deleted during the build are carried over before the new index replaces the old one. The trained
+        quantizers of the current index are reused rather than retrained on decoded vectors, so compressed vectors
+        are re-encoded to the same codes.
+        """
+        with self._lock:
+            if self.index is None or not self.tombstones:
+                return
+            old_index = self.index
+            removed = len(self.tombstones)
+            row_ids = np.array(sorted(self.index_to_id), dtype=np.int64)
+            vectors = old_index.reconstruct_batch(row_ids) if len(row_ids) else None
+            new_index = faiss.clone_index(old_index)
+
+        new_index.reset()
+        self._configure_search(new_index)
+        if vectors is not None:
+            new_index.add_with_ids(vectors, row_ids)
+
+        with self._lock:
+            if self.index is not old_index:
+                # The collection was reset or retrained during the build, which already dropped the tombstones
+                return
+
+            compacted_rows = set(row_ids.tolist())
+            added_rows = [row_id for row_id in self.index_to_id if row_id not in compacted_rows]
+            if added_rows:
+                added_rows = np.array(added_rows, dtype=np.int64)
+                new_index.add_with_ids(old_index.reconstruct_batch(added_rows), added_rows)
+
+            self.index = new_index
+            self.tombstones = set()
+            deleted_rows = [row_id for row_id in compacted_rows if row_id not in self.index_to_id]
+            if deleted_rows:
+                try:
+                    new_index.remove_ids(np.array(deleted_rows, dtype=np.int64))
+                except RuntimeError:
+                    self.tombstones.update(deleted_rows)
+            self._save()
+
+        logger.info(f"Compacted collection {self.collection_name}, dropped {removed} tombstoned vectors")
+
     def create_col(self, name: str, distance: str = None):
         """
         Create a new collection.
@@ -164,15 +631,18 @@ class FAISS(VectorStoreBase):
         """
         distance_strategy = distance or self.distance_strategy
 
-        # Create index based on distance strategy
-        if distance_strategy.lower() == "inner_product" or distance_strategy.lower() == "cosine":
-            self.index = faiss.IndexFlatIP(self.embedding_model_dims)
-        else:
-            self.index = faiss.IndexFlatL2(self.embedding_model_dims)
+        with self._lock:
+            # Create index based on distance strategy. Index types that need training start out flat.
+            self.active_index_spec = "Flat" if self.train_min_vectors else self.index_spec
+            self.index = self._build_index(distance_strategy, self.active_index_spec)
+            self.index_to_id = {}
+            self.id_to_index = {}
+            self.tombstones = set()
+            self.next_row_id = 0
 
-        self.collection_name = name
+            self.collection_name = name
 
-        self._save()
+            self._save()
 
         return self
 
@@ -207,31 +677,260 @@ class FAISS(VectorStoreBase):
         if self.normalize_L2 and self.distance_strategy.lower() == "euclidean":
             faiss.normalize_L2(vectors_np)
 
-        self.index.add(vectors_np)
+        payloads = [payload.copy() for payload in payloads]
+        with self._lock:
+            self._apply_insert(vectors_np, ids, payloads)
+            self._persist(("insert", vectors_np, ids, payloads))
 
-        starting_idx = len(self.index_to_id)
-        for i, (vector_id, payload) in enumerate(zip(ids, payloads)):
-            self.docstore[vector_id] = payload.copy()
-            self.index_to_id[starting_idx + i] = vector_id
+        logger.info(f"Inserted {len(vectors)} vectors into collection {self.collection_name}")
 
-        self._save()
+    def _apply_insert(self, vectors_np: np.ndarray, ids: List[str], payloads: List[Dict]):
+        """
+        Add vectors and payloads to the in-memory index and docstore.
 
-        logger.info(f"Inserted {len(vectors)} vectors into collection {self.collection_name}")
+        Args:
+            vectors_np (np.ndarray): Vectors to add, already normalized if required.
+            ids (List[str]): IDs of the vectors.
+            payloads (List[Dict]): Payloads of the vectors.
+        """
+        # Re-inserting an existing id replaces its previous vector
+        self._remove_rows([self.id_to_index[vector_id] for vector_id in ids if vector_id in self.id_to_index])
+        self._add_vectors(vectors_np, ids)
 
-    def search(
-        self, query: str, vectors: List[list], limit: int = 5, filters: Optional[Dict] = None
-    ) -> List[OutputData]:
+        for vector_id, payload in zip(ids, payloads):
+            self._set_payload(vector_id, payload)
+
+        self._maybe_train()
+
+    def _apply_delete(self, vector_id: str) -> bool:
         """
-        Search for similar vectors.
+        Remove a vector and its payload from the in-memory index and docstore.
 
         Args:
-            query (str): Query (not used, kept for API compatibility).
-            vectors (List[list]): List of vectors to search.
-            limit (int, optional): Number of results to return. Defaults to 5.
-            filters (Optional[Dict], optional): Filters to apply to the search. Defaults to None.
+            vector_id (str): ID of the vector to delete.
 
         Returns:
-            List[OutputData]: Search results.
+            bool: True if the vector existed.
+        """
+        return bool(self._apply_delete_many([vector_id]))
+
+    def _apply_delete_many(self, vector_ids: List[str]) -> List[str]:
+        """
+        Remove vectors and their payloads from the in-memory index and docstore, removing all index rows at once.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to delete.
+
+        Returns:
+            List[str]: IDs of the vectors that existed.
+        """
+        row_ids = []
+        deleted = []
+        for vector_id in vector_ids:
+            row_id = self.id_to_index.get(vector_id)
+            if row_id is None:
+                continue
+            payload = self.docstore.pop(vector_id, None)
+            if payload is not None:
+                self._unindex_payload(vector_id, payload)
+            row_ids.append(row_id)
+            deleted.append(vector_id)
+
+        self._remove_rows(row_ids)
+        return deleted
+
+    def _set_payload(self, vector_id: str, payload: Dict):
+        """
+        Store a payload and keep the payload index in sync with it.
+
+        Args:
+            vector_id (str): ID of the vector.
+            payload (Dict): New payload.
+        """
+        previous = self.docstore.get(vector_id)
+        if previous is not None:
+            self._unindex_payload(vector_id, previous)
+        self.docstore[vector_id] = payload
+        self._index_payload(vector_id, payload)
+
+    def _index_payload(self, vector_id: str, payload: Dict):
+        """
+        Add a payload's filterable fields to the payload index.
+
+        Args:
+            vector_id (str): ID of the vector.
+            payload (Dict): Payload to index.
+        """
+        for key, value in payload.items():
+            if key in _UNINDEXED_PAYLOAD_FIELDS:
+                continue
+            try:
+                self.payload_index.setdefault((key, value), {})[vector_id] = None
+            except TypeError:
+                # Unhashable values (lists, dicts) are matched by scanning instead
+                continue
+
+    def _unindex_payload(self, vector_id: str, payload: Dict):
+        """
+        Remove a payload's filterable fields from the payload index.
+
+        Args:
+            vector_id (str): ID of the vector.
+            payload (Dict): Payload to remove.
+        """
+        for key, value in payload.items():
+            if key in _UNINDEXED_PAYLOAD_FIELDS:
+                continue
+            try:
+                postings = self.payload_index.get((key, value))
+            except TypeError:
+                continue
+            if postings is not None:
+                postings.pop(vector_id, None)
+                if not postings:
+                    del self.payload_index[(key, value)]
+
+    def _match_filters(self, filters: Dict) -> List[str]:
+        """
+        Find the ids of all vectors whose payload matches the filters, using the payload index where possible.
+
+        Args:
+            filters (Dict): Filters to apply.
+
+        Returns:
+            List[str]: Matching vector ids, in insertion order of the most selective filter.
+        """
+        postings = []
+        unindexed_filters = {}
+        for key, value in filters.items():
+            if key in _UNINDEXED_PAYLOAD_FIELDS:
+                unindexed_filters[key] = value
+                continue
+            try:
+                if isinstance(value, list):
+                    matches = {}
+                    for item in value:
+                        matches.update(self.payload_index.get((key, item), {}))
+                else:
+                    matches = self.payload_index.get((key, value), {})
+            except TypeError:
+                unindexed_filters[key] = value
+                continue
+            postings.append(matches)
+
+        if postings:
+            postings.sort(key=len)
+            candidates = [vector_id for vector_id in postings[0] if all(vector_id in p for p in postings[1:])]
+        else:
+            candidates = list(self.docstore)
+
+        if unindexed_filters:
+            candidates = [
+                vector_id
+                for vector_id in candidates
+                if self._apply_filters(self.docstore[vector_id], unindexed_filters)
+            ]
+        return candidates
+
+    def _search_filtered(self, query_vectors: np.ndarray, limit: int, filters: Dict) -> List[List[OutputData]]:
+        """
+        Search only among the vectors matching the filters.
+
+        Args:
+            query_vectors (np.ndarray): Query vectors, shaped (n, dims).
+            limit (int): Number of results to return per query.
+            filters (Dict): Filters to apply.
+
+        Returns:
+            List[List[OutputData]]: Search results for each query.
+        """
+        row_ids = [
+            self.id_to_index[vector_id] for vector_id in self._match_filters(filters) if vector_id in self.id_to_index
+        ]
+        if not row_ids:
+            return [[] for _ in range(len(query_vectors))]
+
+        row_ids = np.array(row_ids, dtype=np.int64)
+        k = min(limit, len(row_ids))
+        index = self.index
+
+        exact = self.active_index_spec.startswith(("HNSW", "IVF")) and len(row_ids) <= _EXACT_SEARCH_MAX_CANDIDATES
+        if exact or not self._supports_selector(index):
+            # Score the candidates exactly, either because they are few enough that a filtered graph or list
+            # traversal could miss them, or because the index type rejects search-time id selectors
+            scores, rows = self._exact_search(index, query_vectors, row_ids, k)
+            return [self._parse_output(s, r, limit) for s, r in zip(scores, rows)]
+
+        selector = faiss.IDSelectorBatch(row_ids)
+        ivf_index = faiss.try_extract_index_ivf(index)
+        if ivf_index is not None:
+            params = faiss.SearchParametersIVF(sel=selector, nprobe=self.ivf_nprobe)
+        elif self.active_index_spec.startswith("HNSW"):
+            params = faiss.SearchParametersHNSW(sel=selector, efSearch=max(self.hnsw_ef_search, k))
+        else:
+            params = faiss.SearchParameters(sel=selector)
+
+        scores, indices = index.search(query_vectors, k, params=params)
+        return [self._parse_output(s, i, limit) for s, i in zip(scores, indices)]
+
+    @staticmethod
+    def _supports_selector(index) -> bool:
+        """
+        Check whether an index accepts id selectors in its search parameters.
+
+        Args:
+            index (faiss.Index): Index to check.
+
+        Returns:
+            bool: True for IVF, HNSW, flat and scalar quantizer indexes. Product quantizer indexes reject them.
+        """
+        if faiss.try_extract_index_ivf(index) is not None:
+            return True
+        base_index = faiss.downcast_index(index.index) if isinstance(index, faiss.IndexIDMap2) else index
+        return isinstance(base_index, (faiss.IndexHNSW, faiss.IndexFlat, faiss.IndexScalarQuantizer))
+
+    @staticmethod
+    def _exact_search(index, query_vectors: np.ndarray, row_ids: np.ndarray, k: int):
+        """
+        Score candidate rows exactly against the query vectors, reconstructing them in bounded chunks.
+
+        Args:
+            index (faiss.Index): Index holding the rows.
+            query_vectors (np.ndarray): Query vectors, shaped (n, dims).
+            row_ids (np.ndarray): Candidate row ids.
+            k (int): Number of nearest rows to keep per query.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Scores and row ids of the nearest rows, best first, shaped (n, k).
+        """
+        metric = index.metric_type
+        best_scores, best_rows = None, None
+        for start in range(0, len(row_ids), _EXACT_SEARCH_MAX_CANDIDATES):
+            chunk = row_ids[start : start + _EXACT_SEARCH_MAX_CANDIDATES]
+            scores, positions = faiss.knn(
+                query_vectors, index.reconstruct_batch(chunk), min(k, len(chunk)), metric=metric
+            )
+            rows = chunk[positions]
+            if best_scores is not None:
+                scores = np.concatenate([best_scores, scores], axis=1)
+                rows = np.concatenate([best_rows, rows], axis=1)
+                order = np.argsort(-scores if metric == faiss.METRIC_INNER_PRODUCT else scores, axis=1, kind="stable")
+                scores = np.take_along_axis(scores, order[:, :k], axis=1)
+                rows = np.take_along_axis(rows, order[:, :k], axis=1)
+            best_scores, best_rows = scores, rows
+        return best_scores, best_rows
+
+    def _search_vectors(self, vectors, limit: int, filters: Optional[Dict]) -> List[List[OutputData]]:
+        """
+        Search for the nearest neighbors of one or more query vectors in a single index call.
+
+        Args:
+            vectors: Query vector or list of query vectors.
+            limit (int): Number of results to return per query.
+            filters (Optional[Dict]): Filters to apply to the search.
+
+        Returns:
+            List[List[OutputData]]: Search results for each query.
         """
         if self.index is None:
             raise ValueError("Collection not initialized. Call create_col first.")
@@ -244,21 +943,55 @@ class FAISS(VectorStoreBase):
         if self.normalize_L2 and self.distance_strategy.lower() == "euclidean":
             faiss.normalize_L2(query_vectors)
 
-        fetch_k = limit * 2 if filters else limit
-        scores, indices = self.index.search(query_vectors, fetch_k)
+        if filters:
+            return self._search_filtered(query_vectors, limit, filters)
+
+        # Tombstoned rows can still be returned by the index. Over-fetch a little and widen the search only for
+        # the rare query whose neighborhood is mostly tombstones.
+        index = self.index
+        fetch_k = limit * 2 if self.tombstones else limit
+        while True:
+            scores, indices = index.search(query_vectors, min(fetch_k, index.ntotal) or limit)
+            results = [self._parse_output(s, i, limit) for s, i in zip(scores, indices)]
+            if fetch_k >= index.ntotal or all(len(result) >= limit for result in results):
+                return results
+            fetch_k *= 2
+
+    def search(
+        self, query: str, vectors: List[list], limit: int = 5, filters: Optional[Dict] = None
+    ) -> List[OutputData]:
+        """
+        Search for similar vectors.
+
+        Args:
+            query (str): Query (not used, kept for API compatibility).
+            vectors (List[list]): List of vectors to search.
+            limit (int, optional): Number of results to return. Defaults to 5.
+            filters (Optional[Dict], optional): Filters to apply to the search. Defaults to None.
+
+        Returns:
+            List[OutputData]: Search results.
+        """
+        return self._search_vectors(vectors, limit, filters)[0]
 
-        results = self._parse_output(scores[0], indices[0], limit)
+    def search_batch(
+        self, queries: List[str], vectors: List[list], limit: int = 5, filters: Optional[Dict] = None
+    ) -> List[List[OutputData]]:
+        """
+        Search for similar vectors for several queries with a single index call.
 
-        if filters:
-            filtered_results = []
-            for result in results:
-                if self._apply_filters(result.payload, filters):
-                    filtered_results.append(result)
-                    if len(filtered_results) >= limit:
-                        break
-            results = filtered_results[:limit]
+        Args:
+            queries (List[str]): Queries (not used, kept for API compatibility).
+            vectors (List[list]): One query vector per query.
+            limit (int, optional): Number of results to return per query. Defaults to 5.
+            filters (Optional[Dict], optional): Filters to apply to every query. Defaults to None.
 
-        return results
+        Returns:
+            List[List[OutputData]]: Search results for each query.
+        """
+        if not vectors:
+            return []
+        return self._search_vectors(vectors, limit, filters)
 
     def _apply_filters(self, payload: Dict, filters: Dict) -> bool:
         """
@@ -296,22 +1029,52 @@ class FAISS(VectorStoreBase):
         if self.index is None:
             raise ValueError("Collection not initialized. Call create_col first.")
 
-        index_to_delete = None
-        for idx, vid in self.index_to_id.items():
-            if vid == vector_id:
-                index_to_delete = idx
-                break
-
-        if index_to_delete is not None:
-            self.docstore.pop(vector_id, None)
-            self.index_to_id.pop(index_to_delete, None)
-
-            self._save()
+        with self._lock:
+            deleted = self._apply_delete(vector_id)
+            if deleted:
+                self._persist(("delete", vector_id))
 
+        if deleted:
             logger.info(f"Deleted vector {vector_id} from collection {self.collection_name}")
         else:
             logger.warning(f"Vector {vector_id} not found in collection {self.collection_name}")
 
+    def delete_batch(self, vector_ids: List[str]):
+        """
+        Delete several vectors by ID, removing all their index rows at once.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to delete.
+        """
+        if self.index is None:
+            raise ValueError("Collection not initialized. Call create_col first.")
+
+        with self._lock:
+            deleted = self._apply_delete_many(vector_ids)
+            if deleted:
+                self._persist(("delete_many", deleted))
+
+        logger.info(f"Deleted {len(deleted)} vectors from collection {self.collection_name}")
+
+    def delete_by_filter(self, filters: Dict):
+        """
+        Delete every vector whose payload matches the filters, found through the payload index.
+
+        Args:
+            filters (Dict): Filters to apply. Must not be empty.
+        """
+        if self.index is None:
+            raise ValueError("Collection not initialized. Call create_col first.")
+        if not filters:
+            raise ValueError("Filters are required to delete by filter. Use reset() to delete everything.")
+
+        with self._lock:
+            deleted = self._apply_delete_many(self._match_filters(filters))
+            if deleted:
+                self._persist(("delete_many", deleted))
+
+        logger.info(f"Deleted {len(deleted)} vectors from collection {self.collection_name}")
+
     def update(
         self,
         vector_id: str,
@@ -329,20 +1092,20 @@ class FAISS(VectorStoreBase):
         if self.index is None:
             raise ValueError("Collection not initialized. Call create_col first.")
 
-        if vector_id not in self.docstore:
-            raise ValueError(f"Vector {vector_id} not found")
-
-        current_payload = self.docstore[vector_id].copy()
+        with self._lock:
+            if vector_id not in self.docstore:
+                raise ValueError(f"Vector {vector_id} not found")
 
-        if payload is not None:
-            self.docstore[vector_id] = payload.copy()
             current_payload = self.docstore[vector_id].copy()
 
-        if vector is not None:
-            self.delete(vector_id)
-            self.insert([vector], [current_payload], [vector_id])
-        else:
-            self._save()
+            if payload is not None:
+                self._set_payload(vector_id, payload.copy())
+                current_payload = self.docstore[vector_id].copy()
+
+            if vector is not None:
+                self.insert([vector], [current_payload], [vector_id])
+            else:
+                self._persist(("payload", vector_id, current_payload))
 
         logger.info(f"Updated vector {vector_id} in collection {self.collection_name}")
 
@@ -394,23 +1157,33 @@ class FAISS(VectorStoreBase):
         """
         Delete a collection.
         """
-        if self.path:
-            try:
-                index_path = f"{self.path}/{self.collection_name}.faiss"
-                docstore_path = f"{self.path}/{self.collection_name}.pkl"
-
-                if os.path.exists(index_path):
-                    os.remove(index_path)
-                if os.path.exists(docstore_path):
-                    os.remove(docstore_path)
-
-                logger.info(f"Deleted collection {self.collection_name}")
-            except Exception as e:
-                logger.warning(f"Failed to delete collection: {e}")
-
-        self.index = None
-        self.docstore = {}
-        self.index_to_id = {}
+        with self._lock:
+            if self.path:
+                try:
+                    index_path = f"{self.path}/{self.collection_name}.faiss"
+                    docstore_path = f"{self.path}/{self.collection_name}.pkl"
+                    log_path = f"{self.path}/{self.collection_name}.log"
+
+                    self._close_log()
+                    if os.path.exists(index_path):
+                        os.remove(index_path)
+                    if os.path.exists(docstore_path):
+                        os.remove(docstore_path)
+                    if os.path.exists(log_path):
+                        os.remove(log_path)
+
+                    logger.info(f"Deleted collection {self.collection_name}")
+                except Exception as e:
+                    logger.warning(f"Failed to delete collection: {e}")
+
+            self.index = None
+            self.docstore = {}
+            self.index_to_id = {}
+            self.id_to_index = {}
+            self.tombstones = set()
+            self.next_row_id = 0
+            self.payload_index = {}
+            self._ops_since_snapshot = 0
 
     def col_info(self) -> Dict:
         """
@@ -424,7 +1197,9 @@ class FAISS(VectorStoreBase):
 
         return {
             "name": self.collection_name,
-            "count": self.index.ntotal,
+            "count": self.index.ntotal - len(self.tombstones),
+            "tombstones": len(self.tombstones),
+            "index_type": self.active_index_spec,
             "dimension": self.index.d,
             "distance": self.distance_strategy,
         }
@@ -446,11 +1221,10 @@ class FAISS(VectorStoreBase):
         results = []
         count = 0
 
-        for vector_id, payload in self.docstore.items():
-            if filters and not self._apply_filters(payload, filters):
-                continue
+        vector_ids = self._match_filters(filters) if filters else self.docstore
 
-            payload_copy = payload.copy()
+        for vector_id in vector_ids:
+            payload_copy = self.docstore[vector_id].copy()
 
             results.append(
                 OutputData(
@@ -466,6 +1240,37 @@ class FAISS(VectorStoreBase):
 
         return [results]
 
+    def list_page(self, filters: Optional[Dict] = None, limit: int = 100, cursor: Optional[int] = None):
+        """
+        List one page of vectors in row id order, resuming after the row id in `cursor`.
+
+        Only the `limit` lowest matching row ids past the cursor are kept while scanning, so a full walk never
+        holds more than one page of payloads.
+
+        Args:
+            filters (Optional[Dict], optional): Filters to apply to the list. Defaults to None.
+            limit (int, optional): Number of vectors to return. Defaults to 100.
+            cursor (Optional[int], optional): Row id returned with the previous page. Defaults to None.
+
+        Returns:
+            Tuple[List[OutputData], Optional[int]]: The page and the cursor of the next page, or None once the
+            listing is exhausted.
+        """
+        if self.index is None:
+            return [], None
+
+        vector_ids = self._match_filters(filters) if filters else self.docstore
+        row_ids = (self.id_to_index[vector_id] for vector_id in vector_ids)
+        if cursor is not None:
+            row_ids = (row_id for row_id in row_ids if row_id > cursor)
+        page_rows = heapq.nsmallest(limit, row_ids)
+
+        page = []
+        for row_id in page_rows:
+            vector_id = self.index_to_id[row_id]
+            page.append(OutputData(id=vector_id, score=None, payload=self.docstore[vector_id].copy()))
+        return page, (page_rows[-1] if len(page_rows) == limit else None)
+
     def reset(self):
         """Reset the index by deleting and recreating it."""
         logger.warning(f"Resetting index {self.collection_name}...")
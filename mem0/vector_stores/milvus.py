@@ -1,10 +1,9 @@
+import json
 import logging
-from typing import Dict, Optional
-
-from pydantic import BaseModel
+from typing import Optional
 
 from mem0.configs.vector_stores.milvus import MetricType
-from mem0.vector_stores.base import VectorStoreBase
+from mem0.vector_stores.base import OutputData, VectorStoreBase
 
 try:
     import pymilvus  # noqa: F401
@@ -16,12 +15,6 @@ from pymilvus import CollectionSchema, DataType, FieldSchema, MilvusClient
 logger = logging.getLogger(__name__)
 
 
-class OutputData(BaseModel):
-    id: Optional[str]  # memory id
-    score: Optional[float]  # distance
-    payload: Optional[Dict]  # metadata
-
-
 class MilvusDB(VectorStoreBase):
     def __init__(
         self,
@@ -31,6 +24,7 @@ class MilvusDB(VectorStoreBase):
         embedding_model_dims: int,
         metric_type: MetricType,
         db_name: str,
+        batch_size: int = 1000,
     ) -> None:
         """Initialize the MilvusDB database.
 
@@ -41,8 +35,10 @@ class MilvusDB(VectorStoreBase):
             embedding_model_dims (int): Dimensions of the embedding model (defaults to 1536).
             metric_type (MetricType): Metric type for similarity search (defaults to L2).
             db_name (str): Name of the database (defaults to "").
+            batch_size (int): Number of vectors sent per insert request (defaults to 1000).
         """
         self.collection_name = collection_name
+        self.batch_size = batch_size
         self.embedding_model_dims = embedding_model_dims
         self.metric_type = metric_type
         self.client = MilvusClient(uri=url, token=token, db_name=db_name)
@@ -83,16 +79,21 @@ class MilvusDB(VectorStoreBase):
             self.client.create_collection(collection_name=collection_name, schema=schema, index_params=index)
 
     def insert(self, ids, vectors, payloads, **kwargs: Optional[dict[str, any]]):
-        """Insert vectors into a collection.
+        """Insert vectors into a collection, sending `batch_size` vectors per request.
 
         Args:
             vectors (List[List[float]]): List of vectors to insert.
             payloads (List[Dict], optional): List of payloads corresponding to vectors.
             ids (List[str], optional): List of IDs corresponding to vectors.
         """
-        for idx, embedding, metadata in zip(ids, vectors, payloads):
-            data = {"id": idx, "vectors": embedding, "metadata": metadata}
-            self.client.insert(collection_name=self.collection_name, data=data, **kwargs)
+        rows = [
+            {"id": idx, "vectors": embedding, "metadata": metadata}
+            for idx, embedding, metadata in zip(ids, vectors, payloads)
+        ]
+        for start in range(0, len(rows), self.batch_size):
+            self.client.insert(
+                collection_name=self.collection_name, data=rows[start : start + self.batch_size], **kwargs
+            )
 
     def _create_filter(self, filters: dict):
         """Prepare filters for efficient query.
@@ -106,7 +107,8 @@ class MilvusDB(VectorStoreBase):
         operands = []
         for key, value in filters.items():
             if isinstance(value, str):
-                operands.append(f'(metadata["{key}"] == "{value}")')
+                # Quote through JSON so quotes and backslashes in the value cannot change the expression
+                operands.append(f'(metadata["{key}"] == {json.dumps(value)})')
             else:
                 operands.append(f'(metadata["{key}"] == {value})')
 
@@ -165,10 +167,39 @@ class MilvusDB(VectorStoreBase):
         Delete a vector by ID.
 
         Args:
-            vector_id (str): ID of the vector to delete.
+            vector_id (str | List[str]): ID of the vector to delete, or a list of IDs to delete in one request.
         """
         self.client.delete(collection_name=self.collection_name, ids=vector_id)
 
+    def delete_batch(self, vector_ids: list):
+        """
+        Delete several vectors by ID in one request.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to delete.
+        """
+        self.delete(list(vector_ids))
+
+    def delete_by_filter(self, filters: dict):
+        """
+        Delete every vector whose metadata matches the filters with a single filtered delete.
+
+        Args:
+            filters (Dict): Filters to apply. Must not be empty.
+        """
+        if not filters:
+            raise ValueError("Filters are required to delete by filter. Use reset() to delete everything.")
+        self.client.delete(collection_name=self.collection_name, filter=self._create_filter(filters))
+
+    def flush(self):
+        """
+        Seal the collection's growing segments and persist them.
+
+        Milvus flushes on its own in the background, so inserts never wait for it. Call this after a bulk
+        load to make the loaded vectors durable and indexed right away.
+        """
+        self.client.flush(collection_name=self.collection_name)
+
     def update(self, vector_id=None, vector=None, payload=None):
         """
         Update a vector and its payload.
@@ -240,6 +271,37 @@ class MilvusDB(VectorStoreBase):
             memories.append(obj)
         return [memories]
 
+    def list_page(self, filters: dict = None, limit: int = 100, cursor: str = None):
+        """
+        List one page of vectors in primary key order, resuming after the id in `cursor`.
+
+        Pages are read with an `id > cursor` predicate rather than an offset, so they stay cheap deep into the
+        collection and are not bound by Milvus' limit on offset + limit.
+
+        Args:
+            filters (dict, optional): Filters to apply to the list. Defaults to None.
+            limit (int, optional): Number of vectors to return. Defaults to 100.
+            cursor (str, optional): Id of the last vector of the previous page. Defaults to None.
+
+        Returns:
+            Tuple[List[OutputData], Optional[str]]: The page and the cursor of the next page, or None once the
+            listing is exhausted.
+        """
+        conditions = []
+        if filters:
+            conditions.append(f"({self._create_filter(filters)})")
+        if cursor is not None:
+            conditions.append(f"id > {json.dumps(cursor)}")
+        result = self.client.query(
+            collection_name=self.collection_name,
+            filter=" and ".join(conditions),
+            output_fields=["id", "metadata"],
+            limit=limit,
+        )
+        # Milvus merges query results in primary key order, so a page holds the lowest ids past the cursor
+        page = [OutputData(id=data.get("id"), score=None, payload=data.get("metadata")) for data in result]
+        return page, (max(memory.id for memory in page) if len(page) == limit else None)
+
     def reset(self):
         """Reset the index by deleting and recreating it."""
         logger.warning(f"Resetting index {self.collection_name}...")
@@ -1,7 +1,5 @@
 import logging
-from typing import Any, Dict, List, Optional
-
-from pydantic import BaseModel
+from typing import Any, Dict, List, Optional, Tuple
 
 try:
     from pymongo import MongoClient
@@ -10,23 +8,28 @@ try:
 except ImportError:
     raise ImportError("The 'pymongo' library is required. Please install it using 'pip install pymongo'.")
 
-from mem0.vector_stores.base import VectorStoreBase
+from mem0.vector_stores.base import OutputData, VectorStoreBase
 
 logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO)
 
 
-class OutputData(BaseModel):
-    id: Optional[str]
-    score: Optional[float]
-    payload: Optional[dict]
-
-
 class MongoDB(VectorStoreBase):
-    VECTOR_TYPE = "knnVector"
+    VECTOR_TYPE = "vector"
     SIMILARITY_METRIC = "cosine"
-
-    def __init__(self, db_name: str, collection_name: str, embedding_model_dims: int, mongo_uri: str):
+    # Payload keys declared as filter fields of the vector search index, so $vectorSearch can pre-filter on them
+    FILTER_FIELDS = ("user_id", "agent_id", "run_id", "actor_id")
+    # Upper bound Atlas accepts for numCandidates
+    MAX_NUM_CANDIDATES = 10000
+
+    def __init__(
+        self,
+        db_name: str,
+        collection_name: str,
+        embedding_model_dims: int,
+        mongo_uri: str,
+        num_candidates_multiplier: int = 10,
+    ):
         """
         Initialize the MongoDB vector store with vector search capabilities.
 
@@ -35,10 +38,17 @@ class MongoDB(VectorStoreBase):
             collection_name (str): Collection name
             embedding_model_dims (int): Dimension of the embedding vector
             mongo_uri (str): MongoDB connection URI
+            num_candidates_multiplier (int, optional): Nearest neighbors considered per requested result.
+                Defaults to 10.
         """
         self.collection_name = collection_name
         self.embedding_model_dims = embedding_model_dims
         self.db_name = db_name
+        self.num_candidates_multiplier = num_candidates_multiplier
+        self.index_name = f"{self.collection_name}_vector_index"
+        # Set once the search index is known to exist, so search does not list indexes on every query
+        self._index_ready = False
+        self._filter_fields = set()
 
         self.client = MongoClient(mongo_uri)
         self.db = self.client[db_name]
@@ -59,27 +69,24 @@ class MongoDB(VectorStoreBase):
             else:
                 collection = database[self.collection_name]
 
-            self.index_name = f"{self.collection_name}_vector_index"
-            found_indexes = list(collection.list_search_indexes(name=self.index_name))
-            if found_indexes:
+            if self._check_index(collection):
                 logger.info(f"Search index '{self.index_name}' already exists in collection '{self.collection_name}'.")
             else:
+                fields = [
+                    {
+                        "type": self.VECTOR_TYPE,
+                        "path": "embedding",
+                        "numDimensions": self.embedding_model_dims,
+                        "similarity": self.SIMILARITY_METRIC,
+                    }
+                ]
+                fields.extend({"type": "filter", "path": "payload." + key} for key in self.FILTER_FIELDS)
                 search_index_model = SearchIndexModel(
-                    name=self.index_name,
-                    definition={
-                        "mappings": {
-                            "dynamic": False,
-                            "fields": {
-                                "embedding": {
-                                    "type": self.VECTOR_TYPE,
-                                    "dimensions": self.embedding_model_dims,
-                                    "similarity": self.SIMILARITY_METRIC,
-                                }
-                            },
-                        }
-                    },
+                    name=self.index_name, type="vectorSearch", definition={"fields": fields}
                 )
                 collection.create_search_index(search_index_model)
+                self._index_ready = True
+                self._filter_fields = set(self.FILTER_FIELDS)
                 logger.info(
                     f"Search index '{self.index_name}' created successfully for collection '{self.collection_name}'."
                 )
@@ -88,6 +95,30 @@ class MongoDB(VectorStoreBase):
             logger.error(f"Error creating collection and search index: {e}")
             return None
 
+    def _check_index(self, collection) -> bool:
+        """
+        Look up the vector search index and remember which payload keys it can filter on.
+
+        Args:
+            collection: Collection holding the index.
+
+        Returns:
+            bool: True if the index exists.
+        """
+        found_indexes = list(collection.list_search_indexes(name=self.index_name))
+        if not found_indexes:
+            return False
+
+        # Indexes created before filter fields were declared can only be post-filtered with $match
+        definition = found_indexes[0].get("latestDefinition", {})
+        self._filter_fields = {
+            field["path"][len("payload.") :]
+            for field in definition.get("fields", [])
+            if field.get("type") == "filter" and field.get("path", "").startswith("payload.")
+        }
+        self._index_ready = True
+        return True
+
     def insert(
         self, vectors: List[List[float]], payloads: Optional[List[Dict]] = None, ids: Optional[List[str]] = None
     ) -> None:
@@ -124,39 +155,35 @@ class MongoDB(VectorStoreBase):
         Returns:
             List[OutputData]: Search results.
         """
-
-        found_indexes = list(self.collection.list_search_indexes(name=self.index_name))
-        if not found_indexes:
+        collection = self.client[self.db_name][self.collection_name]
+        if not self._index_ready and not self._check_index(collection):
             logger.error(f"Index '{self.index_name}' does not exist.")
             return []
 
+        num_candidates = min(max(limit * self.num_candidates_multiplier, limit), self.MAX_NUM_CANDIDATES)
+        vector_search = {
+            "index": self.index_name,
+            "limit": limit,
+            "numCandidates": num_candidates,
+            "queryVector": vectors,
+            "path": "embedding",
+        }
+        # Filters on indexed filter fields run inside $vectorSearch, so they do not shrink the result count
+        pre_filters, post_filters = [], []
+        for key, value in (filters or {}).items():
+            (pre_filters if key in self._filter_fields else post_filters).append({"payload." + key: value})
+        if pre_filters:
+            vector_search["filter"] = {"$and": pre_filters}
+
+        pipeline = [{"$vectorSearch": vector_search}]
+        if post_filters:
+            # Keys the index cannot filter on are matched afterwards, over every candidate instead of only limit
+            vector_search["limit"] = num_candidates
+            pipeline.extend([{"$match": {"$and": post_filters}}, {"$limit": limit}])
+        pipeline.extend([{"$set": {"score": {"$meta": "vectorSearchScore"}}}, {"$project": {"embedding": 0}}])
+
         results = []
         try:
-            collection = self.client[self.db_name][self.collection_name]
-            pipeline = [
-                {
-                    "$vectorSearch": {
-                        "index": self.index_name,
-                        "limit": limit,
-                        "numCandidates": limit,
-                        "queryVector": vectors,
-                        "path": "embedding",
-                    }
-                },
-                {"$set": {"score": {"$meta": "vectorSearchScore"}}},
-                {"$project": {"embedding": 0}},
-            ]
-
-            # Add filter stage if filters are provided
-            if filters:
-                filter_conditions = []
-                for key, value in filters.items():
-                    filter_conditions.append({"payload." + key: value})
-
-                if filter_conditions:
-                    # Add a $match stage after vector search to apply filters
-                    pipeline.insert(1, {"$match": {"$and": filter_conditions}})
-
             results = list(collection.aggregate(pipeline))
             logger.info(f"Vector search completed. Found {len(results)} documents.")
         except Exception as e:
@@ -182,6 +209,31 @@ class MongoDB(VectorStoreBase):
         except PyMongoError as e:
             logger.error(f"Error deleting document: {e}")
 
+    def delete_batch(self, vector_ids: List[str]) -> None:
+        """
+        Delete several vectors by ID with a single delete_many.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to delete.
+        """
+        try:
+            result = self.collection.delete_many({"_id": {"$in": list(vector_ids)}})
+            logger.info(f"Deleted {result.deleted_count} documents from collection '{self.collection_name}'.")
+        except PyMongoError as e:
+            logger.error(f"Error deleting documents: {e}")
+
+    def delete_by_filter(self, filters: Dict) -> None:
+        """
+        Delete every vector whose payload matches the filters with a single delete_many.
+
+        Args:
+            filters (Dict): Filters to apply. Must not be empty.
+        """
+        if not filters:
+            raise ValueError("Filters are required to delete by filter. Use reset() to delete everything.")
+        result = self.collection.delete_many({"$and": [{"payload." + key: value} for key, value in filters.items()]})
+        logger.info(f"Deleted {result.deleted_count} documents from collection '{self.collection_name}'.")
+
     def update(self, vector_id: str, vector: Optional[List[float]] = None, payload: Optional[Dict] = None) -> None:
         """
         Update a vector and its payload.
@@ -297,11 +349,36 @@ class MongoDB(VectorStoreBase):
             logger.error(f"Error listing documents: {e}")
             return []
 
+    def list_page(
+        self, filters: Optional[Dict] = None, limit: int = 100, cursor: Optional[str] = None
+    ) -> Tuple[List[OutputData], Optional[str]]:
+        """
+        List one page of vectors, resuming after the last document id of the previous page.
+
+        Args:
+            filters (Dict, optional): Filters to apply to the list.
+            limit (int, optional): Number of vectors to return. Defaults to 100.
+            cursor (str, optional): Cursor returned with the previous page. Defaults to None.
+
+        Returns:
+            Tuple[List[OutputData], Optional[str]]: The vectors and the cursor of the next page, or None after
+                the last page.
+        """
+        filter_conditions = [{"payload." + key: value} for key, value in (filters or {}).items()]
+        if cursor is not None:
+            filter_conditions.append({"_id": {"$gt": cursor}})
+        query = {"$and": filter_conditions} if filter_conditions else {}
+
+        documents = self.collection.find(query, {"embedding": 0}).sort("_id", 1).limit(limit)
+        page = [OutputData(id=str(doc["_id"]), score=None, payload=doc.get("payload")) for doc in documents]
+        return page, (page[-1].id if len(page) == limit else None)
+
     def reset(self):
         """Reset the index by deleting and recreating it."""
         logger.warning(f"Resetting index {self.collection_name}...")
         self.delete_col()
-        self.collection = self.create_col(self.collection_name)
+        self._index_ready = False
+        self.collection = self.create_col()
 
     def __del__(self) -> None:
         """Close the database connection when the object is deleted."""
@@ -1,9 +1,12 @@
 import json
 import logging
+import re
+import struct
+import uuid
 from contextlib import contextmanager
 from typing import Any, List, Optional
 
-from pydantic import BaseModel
+import numpy as np
 
 # Try to import psycopg (psycopg3) first, then fall back to psycopg2
 try:
@@ -25,15 +28,33 @@ except ImportError:
             "Please install one of them using 'pip install psycopg[pool]' or 'pip install psycopg2'"
         )
 
-from mem0.vector_stores.base import VectorStoreBase
+from mem0.vector_stores.base import OutputData, VectorStoreBase
 
 logger = logging.getLogger(__name__)
 
+# Payload fields copied into indexed columns, so filtering on them does not scan the JSONB payload
+FILTER_COLUMNS = ("user_id", "agent_id", "run_id", "actor_id")
 
-class OutputData(BaseModel):
-    id: Optional[str]
-    score: Optional[float]
-    payload: Optional[dict]
+# pgvector's default and largest hnsw.ef_search; an HNSW scan returns at most ef_search rows
+DEFAULT_HNSW_EF_SEARCH = 40
+MAX_HNSW_EF_SEARCH = 1000
+
+# First pgvector release with iterative index scans
+ITERATIVE_SCAN_MIN_VERSION = (0, 8)
+
+
+def _encode_vectors(vectors: List[List[float]]) -> List[bytes]:
+    """Encode vectors in pgvector's binary format: dimensions, an unused int16, then big-endian float4s."""
+    if not vectors:
+        return []
+    array = np.asarray(vectors, dtype=">f4")
+    header = struct.pack(">HH", array.shape[1], 0)
+    return [header + row.tobytes() for row in array]
+
+
+def _parse_version(version) -> Optional[tuple]:
+    match = re.match(r"(\d+)\.(\d+)", str(version))
+    return (int(match.group(1)), int(match.group(2))) if match else None
 
 
 class PGVector(VectorStoreBase):
@@ -53,6 +74,9 @@ class PGVector(VectorStoreBase):
         sslmode=None,
         connection_string=None,
         connection_pool=None,
+        hnsw_ef_search=None,
+        hnsw_iterative_scan="strict_order",
+        copy_threshold=32,
     ):
         """
         Initialize the PGVector database.
@@ -72,11 +96,19 @@ class PGVector(VectorStoreBase):
             sslmode (str, optional): SSL mode for PostgreSQL connection (e.g., 'require', 'prefer', 'disable')
             connection_string (str, optional): PostgreSQL connection string (overrides individual connection parameters)
             connection_pool (Any, optional): psycopg2 connection pool object (overrides connection string and individual parameters)
+            hnsw_ef_search (int, optional): Size of the HNSW candidate list. Raised to the search limit when lower.
+            hnsw_iterative_scan (str, optional): pgvector iterative scan mode ("off", "strict_order" or
+                "relaxed_order") used so filtered searches still return `limit` rows. Requires pgvector 0.8.
+            copy_threshold (int, optional): Inserts of at least this many vectors use a binary COPY with psycopg 3.
+                None disables COPY.
         """
         self.collection_name = collection_name
         self.use_diskann = diskann
         self.use_hnsw = hnsw
         self.embedding_model_dims = embedding_model_dims
+        self.hnsw_ef_search = hnsw_ef_search
+        self.hnsw_iterative_scan = hnsw_iterative_scan
+        self.copy_threshold = copy_threshold
         self.connection_pool = None
 
         # Connection setup with priority: connection_pool > connection_string > individual parameters
@@ -109,6 +141,9 @@ class PGVector(VectorStoreBase):
         collections = self.list_cols()
         if collection_name not in collections:
             self.create_col()
+        else:
+            self.filter_columns = self._existing_filter_columns()
+        self.pgvector_version = self._get_pgvector_version()
 
     @contextmanager
     def _get_cursor(self, commit: bool = False):
@@ -144,6 +179,30 @@ class PGVector(VectorStoreBase):
                 cur.close()
                 self.connection_pool.putconn(conn)
 
+    @contextmanager
+    def _get_autocommit_cursor(self):
+        """
+        Get a cursor whose statements each run outside a transaction block, as CREATE INDEX CONCURRENTLY requires.
+        """
+        if PSYCOPG_VERSION == 3:
+            with self.connection_pool.connection() as conn:
+                conn.autocommit = True
+                try:
+                    with conn.cursor() as cur:
+                        yield cur
+                finally:
+                    conn.autocommit = False
+        else:
+            conn = self.connection_pool.getconn()
+            conn.autocommit = True
+            cur = conn.cursor()
+            try:
+                yield cur
+            finally:
+                cur.close()
+                conn.autocommit = False
+                self.connection_pool.putconn(conn)
+
     def create_col(self) -> None:
         """
         Create a new collection (table in PostgreSQL).
@@ -156,10 +215,12 @@ class PGVector(VectorStoreBase):
                 CREATE TABLE IF NOT EXISTS {self.collection_name} (
                     id UUID PRIMARY KEY,
                     vector vector({self.embedding_model_dims}),
-                    payload JSONB
+                    payload JSONB,
+                    {", ".join(self._filter_column_definitions())}
                 );
                 """
             )
+            self._create_filter_indexes(cur)
             if self.use_diskann and self.embedding_model_dims < 2000:
                 cur.execute("SELECT * FROM pg_extension WHERE extname = 'vectorscale'")
                 if cur.fetchone():
@@ -179,9 +240,97 @@ class PGVector(VectorStoreBase):
                     USING hnsw (vector vector_cosine_ops)
                     """
                 )
+        self.filter_columns = FILTER_COLUMNS
+
+    def _filter_column_definitions(self) -> List[str]:
+        return [f"{column} TEXT GENERATED ALWAYS AS (payload->>'{column}') STORED" for column in FILTER_COLUMNS]
+
+    def _create_filter_indexes(self, cur) -> None:
+        for column in FILTER_COLUMNS:
+            cur.execute(
+                f"CREATE INDEX IF NOT EXISTS {self.collection_name}_{column}_idx ON {self.collection_name} ({column})"
+            )
+        cur.execute(
+            f"""
+            CREATE INDEX IF NOT EXISTS {self.collection_name}_payload_idx
+            ON {self.collection_name}
+            USING gin (payload jsonb_path_ops)
+            """
+        )
+
+    def _existing_filter_columns(self) -> tuple:
+        """Return the filter columns of an existing collection; ones created by earlier versions have none."""
+        with self._get_cursor() as cur:
+            cur.execute(
+                "SELECT column_name FROM information_schema.columns WHERE table_schema = 'public' AND table_name = %s",
+                (self.collection_name,),
+            )
+            existing_columns = {row[0] for row in cur.fetchall()}
+        filter_columns = tuple(column for column in FILTER_COLUMNS if column in existing_columns)
+        if len(filter_columns) < len(FILTER_COLUMNS):
+            logger.info(
+                f"{self.collection_name} has no filter columns for "
+                f"{', '.join(column for column in FILTER_COLUMNS if column not in filter_columns)}; filters on them "
+                "read the payload. Call migrate_filter_indexes() to index them."
+            )
+        return filter_columns
+
+    def migrate_filter_indexes(self) -> None:
+        """
+        Index the filter fields of a collection created before the filter columns existed.
+
+        Instead of adding the generated columns, which would rewrite the table under an exclusive lock, this
+        builds expression indexes on `payload->>field` for the missing columns and the GIN payload index, all
+        with CREATE INDEX CONCURRENTLY so reads and writes continue meanwhile. Filters on fields without a
+        column already compare `payload->>field`, so they use the new indexes once built. An interrupted build
+        leaves an invalid index behind; drop it and call this again.
+        """
+        missing = [column for column in FILTER_COLUMNS if column not in self.filter_columns]
+        with self._get_autocommit_cursor() as cur:
+            for column in missing:
+                logger.info(f"Building the {column} filter index of {self.collection_name}")
+                cur.execute(
+                    f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {self.collection_name}_{column}_expr_idx "
+                    f"ON {self.collection_name} ((payload->>'{column}'))"
+                )
+            cur.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {self.collection_name}_payload_idx "
+                f"ON {self.collection_name} USING gin (payload jsonb_path_ops)"
+            )
+
+    def _get_pgvector_version(self) -> Optional[tuple]:
+        with self._get_cursor() as cur:
+            cur.execute("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+            row = cur.fetchone()
+        return _parse_version(row[0]) if row else None
+
+    def _configure_search(self, cur, limit: int) -> None:
+        """
+        Tune the HNSW scan of the current transaction for a search returning `limit` rows.
+
+        Without this, a filtered HNSW scan stops after `hnsw.ef_search` candidates and can return fewer
+        rows than requested when most candidates belong to other users.
+        """
+        if not self.use_hnsw or (self.use_diskann and self.embedding_model_dims < 2000):
+            return
+
+        ef_search = min(max(self.hnsw_ef_search or DEFAULT_HNSW_EF_SEARCH, limit), MAX_HNSW_EF_SEARCH)
+        settings = [("hnsw.ef_search", str(ef_search))]
+        version = self.pgvector_version
+        if self.hnsw_iterative_scan and version is not None and version >= ITERATIVE_SCAN_MIN_VERSION:
+            settings.append(("hnsw.iterative_scan", self.hnsw_iterative_scan))
+
+        cur.execute(
+            "SELECT " + ", ".join(["set_config(%s, %s, true)"] * len(settings)),
+            [value for setting in settings for value in setting],
+        )
 
     def insert(self, vectors: list[list[float]], payloads=None, ids=None) -> None:
         logger.info(f"Inserting {len(vectors)} vectors into collection {self.collection_name}")
+        if PSYCOPG_VERSION == 3 and self.copy_threshold is not None and len(vectors) >= self.copy_threshold:
+            self._copy_insert(vectors, payloads, ids)
+            return
+
         json_payloads = [json.dumps(payload) for payload in payloads]
 
         data = [(id, vector, payload) for id, vector, payload in zip(ids, vectors, json_payloads)]
@@ -199,6 +348,21 @@ class PGVector(VectorStoreBase):
                     data,
                 )
 
+    def _copy_insert(self, vectors: List[List[float]], payloads: List[dict], ids: List[str]) -> None:
+        """
+        Insert rows with a binary COPY.
+
+        Vectors are sent in pgvector's binary format and payloads as binary JSONB, so neither is formatted
+        as text on the client or parsed on the server.
+        """
+        encoded_vectors = _encode_vectors(vectors)
+        with self._get_cursor(commit=True) as cur:
+            with cur.copy(f"COPY {self.collection_name} (id, vector, payload) FROM STDIN (FORMAT BINARY)") as copy:
+                # The vector is written as raw bytes, which the server decodes with pgvector's binary input
+                copy.set_types(["uuid", "bytea", "jsonb"])
+                for vector_id, vector, payload in zip(ids, encoded_vectors, payloads):
+                    copy.write_row((uuid.UUID(str(vector_id)), vector, payload))
+
     def search(
         self,
         query: str,
@@ -218,17 +382,10 @@ class PGVector(VectorStoreBase):
         Returns:
             list: Search results.
         """
-        filter_conditions = []
-        filter_params = []
-
-        if filters:
-            for k, v in filters.items():
-                filter_conditions.append("payload->>%s = %s")
-                filter_params.extend([k, str(v)])
-
-        filter_clause = "WHERE " + " AND ".join(filter_conditions) if filter_conditions else ""
+        filter_clause, filter_params = self._build_filter_clause(filters)
 
         with self._get_cursor() as cur:
+            self._configure_search(cur, limit)
             cur.execute(
                 f"""
                 SELECT id, vector <=> %s::vector AS distance, payload
@@ -243,6 +400,95 @@ class PGVector(VectorStoreBase):
             results = cur.fetchall()
         return [OutputData(id=str(r[0]), score=float(r[1]), payload=r[2]) for r in results]
 
+    def search_batch(
+        self,
+        queries: List[str],
+        vectors: List[list[float]],
+        limit: Optional[int] = 5,
+        filters: Optional[dict] = None,
+    ) -> List[List[OutputData]]:
+        """
+        Search for similar vectors for several queries in a single statement.
+
+        Args:
+            queries (List[str]): Queries.
+            vectors (List[List[float]]): One query vector per query.
+            limit (int, optional): Number of results to return per query. Defaults to 5.
+            filters (Dict, optional): Filters to apply to every query. Defaults to None.
+
+        Returns:
+            List[List[OutputData]]: Search results for each query.
+        """
+        if not vectors:
+            return []
+
+        filter_clause, filter_params = self._build_filter_clause(filters)
+        query_values = ", ".join(["(%s, %s::vector)"] * len(vectors))
+        query_params = [param for i, query_vector in enumerate(vectors) for param in (i, query_vector)]
+
+        with self._get_cursor() as cur:
+            self._configure_search(cur, limit)
+            cur.execute(
+                f"""
+                SELECT q.ord, m.id, m.distance, m.payload
+                FROM (VALUES {query_values}) AS q(ord, vec)
+                CROSS JOIN LATERAL (
+                    SELECT id, vector <=> q.vec AS distance, payload
+                    FROM {self.collection_name}
+                    {filter_clause}
+                    ORDER BY distance
+                    LIMIT %s
+                ) AS m
+                ORDER BY q.ord, m.distance
+                """,
+                (*query_params, *filter_params, limit),
+            )
+
+            results = cur.fetchall()
+
+        batch_results = [[] for _ in vectors]
+        for ord, vector_id, distance, payload in results:
+            batch_results[ord].append(OutputData(id=str(vector_id), score=float(distance), payload=payload))
+        return batch_results
+
+    def _build_filter_clause(self, filters: Optional[dict]) -> tuple[str, list]:
+        """
+        Build the WHERE clause matching payload fields against the filters.
+
+        Fields with their own column are compared on the column, and scoping fields of collections without the
+        column on `payload->>field`. The remaining fields with string values are matched together with a JSONB
+        containment test, which the GIN index on the payload serves; a string filter therefore does not match
+        a number stored under the same key. Other values are compared as text, so a filter of 5 matches both 5
+        and "5".
+
+        Args:
+            filters (Dict, optional): Filters to apply.
+
+        Returns:
+            tuple[str, list]: The WHERE clause (empty without filters) and its parameters.
+        """
+        filter_conditions = []
+        filter_params = []
+        payload_filters = {}
+
+        if filters:
+            for k, v in filters.items():
+                if k in self.filter_columns:
+                    filter_conditions.append(f"{k} = %s")
+                    filter_params.append(str(v))
+                elif k in FILTER_COLUMNS or not isinstance(v, str):
+                    filter_conditions.append("payload->>%s = %s")
+                    filter_params.extend([k, str(v)])
+                else:
+                    payload_filters[k] = v
+
+        if payload_filters:
+            filter_conditions.append("payload @> %s::jsonb")
+            filter_params.append(Json(payload_filters))
+
+        filter_clause = "WHERE " + " AND ".join(filter_conditions) if filter_conditions else ""
+        return filter_clause, filter_params
+
     def delete(self, vector_id: str) -> None:
         """
         Delete a vector by ID.
@@ -253,6 +499,29 @@ class PGVector(VectorStoreBase):
         with self._get_cursor(commit=True) as cur:
             cur.execute(f"DELETE FROM {self.collection_name} WHERE id = %s", (vector_id,))
 
+    def delete_batch(self, vector_ids: List[str]) -> None:
+        """
+        Delete several vectors by ID in a single statement.
+
+        Args:
+            vector_ids (List[str]): IDs of the vectors to delete.
+        """
+        with self._get_cursor(commit=True) as cur:
+            cur.execute(f"DELETE FROM {self.collection_name} WHERE id = ANY(%s::uuid[])", (list(vector_ids),))
+
+    def delete_by_filter(self, filters: dict) -> None:
+        """
+        Delete every vector whose payload matches the filters in a single statement.
+
+        Args:
+            filters (Dict): Filters to apply. Must not be empty.
+        """
+        if not filters:
+            raise ValueError("Filters are required to delete by filter. Use reset() to delete everything.")
+        filter_clause, filter_params = self._build_filter_clause(filters)
+        with self._get_cursor(commit=True) as cur:
+            cur.execute(f"DELETE FROM {self.collection_name} {filter_clause}", filter_params)
+
     def update(
         self,
         vector_id: str,
@@ -362,15 +631,7 @@ class PGVector(VectorStoreBase):
         Returns:
             List[OutputData]: List of vectors.
         """
-        filter_conditions = []
-        filter_params = []
-
-        if filters:
-            for k, v in filters.items():
-                filter_conditions.append("payload->>%s = %s")
-                filter_params.extend([k, str(v)])
-
-        filter_clause = "WHERE " + " AND ".join(filter_conditions) if filter_conditions else ""
+        filter_clause, filter_params = self._build_filter_clause(filters)
 
         query = f"""
             SELECT id, vector, payload
@@ -384,6 +645,43 @@ class PGVector(VectorStoreBase):
             results = cur.fetchall()
         return [[OutputData(id=str(r[0]), score=None, payload=r[2]) for r in results]]
 
+    def list_page(
+        self,
+        filters: Optional[dict] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> tuple[List[OutputData], Optional[str]]:
+        """
+        List one page of vectors using keyset pagination on the primary key.
+
+        Args:
+            filters (Dict, optional): Filters to apply to the list.
+            limit (int, optional): Number of vectors to return. Defaults to 100.
+            cursor (str, optional): Cursor returned with the previous page. Defaults to None.
+
+        Returns:
+            tuple[List[OutputData], Optional[str]]: The vectors and the cursor of the next page, or None after
+                the last page.
+        """
+        filter_clause, filter_params = self._build_filter_clause(filters)
+        if cursor is not None:
+            filter_clause = f"{filter_clause} AND id > %s" if filter_clause else "WHERE id > %s"
+            filter_params.append(cursor)
+
+        query = f"""
+            SELECT id, payload
+            FROM {self.collection_name}
+            {filter_clause}
+            ORDER BY id
+            LIMIT %s
+        """
+
+        with self._get_cursor() as cur:
+            cur.execute(query, (*filter_params, limit))
+            results = cur.fetchall()
+        page = [OutputData(id=str(r[0]), score=None, payload=r[1]) for r in results]
+        return page, (page[-1].id if len(page) == limit else None)
+
     def __del__(self) -> None:
         """
         Close the database connection pool when the object is deleted.
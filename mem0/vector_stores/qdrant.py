@@ -7,9 +7,11 @@ from qdrant_client.models import (
     Distance,
     FieldCondition,
     Filter,
+    FilterSelector,
     MatchValue,
     PointIdsList,
     PointStruct,
+    QueryRequest,
     Range,
     VectorParams,
 )
@@ -181,6 +183,32 @@ class Qdrant(VectorStoreBase):
         )
         return hits.points
 
+    def search_batch(self, queries: list, vectors: list, limit: int = 5, filters: dict = None) -> list:
+        """
+        Search for similar vectors for several queries in a single request.
+
+        Args:
+            queries (list): Queries.
+            vectors (list): One query vector per query.
+            limit (int, optional): Number of results to return per query. Defaults to 5.
+            filters (dict, optional): Filters to apply to every query. Defaults to None.
+
+        Returns:
+            list: Search results for each query.
+        """
+        if not vectors:
+            return []
+
+        query_filter = self._create_filter(filters) if filters else None
+        responses = self.client.query_batch_points(
+            collection_name=self.collection_name,
+            requests=[
+                QueryRequest(query=query_vector, filter=query_filter, limit=limit, with_payload=True)
+                for query_vector in vectors
+            ],
+        )
+        return [response.points for response in responses]
+
     def delete(self, vector_id: int):
         """
         Delete a vector by ID.
@@ -195,6 +223,32 @@ class Qdrant(VectorStoreBase):
             ),
         )
 
+    def delete_batch(self, vector_ids: list):
+        """
+        Delete several vectors by ID in one request.
+
+        Args:
+            vector_ids (list): IDs of the vectors to delete.
+        """
+        self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=PointIdsList(points=list(vector_ids)),
+        )
+
+    def delete_by_filter(self, filters: dict):
+        """
+        Delete every vector whose payload matches the filters with a single filtered delete.
+
+        Args:
+            filters (dict): Filters to apply. Must not be empty.
+        """
+        if not filters:
+            raise ValueError("Filters are required to delete by filter. Use reset() to delete everything.")
+        self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=FilterSelector(filter=self._create_filter(filters)),
+        )
+
     def update(self, vector_id: int, vector: list = None, payload: dict = None):
         """
         Update a vector and its payload.
@@ -263,6 +317,29 @@ class Qdrant(VectorStoreBase):
         )
         return result
 
+    def list_page(self, filters: dict = None, limit: int = 100, cursor=None) -> tuple:
+        """
+        List one page of vectors using Qdrant's scroll offsets.
+
+        Args:
+            filters (dict, optional): Filters to apply to the list. Defaults to None.
+            limit (int, optional): Number of vectors to return. Defaults to 100.
+            cursor (optional): Cursor returned with the previous page. Defaults to None.
+
+        Returns:
+            tuple: The vectors and the cursor of the next page, or None after the last page.
+        """
+        query_filter = self._create_filter(filters) if filters else None
+        points, next_offset = self.client.scroll(
+            collection_name=self.collection_name,
+            scroll_filter=query_filter,
+            limit=limit,
+            offset=cursor,
+            with_payload=True,
+            with_vectors=False,
+        )
+        return points, next_offset
+
     def reset(self):
         """Reset the index by deleting and recreating it."""
         logger.warning(f"Resetting index {self.collection_name}...")
@@ -6,13 +6,13 @@ from functools import reduce
 import numpy as np
 import pytz
 import redis
+from redis.commands.search.aggregation import AggregateRequest, Cursor
 from redis.commands.search.query import Query
 from redisvl.index import SearchIndex
 from redisvl.query import VectorQuery
 from redisvl.query.filter import Tag
 
-from mem0.memory.utils import extract_json
-from mem0.vector_stores.base import VectorStoreBase
+from mem0.vector_stores.base import OutputData, VectorStoreBase
 
 logger = logging.getLogger(__name__)
 
@@ -37,12 +37,64 @@ DEFAULT_FIELDS = [
 
 excluded_keys = {"user_id", "agent_id", "run_id", "hash", "data", "created_at", "updated_at"}
 
+SCOPE_FIELDS = ("agent_id", "run_id", "user_id")
 
-class MemoryResult:
-    def __init__(self, id: str, payload: dict, score: float = None):
-        self.id = id
-        self.payload = payload
-        self.score = score
+RETURN_FIELDS = ["memory_id", "hash", "agent_id", "run_id", "user_id", "memory", "metadata", "created_at", "updated_at"]
+
+# Number of matching keys looked up and unlinked per round trip by delete_by_filter
+DELETE_PAGE_SIZE = 1000
+
+_TIMEZONE = pytz.timezone("US/Pacific")
+
+
+def _format_timestamp(value) -> str:
+    return datetime.fromtimestamp(int(value), tz=_TIMEZONE).isoformat(timespec="microseconds")
+
+
+def _payload_from_fields(fields: dict) -> dict:
+    """Rebuild a memory payload from the fields of its Redis hash."""
+    payload = {"hash": fields["hash"], "data": fields["memory"], "created_at": _format_timestamp(fields["created_at"])}
+    if fields.get("updated_at"):
+        payload["updated_at"] = _format_timestamp(fields["updated_at"])
+    for field in SCOPE_FIELDS:
+        if field in fields:
+            payload[field] = fields[field]
+    if fields.get("metadata"):
+        payload.update(json.loads(fields["metadata"]))
+    return payload
+
+
+def _hash_fields(memory_id: str, embedding: np.ndarray, payload: dict) -> dict:
+    """Build the fields of the Redis hash storing a memory."""
+    fields = {
+        "memory_id": memory_id,
+        "hash": payload["hash"],
+        "memory": payload["data"],
+        "created_at": int(datetime.fromisoformat(payload["created_at"]).timestamp()),
+        "embedding": embedding.tobytes(),
+    }
+    if payload.get("updated_at"):
+        fields["updated_at"] = int(datetime.fromisoformat(payload["updated_at"]).timestamp())
+
+    # Conditionally add optional fields
+    for field in SCOPE_FIELDS:
+        if field in payload:
+            fields[field] = payload[field]
+
+    # Add metadata excluding specific keys
+    fields["metadata"] = json.dumps({k: v for k, v in payload.items() if k not in excluded_keys})
+    return fields
+
+
+def _row_fields(row: list) -> dict:
+    """Decode an FT.AGGREGATE result row, a flat list of field names and values, into a dict."""
+    values = [value.decode() if isinstance(value, bytes) else value for value in row]
+    return dict(zip(values[::2], values[1::2]))
+
+
+def _filter_expression(filters: dict):
+    conditions = [Tag(key) == value for key, value in filters.items() if value is not None]
+    return reduce(lambda x, y: x & y, conditions)
 
 
 class RedisDB(VectorStoreBase):
@@ -120,64 +172,35 @@ class RedisDB(VectorStoreBase):
         return index
 
     def insert(self, vectors: list, payloads: list = None, ids: list = None):
-        data = []
-        for vector, payload, id in zip(vectors, payloads, ids):
-            # Start with required fields
-            entry = {
-                "memory_id": id,
-                "hash": payload["hash"],
-                "memory": payload["data"],
-                "created_at": int(datetime.fromisoformat(payload["created_at"]).timestamp()),
-                "embedding": np.array(vector, dtype=np.float32).tobytes(),
-            }
-
-            # Conditionally add optional fields
-            for field in ["agent_id", "run_id", "user_id"]:
-                if field in payload:
-                    entry[field] = payload[field]
-
-            # Add metadata excluding specific keys
-            entry["metadata"] = json.dumps({k: v for k, v in payload.items() if k not in excluded_keys})
-
-            data.append(entry)
+        """
+        Insert vectors with their payloads.
+
+        All vectors are converted to float32 in one array and the hashes are written through redisvl's
+        non-transactional pipeline.
+
+        Args:
+            vectors (list): Vectors to insert.
+            payloads (list, optional): Payload of each vector.
+            ids (list, optional): ID of each vector.
+        """
+        embeddings = np.asarray(vectors, dtype=np.float32)
+        data = [_hash_fields(id, embedding, payload) for embedding, payload, id in zip(embeddings, payloads, ids)]
         self.index.load(data, id_field="memory_id")
 
     def search(self, query: str, vectors: list, limit: int = 5, filters: dict = None):
-        conditions = [Tag(key) == value for key, value in filters.items() if value is not None]
-        filter = reduce(lambda x, y: x & y, conditions)
-
         v = VectorQuery(
             vector=np.array(vectors, dtype=np.float32).tobytes(),
             vector_field_name="embedding",
-            return_fields=["memory_id", "hash", "agent_id", "run_id", "user_id", "memory", "metadata", "created_at"],
-            filter_expression=filter,
+            return_fields=RETURN_FIELDS,
+            filter_expression=_filter_expression(filters),
             num_results=limit,
         )
 
         results = self.index.query(v)
 
         return [
-            MemoryResult(
-                id=result["memory_id"],
-                score=result["vector_distance"],
-                payload={
-                    "hash": result["hash"],
-                    "data": result["memory"],
-                    "created_at": datetime.fromtimestamp(
-                        int(result["created_at"]), tz=pytz.timezone("US/Pacific")
-                    ).isoformat(timespec="microseconds"),
-                    **(
-                        {
-                            "updated_at": datetime.fromtimestamp(
-                                int(result["updated_at"]), tz=pytz.timezone("US/Pacific")
-                            ).isoformat(timespec="microseconds")
-                        }
-                        if "updated_at" in result
-                        else {}
-                    ),
-                    **{field: result[field] for field in ["agent_id", "run_id", "user_id"] if field in result},
-                    **{k: v for k, v in json.loads(extract_json(result["metadata"])).items()},
-                },
+            OutputData(
+                id=result["memory_id"], score=float(result["vector_distance"]), payload=_payload_from_fields(result)
             )
             for result in results
         ]
@@ -185,45 +208,43 @@ class RedisDB(VectorStoreBase):
     def delete(self, vector_id):
         self.index.drop_keys(f"{self.schema['index']['prefix']}:{vector_id}")
 
-    def update(self, vector_id=None, vector=None, payload=None):
-        data = {
-            "memory_id": vector_id,
-            "hash": payload["hash"],
-            "memory": payload["data"],
-            "created_at": int(datetime.fromisoformat(payload["created_at"]).timestamp()),
-            "updated_at": int(datetime.fromisoformat(payload["updated_at"]).timestamp()),
-            "embedding": np.array(vector, dtype=np.float32).tobytes(),
-        }
+    def delete_batch(self, vector_ids: list):
+        """
+        Unlink the hashes of several memories in one request.
+
+        Args:
+            vector_ids (list): IDs of the memories to delete.
+        """
+        prefix = self.schema["index"]["prefix"]
+        self.index.drop_keys([f"{prefix}:{vector_id}" for vector_id in vector_ids])
+
+    def delete_by_filter(self, filters: dict):
+        """
+        Delete every memory matching the filters.
 
-        for field in ["agent_id", "run_id", "user_id"]:
-            if field in payload:
-                data[field] = payload[field]
+        Matching keys are looked up a page at a time without their contents and unlinked in bulk, instead of
+        fetching and deleting each memory separately.
 
-        data["metadata"] = json.dumps({k: v for k, v in payload.items() if k not in excluded_keys})
+        Args:
+            filters (dict): Filters to apply. Must not be empty.
+        """
+        if not filters:
+            raise ValueError("Filters are required to delete by filter. Use reset() to delete everything.")
+
+        query = Query(str(_filter_expression(filters))).no_content().paging(0, DELETE_PAGE_SIZE)
+        while True:
+            keys = [doc.id for doc in self.index.search(query).docs]
+            if not keys:
+                break
+            self.index.drop_keys(keys)
+
+    def update(self, vector_id=None, vector=None, payload=None):
+        data = _hash_fields(vector_id, np.asarray(vector, dtype=np.float32), payload)
         self.index.load(data=[data], keys=[f"{self.schema['index']['prefix']}:{vector_id}"], id_field="memory_id")
 
     def get(self, vector_id):
         result = self.index.fetch(vector_id)
-        payload = {
-            "hash": result["hash"],
-            "data": result["memory"],
-            "created_at": datetime.fromtimestamp(int(result["created_at"]), tz=pytz.timezone("US/Pacific")).isoformat(
-                timespec="microseconds"
-            ),
-            **(
-                {
-                    "updated_at": datetime.fromtimestamp(
-                        int(result["updated_at"]), tz=pytz.timezone("US/Pacific")
-                    ).isoformat(timespec="microseconds")
-                }
-                if "updated_at" in result
-                else {}
-            ),
-            **{field: result[field] for field in ["agent_id", "run_id", "user_id"] if field in result},
-            **{k: v for k, v in json.loads(extract_json(result["metadata"])).items()},
-        }
-
-        return MemoryResult(id=result["memory_id"], payload=payload)
+        return OutputData(id=result["memory_id"], payload=_payload_from_fields(result))
 
     def list_cols(self):
         return self.index.listall()
@@ -256,40 +277,42 @@ class RedisDB(VectorStoreBase):
         """
         List all recent created memories from the vector store.
         """
-        conditions = [Tag(key) == value for key, value in filters.items() if value is not None]
-        filter = reduce(lambda x, y: x & y, conditions)
-        query = Query(str(filter)).sort_by("created_at", asc=False)
+        query = Query(str(_filter_expression(filters))).sort_by("created_at", asc=False)
         if limit is not None:
-            query = Query(str(filter)).sort_by("created_at", asc=False).paging(0, limit)
+            query = query.paging(0, limit)
 
         results = self.index.search(query)
         return [
-            [
-                MemoryResult(
-                    id=result["memory_id"],
-                    payload={
-                        "hash": result["hash"],
-                        "data": result["memory"],
-                        "created_at": datetime.fromtimestamp(
-                            int(result["created_at"]), tz=pytz.timezone("US/Pacific")
-                        ).isoformat(timespec="microseconds"),
-                        **(
-                            {
-                                "updated_at": datetime.fromtimestamp(
-                                    int(result["updated_at"]), tz=pytz.timezone("US/Pacific")
-                                ).isoformat(timespec="microseconds")
-                            }
-                            if result.__dict__.get("updated_at")
-                            else {}
-                        ),
-                        **{
-                            field: result[field]
-                            for field in ["agent_id", "run_id", "user_id"]
-                            if field in result.__dict__
-                        },
-                        **{k: v for k, v in json.loads(extract_json(result["metadata"])).items()},
-                    },
-                )
-                for result in results.docs
-            ]
+            [OutputData(id=result.memory_id, payload=_payload_from_fields(result.__dict__)) for result in results.docs]
         ]
+
+    def list_page(self, filters: dict = None, limit: int = 100, cursor: int = None):
+        """
+        List one page of memories through an FT.AGGREGATE cursor, so each page is read where the previous one stopped.
+
+        The cursor is a RediSearch server-side cursor; it expires once it has been idle for longer than the
+        server's cursor idle timeout (five minutes by default), after which the listing must be restarted.
+
+        Args:
+            filters (dict, optional): Filters to apply to the list. Defaults to None.
+            limit (int, optional): Number of memories to return. Defaults to 100.
+            cursor (int, optional): Cursor id returned with the previous page. Defaults to None.
+
+        Returns:
+            Tuple[List[OutputData], Optional[int]]: The page and the cursor of the next page, or None once the
+            listing is exhausted.
+        """
+        search = self.client.ft(self.schema["index"]["name"])
+        if cursor is None:
+            query = str(_filter_expression(filters)) if filters else "*"
+            request = AggregateRequest(query).load(*(f"@{field}" for field in RETURN_FIELDS)).cursor(count=limit)
+        else:
+            request = Cursor(cursor)
+            request.count = limit
+
+        result = search.aggregate(request)
+        page = []
+        for row in result.rows:
+            fields = _row_fields(row)
+            page.append(OutputData(id=fields["memory_id"], payload=_payload_from_fields(fields)))
+        return page, (result.cursor.cid or None)
@@ -23,6 +23,9 @@ from uuid import uuid4
 
 router = APIRouter(prefix="/api/v1/backup", tags=["backup"])
 
+# Number of memories embedded and upserted per request during import
+EMBED_BATCH_SIZE = 64
+
 class ExportRequest(BaseModel):
     user_id: str
     app_id: Optional[UUID] = None
@@ -427,6 +430,26 @@ async def import_backup(
                         "updated_at": m.get("updated_at"),
                     }
 
+        pending = []
+
+        def flush_pending():
+            if not pending:
+                return
+            ids = [str(new_id) for new_id, _, _ in pending]
+            try:
+                vecs = memory_client.embedding_model.embed_batch([content for _, content, _ in pending], "add")
+                vector_store.insert(vectors=vecs, payloads=[payload for _, _, payload in pending], ids=ids)
+            except Exception as e:
+                # Retry row by row so one bad memory does not drop the rest of the chunk
+                print(f"Batch vector upsert failed for memories {ids}, retrying per memory: {e}")
+                for new_id, content, payload in pending:
+                    try:
+                        vec = memory_client.embedding_model.embed(content, "add")
+                        vector_store.insert(vectors=[vec], payloads=[payload], ids=[str(new_id)])
+                    except Exception as row_error:
+                        print(f"Vector upsert failed for memory {new_id}: {row_error}")
+            pending.clear()
+
         for rec in iter_logical_records():
             old_id = rec["id"]
             new_id = old_to_new_id.get(old_id, UUID(old_id))
@@ -452,12 +475,11 @@ async def import_backup(
             payload["user_id"] = user_id
             payload.setdefault("source_app", "openmemory")
 
-            try:
-                vec = memory_client.embedding_model.embed(content, "add")
-                vector_store.insert(vectors=[vec], payloads=[payload], ids=[str(new_id)])
-            except Exception as e:
-                print(f"Vector upsert failed for memory {new_id}: {e}")
-                continue
+            pending.append((new_id, content, payload))
+            if len(pending) >= EMBED_BATCH_SIZE:
+                flush_pending()
+
+        flush_pending()
 
         return {"message": f'Import completed into user "{user_id}"'}
 
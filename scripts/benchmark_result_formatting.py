@@ -0,0 +1,96 @@
+"""
+Micro-benchmark of the search result path, from vector store rows to API result dicts.
+
+Compares the previous path (a pydantic OutputData per row, then a MemoryItem per hit dumped back to a dict)
+with the current one (slotted OutputData and `_format_memory`).
+
+Usage:
+    python scripts/benchmark_result_formatting.py [--limit 100] [--repeat 2000]
+"""
+
+import argparse
+import timeit
+from typing import Dict, Optional
+
+from pydantic import BaseModel
+
+from mem0.configs.base import MemoryItem
+from mem0.memory.main import _format_memory
+from mem0.vector_stores.base import OutputData
+
+PROMOTED_PAYLOAD_KEYS = ["user_id", "agent_id", "run_id", "actor_id", "role"]
+CORE_AND_PROMOTED_KEYS = {"data", "hash", "created_at", "updated_at", "id", *PROMOTED_PAYLOAD_KEYS}
+
+
+class PydanticOutputData(BaseModel):
+    id: Optional[str]
+    score: Optional[float]
+    payload: Optional[Dict]
+
+
+def make_rows(limit):
+    return [
+        (
+            f"memory-{i}",
+            1.0 / (i + 1),
+            {
+                "data": f"memory text {i}",
+                "hash": f"{i:032x}",
+                "created_at": "2025-01-01T00:00:00-08:00",
+                "updated_at": None,
+                "user_id": "alice",
+                "agent_id": "assistant",
+                "category": "preferences",
+            },
+        )
+        for i in range(limit)
+    ]
+
+
+def pydantic_path(rows):
+    results = []
+    for mem in [PydanticOutputData(id=i, score=s, payload=p) for i, s, p in rows]:
+        item = MemoryItem(
+            id=mem.id,
+            memory=mem.payload["data"],
+            hash=mem.payload.get("hash"),
+            created_at=mem.payload.get("created_at"),
+            updated_at=mem.payload.get("updated_at"),
+            score=mem.score,
+        ).model_dump()
+        for key in PROMOTED_PAYLOAD_KEYS:
+            if key in mem.payload:
+                item[key] = mem.payload[key]
+        additional_metadata = {k: v for k, v in mem.payload.items() if k not in CORE_AND_PROMOTED_KEYS}
+        if additional_metadata:
+            item["metadata"] = additional_metadata
+        results.append(item)
+    return results
+
+
+def slotted_path(rows):
+    return [
+        _format_memory(mem, include_score=True, score=mem.score)
+        for mem in [OutputData(id=i, score=s, payload=p) for i, s, p in rows]
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--limit", type=int, default=100, help="Hits per search")
+    parser.add_argument("--repeat", type=int, default=2000, help="Searches to format")
+    args = parser.parse_args()
+
+    rows = make_rows(args.limit)
+    assert pydantic_path(rows) == slotted_path(rows)
+
+    timings = {}
+    for name, path in (("pydantic", pydantic_path), ("slotted", slotted_path)):
+        seconds = min(timeit.repeat(lambda: path(rows), number=args.repeat, repeat=3))
+        timings[name] = seconds
+        print(f"{name:>8}: {seconds / args.repeat * 1e6:8.1f} us per search of {args.limit} hits")
+    print(f" speedup: {timings['pydantic'] / timings['slotted']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
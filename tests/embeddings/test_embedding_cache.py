@@ -0,0 +1,92 @@
+from unittest.mock import Mock
+
+import pytest
+
+from mem0.configs.embeddings.base import BaseEmbedderConfig
+from mem0.embeddings.cache import CachedEmbedding, EmbeddingCache
+from mem0.embeddings.configs import EmbedderConfig, EmbeddingCacheConfig
+from mem0.utils.factory import EmbedderFactory
+
+
+@pytest.fixture
+def mock_embedder():
+    embedder = Mock()
+    embedder.config = BaseEmbedderConfig(model="test-model", embedding_dims=3)
+    embedder.embed.side_effect = lambda text, memory_action=None: [float(len(text)), 0.5, 1.0]
+    embedder.embed_batch.side_effect = lambda texts, memory_action=None: [[float(len(t)), 0.5, 1.0] for t in texts]
+    return embedder
+
+
+def test_embed_hits_cache_on_repeat(mock_embedder):
+    cached = CachedEmbedding(mock_embedder, "openai", EmbeddingCache(max_bytes=1024))
+
+    first = cached.embed("alice", "add")
+    second = cached.embed("alice", "add")
+
+    assert first == second == [5.0, 0.5, 1.0]
+    assert mock_embedder.embed.call_count == 1
+    assert cached.stats()["hits"] == 1
+    assert cached.stats()["misses"] == 1
+
+
+def test_memory_action_is_part_of_the_key(mock_embedder):
+    cached = CachedEmbedding(mock_embedder, "openai", EmbeddingCache(max_bytes=1024))
+
+    cached.embed("alice", "add")
+    cached.embed("alice", "search")
+
+    assert mock_embedder.embed.call_count == 2
+
+
+def test_embed_batch_only_sends_misses(mock_embedder):
+    cached = CachedEmbedding(mock_embedder, "openai", EmbeddingCache(max_bytes=1024))
+    cached.embed("alice")
+
+    result = cached.embed_batch(["alice", "bob", "bob", "charlie"])
+
+    assert result == [[5.0, 0.5, 1.0], [3.0, 0.5, 1.0], [3.0, 0.5, 1.0], [7.0, 0.5, 1.0]]
+    mock_embedder.embed_batch.assert_called_once_with(["bob", "charlie"], None)
+
+
+def test_lru_evicts_by_byte_size(mock_embedder):
+    # Each vector is 3 float64 values = 24 bytes, so only two fit.
+    cache = EmbeddingCache(max_bytes=48)
+    cached = CachedEmbedding(mock_embedder, "openai", cache)
+
+    cached.embed_batch(["a", "bb", "ccc"])
+
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["bytes"] == 48
+    cached.embed("a")
+    assert mock_embedder.embed.call_count == 1
+
+
+def test_persistent_tier_survives_new_cache(mock_embedder, tmp_path):
+    db_path = str(tmp_path / "embedding_cache.db")
+    CachedEmbedding(mock_embedder, "openai", EmbeddingCache(max_bytes=1024, db_path=db_path)).embed("alice")
+
+    fresh_cache = EmbeddingCache(max_bytes=1024, db_path=db_path)
+    result = CachedEmbedding(mock_embedder, "openai", fresh_cache).embed("alice")
+
+    assert result == [5.0, 0.5, 1.0]
+    assert mock_embedder.embed.call_count == 1
+    assert fresh_cache.stats()["persistent_hits"] == 1
+    fresh_cache.close()
+
+
+def test_factory_wraps_embedder_when_cache_configured(mocker):
+    mocker.patch("mem0.embeddings.openai.OpenAI")
+    config = EmbedderConfig(provider="openai", config={}, cache={"max_bytes": 2048})
+
+    embedder = EmbedderFactory.create(config.provider, config.config, None, config.cache)
+
+    assert isinstance(embedder, CachedEmbedding)
+    assert embedder.config.model == "text-embedding-3-small"
+
+
+def test_factory_skips_cache_when_disabled(mocker):
+    mocker.patch("mem0.embeddings.openai.OpenAI")
+
+    embedder = EmbedderFactory.create("openai", {}, None, EmbeddingCacheConfig(enabled=False))
+
+    assert not isinstance(embedder, CachedEmbedding)
@@ -30,6 +30,17 @@ def test_embed_text(mock_ollama_client):
     assert embedding == [0.1, 0.2, 0.3, 0.4, 0.5]
 
 
+def test_embed_text_with_embed_endpoint(mock_ollama_client):
+    config = BaseEmbedderConfig(model="nomic-embed-text", embedding_dims=512, ollama_use_embed_endpoint=True)
+    embedder = OllamaEmbedding(config)
+
+    mock_ollama_client.embed.return_value = {"embeddings": [[0.1, 0.2]]}
+
+    assert embedder.embed("Sample text to embed.") == [0.1, 0.2]
+    mock_ollama_client.embed.assert_called_once_with(model="nomic-embed-text", input="Sample text to embed.")
+    mock_ollama_client.embeddings.assert_not_called()
+
+
 def test_ensure_model_exists(mock_ollama_client):
     config = BaseEmbedderConfig(model="nomic-embed-text", embedding_dims=512)
     embedder = OllamaEmbedding(config)
@@ -41,3 +52,28 @@ def test_ensure_model_exists(mock_ollama_client):
     embedder._ensure_model_exists()
 
     mock_ollama_client.pull.assert_called_once_with("nomic-embed-text")
+
+
+def test_embed_batch_stays_on_legacy_endpoint_by_default(mock_ollama_client):
+    config = BaseEmbedderConfig(model="nomic-embed-text", embedding_dims=512)
+    embedder = OllamaEmbedding(config)
+
+    mock_ollama_client.embeddings.side_effect = [{"embedding": [0.1, 0.2]}, {"embedding": [0.3, 0.4]}]
+
+    embeddings = embedder.embed_batch(["first", "second"])
+
+    mock_ollama_client.embed.assert_not_called()
+    assert embeddings == [[0.1, 0.2], [0.3, 0.4]]
+
+
+def test_embed_batch(mock_ollama_client):
+    config = BaseEmbedderConfig(model="nomic-embed-text", embedding_dims=512, ollama_use_embed_endpoint=True)
+    embedder = OllamaEmbedding(config)
+
+    mock_ollama_client.embed.return_value = {"embeddings": [[0.1, 0.2], [0.3, 0.4]]}
+
+    embeddings = embedder.embed_batch(["first", "second"])
+
+    mock_ollama_client.embed.assert_called_once_with(model="nomic-embed-text", input=["first", "second"])
+    mock_ollama_client.embeddings.assert_not_called()
+    assert embeddings == [[0.1, 0.2], [0.3, 0.4]]
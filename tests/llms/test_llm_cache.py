@@ -0,0 +1,103 @@
+from unittest.mock import patch
+
+from mem0.llms.cache import LLMResponseCache, get_shared_cache
+from mem0.llms.configs import LlmCacheConfig, LlmConfig
+
+MESSAGES = [{"role": "system", "content": "Extract facts"}, {"role": "user", "content": "I like tea"}]
+
+
+def test_get_returns_stored_response():
+    cache = LLMResponseCache(max_entries=10, ttl_seconds=60)
+    key = cache.make_key("openai", "gpt-4o-mini", MESSAGES)
+
+    assert cache.get(key) is None
+    cache.set(key, '{"facts": ["likes tea"]}')
+
+    assert cache.get(key) == '{"facts": ["likes tea"]}'
+    assert cache.stats() == {"hits": 1, "misses": 1, "persistent_hits": 0, "entries": 1}
+
+
+def test_key_ignores_surrounding_whitespace_but_not_model():
+    padded = [{"role": message["role"], "content": f"  {message['content']}\n"} for message in MESSAGES]
+
+    key = LLMResponseCache.make_key("openai", "gpt-4o-mini", MESSAGES)
+
+    assert LLMResponseCache.make_key("openai", "gpt-4o-mini", padded) == key
+    assert LLMResponseCache.make_key("openai", "gpt-4o", MESSAGES) != key
+    assert LLMResponseCache.make_key("openai", "gpt-4o-mini", MESSAGES, {"type": "json_object"}) != key
+
+
+def test_entries_expire_after_ttl():
+    cache = LLMResponseCache(max_entries=10, ttl_seconds=60)
+    with patch("mem0.llms.cache.time.time", return_value=1000.0):
+        cache.set("key", "response")
+    with patch("mem0.llms.cache.time.time", return_value=1059.0):
+        assert cache.get("key") == "response"
+    with patch("mem0.llms.cache.time.time", return_value=1061.0):
+        assert cache.get("key") is None
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = LLMResponseCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+
+def test_persistent_tier_survives_restart(tmp_path):
+    db_path = str(tmp_path / "llm_cache.db")
+    cache = LLMResponseCache(max_entries=10, ttl_seconds=60, db_path=db_path)
+    cache.set("key", "response")
+    cache.close()
+
+    reopened = LLMResponseCache(max_entries=10, ttl_seconds=60, db_path=db_path)
+
+    assert reopened.get("key") == "response"
+    assert reopened.stats()["persistent_hits"] == 1
+    reopened.close()
+
+
+def test_expired_rows_are_purged_periodically_not_on_every_write(tmp_path):
+    cache = LLMResponseCache(max_entries=10, ttl_seconds=60, db_path=str(tmp_path / "llm_cache.db"))
+    with patch("mem0.llms.cache.time.time", return_value=1000.0):
+        cache.set("old", "response")
+    with patch("mem0.llms.cache.time.time", return_value=2000.0), patch("mem0.memory.cache.PURGE_INTERVAL", 3):
+        cache.set("a", "1")
+        assert cache.connection.execute("SELECT count(*) FROM llm_responses").fetchone()[0] == 2
+        cache.set("b", "2")
+        keys = {row[0] for row in cache.connection.execute("SELECT key FROM llm_responses")}
+
+    assert keys == {"a", "b"}
+    indexes = {row[1] for row in cache.connection.execute("PRAGMA index_list(llm_responses)")}
+    assert "llm_responses_expires_at_idx" in indexes
+    cache.close()
+
+
+def test_persistent_tier_keeps_newest_rows(tmp_path):
+    cache = LLMResponseCache(
+        max_entries=10, ttl_seconds=60, db_path=str(tmp_path / "llm_cache.db"), max_persistent_entries=2
+    )
+    with patch("mem0.memory.cache.PURGE_INTERVAL", 1):
+        for key in ["a", "b", "a", "c"]:
+            cache.set(key, key)
+
+    keys = {row[0] for row in cache.connection.execute("SELECT key FROM llm_responses")}
+    assert keys == {"a", "c"}
+    cache.close()
+
+
+def test_shared_cache_per_settings():
+    config = LlmCacheConfig(max_entries=7)
+
+    assert get_shared_cache(config) is get_shared_cache(LlmCacheConfig(max_entries=7))
+    assert get_shared_cache(config) is not get_shared_cache(LlmCacheConfig(max_entries=8))
+
+
+def test_cache_is_opt_in():
+    assert LlmConfig().cache is None
+    assert LlmConfig(cache={"ttl_seconds": 5}).cache.ttl_seconds == 5
@@ -0,0 +1,61 @@
+import threading
+
+from mem0.memory.executor import MemoryExecutor
+
+
+def test_submit_returns_result_and_counts():
+    executor = MemoryExecutor(max_workers=2)
+
+    futures = [executor.submit(pow, 2, n) for n in range(5)]
+
+    assert [future.result() for future in futures] == [1, 2, 4, 8, 16]
+    stats = executor.stats()
+    assert stats["completed"] == 5
+    assert stats["queued"] == 0
+    assert stats["running"] == 0
+    executor.shutdown()
+
+
+def test_queue_depth_is_tracked():
+    executor = MemoryExecutor(max_workers=1, max_pending=3)
+    release = threading.Event()
+
+    futures = [executor.submit(release.wait) for _ in range(3)]
+    stats = executor.stats()
+    assert stats["running"] + stats["queued"] == 3
+    assert stats["max_queue_depth"] >= 2
+
+    release.set()
+    for future in futures:
+        future.result()
+    executor.shutdown()
+
+
+def test_submit_blocks_when_full():
+    executor = MemoryExecutor(max_workers=1, max_pending=1)
+    release = threading.Event()
+    executor.submit(release.wait)
+
+    submitted = threading.Event()
+
+    def submit_second():
+        executor.submit(lambda: None).result()
+        submitted.set()
+
+    thread = threading.Thread(target=submit_second)
+    thread.start()
+    assert not submitted.wait(0.1)
+
+    release.set()
+    thread.join(timeout=5)
+    assert submitted.is_set()
+    executor.shutdown()
+
+
+def test_exceptions_release_slot():
+    executor = MemoryExecutor(max_workers=1, max_pending=1)
+
+    future = executor.submit(lambda: 1 / 0)
+    assert isinstance(future.exception(), ZeroDivisionError)
+    assert executor.submit(lambda: "ok").result() == "ok"
+    executor.shutdown()
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from mem0.graphs.bm25 import BM25Scorer, rerank_relations
+
+CORPUS = [
+    ["alice", "knows", "bob"],
+    ["alice", "works", "with", "charlie"],
+    ["bob", "lives", "in", "new", "york"],
+    ["charlie", "likes", "tea"],
+    ["alice", "likes", "coffee"],
+]
+
+
+def test_scores_match_rank_bm25():
+    rank_bm25 = pytest.importorskip("rank_bm25")
+    query = ["alice", "likes", "tea", "tea", "unknown"]
+
+    expected = rank_bm25.BM25Okapi(CORPUS).get_scores(query)
+
+    np.testing.assert_allclose(BM25Scorer(CORPUS).get_scores(query), expected, rtol=1e-5)
+
+
+def test_top_n_orders_by_score_then_corpus_position():
+    scorer = BM25Scorer(CORPUS)
+
+    assert scorer.top_n(["likes", "tea"], 2) == [3, 4]
+    assert scorer.top_n(["alice"], 10) == [0, 4, 1, 2, 3]
+    assert scorer.top_n(["unknown"], 2) == [0, 1]
+
+
+def test_empty_corpus():
+    scorer = BM25Scorer([])
+
+    assert scorer.get_scores(["alice"]).size == 0
+    assert scorer.top_n(["alice"], 5) == []
+
+
+def test_rerank_relations_tokenizes_entities_and_query():
+    relations = [
+        {"source": "alice", "relationship": "knows", "destination": "bob", "relation_id": 1},
+        {"source": "bob", "relationship": "lives_in", "destination": "new_york", "relation_id": 2},
+        {"source": "alice", "relationship": "likes", "destination": "tea", "relation_id": 3},
+    ]
+
+    results = rerank_relations("Where does Bob live? New York?", relations, n=2)
+
+    assert results[0] == {"source": "bob", "relationship": "lives_in", "destination": "new_york"}
+    assert len(results) == 2
@@ -42,7 +42,11 @@ class TestKuzu:
         def mock_embed(text):
             return self.embeddings[text]
 
+        def mock_embed_batch(texts):
+            return [self.embeddings[text] for text in texts]
+
         mock_model.embed.side_effect = mock_embed
+        mock_model.embed_batch.side_effect = mock_embed_batch
         return mock_model
 
     @pytest.fixture
@@ -159,6 +163,73 @@ class TestKuzu:
         assert get_node_count(kuzu_memory) == 0
         assert get_edge_count(kuzu_memory) == 0
 
+    @patch("mem0.memory.kuzu_memory.EmbedderFactory")
+    @patch("mem0.memory.kuzu_memory.LlmFactory")
+    def test_add_entities_in_one_batch(
+        self, mock_llm_factory, mock_embedder_factory, mock_config, mock_embedding_model, mock_llm
+    ):
+        """Test that a batch of relations is written with a fixed number of queries"""
+        mock_embedder_factory.create.return_value = mock_embedding_model
+        mock_llm_factory.create.return_value = mock_llm
+
+        kuzu_memory = MemoryGraph(mock_config)
+        filters = {"user_id": "test_user"}
+        kuzu_memory._add_entities([{"source": "alice", "destination": "bob", "relationship": "knows"}], filters, {})
+
+        data = [
+            {"source": "alice", "destination": "bob", "relationship": "knows"},
+            {"source": "bob", "destination": "charlie", "relationship": "knows"},
+            {"source": "charlie", "destination": "dave", "relationship": "likes"},
+            {"source": "alice", "destination": "bob", "relationship": "knows"},
+        ]
+        with patch.object(kuzu_memory, "kuzu_execute", wraps=kuzu_memory.kuzu_execute) as spy:
+            result = kuzu_memory._add_entities(data, filters, {})
+
+        # resolve, begin, existing nodes, new nodes, relationships, commit
+        assert spy.call_count == 6
+        assert result[0] == [{"source": "alice", "relationship": "knows", "target": "bob"}]
+        assert result[3] == result[0]
+        assert get_node_count(kuzu_memory) == 4
+        assert get_edge_count(kuzu_memory) == 3
+
+        mentions = kuzu_memory.kuzu_execute(
+            "MATCH (n:Entity)-[r:CONNECTED_TO]->(m:Entity) WHERE n.name = 'alice' "
+            "RETURN n.mentions AS n, r.mentions AS r"
+        )
+        assert mentions == [{"n": 3, "r": 3}]
+
+
+    @patch("mem0.memory.kuzu_memory.EmbedderFactory")
+    @patch("mem0.memory.kuzu_memory.LlmFactory")
+    def test_search_graph_db_in_one_query(
+        self, mock_llm_factory, mock_embedder_factory, mock_config, mock_embedding_model, mock_llm
+    ):
+        """Test that all entities are searched with one query and shared relations are returned once"""
+        mock_embedder_factory.create.return_value = mock_embedding_model
+        mock_llm_factory.create.return_value = mock_llm
+
+        kuzu_memory = MemoryGraph(mock_config)
+        filters = {"user_id": "test_user"}
+        data = [
+            {"source": "alice", "destination": "bob", "relationship": "knows"},
+            {"source": "bob", "destination": "charlie", "relationship": "knows"},
+            {"source": "charlie", "destination": "dave", "relationship": "likes"},
+        ]
+        kuzu_memory._add_entities(data, filters, {})
+
+        with patch.object(kuzu_memory, "kuzu_execute", wraps=kuzu_memory.kuzu_execute) as spy:
+            results = kuzu_memory._search_graph_db(["alice", "bob"], filters, threshold=0.99)
+
+        assert spy.call_count == 1
+        assert sorted(f"{r['source']}_{r['relationship']}_{r['destination']}" for r in results) == [
+            "alice_knows_bob",
+            "bob_knows_charlie",
+        ]
+
+        results = kuzu_memory._search_graph_db(["bob"], filters, limit=1, threshold=0.99)
+        assert len(results) == 1
+
+
 def get_node_count(kuzu_memory):
     results = kuzu_memory.kuzu_execute(
         """
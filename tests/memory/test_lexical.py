@@ -0,0 +1,187 @@
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from mem0.memory.lexical import LexicalIndex, reciprocal_rank_fusion, tokenize
+from mem0.vector_stores.base import OutputData
+
+
+def _loaded_index(*memories, filters=None):
+    vector_store = MagicMock()
+    vector_store.list_page.return_value = (
+        [OutputData(id=memory_id, payload=payload) for memory_id, payload in memories],
+        None,
+    )
+    index = LexicalIndex()
+    index.ensure_loaded(vector_store, filters or {"user_id": "alice"})
+    return index, vector_store
+
+
+def test_tokenize_splits_identifiers():
+    assert tokenize("Order SKU-4711 shipped!") == ["order", "sku", "4711", "shipped"]
+
+
+def test_reciprocal_rank_fusion_rewards_agreement():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "d"]], k=60)
+
+    assert [item for item, _ in fused] == ["b", "a", "d", "c"]
+    assert fused[0][1] == 1 / 62 + 1 / 61
+
+
+def test_search_ranks_rare_terms_higher():
+    index, _ = _loaded_index(
+        ("1", {"data": "ordered a blue shirt", "user_id": "alice"}),
+        ("2", {"data": "ordered SKU-4711 yesterday", "user_id": "alice"}),
+        ("3", {"data": "ordered a red shirt", "user_id": "alice"}),
+    )
+
+    results = index.search("where is sku 4711", {"user_id": "alice"}, limit=5)
+
+    assert [memory_id for memory_id, _ in results] == ["2"]
+    assert results[0][1] > 0
+
+
+def test_ensure_loaded_reads_each_scope_once():
+    index, vector_store = _loaded_index(("1", {"data": "likes tea", "user_id": "alice"}))
+
+    index.ensure_loaded(vector_store, {"user_id": "alice"})
+    index.ensure_loaded(vector_store, {"user_id": "alice", "agent_id": "assistant"})
+
+    vector_store.list_page.assert_called_once()
+    assert vector_store.list_page.call_args.kwargs["filters"] == {"user_id": "alice"}
+
+
+def test_ensure_loaded_follows_cursor():
+    vector_store = MagicMock()
+    vector_store.list_page.side_effect = [
+        ([OutputData(id="1", payload={"data": "likes tea", "user_id": "alice"})], "cursor-1"),
+        ([OutputData(id="2", payload={"data": "drinks coffee", "user_id": "alice"})], None),
+    ]
+    index = LexicalIndex()
+
+    index.ensure_loaded(vector_store, {"user_id": "alice", "category": "food"})
+
+    assert index.stats() == {"memories": 2, "scopes": 1, "loaded": 1}
+    assert vector_store.list_page.call_args_list[0].kwargs["filters"] == {"user_id": "alice"}
+
+
+def test_writes_keep_index_current():
+    index, _ = _loaded_index(("1", {"data": "likes tea", "user_id": "alice"}))
+
+    index.add("2", {"data": "likes green tea", "user_id": "alice"})
+    index.add("1", {"data": "likes coffee", "user_id": "alice"})
+    assert [memory_id for memory_id, _ in index.search("tea", {"user_id": "alice"}, 5)] == ["2"]
+
+    index.remove("2")
+    assert index.search("tea", {"user_id": "alice"}, 5) == []
+    assert index.stats()["memories"] == 1
+
+
+def test_writes_to_unloaded_scopes_are_ignored():
+    index, _ = _loaded_index(("1", {"data": "likes tea", "user_id": "alice"}))
+
+    index.add("2", {"data": "likes tea", "user_id": "bob"})
+
+    assert index.stats()["memories"] == 1
+    assert index.search("tea", {"user_id": "bob"}, 5) == []
+
+
+def test_search_applies_only_scope_filters():
+    index, _ = _loaded_index(
+        ("1", {"data": "likes tea", "user_id": "alice", "agent_id": "a"}),
+        ("2", {"data": "likes tea", "user_id": "alice", "agent_id": "b", "topic": "food"}),
+        filters={"user_id": "alice"},
+    )
+
+    assert [r[0] for r in index.search("tea", {"user_id": "alice", "agent_id": "b"}, 5)] == ["2"]
+    # Filters on other payload fields are left to the caller, which fetches the payloads
+    assert len(index.search("tea", {"user_id": "alice", "topic": "food"}, 5)) == 2
+    assert len(index.search("tea", {"user_id": "alice"}, 5)) == 2
+
+
+def test_remove_matching_and_clear():
+    index, _ = _loaded_index(
+        ("1", {"data": "likes tea", "user_id": "alice", "run_id": "r1"}),
+        ("2", {"data": "likes tea", "user_id": "alice", "run_id": "r2"}),
+    )
+
+    index.remove_matching({"run_id": "r1"})
+    assert [r[0] for r in index.search("tea", {"user_id": "alice"}, 5)] == ["2"]
+
+    index.clear()
+    assert index.stats() == {"memories": 0, "scopes": 0, "loaded": 0}
+
+
+def test_index_keeps_no_payloads():
+    index, _ = _loaded_index(("1", {"data": "likes tea", "user_id": "alice", "secret": "x"}))
+
+    assert index._memories == {"1": (("alice", None, None), ["likes", "tea"])}
+
+
+def test_least_recently_searched_scope_is_evicted():
+    vector_store = MagicMock()
+    vector_store.list_page.side_effect = lambda filters, limit, cursor: (
+        [OutputData(id=filters["user_id"], payload={"data": "likes tea", **filters})],
+        None,
+    )
+    index = LexicalIndex(max_scopes=2)
+
+    index.ensure_loaded(vector_store, {"user_id": "alice"})
+    index.ensure_loaded(vector_store, {"user_id": "bob"})
+    index.ensure_loaded(vector_store, {"user_id": "alice"})
+    index.ensure_loaded(vector_store, {"user_id": "carol"})
+
+    assert index.stats() == {"memories": 2, "scopes": 2, "loaded": 2}
+    assert index.search("tea", {"user_id": "bob"}, 5) == []
+    assert [r[0] for r in index.search("tea", {"user_id": "alice"}, 5)] == ["alice"]
+    index.add("bob-2", {"data": "likes tea", "user_id": "bob"})
+    assert index.stats()["memories"] == 2
+
+
+def test_failed_load_is_undone_and_retried():
+    vector_store = MagicMock()
+    vector_store.list_page.side_effect = [
+        ([OutputData(id="1", payload={"data": "likes tea", "user_id": "alice"})], "cursor-1"),
+        ConnectionError("store unavailable"),
+        ([OutputData(id="1", payload={"data": "likes tea", "user_id": "alice"})], "cursor-1"),
+        ([OutputData(id="2", payload={"data": "drinks green tea", "user_id": "alice"})], None),
+    ]
+    index = LexicalIndex()
+
+    with pytest.raises(ConnectionError):
+        index.ensure_loaded(vector_store, {"user_id": "alice"})
+    assert index.stats() == {"memories": 0, "scopes": 0, "loaded": 0}
+
+    index.ensure_loaded(vector_store, {"user_id": "alice"})
+    assert sorted(r[0] for r in index.search("tea", {"user_id": "alice"}, 5)) == ["1", "2"]
+
+
+def test_concurrent_search_waits_for_the_scope_to_load():
+    first_page_read = threading.Event()
+    release = threading.Event()
+
+    def list_page(filters, limit, cursor):
+        if cursor is None:
+            first_page_read.set()
+            release.wait(5)
+            return [OutputData(id="1", payload={"data": "likes tea", "user_id": "alice"})], "cursor-1"
+        return [OutputData(id="2", payload={"data": "drinks green tea", "user_id": "alice"})], None
+
+    vector_store = MagicMock()
+    vector_store.list_page.side_effect = list_page
+    index = LexicalIndex()
+    loader = threading.Thread(target=index.ensure_loaded, args=(vector_store, {"user_id": "alice"}))
+    loader.start()
+    first_page_read.wait(5)
+
+    waiter = threading.Thread(target=index.ensure_loaded, args=(vector_store, {"user_id": "alice"}))
+    waiter.start()
+    waiter.join(0.1)
+    assert waiter.is_alive()
+
+    release.set()
+    waiter.join(5)
+    loader.join(5)
+    assert vector_store.list_page.call_count == 2
+    assert index.stats()["memories"] == 2
@@ -3,7 +3,10 @@ from unittest.mock import MagicMock
 
 import pytest
 
-from mem0.memory.main import AsyncMemory, Memory
+from mem0.configs.base import MemoryItem
+from mem0.llms.cache import LLMResponseCache
+from mem0.memory.main import AsyncMemory, Memory, _format_memory
+from mem0.vector_stores.base import OutputData, VectorStoreBase
 
 
 def _setup_mocks(mocker):
@@ -76,6 +79,60 @@ class TestAddToVectorStoreErrors:
         assert result == []  # Should return empty list when no memories processed
         assert "Invalid JSON response" in caplog.text
 
+    def test_fact_embeddings_are_batched(self, mocker, mock_memory):
+        """Test that all extracted facts are embedded with a single batch call"""
+        mock_memory.llm.generate_response.side_effect = ['{"facts": ["fact one", "fact two"]}', '{"memory": []}']
+        mock_memory.embedding_model.embed_batch.return_value = [[0.1, 0.2], [0.3, 0.4]]
+        mock_memory.vector_store.search.return_value = []
+        mocker.patch("mem0.memory.main.capture_event")
+
+        mock_memory._add_to_vector_store(
+            messages=[{"role": "user", "content": "test"}], metadata={}, filters={}, infer=True
+        )
+
+        mock_memory.embedding_model.embed_batch.assert_called_once_with(["fact one", "fact two"], "add")
+        mock_memory.embedding_model.embed.assert_not_called()
+        # Per-fact searches run concurrently, so they may complete in any order
+        assert sorted(call.kwargs["vectors"] for call in mock_memory.vector_store.search.call_args_list) == [
+            [0.1, 0.2],
+            [0.3, 0.4],
+        ]
+        # ... on the instance executor, so they count towards its backpressure and stats
+        assert mock_memory.executor_stats()["completed"] == 2
+
+    def test_single_fact_search_does_not_create_executor(self, mocker, mock_memory):
+        """Test that one fact is searched inline, without creating the instance executor"""
+        mock_memory.llm.generate_response.side_effect = ['{"facts": ["fact one"]}', '{"memory": []}']
+        mock_memory.embedding_model.embed_batch.return_value = [[0.1, 0.2]]
+        mock_memory.vector_store.search.return_value = []
+        mocker.patch("mem0.memory.main.capture_event")
+
+        mock_memory._add_to_vector_store(
+            messages=[{"role": "user", "content": "test"}], metadata={}, filters={}, infer=True
+        )
+
+        mock_memory.vector_store.search.assert_called_once()
+        assert mock_memory._executor is None
+
+    def test_fact_searches_use_search_batch_when_supported(self, mocker, mock_memory):
+        """Test that a vector store with a native multi-query search is queried once for all facts"""
+        mock_memory.llm.generate_response.side_effect = ['{"facts": ["fact one", "fact two"]}', '{"memory": []}']
+        mock_memory.embedding_model.embed_batch.return_value = [[0.1, 0.2], [0.3, 0.4]]
+        mock_memory.vector_store.search_batch.return_value = [[], []]
+        mocker.patch("mem0.memory.main._supports_search_batch", return_value=True)
+        mocker.patch("mem0.memory.main.capture_event")
+
+        mock_memory._add_to_vector_store(
+            messages=[{"role": "user", "content": "test"}], metadata={}, filters={"user_id": "alice"}, infer=True
+        )
+
+        mock_memory.vector_store.search_batch.assert_called_once_with(
+            queries=["fact one", "fact two"], vectors=[[0.1, 0.2], [0.3, 0.4]], limit=5, filters={"user_id": "alice"}
+        )
+        mock_memory.vector_store.search.assert_not_called()
+        # Nothing runs on the executor, so it is never created
+        assert mock_memory._executor is None
+
 
 @pytest.mark.asyncio
 class TestAsyncAddToVectorStoreErrors:
@@ -125,3 +182,526 @@ class TestAsyncAddToVectorStoreErrors:
         assert result == []
         assert "Invalid JSON response" in caplog.text
         assert mock_capture_event.call_count == 1
+
+
+class TestMemoryExecutor:
+    @pytest.fixture
+    def memory(self, mocker):
+        _setup_mocks(mocker)
+        return Memory()
+
+    def test_no_executor_without_graph(self, memory):
+        """Test that operations run inline and no thread pool is created when the graph is disabled"""
+        vector_result, graph_result = memory._run_with_graph(lambda: "vector", lambda: "graph")
+
+        assert (vector_result, graph_result) == ("vector", None)
+        assert memory._executor is None
+        assert memory.executor_stats()["completed"] == 0
+
+    def test_executor_reused_with_graph(self, memory):
+        """Test that graph operations share one long-lived executor per instance"""
+        memory.enable_graph = True
+
+        assert memory._run_with_graph(lambda: "vector", lambda: "graph") == ("vector", "graph")
+        executor = memory._executor
+        assert memory._run_with_graph(lambda: "vector", lambda: "graph") == ("vector", "graph")
+
+        assert memory._executor is executor
+        assert memory.executor_stats()["completed"] == 2
+
+        memory.close()
+        assert memory._executor is None
+
+
+class TestFormatMemory:
+    PAYLOAD = {
+        "data": "likes tea",
+        "hash": "abc",
+        "created_at": "2025-01-01T00:00:00",
+        "user_id": "alice",
+        "role": "user",
+        "topic": "food",
+    }
+
+    @pytest.mark.parametrize(
+        "payload", [PAYLOAD, {"data": "likes tea"}, {**PAYLOAD, "updated_at": "2025-01-02T00:00:00"}]
+    )
+    def test_matches_memory_item_dump(self, payload):
+        """Test that the formatted memory matches what the MemoryItem model produced, key order included"""
+        mem = OutputData(id="1", score=0.5, payload=payload)
+        expected = MemoryItem(
+            id=mem.id,
+            memory=payload["data"],
+            hash=payload.get("hash"),
+            created_at=payload.get("created_at"),
+            updated_at=payload.get("updated_at"),
+            score=mem.score,
+        ).model_dump()
+        for key in ("user_id", "agent_id", "run_id", "actor_id", "role"):
+            if key in payload:
+                expected[key] = payload[key]
+        if "topic" in payload:
+            expected["metadata"] = {"topic": payload["topic"]}
+
+        formatted = _format_memory(mem, include_score=True, score=mem.score)
+
+        assert formatted == expected
+        assert list(formatted) == list(expected)
+        unscored = dict(expected)
+        del unscored["score"]
+        assert list(_format_memory(mem)) == list(unscored)
+
+
+class TestIterAll:
+    @pytest.fixture
+    def mock_memory(self, mocker):
+        _setup_mocks(mocker)
+        mocker.patch("mem0.memory.main.capture_event")
+        return Memory()
+
+    def test_walks_every_page(self, mock_memory):
+        """Test that iter_all follows the cursor until the last page"""
+        mock_memory.vector_store.list_page.side_effect = [
+            ([MagicMock(id="1", payload={"data": "likes tea", "user_id": "alice", "topic": "food"})], "cursor-1"),
+            ([MagicMock(id="2", payload={"data": "lives in Paris", "user_id": "alice"})], None),
+        ]
+
+        memories = list(mock_memory.iter_all(user_id="alice", page_size=1))
+
+        assert [m["memory"] for m in memories] == ["likes tea", "lives in Paris"]
+        assert memories[0]["user_id"] == "alice"
+        assert memories[0]["metadata"] == {"topic": "food"}
+        cursors = [call.kwargs["cursor"] for call in mock_memory.vector_store.list_page.call_args_list]
+        assert cursors == [None, "cursor-1"]
+        assert mock_memory.vector_store.list_page.call_args.kwargs["filters"] == {"user_id": "alice"}
+
+    def test_requires_scoping_id(self, mock_memory):
+        """Test that iter_all refuses to walk unscoped memories"""
+        with pytest.raises(ValueError):
+            next(mock_memory.iter_all())
+
+
+@pytest.mark.asyncio
+async def test_async_iter_all_walks_every_page(mocker):
+    _setup_mocks(mocker)
+    mocker.patch("mem0.memory.main.capture_event")
+    memory = AsyncMemory()
+    memory.vector_store.list_page.side_effect = [
+        ([MagicMock(id="1", payload={"data": "likes tea", "user_id": "alice"})], "cursor-1"),
+        ([], None),
+    ]
+
+    memories = [m async for m in memory.iter_all(user_id="alice", page_size=1)]
+
+    assert [m["id"] for m in memories] == ["1"]
+    assert memory.vector_store.list_page.call_count == 2
+
+
+class TestHybridSearch:
+    @pytest.fixture
+    def mock_memory(self, mocker):
+        _setup_mocks(mocker)
+        mocker.patch("mem0.memory.main.capture_event")
+        memory = Memory()
+        memory.vector_store.list_page.return_value = (
+            [
+                OutputData(id="1", payload={"data": "likes tea", "user_id": "alice"}),
+                OutputData(id="2", payload={"data": "ordered SKU-4711", "user_id": "alice"}),
+            ],
+            None,
+        )
+        memory.vector_store.search.return_value = [
+            OutputData(id="1", score=0.9, payload={"data": "likes tea", "user_id": "alice"})
+        ]
+        memory.vector_store.get.return_value = OutputData(
+            id="2", payload={"data": "ordered SKU-4711", "user_id": "alice"}
+        )
+        return memory
+
+    def test_finds_exact_token_matches(self, mock_memory):
+        """Test that hybrid search returns memories only the lexical index matches, fused with dense hits"""
+        results = mock_memory.search("SKU-4711 tea", user_id="alice", mode="hybrid")["results"]
+
+        assert sorted(r["id"] for r in results) == ["1", "2"]
+        assert all(r["score"] > 0 for r in results)
+        assert mock_memory.vector_store.search.call_args.kwargs["limit"] == 200
+        assert mock_memory.vector_store.list_page.call_args.kwargs["filters"] == {"user_id": "alice"}
+        mock_memory.vector_store.get.assert_called_once_with(vector_id="2")
+
+    def test_lexical_hits_are_fetched_fresh(self, mock_memory):
+        """Test that lexical-only hits are read from the vector store and dropped once they are gone"""
+        mock_memory.search("SKU-4711", user_id="alice", mode="hybrid")
+        mock_memory.vector_store.get.return_value = OutputData(
+            id="2", payload={"data": "ordered SKU-4711 and SKU-4712", "user_id": "alice"}
+        )
+        results = mock_memory.search("SKU-4711", user_id="alice", mode="hybrid")["results"]
+        assert {r["id"]: r["memory"] for r in results}["2"] == "ordered SKU-4711 and SKU-4712"
+
+        mock_memory.vector_store.get.return_value = None
+        results = mock_memory.search("SKU-4711", user_id="alice", mode="hybrid")["results"]
+
+        assert [r["id"] for r in results] == ["1"]
+        assert mock_memory.lexical_index.stats()["memories"] == 1
+
+    def test_dense_mode_skips_lexical_index(self, mock_memory):
+        """Test that the default mode neither loads nor queries the lexical index"""
+        results = mock_memory.search("SKU-4711", user_id="alice")["results"]
+
+        assert [r["id"] for r in results] == ["1"]
+        mock_memory.vector_store.list_page.assert_not_called()
+
+    def test_writes_reach_loaded_index(self, mock_memory):
+        """Test that memories deleted after the index is loaded are no longer matched"""
+        mock_memory.db = MagicMock()
+        mock_memory.search("SKU-4711", user_id="alice", mode="hybrid")
+        mock_memory.vector_store.get.return_value = OutputData(id="2", payload={"data": "ordered SKU-4711"})
+
+        mock_memory._delete_memory("2")
+
+        results = mock_memory.search("SKU-4711", user_id="alice", mode="hybrid")["results"]
+        assert [r["id"] for r in results] == ["1"]
+
+    def test_rejects_unknown_mode(self, mock_memory):
+        with pytest.raises(ValueError, match="Invalid search mode"):
+            mock_memory.search("tea", user_id="alice", mode="sparse")
+
+
+@pytest.mark.asyncio
+async def test_async_hybrid_search(mocker):
+    _setup_mocks(mocker)
+    mocker.patch("mem0.memory.main.capture_event")
+    memory = AsyncMemory()
+    memory.vector_store.list_page.return_value = (
+        [OutputData(id="2", payload={"data": "ordered SKU-4711", "user_id": "alice"})],
+        None,
+    )
+    memory.vector_store.search.return_value = []
+    memory.vector_store.get.return_value = OutputData(id="2", payload={"data": "ordered SKU-4711", "user_id": "alice"})
+
+    results = (await memory.search("SKU-4711", user_id="alice", mode="hybrid"))["results"]
+
+    assert [r["id"] for r in results] == ["2"]
+
+
+class TestDeleteAll:
+    @pytest.fixture
+    def mock_memory(self, mocker):
+        _setup_mocks(mocker)
+        mocker.patch("mem0.memory.main.capture_event")
+        memory = Memory()
+        memory.db = mocker.MagicMock()
+        return memory
+
+    def test_deletes_and_records_exactly_the_listed_memories(self, mock_memory):
+        """Test that delete_all deletes the listed ids in one batch and records them in one history batch"""
+        mock_memory.vector_store.list.side_effect = [
+            [
+                [
+                    MagicMock(id="1", payload={"data": "likes tea", "actor_id": "alice"}),
+                    MagicMock(id="2", payload={"data": "lives in Paris", "role": "user"}),
+                ]
+            ],
+            [[]],
+        ]
+
+        mock_memory.delete_all(user_id="alice")
+
+        assert sorted(mock_memory.vector_store.delete_batch.call_args.args[0]) == ["1", "2"]
+        mock_memory.vector_store.delete_by_filter.assert_not_called()
+        mock_memory.vector_store.delete.assert_not_called()
+        mock_memory.db.add_history.assert_not_called()
+        history = mock_memory.db.add_history_batch.call_args.args[0]
+        assert [(r["memory_id"], r["old_memory"], r["event"], r["is_deleted"]) for r in history] == [
+            ("1", "likes tea", "DELETE", 1),
+            ("2", "lives in Paris", "DELETE", 1),
+        ]
+        assert history[0]["actor_id"] == "alice"
+        assert history[1]["role"] == "user"
+
+    def test_nothing_to_delete(self, mock_memory):
+        """Test that no delete or history write is issued when nothing matches"""
+        mock_memory.vector_store.list.return_value = [[]]
+
+        mock_memory.delete_all(user_id="alice")
+
+        mock_memory.vector_store.delete_batch.assert_not_called()
+        mock_memory.db.add_history_batch.assert_not_called()
+
+    def test_pages_through_a_store_with_a_listing_cap(self, mock_memory, mocker):
+        """Test that delete_all walks several pages of a store using the default list_page and delete_by_filter"""
+        mocker.patch("mem0.memory.main.DELETE_ALL_PAGE_SIZE", 2)
+        store = _CappedListStore(max_listed=2)
+        for i in range(5):
+            store.memories[f"id{i}"] = {"data": f"fact {i}", "user_id": "alice"}
+        store.memories["other"] = {"data": "not alice", "user_id": "bob"}
+        mock_memory.vector_store = store
+
+        # A memory added while delete_all runs is picked up and recorded by a later round
+        add_history_batch = mock_memory.db.add_history_batch
+
+        def add_during_delete(records):
+            if add_history_batch.call_count == 1:
+                store.memories["late"] = {"data": "added meanwhile", "user_id": "alice"}
+
+        add_history_batch.side_effect = add_during_delete
+
+        mock_memory.delete_all(user_id="alice")
+
+        recorded = [r["memory_id"] for call in add_history_batch.call_args_list for r in call.args[0]]
+        assert sorted(recorded) == ["id0", "id1", "id2", "id3", "id4", "late"]
+        assert all(len(call.args[0]) <= 2 for call in add_history_batch.call_args_list)
+        assert list(store.memories) == ["other"]
+
+    def test_default_delete_by_filter_lists_from_the_start(self):
+        """Test that the default delete_by_filter never asks a store for more than one page"""
+        store = _CappedListStore(max_listed=1000)
+        for i in range(2500):
+            store.memories[f"id{i}"] = {"user_id": "alice" if i % 2 else "bob"}
+
+        store.delete_by_filter({"user_id": "alice"})
+
+        assert len(store.memories) == 1250
+        assert all(payload["user_id"] == "bob" for payload in store.memories.values())
+
+    def test_waits_for_a_store_still_listing_deleted_memories(self, mock_memory, mocker):
+        """Test that a full page of already deleted memories is listed again instead of ending the deletion"""
+        mocker.patch("mem0.memory.main.DELETE_ALL_PAGE_SIZE", 1)
+        sleep = mocker.patch("mem0.memory.main.time.sleep")
+        first = MagicMock(id="1", payload={"data": "likes tea"})
+        second = MagicMock(id="2", payload={"data": "lives in Paris"})
+        mock_memory.vector_store.list.side_effect = [[[first]], [[first]], [[second]], [[]]]
+
+        mock_memory.delete_all(user_id="alice")
+
+        assert [call.args[0] for call in mock_memory.vector_store.delete_batch.call_args_list] == [["1"], ["2"]]
+        sleep.assert_called_once_with(0.5)
+
+    def test_warns_when_deleted_memories_stay_listed(self, mock_memory, mocker, caplog):
+        """Test that delete_all gives up with a warning once the retries only list deleted memories"""
+        mocker.patch("mem0.memory.main.DELETE_ALL_PAGE_SIZE", 1)
+        sleep = mocker.patch("mem0.memory.main.time.sleep")
+        mock_memory.vector_store.list.return_value = [[MagicMock(id="1", payload={"data": "likes tea"})]]
+
+        with caplog.at_level(logging.WARNING):
+            mock_memory.delete_all(user_id="alice")
+
+        mock_memory.vector_store.delete_batch.assert_called_once_with(["1"])
+        assert [call.args[0] for call in sleep.call_args_list] == [0.5, 1.0, 2.0]
+        assert "still lists only deleted ones" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_async_delete_all_records_each_deleted_page(mocker):
+    _setup_mocks(mocker)
+    mocker.patch("mem0.memory.main.capture_event")
+    memory = AsyncMemory()
+    memory.db = mocker.MagicMock()
+    memory.vector_store.list.side_effect = [
+        [[OutputData(id="1", payload={"data": "likes tea"})]],
+        [[OutputData(id="1", payload={"data": "likes tea"})]],
+    ]
+
+    await memory.delete_all(user_id="alice")
+
+    memory.vector_store.delete_batch.assert_called_once_with(["1"])
+    assert [r["memory_id"] for r in memory.db.add_history_batch.call_args.args[0]] == ["1"]
+
+
+class _CappedListStore(VectorStoreBase):
+    """In-memory store relying on the default paging, refusing listings past a cap like Elasticsearch does."""
+
+    def __init__(self, max_listed):
+        self.max_listed = max_listed
+        self.memories = {}
+
+    def list(self, filters=None, limit=100):
+        if limit > self.max_listed:
+            raise ValueError(f"Result window is too large: {limit} > {self.max_listed}")
+        matches = [
+            OutputData(id=memory_id, payload=payload)
+            for memory_id, payload in self.memories.items()
+            if all(payload.get(key) == value for key, value in (filters or {}).items())
+        ]
+        return [matches[:limit]]
+
+    def delete(self, vector_id):
+        del self.memories[vector_id]
+
+    def create_col(self, name, vector_size, distance):
+        pass
+
+    def insert(self, vectors, payloads=None, ids=None):
+        pass
+
+    def search(self, query, vectors, limit=5, filters=None):
+        return []
+
+    def update(self, vector_id, vector=None, payload=None):
+        pass
+
+    def get(self, vector_id):
+        return None
+
+    def list_cols(self):
+        return []
+
+    def delete_col(self):
+        pass
+
+    def col_info(self):
+        return {}
+
+    def reset(self):
+        self.memories.clear()
+
+
+class TestLlmResponseCache:
+    @pytest.fixture
+    def mock_memory(self, mocker):
+        _setup_mocks(mocker)
+        mocker.patch("mem0.memory.main.capture_event")
+
+        memory = Memory()
+        memory.config = mocker.MagicMock()
+        memory.config.llm.provider = "openai"
+        memory.config.llm.config = {}
+        memory.config.custom_fact_extraction_prompt = None
+        memory.config.custom_update_memory_prompt = None
+        memory.llm.config.model = "gpt-4o-mini"
+        memory.llm_cache = LLMResponseCache(max_entries=10, ttl_seconds=60)
+        memory.db = mocker.MagicMock()
+        memory.vector_store.search.return_value = []
+        memory.api_version = "v1.1"
+
+        return memory
+
+    def test_replayed_add_is_served_from_cache(self, mock_memory):
+        """Test that re-submitting the same messages does not call the LLM again"""
+        mock_memory.llm.generate_response.side_effect = ['{"facts": ["likes tea"]}', '{"memory": []}']
+
+        first = mock_memory.add("I like tea", user_id="alice")
+        second = mock_memory.add("I like tea", user_id="alice")
+
+        assert mock_memory.llm.generate_response.call_count == 2
+        assert first["cache"] == {"fact_extraction": False, "memory_update": False}
+        assert second["cache"] == {"fact_extraction": True, "memory_update": True}
+
+    def test_unparseable_responses_are_not_cached(self, mock_memory):
+        """Test that a response that cannot be parsed is requested again"""
+        mock_memory.llm.generate_response.side_effect = ["not json", '{"facts": []}']
+
+        mock_memory.add("I like tea", user_id="alice")
+        second = mock_memory.add("I like tea", user_id="alice")
+
+        assert mock_memory.llm.generate_response.call_count == 2
+        assert second["cache"] == {"fact_extraction": False}
+
+    def test_no_cache_report_without_cache(self, mock_memory):
+        """Test that the add result is unchanged when caching is off"""
+        mock_memory.llm_cache = None
+        mock_memory.llm.generate_response.side_effect = ['{"facts": []}']
+
+        assert mock_memory.add("I like tea", user_id="alice") == {"results": []}
+
+
+class TestAddBatch:
+    @pytest.fixture
+    def mock_memory(self, mocker):
+        _setup_mocks(mocker)
+        mocker.patch("mem0.memory.main.capture_event")
+
+        memory = Memory()
+        memory.config = mocker.MagicMock()
+        memory.config.llm.config = {}
+        memory.config.custom_fact_extraction_prompt = None
+        memory.config.custom_update_memory_prompt = None
+        memory.db = mocker.MagicMock()
+        memory.vector_store.search.return_value = []
+        memory.api_version = "v1.1"
+
+        return memory
+
+    def test_batches_embeddings_inserts_and_history(self, mock_memory):
+        """Test that facts from all items are embedded, inserted and recorded together"""
+        mock_memory.llm.generate_response.side_effect = [
+            '{"facts": ["likes tea"]}',
+            '{"facts": ["lives in Paris"]}',
+            '{"memory": [{"event": "ADD", "text": "likes tea"}]}',
+            '{"memory": [{"event": "ADD", "text": "lives in Paris"}]}',
+        ]
+        mock_memory.embedding_model.embed_batch.return_value = [[0.1, 0.2], [0.3, 0.4]]
+
+        results = mock_memory.add_batch(
+            [{"messages": "I like tea", "user_id": "alice"}, {"messages": "I live in Paris", "user_id": "bob"}],
+            concurrency=1,
+        )
+
+        mock_memory.embedding_model.embed_batch.assert_called_once_with(["likes tea", "lives in Paris"], "add")
+        mock_memory.vector_store.insert.assert_called_once()
+        payloads = mock_memory.vector_store.insert.call_args.kwargs["payloads"]
+        assert [(p["data"], p["user_id"]) for p in payloads] == [("likes tea", "alice"), ("lives in Paris", "bob")]
+        history = mock_memory.db.add_history_batch.call_args.args[0]
+        assert [record["new_memory"] for record in history] == ["likes tea", "lives in Paris"]
+        mock_memory.db.add_history.assert_not_called()
+
+        assert [r["results"][0]["memory"] for r in results] == ["likes tea", "lives in Paris"]
+        assert all("error" not in r for r in results)
+
+    def test_reports_failures_per_item(self, mock_memory):
+        """Test that invalid items and failed inserts only fail their own item"""
+        mock_memory.embedding_model.embed_batch.return_value = [[0.1], [0.2]]
+        mock_memory.vector_store.insert.side_effect = [RuntimeError("batch failed"), None, RuntimeError("bad item")]
+
+        results = mock_memory.add_batch(
+            [
+                {"messages": "first", "user_id": "alice"},
+                {"messages": "missing ids"},
+                {"messages": "second", "user_id": "bob"},
+            ],
+            infer=False,
+        )
+
+        assert results[0]["results"][0]["memory"] == "first"
+        assert "error" not in results[0]
+        assert results[1]["results"] == []
+        assert "user_id" in results[1]["error"]
+        assert results[2] == {"results": [], "error": "bad item"}
+        history = mock_memory.db.add_history_batch.call_args.args[0]
+        assert [record["new_memory"] for record in history] == ["first"]
+
+    def test_graph_failure_keeps_written_memories(self, mock_memory, mocker):
+        """Test that an item whose graph update fails still reports the memories written for it"""
+        mock_memory.enable_graph = True
+        mock_memory.graph = mocker.MagicMock()
+        mocker.patch.object(mock_memory, "_add_to_graph", side_effect=[RuntimeError("graph down"), []])
+        mock_memory.embedding_model.embed_batch.return_value = [[0.1], [0.2]]
+
+        results = mock_memory.add_batch(
+            [{"messages": "first", "user_id": "alice"}, {"messages": "second", "user_id": "bob"}],
+            infer=False,
+            concurrency=1,
+        )
+
+        assert results[0]["results"][0]["memory"] == "first"
+        assert results[0]["relations_error"] == "graph down"
+        assert "error" not in results[0]
+        assert results[1]["results"][0]["memory"] == "second"
+        assert "relations_error" not in results[1]
+
+
+@pytest.mark.asyncio
+async def test_async_add_batch_without_inference(mocker):
+    _setup_mocks(mocker)
+    mocker.patch("mem0.memory.main.capture_event")
+    memory = AsyncMemory()
+    memory.db = mocker.MagicMock()
+    memory.embedding_model.embed_batch.return_value = [[0.1], [0.2]]
+
+    results = await memory.add_batch(
+        [{"messages": "first", "user_id": "alice"}, {"messages": "second", "agent_id": "helper"}], infer=False
+    )
+
+    memory.embedding_model.embed_batch.assert_called_once_with(["first", "second"], "add")
+    memory.vector_store.insert.assert_called_once()
+    memory.llm.generate_response.assert_not_called()
+    assert [r["results"][0]["memory"] for r in results] == ["first", "second"]
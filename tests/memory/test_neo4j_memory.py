@@ -0,0 +1,249 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+from mem0.memory.graph_memory import MAX_INDEX_CANDIDATES, MemoryGraph
+
+
+class _Neo4jError(Exception):
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+@pytest.fixture
+def mock_config():
+    config = Mock()
+    config.graph_store.config.url = "bolt://localhost:7687"
+    config.graph_store.config.username = "neo4j"
+    config.graph_store.config.password = "password"
+    config.graph_store.config.database = None
+    config.graph_store.config.base_label = True
+    config.graph_store.config.vector_index = True
+    config.graph_store.config.vector_index_candidates = 100
+    config.graph_store.llm = None
+    return config
+
+
+@pytest.fixture
+def mock_graph():
+    with patch("mem0.memory.graph_memory.Neo4jGraph") as mock_neo4j:
+        yield mock_neo4j.return_value
+
+
+@pytest.fixture
+def memory_graph(mock_config, mock_graph):
+    with patch("mem0.memory.graph_memory.EmbedderFactory") as mock_embedder_factory:
+        with patch("mem0.memory.graph_memory.LlmFactory"):
+            mock_embedder_factory.create.return_value.config.embedding_dims = 3
+            mock_embedder_factory.create.return_value.embed_batch.return_value = [[0.1, 0.2, 0.3]]
+            yield MemoryGraph(mock_config)
+
+
+def test_creates_vector_index(memory_graph, mock_graph):
+    queries = [call.args[0] for call in mock_graph.query.call_args_list]
+
+    assert memory_graph.use_vector_index is True
+    assert any(
+        "CREATE VECTOR INDEX entity_embedding" in query and "`vector.dimensions`: 3" in query for query in queries
+    )
+
+
+def test_search_uses_vector_index(memory_graph, mock_graph):
+    mock_graph.query.reset_mock()
+    mock_graph.query.return_value = [{"source": "alice", "relation_id": "r1", "similarity": 0.9, "entity_idx": [0]}]
+
+    result = memory_graph._search_graph_db(["alice"], {"user_id": "u1", "agent_id": "a1"})
+
+    mock_graph.query.assert_called_once()
+    query = mock_graph.query.call_args.args[0]
+    params = mock_graph.query.call_args.kwargs["params"]
+    assert "db.index.vector.queryNodes" in query
+    assert "vector.similarity.cosine" not in query
+    assert "n.agent_id = $agent_id" in query
+    assert params["index_name"] == "entity_embedding"
+    assert params["index_candidates"] == 100
+    assert result == [{"source": "alice", "relation_id": "r1", "similarity": 0.9}]
+
+
+def test_search_runs_one_query_for_all_entities(memory_graph, mock_graph):
+    memory_graph.embedding_model.embed_batch.side_effect = lambda names: [[0.1, 0.2, 0.3] for _ in names]
+    mock_graph.query.reset_mock()
+    mock_graph.query.return_value = [{"relation_id": "r1", "similarity": 0.9, "entity_idx": [0, 1, 2]}]
+
+    memory_graph._search_graph_db(["alice", "bob", "carol"], {"user_id": "u1"}, limit=10)
+
+    mock_graph.query.assert_called_once()
+    query = mock_graph.query.call_args.args[0]
+    params = mock_graph.query.call_args.kwargs["params"]
+    assert "UNWIND $entities AS entity" in query
+    assert "max(similarity) AS similarity" in query
+    assert len(params["entities"]) == 3
+    assert params["limit"] == 10
+
+
+def test_search_widens_index_for_entities_crowded_out_of_it(memory_graph, mock_graph):
+    memory_graph.embedding_model.embed_batch.side_effect = lambda names: [[0.1, 0.2, 0.3] for _ in names]
+    mock_graph.query.reset_mock()
+    mock_graph.query.side_effect = [
+        [{"relation_id": "r1", "similarity": 0.8, "entity_idx": [0]}],
+        [{"key": 1}],
+        [
+            {"relation_id": "r2", "similarity": 0.7, "entity_idx": [1]},
+            {"relation_id": "r1", "similarity": 0.9, "entity_idx": [1]},
+        ],
+    ]
+
+    result = memory_graph._search_graph_db(["alice", "bob"], {"user_id": "u1"})
+
+    queries = [call.args[0] for call in mock_graph.query.call_args_list]
+    retry_params = mock_graph.query.call_args.kwargs["params"]
+    assert not any("vector.similarity.cosine" in query for query in queries)
+    assert [entity["idx"] for entity in retry_params["entities"]] == [1]
+    assert retry_params["index_candidates"] == 200
+    assert result == [{"relation_id": "r1", "similarity": 0.9}, {"relation_id": "r2", "similarity": 0.7}]
+
+
+def test_new_entities_are_not_scanned(memory_graph, mock_graph):
+    mock_graph.query.reset_mock()
+    mock_graph.query.side_effect = [[], []]
+
+    assert memory_graph._resolve_entity_nodes({"alice": [0.1, 0.2, 0.3]}, {"user_id": "u1"}) == {}
+
+    probe_query = mock_graph.query.call_args.args[0]
+    probe_params = mock_graph.query.call_args.kwargs["params"]
+    assert mock_graph.query.call_count == 2
+    assert "count(score) AS hits" in probe_query
+    assert probe_params["entities"] == [{"key": "alice", "embedding": [0.1, 0.2, 0.3]}]
+    assert probe_params["index_candidates"] == 100
+
+
+def test_scans_when_widening_reaches_the_limit(memory_graph, mock_graph):
+    memory_graph.vector_index_candidates = MAX_INDEX_CANDIDATES
+    mock_graph.query.reset_mock()
+    mock_graph.query.side_effect = [[], [{"key": "alice"}], [{"name": "alice", "node_id": "id"}]]
+
+    result = memory_graph._resolve_entity_nodes({"alice": [0.1, 0.2, 0.3]}, {"user_id": "u1"})
+
+    scan_query = mock_graph.query.call_args.args[0]
+    assert "vector.similarity.cosine(candidate.embedding, entity.embedding)" in scan_query
+    assert "index_name" not in mock_graph.query.call_args.kwargs["params"]
+    assert result == {"alice": "id"}
+
+
+def test_index_errors_without_missing_index_are_raised(memory_graph, mock_graph):
+    mock_graph.query.reset_mock()
+    mock_graph.query.side_effect = [
+        _Neo4jError("Neo.ClientError.Procedure.ProcedureCallFailed", "Index query vector has 2 dimensions"),
+        [{"state": "ONLINE"}],
+    ]
+
+    with pytest.raises(_Neo4jError):
+        memory_graph._resolve_entity_nodes({"alice": [0.1, 0.2]}, {"user_id": "u1"})
+    assert memory_graph.use_vector_index is True
+
+    mock_graph.query.side_effect = [Exception("connection to index server lost")]
+    with pytest.raises(Exception, match="connection"):
+        memory_graph._resolve_entity_nodes({"alice": [0.1, 0.2, 0.3]}, {"user_id": "u1"})
+
+
+def test_scans_while_index_is_populating(memory_graph, mock_graph):
+    mock_graph.query.reset_mock()
+    mock_graph.query.side_effect = [
+        _Neo4jError("Neo.ClientError.Procedure.ProcedureCallFailed", "Index is not online"),
+        [{"state": "POPULATING"}],
+        [{"name": "alice", "node_id": "id"}],
+    ]
+
+    assert memory_graph._resolve_entity_nodes({"alice": [0.1, 0.2, 0.3]}, {"user_id": "u1"}) == {"alice": "id"}
+    assert memory_graph.use_vector_index is True
+
+
+def test_falls_back_to_scan_when_index_missing(memory_graph, mock_graph):
+    mock_graph.query.reset_mock()
+    mock_graph.query.side_effect = [
+        _Neo4jError(
+            "Neo.ClientError.Procedure.ProcedureCallFailed", "There is no such vector schema index: entity_embedding"
+        ),
+        [],
+        [{"name": "alice", "node_id": "id"}],
+    ]
+
+    result = memory_graph._resolve_entity_nodes({"alice": [0.1, 0.2, 0.3]}, {"user_id": "u1"})
+
+    assert "SHOW INDEXES" in mock_graph.query.call_args_list[1].args[0]
+    fallback_query = mock_graph.query.call_args.args[0]
+    assert "vector.similarity.cosine(candidate.embedding, entity.embedding)" in fallback_query
+    assert "index_name" not in mock_graph.query.call_args.kwargs["params"]
+    assert memory_graph.use_vector_index is False
+    assert result == {"alice": "id"}
+
+
+def test_scan_without_base_label(mock_config, mock_graph):
+    mock_config.graph_store.config.base_label = False
+    with patch("mem0.memory.graph_memory.EmbedderFactory"), patch("mem0.memory.graph_memory.LlmFactory"):
+        memory_graph = MemoryGraph(mock_config)
+
+    assert memory_graph.use_vector_index is False
+    mock_graph.query.assert_not_called()
+
+
+def test_add_entities_batches_writes(memory_graph, mock_graph):
+    memory_graph.embedding_model.embed_batch.side_effect = lambda names: [[0.1, 0.2, 0.3] for _ in names]
+    mock_graph.query.reset_mock()
+    mock_graph.query.side_effect = [
+        [{"name": "alice", "node_id": "4:x:1"}],
+        [],
+        [
+            {"key": 0, "source": "alice", "relationship": "knows", "target": "bob"},
+            {"key": 1, "source": "bob", "relationship": "likes", "target": "carol"},
+        ],
+    ]
+    to_be_added = [
+        {"source": "alice", "relationship": "knows", "destination": "bob"},
+        {"source": "bob", "relationship": "likes", "destination": "carol"},
+        {"source": "alice", "relationship": "knows", "destination": "bob"},
+    ]
+
+    result = memory_graph._add_entities(to_be_added, {"user_id": "u1"}, {"bob": "person", "carol": "person"})
+
+    assert mock_graph.query.call_count == 3
+    resolve_params = mock_graph.query.call_args_list[0].kwargs["params"]
+    assert [entity["name"] for entity in resolve_params["entities"]] == ["alice", "bob", "carol"]
+    # Names the index did not resolve are only checked for a truncated index page, not scanned
+    probe_query = mock_graph.query.call_args_list[1].args[0]
+    probe_params = mock_graph.query.call_args_list[1].kwargs["params"]
+    assert "vector.similarity.cosine" not in probe_query
+    assert [entity["key"] for entity in probe_params["entities"]] == ["bob", "carol"]
+
+    write_query = mock_graph.query.call_args_list[2].args[0]
+    write_params = mock_graph.query.call_args_list[2].kwargs["params"]
+    assert "MERGE (source)-[r:knows]->(destination)" in write_query
+    assert "MERGE (source)-[r:likes]->(destination)" in write_query
+    assert write_params["existing_nodes"] == [{"idx": 0, "node_id": "4:x:1", "mentions": 2}]
+    assert [node["name"] for node in write_params["new_nodes_0"]] == ["bob", "carol"]
+    assert write_params["rows_0"] == [{"key": 0, "source": 0, "relationship": "knows", "destination": 1, "mentions": 2}]
+    assert result == [
+        [{"source": "alice", "relationship": "knows", "target": "bob"}],
+        [{"source": "bob", "relationship": "likes", "target": "carol"}],
+        [{"source": "alice", "relationship": "knows", "target": "bob"}],
+    ]
+
+
+def test_delete_entities_batches_writes(memory_graph, mock_graph):
+    mock_graph.query.reset_mock()
+    mock_graph.query.return_value = [{"key": 1, "source": "bob", "target": "carol", "relationship": "likes"}]
+    to_be_deleted = [
+        {"source": "alice", "relationship": "knows", "destination": "bob"},
+        {"source": "bob", "relationship": "likes", "destination": "carol"},
+    ]
+
+    result = memory_graph._delete_entities(to_be_deleted, {"user_id": "u1", "run_id": "r1"})
+
+    mock_graph.query.assert_called_once()
+    query = mock_graph.query.call_args.args[0]
+    params = mock_graph.query.call_args.kwargs["params"]
+    assert "-[r:knows]->" in query and "-[r:likes]->" in query
+    assert "run_id: $run_id" in query
+    assert params["rows_1"] == [{"key": 1, "source": "bob", "destination": "carol"}]
+    assert result == [[], [{"source": "bob", "target": "carol", "relationship": "likes"}]]
@@ -123,27 +123,18 @@ class TestNeptuneMemory(unittest.TestCase):
         ]
         self.memory_graph._search_graph_db = MagicMock(return_value=mock_search_results)
 
-        # Mock BM25Okapi
-        with patch("mem0.graphs.neptune.base.BM25Okapi") as mock_bm25:
-            mock_bm25_instance = MagicMock()
-            mock_bm25.return_value = mock_bm25_instance
+        # Call the search method
+        result = self.memory_graph.search("Who works with Alice?", self.test_filters, limit=5)
 
-            # Mock get_top_n to return reranked results
-            reranked_results = [["alice", "knows", "bob"], ["alice", "works_with", "charlie"]]
-            mock_bm25_instance.get_top_n.return_value = reranked_results
-
-            # Call the search method
-            result = self.memory_graph.search("Find Alice", self.test_filters, limit=5)
-
-            # Verify the method calls
-            self.memory_graph._retrieve_nodes_from_data.assert_called_once_with("Find Alice", self.test_filters)
-            self.memory_graph._search_graph_db.assert_called_once_with(node_list=["alice"], filters=self.test_filters)
+        # Verify the method calls
+        self.memory_graph._retrieve_nodes_from_data.assert_called_once_with("Who works with Alice?", self.test_filters)
+        self.memory_graph._search_graph_db.assert_called_once_with(node_list=["alice"], filters=self.test_filters)
 
-            # Check the result structure
-            self.assertEqual(len(result), 2)
-            self.assertEqual(result[0]["source"], "alice")
-            self.assertEqual(result[0]["relationship"], "knows")
-            self.assertEqual(result[0]["destination"], "bob")
+        # Check the result structure and that BM25 ranks the matching relationship first
+        self.assertEqual(len(result), 2)
+        self.assertEqual(result[0]["source"], "alice")
+        self.assertEqual(result[0]["relationship"], "works_with")
+        self.assertEqual(result[0]["destination"], "charlie")
 
     def test_get_all_method(self):
         """Test the get_all method."""
@@ -242,7 +233,7 @@ class TestNeptuneMemory(unittest.TestCase):
 
         # Mock embedding
         mock_embedding = [0.1, 0.2, 0.3]
-        self.mock_embedding_model.embed.return_value = mock_embedding
+        self.mock_embedding_model.embed_batch.return_value = [mock_embedding, mock_embedding]
 
         # Mock the _search_graph_db_cypher method
         mock_cypher = "MATCH (n) RETURN n"
@@ -258,7 +249,7 @@ class TestNeptuneMemory(unittest.TestCase):
         result = self.memory_graph._search_graph_db(node_list, self.test_filters, limit=10)
 
         # Verify the method calls
-        self.assertEqual(self.mock_embedding_model.embed.call_count, 2)
+        self.mock_embedding_model.embed_batch.assert_called_once_with(node_list)
         self.assertEqual(self.memory_graph._search_graph_db_cypher.call_count, 2)
         self.assertEqual(self.mock_graph.query.call_count, 2)
 
@@ -274,7 +265,7 @@ class TestNeptuneMemory(unittest.TestCase):
 
         # Mock embeddings
         mock_embedding = [0.1, 0.2, 0.3]
-        self.mock_embedding_model.embed.return_value = mock_embedding
+        self.mock_embedding_model.embed_batch.return_value = [mock_embedding, mock_embedding]
 
         # Mock search results
         mock_source_search = [{"id(source_candidate)": 123, "cosine_similarity": 0.95}]
@@ -297,7 +288,7 @@ class TestNeptuneMemory(unittest.TestCase):
         result = self.memory_graph._add_entities(to_be_added, self.user_id, entity_type_map)
 
         # Verify the method calls
-        self.assertEqual(self.mock_embedding_model.embed.call_count, 2)
+        self.mock_embedding_model.embed_batch.assert_called_once_with(["alice", "bob"])
         self.memory_graph._search_source_node.assert_called_once_with(mock_embedding, self.user_id, threshold=0.9)
         self.memory_graph._search_destination_node.assert_called_once_with(mock_embedding, self.user_id, threshold=0.9)
         self.memory_graph._add_entities_cypher.assert_called_once()
@@ -0,0 +1,82 @@
+import threading
+
+import pytest
+
+from mem0.memory.storage import SQLiteManager
+
+
+@pytest.fixture
+def db(tmp_path):
+    manager = SQLiteManager(str(tmp_path / "history.db"))
+    yield manager
+    manager.close()
+
+
+def test_file_database_uses_wal(db):
+    assert db.connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_memory_id_index_created(db):
+    indexes = {row[1] for row in db.connection.execute("PRAGMA index_list(history)").fetchall()}
+    assert "idx_history_memory_id" in indexes
+
+
+def test_history_round_trip(db):
+    db.add_history("m1", None, "likes tea", "ADD", created_at="2024-01-01T00:00:00")
+    db.add_history_batch(
+        [
+            {
+                "memory_id": "m1",
+                "old_memory": "likes tea",
+                "new_memory": "likes green tea",
+                "event": "UPDATE",
+                "created_at": "2024-01-01T00:00:00",
+                "updated_at": "2024-01-02T00:00:00",
+            },
+            {"memory_id": "m2", "new_memory": "lives in Paris", "event": "ADD"},
+        ]
+    )
+
+    history = db.get_history("m1")
+
+    assert [record["event"] for record in history] == ["ADD", "UPDATE"]
+    assert history[1]["new_memory"] == "likes green tea"
+    assert history[1]["is_deleted"] is False
+    assert len(db.get_history("m2")) == 1
+
+
+def test_concurrent_writes_are_all_committed(db):
+    def write(worker):
+        for i in range(25):
+            db.add_history(f"m{worker}", None, f"fact {i}", "ADD")
+
+    threads = [threading.Thread(target=write, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(len(db.get_history(f"m{worker}")) == 25 for worker in range(8))
+
+
+def test_failed_write_is_reported(db):
+    db.connection.execute("DROP TABLE history")
+
+    with pytest.raises(Exception):
+        db.add_history("m1", None, "likes tea", "ADD")
+
+
+def test_reset_recreates_table(db):
+    db.add_history("m1", None, "likes tea", "ADD")
+
+    db.reset()
+
+    assert db.get_history("m1") == []
+
+
+def test_in_memory_database():
+    manager = SQLiteManager()
+    manager.add_history("m1", None, "likes tea", "ADD")
+
+    assert len(manager.get_history("m1")) == 1
+    manager.close()
@@ -89,10 +89,12 @@ def test_add(memory_instance, version, enable_graph):
         [{"role": "user", "content": "Test message"}], {"user_id": "test_user"}, {"user_id": "test_user"}, True
     )
 
-    # Remove the conditional assertion for _add_to_graph
-    memory_instance._add_to_graph.assert_called_once_with(
-        [{"role": "user", "content": "Test message"}], {"user_id": "test_user"}
-    )
+    if enable_graph:
+        memory_instance._add_to_graph.assert_called_once_with(
+            [{"role": "user", "content": "Test message"}], {"user_id": "test_user"}
+        )
+    else:
+        memory_instance._add_to_graph.assert_not_called()
 
 
 def test_get(memory_instance):
@@ -194,14 +196,19 @@ def test_delete(memory_instance):
 def test_delete_all(memory_instance, version, enable_graph):
     memory_instance.config.version = version
     memory_instance.enable_graph = enable_graph
-    mock_memories = [Mock(id="1"), Mock(id="2")]
-    memory_instance.vector_store.list = Mock(return_value=(mock_memories, None))
+    mock_memories = [Mock(id="1", payload={"data": "first"}), Mock(id="2", payload={"data": "second"})]
+    memory_instance.vector_store.list = Mock(side_effect=[[mock_memories], [[]]])
+    memory_instance.db = Mock()
     memory_instance._delete_memory = Mock()
     memory_instance.graph.delete_all = Mock()
 
     result = memory_instance.delete_all(user_id="test_user")
 
-    assert memory_instance._delete_memory.call_count == 2
+    memory_instance._delete_memory.assert_not_called()
+    memory_instance.vector_store.delete_batch.assert_called_once()
+    assert sorted(memory_instance.vector_store.delete_batch.call_args.args[0]) == ["1", "2"]
+    history = memory_instance.db.add_history_batch.call_args.args[0]
+    assert [(record["memory_id"], record["old_memory"]) for record in history] == [("1", "first"), ("2", "second")]
 
     if enable_graph:
         memory_instance.graph.delete_all.assert_called_once_with({"user_id": "test_user"})
@@ -3,6 +3,8 @@ from unittest.mock import patch
 
 import pytest
 
+from mem0.memory.telemetry import TelemetryPipeline
+
 MEM0_TELEMETRY = os.environ.get("MEM0_TELEMETRY", "True")
 
 if isinstance(MEM0_TELEMETRY, str):
@@ -33,3 +35,43 @@ def test_telemetry_disabled():
 
 def test_telemetry_default_enabled():
     assert use_telemetry() is True
+
+
+@pytest.fixture
+def pipeline():
+    with patch("mem0.memory.telemetry.AnonymousTelemetry") as mock_telemetry:
+        with patch("mem0.memory.telemetry.get_or_create_user_id", return_value="anon-user") as mock_get_user_id:
+            telemetry_pipeline = TelemetryPipeline(max_queue_size=10, enabled=True)
+            yield telemetry_pipeline, mock_telemetry.return_value, mock_get_user_id
+            telemetry_pipeline.shutdown()
+
+
+def test_pipeline_sends_events_in_background(pipeline):
+    telemetry_pipeline, mock_client, mock_get_user_id = pipeline
+    vector_store = object()
+
+    telemetry_pipeline.capture("mem0.add", {"keys": ["user_id"]}, vector_store=vector_store)
+    telemetry_pipeline.capture("mem0.search", {}, vector_store=vector_store)
+    assert telemetry_pipeline.flush()
+
+    assert [call.args[0] for call in mock_client.capture_event.call_args_list] == ["mem0.add", "mem0.search"]
+    assert mock_client.capture_event.call_args.kwargs["user_email"] == "anon-user"
+    mock_get_user_id.assert_called_once_with(vector_store)
+
+
+def test_pipeline_drops_events_when_full(pipeline):
+    telemetry_pipeline = TelemetryPipeline(max_queue_size=1, enabled=True)
+    telemetry_pipeline._ensure_started = lambda: None
+
+    telemetry_pipeline.capture("first")
+    telemetry_pipeline.capture("second")
+
+    assert telemetry_pipeline.dropped == 1
+
+
+def test_pipeline_disabled_captures_nothing():
+    telemetry_pipeline = TelemetryPipeline(enabled=False)
+    telemetry_pipeline.capture("mem0.add")
+
+    assert telemetry_pipeline._thread is None
+    assert telemetry_pipeline._queue.empty()
@@ -48,6 +48,24 @@ def test_search_vectors(chromadb_instance, mock_chromadb_client):
     assert results[0].payload == {"name": "vector1"}
 
 
+def test_search_batch(chromadb_instance, mock_chromadb_client):
+    mock_result = {
+        "ids": [["id1"], ["id2", "id3"]],
+        "distances": [[0.1], [0.2, 0.3]],
+        "metadatas": [[{"name": "vector1"}], [{"name": "vector2"}, {"name": "vector3"}]],
+    }
+    chromadb_instance.collection.query.return_value = mock_result
+
+    vectors = [[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]]
+    results = chromadb_instance.search_batch(queries=["a", "b"], vectors=vectors, limit=2)
+
+    chromadb_instance.collection.query.assert_called_once_with(query_embeddings=vectors, where=None, n_results=2)
+
+    assert [[r.id for r in result] for result in results] == [["id1"], ["id2", "id3"]]
+    assert results[1][0].score == 0.2
+    assert results[1][1].payload == {"name": "vector3"}
+
+
 def test_search_vectors_with_filters(chromadb_instance, mock_chromadb_client):
     """Test search with agent_id and run_id filters."""
     mock_result = {
@@ -123,6 +141,14 @@ def test_delete_vector(chromadb_instance):
     chromadb_instance.collection.delete.assert_called_once_with(ids=vector_id)
 
 
+def test_delete_by_filter(chromadb_instance):
+    chromadb_instance.delete_by_filter({"user_id": "alice", "agent_id": "agent1"})
+
+    chromadb_instance.collection.delete.assert_called_once_with(
+        where={"$and": [{"user_id": "alice"}, {"agent_id": "agent1"}]}
+    )
+
+
 def test_update_vector(chromadb_instance):
     vector_id = "id1"
     new_vector = [0.7, 0.8, 0.9]
@@ -169,6 +195,16 @@ def test_list_vectors(chromadb_instance):
     assert results[0][1].id == "id2"
 
 
+def test_list_page_advances_offset(chromadb_instance):
+    chromadb_instance.collection.get.return_value = {"ids": ["id3", "id4"], "metadatas": [{}, {}]}
+
+    page, cursor = chromadb_instance.list_page(limit=2, cursor=2)
+
+    chromadb_instance.collection.get.assert_called_once_with(where=None, limit=2, offset=2)
+    assert [result.id for result in page] == ["id3", "id4"]
+    assert cursor == 4
+
+
 def test_list_vectors_with_filters(chromadb_instance):
     """Test list with agent_id and run_id filters."""
     mock_result = {
@@ -1,205 +1,569 @@
+import gc
 import os
+import pickle
 import tempfile
-from unittest.mock import Mock, patch
+import weakref
+from unittest.mock import patch
 
 import faiss
 import numpy as np
 import pytest
 
-from mem0.vector_stores.faiss import FAISS, OutputData
+from mem0.vector_stores.faiss import FAISS
 
 
 @pytest.fixture
-def mock_faiss_index():
-    index = Mock(spec=faiss.IndexFlatL2)
-    index.d = 128  # Dimension of the vectors
-    index.ntotal = 0  # Number of vectors in the index
-    return index
+def faiss_instance():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        faiss_store = FAISS(
+            collection_name="test_collection",
+            path=os.path.join(temp_dir, "test_faiss"),
+            distance_strategy="euclidean",
+            embedding_model_dims=3,
+        )
+        yield faiss_store
 
 
-@pytest.fixture
-def faiss_instance(mock_faiss_index):
-    with tempfile.TemporaryDirectory() as temp_dir:
-        # Mock the faiss index creation
-        with patch("faiss.IndexFlatL2", return_value=mock_faiss_index):
-            # Mock the faiss.write_index function
-            with patch("faiss.write_index"):
-                # Create a FAISS instance with a temporary directory
-                faiss_store = FAISS(
-                    collection_name="test_collection",
-                    path=os.path.join(temp_dir, "test_faiss"),
-                    distance_strategy="euclidean",
-                )
-                # Set up the mock index
-                faiss_store.index = mock_faiss_index
-                yield faiss_store
-
-
-def test_create_col(faiss_instance, mock_faiss_index):
+def test_create_col(faiss_instance):
     # Test creating a collection with euclidean distance
-    with patch("faiss.IndexFlatL2", return_value=mock_faiss_index) as mock_index_flat_l2:
-        with patch("faiss.write_index"):
-            faiss_instance.create_col(name="new_collection")
-            mock_index_flat_l2.assert_called_once_with(faiss_instance.embedding_model_dims)
+    faiss_instance.create_col(name="new_collection")
+    assert isinstance(faiss_instance.index, faiss.IndexIDMap2)
+    assert faiss_instance.index.metric_type == faiss.METRIC_L2
+    assert faiss_instance.index.d == faiss_instance.embedding_model_dims
 
     # Test creating a collection with inner product distance
-    with patch("faiss.IndexFlatIP", return_value=mock_faiss_index) as mock_index_flat_ip:
-        with patch("faiss.write_index"):
-            faiss_instance.create_col(name="new_collection", distance="inner_product")
-            mock_index_flat_ip.assert_called_once_with(faiss_instance.embedding_model_dims)
+    faiss_instance.create_col(name="new_collection", distance="inner_product")
+    assert faiss_instance.index.metric_type == faiss.METRIC_INNER_PRODUCT
 
 
-def test_insert(faiss_instance, mock_faiss_index):
-    # Prepare test data
+def test_insert(faiss_instance):
     vectors = [[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]]
     payloads = [{"name": "vector1"}, {"name": "vector2"}]
     ids = ["id1", "id2"]
 
-    # Mock the numpy array conversion
-    with patch("numpy.array", return_value=np.array(vectors, dtype=np.float32)) as mock_np_array:
-        # Mock index.add
-        mock_faiss_index.add.return_value = None
+    faiss_instance.insert(vectors=vectors, payloads=payloads, ids=ids)
+
+    assert faiss_instance.index.ntotal == 2
+    assert faiss_instance.docstore["id1"] == {"name": "vector1"}
+    assert faiss_instance.docstore["id2"] == {"name": "vector2"}
+    assert faiss_instance.index_to_id[0] == "id1"
+    assert faiss_instance.index_to_id[1] == "id2"
+    assert faiss_instance.id_to_index == {"id1": 0, "id2": 1}
+
+
+def test_insert_existing_id_replaces_vector(faiss_instance):
+    faiss_instance.insert(vectors=[[0.1, 0.2, 0.3]], payloads=[{"name": "old"}], ids=["id1"])
+    faiss_instance.insert(vectors=[[0.9, 0.9, 0.9]], payloads=[{"name": "new"}], ids=["id1"])
+
+    assert faiss_instance.index.ntotal == 1
+    assert faiss_instance.docstore["id1"] == {"name": "new"}
+    row_id = faiss_instance.id_to_index["id1"]
+    np.testing.assert_allclose(faiss_instance.index.reconstruct(row_id), [0.9, 0.9, 0.9], rtol=1e-6)
+
+
+def test_search(faiss_instance):
+    faiss_instance.insert(
+        vectors=[[0.1, 0.2, 0.3], [0.9, 0.9, 0.9]],
+        payloads=[{"name": "vector1"}, {"name": "vector2"}],
+        ids=["id1", "id2"],
+    )
+
+    results = faiss_instance.search(query="test query", vectors=[0.1, 0.2, 0.3], limit=2)
+
+    assert len(results) == 2
+    assert results[0].id == "id1"
+    assert results[0].score == pytest.approx(0.0)
+    assert results[0].payload == {"name": "vector1"}
+    assert results[1].id == "id2"
+    assert results[1].payload == {"name": "vector2"}
+
 
-        # Call insert
-        faiss_instance.insert(vectors=vectors, payloads=payloads, ids=ids)
+def test_search_with_filters(faiss_instance):
+    faiss_instance.insert(
+        vectors=[[0.1, 0.2, 0.3], [0.1, 0.2, 0.31]],
+        payloads=[{"name": "vector1", "category": "A"}, {"name": "vector2", "category": "B"}],
+        ids=["id1", "id2"],
+    )
+
+    results = faiss_instance.search(query="test query", vectors=[0.1, 0.2, 0.3], limit=2, filters={"category": "A"})
+
+    assert len(results) == 1
+    assert results[0].id == "id1"
+    assert results[0].score == pytest.approx(0.0)
+    assert results[0].payload == {"name": "vector1", "category": "A"}
+
+
+def test_search_with_filters_is_not_crowded_out(faiss_instance):
+    # A heavy user whose vectors are all closer to the query than the filtered user's
+    faiss_instance.insert(
+        vectors=[[0.0, 0.0, 0.01 * i] for i in range(50)],
+        payloads=[{"user_id": "heavy"} for _ in range(50)],
+    )
+    faiss_instance.insert(
+        vectors=[[1.0, 1.0, 1.0], [2.0, 2.0, 2.0], [3.0, 3.0, 3.0]],
+        payloads=[{"user_id": "alice", "run_id": "r1"}, {"user_id": "alice", "run_id": "r2"}, {"user_id": "alice"}],
+        ids=["a1", "a2", "a3"],
+    )
 
-        # Verify numpy.array was called
-        mock_np_array.assert_called_once_with(vectors, dtype=np.float32)
+    results = faiss_instance.search(query="", vectors=[0.0, 0.0, 0.0], limit=3, filters={"user_id": "alice"})
+    assert [r.id for r in results] == ["a1", "a2", "a3"]
 
-        # Verify index.add was called
-        mock_faiss_index.add.assert_called_once()
+    results = faiss_instance.search(
+        query="", vectors=[0.0, 0.0, 0.0], limit=3, filters={"user_id": "alice", "run_id": ["r2", "r3"]}
+    )
+    assert [r.id for r in results] == ["a2"]
 
-        # Verify docstore and index_to_id were updated
-        assert faiss_instance.docstore["id1"] == {"name": "vector1"}
-        assert faiss_instance.docstore["id2"] == {"name": "vector2"}
-        assert faiss_instance.index_to_id[0] == "id1"
-        assert faiss_instance.index_to_id[1] == "id2"
+    assert faiss_instance.search(query="", vectors=[0.0, 0.0, 0.0], filters={"user_id": "bob"}) == []
 
 
-def test_search(faiss_instance, mock_faiss_index):
-    # Prepare test data
-    query_vector = [0.1, 0.2, 0.3]
+def test_search_with_filters_on_hnsw_index(tmp_path):
+    store = FAISS(collection_name="hnsw", path=str(tmp_path / "hnsw"), embedding_model_dims=3, index_type="hnsw")
+    store.insert(
+        vectors=np.random.default_rng(0).random((200, 3)).tolist(),
+        payloads=[{"user_id": "alice" if i % 50 == 0 else "bob"} for i in range(200)],
+        ids=[f"id{i}" for i in range(200)],
+    )
 
-    # Setup the docstore and index_to_id mapping
-    faiss_instance.docstore = {"id1": {"name": "vector1"}, "id2": {"name": "vector2"}}
-    faiss_instance.index_to_id = {0: "id1", 1: "id2"}
+    results = store.search(query="", vectors=[0.5, 0.5, 0.5], limit=10, filters={"user_id": "alice"})
 
-    # First, create the mock for the search return values
-    search_scores = np.array([[0.9, 0.8]])
-    search_indices = np.array([[0, 1]])
-    mock_faiss_index.search.return_value = (search_scores, search_indices)
+    assert sorted(r.id for r in results) == ["id0", "id100", "id150", "id50"]
 
-    # Then patch numpy.array only for the query vector conversion
-    with patch("numpy.array") as mock_np_array:
-        mock_np_array.return_value = np.array(query_vector, dtype=np.float32)
 
-        # Then patch _parse_output to return the expected results
-        expected_results = [
-            OutputData(id="id1", score=0.9, payload={"name": "vector1"}),
-            OutputData(id="id2", score=0.8, payload={"name": "vector2"}),
-        ]
+@pytest.mark.parametrize(("compression", "index_spec"), [("pq", "PQ1"), ("sq8", "SQ8")])
+def test_search_with_filters_on_compressed_flat_index(tmp_path, compression, index_spec):
+    store = FAISS(
+        collection_name="compressed",
+        path=str(tmp_path / "compressed"),
+        embedding_model_dims=8,
+        compression=compression,
+        pq_m=1,
+        train_min_vectors=300,
+    )
+    vectors = np.random.default_rng(0).random((400, 8))
+    store.insert(
+        vectors=vectors.tolist(),
+        payloads=[{"user_id": "alice" if i % 4 == 0 else "bob"} for i in range(400)],
+        ids=[f"id{i}" for i in range(400)],
+    )
+    assert store.active_index_spec == index_spec
 
-        with patch.object(faiss_instance, "_parse_output", return_value=expected_results):
-            # Call search
-            results = faiss_instance.search(query="test query", vectors=query_vector, limit=2)
+    results = store.search(query="", vectors=vectors[8].tolist(), limit=5, filters={"user_id": "alice"})
 
-            # Verify numpy.array was called (but we don't check exact call arguments since it's complex)
-            assert mock_np_array.called
+    assert len(results) == 5
+    assert results[0].id == "id8"
+    assert all(store.docstore[r.id]["user_id"] == "alice" for r in results)
+
+    # Candidates scored in several chunks give the same ranking
+    with patch("mem0.vector_stores.faiss._EXACT_SEARCH_MAX_CANDIDATES", 7):
+        chunked = store.search(query="", vectors=vectors[8].tolist(), limit=5, filters={"user_id": "alice"})
+    assert [r.id for r in chunked] == [r.id for r in results]
 
-            # Verify index.search was called
-            mock_faiss_index.search.assert_called_once()
 
-            # Verify results
-            assert len(results) == 2
-            assert results[0].id == "id1"
-            assert results[0].score == 0.9
-            assert results[0].payload == {"name": "vector1"}
-            assert results[1].id == "id2"
-            assert results[1].score == 0.8
-            assert results[1].payload == {"name": "vector2"}
+def test_payload_index_follows_updates_and_deletes(faiss_instance):
+    faiss_instance.insert(
+        vectors=[[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]],
+        payloads=[{"user_id": "alice", "meta": {"k": 1}}, {"user_id": "alice"}],
+        ids=["id1", "id2"],
+    )
+    assert list(faiss_instance.payload_index[("user_id", "alice")]) == ["id1", "id2"]
 
+    faiss_instance.update("id1", payload={"user_id": "bob", "meta": {"k": 1}})
+    faiss_instance.delete("id2")
 
-def test_search_with_filters(faiss_instance, mock_faiss_index):
-    # Prepare test data
-    query_vector = [0.1, 0.2, 0.3]
-
-    # Setup the docstore and index_to_id mapping
-    faiss_instance.docstore = {"id1": {"name": "vector1", "category": "A"}, "id2": {"name": "vector2", "category": "B"}}
-    faiss_instance.index_to_id = {0: "id1", 1: "id2"}
-
-    # First set up the search return values
-    search_scores = np.array([[0.9, 0.8]])
-    search_indices = np.array([[0, 1]])
-    mock_faiss_index.search.return_value = (search_scores, search_indices)
-
-    # Patch numpy.array for query vector conversion
-    with patch("numpy.array") as mock_np_array:
-        mock_np_array.return_value = np.array(query_vector, dtype=np.float32)
-
-        # Directly mock the _parse_output method to return our expected values
-        # We're simulating that _parse_output filters to just the first result
-        all_results = [
-            OutputData(id="id1", score=0.9, payload={"name": "vector1", "category": "A"}),
-            OutputData(id="id2", score=0.8, payload={"name": "vector2", "category": "B"}),
-        ]
-
-        # Replace the _apply_filters method to handle our test case
-        with patch.object(faiss_instance, "_parse_output", return_value=all_results):
-            with patch.object(faiss_instance, "_apply_filters", side_effect=lambda p, f: p.get("category") == "A"):
-                # Call search with filters
-                results = faiss_instance.search(
-                    query="test query", vectors=query_vector, limit=2, filters={"category": "A"}
-                )
-
-                # Verify numpy.array was called
-                assert mock_np_array.called
-
-                # Verify index.search was called
-                mock_faiss_index.search.assert_called_once()
-
-                # Verify filtered results - since we've mocked everything,
-                # we should get just the result we want
-                assert len(results) == 1
-                assert results[0].id == "id1"
-                assert results[0].score == 0.9
-                assert results[0].payload == {"name": "vector1", "category": "A"}
+    assert ("user_id", "alice") not in faiss_instance.payload_index
+    assert list(faiss_instance.payload_index[("user_id", "bob")]) == ["id1"]
+
+    # Unhashable values are not indexed but can still be filtered on
+    results = faiss_instance.list(filters={"user_id": "bob", "meta": {"k": 1}})
+    assert [r.id for r in results[0]] == ["id1"]
+
+
+def test_search_batch(faiss_instance):
+    faiss_instance.insert(
+        vectors=[[0.1, 0.0, 0.0], [0.5, 0.0, 0.0], [0.9, 0.0, 0.0]],
+        payloads=[{"user_id": "alice"}, {"user_id": "bob"}, {"user_id": "alice"}],
+        ids=["id1", "id2", "id3"],
+    )
+    queries = [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0]]
+
+    results = faiss_instance.search_batch(queries=["a", "b"], vectors=queries, limit=2)
+    assert [[r.id for r in result] for result in results] == [["id1", "id2"], ["id3", "id2"]]
+
+    results = faiss_instance.search_batch(queries=["a", "b"], vectors=queries, limit=2, filters={"user_id": "alice"})
+    assert [[r.id for r in result] for result in results] == [["id1", "id3"], ["id3", "id1"]]
+
+    results = faiss_instance.search_batch(queries=["a", "b"], vectors=queries, filters={"user_id": "carol"})
+    assert results == [[], []]
 
 
 def test_delete(faiss_instance):
-    # Setup the docstore and index_to_id mapping
-    faiss_instance.docstore = {"id1": {"name": "vector1"}, "id2": {"name": "vector2"}}
-    faiss_instance.index_to_id = {0: "id1", 1: "id2"}
+    faiss_instance.insert(
+        vectors=[[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]],
+        payloads=[{"name": "vector1"}, {"name": "vector2"}],
+        ids=["id1", "id2"],
+    )
 
-    # Call delete
     faiss_instance.delete(vector_id="id1")
 
-    # Verify the vector was removed from docstore and index_to_id
+    # The vector is removed from the index itself, not only from the mappings
+    assert faiss_instance.index.ntotal == 1
     assert "id1" not in faiss_instance.docstore
+    assert "id1" not in faiss_instance.id_to_index
     assert 0 not in faiss_instance.index_to_id
     assert "id2" in faiss_instance.docstore
     assert 1 in faiss_instance.index_to_id
 
+    results = faiss_instance.search(query="", vectors=[0.1, 0.2, 0.3], limit=5)
+    assert [r.id for r in results] == ["id2"]
 
-def test_update(faiss_instance, mock_faiss_index):
-    # Setup the docstore and index_to_id mapping
-    faiss_instance.docstore = {"id1": {"name": "vector1"}, "id2": {"name": "vector2"}}
-    faiss_instance.index_to_id = {0: "id1", 1: "id2"}
 
-    # Test updating payload only
+def test_update(faiss_instance):
+    faiss_instance.insert(
+        vectors=[[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]],
+        payloads=[{"name": "vector1"}, {"name": "vector2"}],
+        ids=["id1", "id2"],
+    )
+
+    # Test updating payload only, which leaves the index untouched
     faiss_instance.update(vector_id="id1", payload={"name": "updated_vector1"})
     assert faiss_instance.docstore["id1"] == {"name": "updated_vector1"}
+    assert faiss_instance.id_to_index["id1"] == 0
 
     # Test updating vector
-    # This requires mocking the delete and insert methods
-    with patch.object(faiss_instance, "delete") as mock_delete:
-        with patch.object(faiss_instance, "insert") as mock_insert:
-            new_vector = [0.7, 0.8, 0.9]
-            faiss_instance.update(vector_id="id2", vector=new_vector)
+    faiss_instance.update(vector_id="id2", vector=[0.7, 0.8, 0.9])
+    assert faiss_instance.index.ntotal == 2
+    assert faiss_instance.docstore["id2"] == {"name": "vector2"}
+    row_id = faiss_instance.id_to_index["id2"]
+    np.testing.assert_allclose(faiss_instance.index.reconstruct(row_id), [0.7, 0.8, 0.9], rtol=1e-6)
+
+
+def test_tombstones_and_compaction(faiss_instance):
+    faiss_instance.compaction_threshold = 0.5
+    faiss_instance.insert(
+        vectors=[[0.1, 0.0, 0.0], [0.2, 0.0, 0.0], [0.3, 0.0, 0.0], [0.4, 0.0, 0.0]],
+        ids=["id1", "id2", "id3", "id4"],
+    )
+
+    # Simulate an index type that cannot remove vectors in place
+    with patch.object(faiss_instance.index, "remove_ids", side_effect=RuntimeError("not implemented")):
+        faiss_instance.delete("id1")
+
+    assert faiss_instance.tombstones == {0}
+    assert faiss_instance.index.ntotal == 4
+    assert faiss_instance.col_info()["count"] == 3
+    assert faiss_instance.col_info()["tombstones"] == 1
+
+    # Tombstoned rows are skipped without shrinking the result set
+    results = faiss_instance.search(query="", vectors=[0.1, 0.0, 0.0], limit=3)
+    assert [r.id for r in results] == ["id2", "id3", "id4"]
+
+    faiss_instance.compact()
+
+    assert faiss_instance.tombstones == set()
+    assert faiss_instance.index.ntotal == 3
+    assert sorted(faiss_instance.id_to_index) == ["id2", "id3", "id4"]
+
+
+def test_tombstone_ratio_triggers_compaction(faiss_instance):
+    faiss_instance.compaction_threshold = 0.2
+    faiss_instance.insert(vectors=[[0.1, 0.0, 0.0], [0.2, 0.0, 0.0]], ids=["id1", "id2"])
+
+    with patch.object(faiss_instance.index, "remove_ids", side_effect=RuntimeError("not implemented")):
+        faiss_instance.delete("id1")
+
+    # Compaction runs on a background thread instead of inside delete()
+    faiss_instance._compaction_thread.join()
+    assert faiss_instance.tombstones == set()
+    assert faiss_instance.index.ntotal == 1
+    assert [r.id for r in faiss_instance.search(query="", vectors=[0.1, 0.0, 0.0], limit=2)] == ["id2"]
+
+
+def test_search_over_fetch_is_bounded_with_tombstones(tmp_path):
+    store = FAISS(collection_name="hnsw", path=str(tmp_path / "hnsw"), embedding_model_dims=3, index_type="hnsw")
+    store.compaction_threshold = 1.0
+    store.insert(vectors=[[i / 100, 0.0, 0.0] for i in range(100)], ids=[f"id{i}" for i in range(100)])
+    for i in range(0, 60, 2):
+        store.delete(f"id{i}")
+    assert len(store.tombstones) == 30
+
+    with patch.object(store.index, "search", wraps=store.index.search) as search:
+        results = store.search(query="", vectors=[0.505, 0.0, 0.0], limit=3)
+    assert search.call_args.args[1] == 6
+    assert [r.id for r in results] == ["id51", "id49", "id53"]
+
+    # Queries landing among tombstones widen the search until they are filled
+    results = store.search(query="", vectors=[0.0, 0.0, 0.0], limit=5)
+    assert [r.id for r in results] == ["id1", "id3", "id5", "id7", "id9"]
+
+
+def test_compaction_keeps_writes_made_during_the_build(tmp_path):
+    store = FAISS(collection_name="hnsw", path=str(tmp_path / "hnsw"), embedding_model_dims=3, index_type="hnsw")
+    store.compaction_threshold = 1.0
+    store.insert(vectors=[[0.1, 0.0, 0.0], [0.2, 0.0, 0.0], [0.3, 0.0, 0.0]], ids=["id1", "id2", "id3"])
+    store.delete("id1")
+
+    def write_during_build(index):
+        store.insert(vectors=[[0.4, 0.0, 0.0]], ids=["id4"])
+        store.delete("id2")
+
+    with patch.object(store, "_configure_search", side_effect=write_during_build):
+        store.compact()
+
+    # id2 was deleted from the old index during the build, so it is tombstoned again in the new one
+    assert store.tombstones == {1}
+    assert store.index.ntotal == 3
+    assert [r.id for r in store.search(query="", vectors=[0.2, 0.0, 0.0], limit=3)] == ["id3", "id4"]
+
+
+def test_compaction_reuses_trained_quantizer(tmp_path):
+    store = FAISS(
+        collection_name="sq8",
+        path=str(tmp_path / "sq8"),
+        embedding_model_dims=8,
+        index_type="hnsw",
+        compression="sq8",
+        train_min_vectors=50,
+    )
+    store.compaction_threshold = 1.0
+    store.insert(vectors=np.random.default_rng(0).random((100, 8)).tolist(), ids=[f"id{i}" for i in range(100)])
+    assert store.active_index_spec == "HNSW32_SQ8"
+    for i in range(10):
+        store.delete(f"id{i}")
+
+    live_rows = np.array(sorted(store.index_to_id), dtype=np.int64)
+    before = store.index.reconstruct_batch(live_rows)
+    store.compact()
+
+    assert store.index.ntotal == 90
+    np.testing.assert_array_equal(store.index.reconstruct_batch(live_rows), before)
+
+
+def test_load_legacy_positional_index():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "legacy")
+        os.makedirs(path)
+
+        # Older versions stored a plain flat index addressed by position and left deleted vectors behind
+        legacy_index = faiss.IndexFlatL2(3)
+        legacy_index.add(np.array([[0.1, 0.0, 0.0], [0.2, 0.0, 0.0], [0.3, 0.0, 0.0]], dtype=np.float32))
+        faiss.write_index(legacy_index, f"{path}/legacy.faiss")
+        with open(f"{path}/legacy.pkl", "wb") as f:
+            pickle.dump(({"id1": {"name": "a"}, "id3": {"name": "c"}}, {0: "id1", 2: "id3"}), f)
+
+        store = FAISS(collection_name="legacy", path=path, embedding_model_dims=3)
+
+        assert isinstance(store.index, faiss.IndexIDMap2)
+        assert store.index.ntotal == 2
+        assert store.id_to_index == {"id1": 0, "id3": 2}
+        np.testing.assert_allclose(store.index.reconstruct(2), [0.3, 0.0, 0.0], rtol=1e-6)
+
+        store.insert(vectors=[[0.4, 0.0, 0.0]], ids=["id4"])
+        assert store.id_to_index["id4"] == 3
+
+
+def test_persistence_roundtrip():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "store")
+        store = FAISS(collection_name="roundtrip", path=path, embedding_model_dims=3)
+        store.insert(vectors=[[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]], payloads=[{"a": 1}, {"b": 2}], ids=["id1", "id2"])
+        store.delete("id1")
+
+        reloaded = FAISS(collection_name="roundtrip", path=path, embedding_model_dims=3)
+
+        assert reloaded.index.ntotal == 1
+        assert reloaded.id_to_index == {"id2": 1}
+        assert reloaded.next_row_id == 2
+        assert reloaded.get("id2").payload == {"b": 2}
+
+
+@pytest.fixture
+def write_behind_path():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield os.path.join(temp_dir, "write_behind")
+
+
+def test_write_behind_logs_instead_of_snapshotting(write_behind_path):
+    store = FAISS(collection_name="wb", path=write_behind_path, embedding_model_dims=3, write_behind=True)
+
+    with patch.object(store, "_save") as mock_save:
+        store.insert(vectors=[[0.1, 0.2, 0.3]], payloads=[{"a": 1}], ids=["id1"])
+        store.update("id1", payload={"a": 2})
+        store.delete("id1")
+
+    mock_save.assert_not_called()
+    assert store._ops_since_snapshot == 3
+    assert os.path.exists(f"{write_behind_path}/wb.log")
+    store.close()
+
+
+def test_write_behind_snapshot_after_op_count(write_behind_path):
+    store = FAISS(
+        collection_name="wb", path=write_behind_path, embedding_model_dims=3, write_behind=True, snapshot_interval_ops=2
+    )
+
+    store.insert(vectors=[[0.1, 0.2, 0.3]], ids=["id1"])
+    assert os.path.exists(f"{write_behind_path}/wb.log")
+
+    store.insert(vectors=[[0.4, 0.5, 0.6]], ids=["id2"])
+    assert not os.path.exists(f"{write_behind_path}/wb.log")
+    assert store._ops_since_snapshot == 0
+    store.close()
 
-            # Verify delete and insert were called
-            # Match the actual call signature (positional arg instead of keyword)
-            mock_delete.assert_called_once_with("id2")
-            mock_insert.assert_called_once()
+
+def test_write_behind_replays_log_after_crash(write_behind_path):
+    store = FAISS(collection_name="wb", path=write_behind_path, embedding_model_dims=3, write_behind=True)
+    store.insert(vectors=[[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]], payloads=[{"a": 1}, {"b": 2}], ids=["id1", "id2"])
+    store.update("id2", vector=[0.7, 0.8, 0.9], payload={"b": 3})
+    store.delete("id1")
+    # Simulate a crash: the log is left behind without a final snapshot
+    store._close_log()
+
+    # Append a torn record, as a crash in the middle of a write would
+    with open(f"{write_behind_path}/wb.log", "ab") as f:
+        f.write(pickle.dumps(("delete", "id2"))[:5])
+
+    recovered = FAISS(collection_name="wb", path=write_behind_path, embedding_model_dims=3)
+
+    assert recovered.index.ntotal == 1
+    assert recovered.get("id1") is None
+    assert recovered.get("id2").payload == {"b": 3}
+    row_id = recovered.id_to_index["id2"]
+    np.testing.assert_allclose(recovered.index.reconstruct(row_id), [0.7, 0.8, 0.9], rtol=1e-6)
+    # The recovered state is folded into a new snapshot
+    assert not os.path.exists(f"{write_behind_path}/wb.log")
+
+
+def test_delete_by_filter_is_replayed_from_log(write_behind_path):
+    store = FAISS(collection_name="wb", path=write_behind_path, embedding_model_dims=3, write_behind=True)
+    store.insert(
+        vectors=[[0.1, 0.2, 0.3], [0.4, 0.5, 0.6], [0.7, 0.8, 0.9]],
+        payloads=[{"user_id": "alice"}, {"user_id": "bob"}, {"user_id": "alice"}],
+        ids=["id1", "id2", "id3"],
+    )
+
+    store.delete_by_filter({"user_id": "alice"})
+    store._close_log()
+
+    assert [memory.id for memory in store.list()[0]] == ["id2"]
+    recovered = FAISS(collection_name="wb", path=write_behind_path, embedding_model_dims=3)
+    assert recovered.index.ntotal == 1
+    assert recovered.get("id1") is None
+    assert recovered.get("id3") is None
+    assert recovered.get("id2").payload == {"user_id": "bob"}
+
+
+def test_delete_by_filter_requires_filters(faiss_instance):
+    with pytest.raises(ValueError):
+        faiss_instance.delete_by_filter({})
+
+
+def test_write_behind_close_flushes_snapshot(write_behind_path):
+    store = FAISS(collection_name="wb", path=write_behind_path, embedding_model_dims=3, write_behind=True)
+    store.insert(vectors=[[0.1, 0.2, 0.3]], payloads=[{"a": 1}], ids=["id1"])
+
+    store.close()
+
+    assert not os.path.exists(f"{write_behind_path}/wb.log")
+    reloaded = FAISS(collection_name="wb", path=write_behind_path, embedding_model_dims=3)
+    assert reloaded.get("id1").payload == {"a": 1}
+
+
+def test_write_behind_exit_hook_does_not_keep_store_alive(write_behind_path):
+    store = FAISS(collection_name="wb", path=write_behind_path, embedding_model_dims=3, write_behind=True)
+    store_ref = weakref.ref(store)
+
+    del store
+    gc.collect()
+
+    assert store_ref() is None
+
+
+def test_hnsw_index(tmp_path):
+    store = FAISS(
+        collection_name="hnsw", path=str(tmp_path / "hnsw"), embedding_model_dims=3, index_type="hnsw", hnsw_m=8
+    )
+    assert store.active_index_spec == "HNSW8"
+    assert faiss.downcast_index(store.index.index).hnsw.efSearch == 64
+
+    store.insert(vectors=[[0.1, 0.0, 0.0], [0.2, 0.0, 0.0], [0.9, 0.0, 0.0]], ids=["id1", "id2", "id3"])
+    results = store.search(query="", vectors=[0.19, 0.0, 0.0], limit=2)
+    assert [r.id for r in results] == ["id2", "id1"]
+
+    # HNSW cannot remove vectors in place, so deletes go through tombstones
+    store.compaction_threshold = 0.5
+    store.delete("id2")
+    assert store.tombstones == {1}
+    results = store.search(query="", vectors=[0.19, 0.0, 0.0], limit=2)
+    assert [r.id for r in results] == ["id1", "id3"]
+
+
+def test_ivf_index_trains_once_enough_vectors(tmp_path):
+    store = FAISS(
+        collection_name="ivf",
+        path=str(tmp_path / "ivf"),
+        embedding_model_dims=8,
+        index_type="ivf",
+        compression="sq8",
+        ivf_nlist=4,
+        ivf_nprobe=4,
+        train_min_vectors=300,
+    )
+    assert store.index_spec == "IVF4,SQ8"
+    assert store.active_index_spec == "Flat"
+
+    vectors = np.random.default_rng(0).random((300, 8), dtype=np.float32)
+    ids = [f"id{i}" for i in range(300)]
+    store.insert(vectors=vectors[:299].tolist(), ids=ids[:299])
+    assert store.active_index_spec == "Flat"
+
+    store.insert(vectors=vectors[299:].tolist(), ids=ids[299:])
+    assert store.active_index_spec == "IVF4,SQ8"
+    assert store.index.is_trained
+    assert store.index.ntotal == 300
+    assert faiss.try_extract_index_ivf(store.index).nprobe == 4
+
+    # IVF indexes remove vectors in place
+    store.delete("id0")
+    assert store.index.ntotal == 299
+    assert store.tombstones == set()
+
+    results = store.search(query="", vectors=vectors[10].tolist(), limit=5)
+    assert "id10" in [r.id for r in results]
+
+    reloaded = FAISS(
+        collection_name="ivf",
+        path=str(tmp_path / "ivf"),
+        embedding_model_dims=8,
+        index_type="ivf",
+        compression="sq8",
+        ivf_nlist=4,
+        train_min_vectors=300,
+    )
+    assert reloaded.active_index_spec == "IVF4,SQ8"
+    assert reloaded.index.ntotal == 299
+
+
+def test_index_factory_spec(tmp_path):
+    def spec(**kwargs):
+        return FAISS(collection_name="spec", path=str(tmp_path / "spec"), embedding_model_dims=32, **kwargs).index_spec
+
+    assert spec() == "Flat"
+    assert spec(compression="sq8") == "SQ8"
+    assert spec(index_type="hnsw", hnsw_m=16, compression="pq", pq_m=8) == "HNSW16_PQ8"
+    assert spec(index_type="ivf", ivf_nlist=256, compression="pq") == "IVF256,PQ16"
+
+
+def test_flat_index_is_migrated_to_configured_type(tmp_path):
+    path = str(tmp_path / "migrate")
+    flat_store = FAISS(collection_name="migrate", path=path, embedding_model_dims=3)
+    flat_store.insert(vectors=[[0.1, 0.0, 0.0], [0.2, 0.0, 0.0]], payloads=[{"a": 1}, {"b": 2}], ids=["id1", "id2"])
+
+    hnsw_store = FAISS(collection_name="migrate", path=path, embedding_model_dims=3, index_type="hnsw")
+
+    assert hnsw_store.active_index_spec == "HNSW32"
+    assert isinstance(faiss.downcast_index(hnsw_store.index.index), faiss.IndexHNSWFlat)
+    assert hnsw_store.id_to_index == {"id1": 0, "id2": 1}
+    assert [r.id for r in hnsw_store.search(query="", vectors=[0.2, 0.0, 0.0], limit=1)] == ["id2"]
 
 
 def test_get(faiss_instance):
@@ -218,12 +582,15 @@ def test_get(faiss_instance):
 
 
 def test_list(faiss_instance):
-    # Setup the docstore
-    faiss_instance.docstore = {
-        "id1": {"name": "vector1", "category": "A"},
-        "id2": {"name": "vector2", "category": "B"},
-        "id3": {"name": "vector3", "category": "A"},
-    }
+    faiss_instance.insert(
+        vectors=[[0.1, 0.2, 0.3]] * 3,
+        payloads=[
+            {"name": "vector1", "category": "A"},
+            {"name": "vector2", "category": "B"},
+            {"name": "vector3", "category": "A"},
+        ],
+        ids=["id1", "id2", "id3"],
+    )
 
     # Test listing all vectors
     results = faiss_instance.list()
@@ -241,10 +608,8 @@ def test_list(faiss_instance):
         assert result.payload["category"] == "A"
 
 
-def test_col_info(faiss_instance, mock_faiss_index):
-    # Mock index attributes
-    mock_faiss_index.ntotal = 5
-    mock_faiss_index.d = 128
+def test_col_info(faiss_instance):
+    faiss_instance.insert(vectors=[[0.1, 0.2, 0.3]] * 5)
 
     # Get collection info
     info = faiss_instance.col_info()
@@ -252,7 +617,8 @@ def test_col_info(faiss_instance, mock_faiss_index):
     # Verify the returned info
     assert info["name"] == "test_collection"
     assert info["count"] == 5
-    assert info["dimension"] == 128
+    assert info["tombstones"] == 0
+    assert info["dimension"] == 3
     assert info["distance"] == "euclidean"
 
 
@@ -263,29 +629,70 @@ def test_delete_col(faiss_instance):
             # Call delete_col
             faiss_instance.delete_col()
 
-            # Verify os.remove was called twice (for index and docstore files)
-            assert mock_remove.call_count == 2
+            # Verify os.remove was called for the index, docstore and mutation log files
+            assert mock_remove.call_count == 3
 
             # Verify the internal state was reset
             assert faiss_instance.index is None
             assert faiss_instance.docstore == {}
             assert faiss_instance.index_to_id == {}
+            assert faiss_instance.id_to_index == {}
 
 
-def test_normalize_L2(faiss_instance, mock_faiss_index):
+def test_normalize_L2(faiss_instance):
     # Setup a FAISS instance with normalize_L2=True
     faiss_instance.normalize_L2 = True
 
     # Prepare test data
     vectors = [[0.1, 0.2, 0.3]]
 
-    # Mock numpy array conversion
-    # Mock numpy array conversion
-    with patch("numpy.array", return_value=np.array(vectors, dtype=np.float32)):
-        # Mock faiss.normalize_L2
-        with patch("faiss.normalize_L2") as mock_normalize:
-            # Call insert
-            faiss_instance.insert(vectors=vectors, ids=["id1"])
+    # Mock faiss.normalize_L2
+    with patch("faiss.normalize_L2") as mock_normalize:
+        # Call insert
+        faiss_instance.insert(vectors=vectors, ids=["id1"])
+
+        # Verify faiss.normalize_L2 was called
+        mock_normalize.assert_called_once()
+
+
+def test_list_page_walks_all_vectors(faiss_instance):
+    ids = [f"id{i}" for i in range(5)]
+    faiss_instance.insert(
+        vectors=[[float(i), 0.0, 0.0] for i in range(5)],
+        payloads=[{"user_id": "alice"} for _ in range(5)],
+        ids=ids,
+    )
+
+    pages = []
+    cursor = None
+    while True:
+        page, cursor = faiss_instance.list_page(filters={"user_id": "alice"}, limit=2, cursor=cursor)
+        pages.append([result.id for result in page])
+        if cursor is None:
+            break
+
+    assert pages == [["id0", "id1"], ["id2", "id3"], ["id4"]]
+
+
+def test_list_page_resumes_after_a_deleted_cursor_row(faiss_instance):
+    ids = [f"id{i}" for i in range(4)]
+    faiss_instance.insert(vectors=[[float(i), 0.0, 0.0] for i in range(4)], ids=ids)
+
+    page, cursor = faiss_instance.list_page(limit=2)
+    faiss_instance.delete("id1")
+    faiss_instance.insert(vectors=[[9.0, 0.0, 0.0]], ids=["id9"])
+    next_page, next_cursor = faiss_instance.list_page(limit=2, cursor=cursor)
+
+    assert [result.id for result in page] == ["id0", "id1"]
+    assert [result.id for result in next_page] == ["id2", "id3"]
+    assert [result.id for result in faiss_instance.list_page(limit=2, cursor=next_cursor)[0]] == ["id9"]
+
+
+def test_delete_batch_removes_only_the_given_ids(faiss_instance):
+    ids = [f"id{i}" for i in range(4)]
+    faiss_instance.insert(vectors=[[float(i), 0.0, 0.0] for i in range(4)], ids=ids)
+
+    faiss_instance.delete_batch(["id1", "id3", "missing"])
 
-            # Verify faiss.normalize_L2 was called
-            mock_normalize.assert_called_once()
+    assert sorted(faiss_instance.docstore) == ["id0", "id2"]
+    assert faiss_instance.index.ntotal == 2
@@ -0,0 +1,74 @@
+from unittest.mock import patch
+
+import pytest
+
+from mem0.configs.vector_stores.milvus import MetricType
+from mem0.vector_stores.milvus import MilvusDB
+
+
+@pytest.fixture
+def milvus_db():
+    with patch("mem0.vector_stores.milvus.MilvusClient") as mock_client_class:
+        mock_client_class.return_value.has_collection.return_value = True
+        yield MilvusDB(
+            url="http://localhost:19530",
+            token=None,
+            collection_name="mem0",
+            embedding_model_dims=3,
+            metric_type=MetricType.COSINE,
+            db_name="",
+            batch_size=2,
+        )
+
+
+def test_insert_sends_batches(milvus_db):
+    ids = ["a", "b", "c"]
+    vectors = [[0.1, 0.2, 0.3]] * 3
+    payloads = [{"data": "one"}, {"data": "two"}, {"data": "three"}]
+
+    milvus_db.insert(ids, vectors, payloads)
+
+    batches = [call.kwargs["data"] for call in milvus_db.client.insert.call_args_list]
+    assert [[row["id"] for row in batch] for batch in batches] == [["a", "b"], ["c"]]
+    assert batches[1][0] == {"id": "c", "vectors": [0.1, 0.2, 0.3], "metadata": {"data": "three"}}
+
+
+def test_delete_by_filter_uses_one_filtered_delete(milvus_db):
+    milvus_db.delete_by_filter({"user_id": "alice", "priority": 2})
+
+    milvus_db.client.delete.assert_called_once_with(
+        collection_name="mem0", filter='(metadata["user_id"] == "alice") and (metadata["priority"] == 2)'
+    )
+    with pytest.raises(ValueError):
+        milvus_db.delete_by_filter({})
+
+
+def test_filter_values_are_quoted(milvus_db):
+    assert milvus_db._create_filter({"user_id": 'a" or "1" == "1'}) == (
+        '(metadata["user_id"] == "a\\" or \\"1\\" == \\"1")'
+    )
+
+
+def test_delete_accepts_id_list_and_flush(milvus_db):
+    milvus_db.delete(["a", "b"])
+    milvus_db.flush()
+
+    milvus_db.client.delete.assert_called_once_with(collection_name="mem0", ids=["a", "b"])
+    milvus_db.client.flush.assert_called_once_with(collection_name="mem0")
+
+
+def test_list_page_uses_an_id_keyset(milvus_db):
+    milvus_db.client.query.side_effect = [
+        [{"id": "a", "metadata": {"user_id": "alice"}}, {"id": "b", "metadata": {"user_id": "alice"}}],
+        [{"id": "c", "metadata": {"user_id": "alice"}}],
+    ]
+
+    page, cursor = milvus_db.list_page(filters={"user_id": "alice"}, limit=2)
+    last_page, last_cursor = milvus_db.list_page(filters={"user_id": "alice"}, limit=2, cursor=cursor)
+
+    assert [memory.id for memory in page] == ["a", "b"]
+    assert cursor == "b"
+    assert [memory.id for memory in last_page] == ["c"]
+    assert last_cursor is None
+    filters = [call.kwargs["filter"] for call in milvus_db.client.query.call_args_list]
+    assert filters == ['((metadata["user_id"] == "alice"))', '((metadata["user_id"] == "alice")) and id > "b"']
@@ -48,17 +48,15 @@ def test_initalize_create_col(mongo_vector_fixture):
     search_index_model = args[0].document
     assert search_index_model == {
         "name": "test_collection_vector_index",
+        "type": "vectorSearch",
         "definition": {
-            "mappings": {
-                "dynamic": False,
-                "fields": {
-                    "embedding": {
-                        "type": "knnVector",
-                        "dimensions": 1536,
-                        "similarity": "cosine",
-                    }
-                },
-            }
+            "fields": [
+                {"type": "vector", "path": "embedding", "numDimensions": 1536, "similarity": "cosine"},
+                {"type": "filter", "path": "payload.user_id"},
+                {"type": "filter", "path": "payload.agent_id"},
+                {"type": "filter", "path": "payload.run_id"},
+                {"type": "filter", "path": "payload.actor_id"},
+            ]
         },
     }
     assert mongo_vector.collection == mock_collection
@@ -95,7 +93,7 @@ def test_search(mongo_vector_fixture):
                 "$vectorSearch": {
                     "index": "test_collection_vector_index",
                     "limit": 2,
-                    "numCandidates": 2,
+                    "numCandidates": 20,
                     "queryVector": query_vector,
                     "path": "embedding",
                 },
@@ -126,13 +124,10 @@ def test_search_with_filters(mongo_vector_fixture):
     mock_collection.aggregate.assert_called_once()
     pipeline = mock_collection.aggregate.call_args[0][0]
     
-    # Check that the pipeline has the expected stages
-    assert len(pipeline) == 4  # vectorSearch, match, set, project
-    
-    # Check that the match stage is present with the correct filters
-    match_stage = pipeline[1]
-    assert "$match" in match_stage
-    assert match_stage["$match"]["$and"] == [
+    # Check that the filters run inside $vectorSearch instead of a later $match stage
+    assert len(pipeline) == 3  # vectorSearch, set, project
+    assert pipeline[0]["$vectorSearch"]["limit"] == 2
+    assert pipeline[0]["$vectorSearch"]["filter"]["$and"] == [
         {"payload.user_id": "alice"},
         {"payload.agent_id": "agent1"},
         {"payload.run_id": "run1"}
@@ -160,10 +155,8 @@ def test_search_with_single_filter(mongo_vector_fixture):
     mock_collection.aggregate.assert_called_once()
     pipeline = mock_collection.aggregate.call_args[0][0]
     
-    # Check that the match stage is present with the correct filter
-    match_stage = pipeline[1]
-    assert "$match" in match_stage
-    assert match_stage["$match"]["$and"] == [{"payload.user_id": "alice"}]
+    # Check that the filter is applied by $vectorSearch
+    assert pipeline[0]["$vectorSearch"]["filter"]["$and"] == [{"payload.user_id": "alice"}]
     
     assert len(results) == 1
     assert results[0].payload["user_id"] == "alice"
@@ -190,6 +183,51 @@ def test_search_with_no_filters(mongo_vector_fixture):
     assert len(results) == 1
 
 
+def test_search_checks_index_once(mongo_vector_fixture):
+    mongo_vector, mock_collection, _ = mongo_vector_fixture
+    mock_collection.list_search_indexes.reset_mock()
+
+    mongo_vector.search("query_str", [0.1] * 1536, limit=2)
+    mongo_vector.search("query_str", [0.1] * 1536, limit=2)
+
+    mock_collection.list_search_indexes.assert_not_called()
+    assert mock_collection.aggregate.call_count == 2
+
+
+def test_search_num_candidates_multiplier_is_capped(mongo_vector_fixture):
+    mongo_vector, mock_collection, _ = mongo_vector_fixture
+    mongo_vector.num_candidates_multiplier = 50
+
+    mongo_vector.search("query_str", [0.1] * 1536, limit=5)
+    mongo_vector.search("query_str", [0.1] * 1536, limit=500)
+
+    pipelines = [call.args[0] for call in mock_collection.aggregate.call_args_list]
+    assert [pipeline[0]["$vectorSearch"]["numCandidates"] for pipeline in pipelines] == [250, 10000]
+
+
+def test_search_post_filters_keys_missing_from_legacy_index(mongo_vector_fixture):
+    mongo_vector, mock_collection, _ = mongo_vector_fixture
+    mock_collection.list_search_indexes.return_value = [
+        {
+            "name": "test_collection_vector_index",
+            "latestDefinition": {
+                "fields": [
+                    {"type": "vector", "path": "embedding", "numDimensions": 1536, "similarity": "cosine"},
+                    {"type": "filter", "path": "payload.user_id"},
+                ]
+            },
+        }
+    ]
+    mongo_vector._index_ready = False
+
+    mongo_vector.search("query_str", [0.1] * 1536, limit=2, filters={"user_id": "alice", "category": "food"})
+
+    pipeline = mock_collection.aggregate.call_args[0][0]
+    assert pipeline[0]["$vectorSearch"]["filter"] == {"$and": [{"payload.user_id": "alice"}]}
+    assert pipeline[0]["$vectorSearch"]["limit"] == 20
+    assert pipeline[1:3] == [{"$match": {"$and": [{"payload.category": "food"}]}}, {"$limit": 2}]
+
+
 def test_delete(mongo_vector_fixture):
     mongo_vector, mock_collection, _ = mongo_vector_fixture
     vector_id = "id1"
@@ -203,6 +241,14 @@ def test_delete(mongo_vector_fixture):
     mock_collection.delete_one.assert_called_once_with({"_id": vector_id})
 
 
+def test_delete_by_filter(mongo_vector_fixture):
+    mongo_vector, mock_collection, _ = mongo_vector_fixture
+
+    mongo_vector.delete_by_filter({"user_id": "alice"})
+
+    mock_collection.delete_many.assert_called_once_with({"$and": [{"payload.user_id": "alice"}]})
+
+
 def test_update(mongo_vector_fixture):
     mongo_vector, mock_collection, _ = mongo_vector_fixture
     vector_id = "id1"
@@ -281,6 +327,26 @@ def test_list(mongo_vector_fixture):
     assert results[0].payload == {"key": "value1"}
 
 
+def test_list_page_resumes_after_cursor(mongo_vector_fixture):
+    mongo_vector, mock_collection, _ = mongo_vector_fixture
+    mock_cursor = mock_collection.find.return_value
+    mock_cursor.sort.return_value = mock_cursor
+    mock_cursor.__iter__.return_value = [
+        {"_id": "id3", "payload": {"user_id": "alice"}},
+        {"_id": "id4", "payload": {"user_id": "alice"}},
+    ]
+
+    page, cursor = mongo_vector.list_page(filters={"user_id": "alice"}, limit=2, cursor="id2")
+
+    mock_collection.find.assert_called_once_with(
+        {"$and": [{"payload.user_id": "alice"}, {"_id": {"$gt": "id2"}}]}, {"embedding": 0}
+    )
+    mock_cursor.sort.assert_called_once_with("_id", 1)
+    mock_cursor.limit.assert_called_once_with(2)
+    assert [result.id for result in page] == ["id3", "id4"]
+    assert cursor == "id4"
+
+
 def test_list_with_filters(mongo_vector_fixture):
     """Test list with agent_id and run_id filters."""
     mongo_vector, mock_collection, _ = mongo_vector_fixture
@@ -1,4 +1,5 @@
 import importlib
+import struct
 import sys
 import unittest
 import uuid
@@ -449,6 +450,47 @@ class TestPGVector(unittest.TestCase):
         self.assertEqual(results[1].id, self.test_ids[1])
         self.assertEqual(results[1].score, 0.2)
 
+    @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
+    @patch('mem0.vector_stores.pgvector.ConnectionPool')
+    @patch.object(PGVector, '_get_cursor')
+    def test_search_batch(self, mock_get_cursor, mock_connection_pool):
+        """Test that several queries are answered by a single statement."""
+        mock_connection_pool.return_value = MagicMock()
+        mock_get_cursor.return_value.__enter__.return_value = self.mock_cursor
+        mock_get_cursor.return_value.__exit__.return_value = None
+
+        self.mock_cursor.fetchall.return_value = [
+            (0, self.test_ids[0], 0.1, {"key": "value1"}),
+            (1, self.test_ids[1], 0.2, {"key": "value2"}),
+            (1, self.test_ids[0], 0.3, {"key": "value1"}),
+        ]
+
+        pgvector = PGVector(
+            dbname="test_db",
+            collection_name="test_collection",
+            embedding_model_dims=3,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            diskann=False,
+            hnsw=False,
+        )
+        self.mock_cursor.execute.reset_mock()
+
+        results = pgvector.search_batch(
+            ["first", "second"], [[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]], limit=2, filters={"user_id": "alice"}
+        )
+
+        self.mock_cursor.execute.assert_called_once()
+        query, params = self.mock_cursor.execute.call_args[0]
+        self.assertIn("CROSS JOIN LATERAL", query)
+        self.assertIn("WHERE user_id = %s", query)
+        self.assertEqual(params, (0, [0.1, 0.2, 0.3], 1, [0.4, 0.5, 0.6], "alice", 2))
+
+        self.assertEqual([[r.id for r in result] for result in results], [[self.test_ids[0]], [self.test_ids[1], self.test_ids[0]]])
+        self.assertEqual(results[1][1].score, 0.3)
+
     @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 2)
     @patch('mem0.vector_stores.pgvector.ConnectionPool')
     @patch.object(PGVector, '_get_cursor')
@@ -2225,6 +2267,281 @@ class TestPGVector(unittest.TestCase):
             # Verify pool.closeall() was called
             mock_pool.closeall.assert_called()
 
+    @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
+    @patch('mem0.vector_stores.pgvector.ConnectionPool')
+    @patch.object(PGVector, '_get_cursor')
+    def test_list_page_uses_keyset_pagination(self, mock_get_cursor, mock_connection_pool):
+        """Test that list_page resumes after the cursor id instead of using an offset."""
+        mock_get_cursor.return_value.__enter__.return_value = self.mock_cursor
+        mock_get_cursor.return_value.__exit__.return_value = None
+        self.mock_cursor.fetchall.return_value = [
+            (self.test_ids[0], {"user_id": "alice"}),
+            (self.test_ids[1], {"user_id": "alice"}),
+        ]
+
+        pgvector = PGVector(
+            dbname="test_db",
+            collection_name="test_collection",
+            embedding_model_dims=3,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            diskann=False,
+            hnsw=False,
+            minconn=1,
+            maxconn=4
+        )
+
+        page, cursor = pgvector.list_page(filters={"user_id": "alice"}, limit=2, cursor="last-id")
+
+        query, params = self.mock_cursor.execute.call_args[0]
+        self.assertIn("WHERE user_id = %s AND id > %s", query)
+        self.assertIn("ORDER BY id", query)
+        self.assertNotIn("OFFSET", query)
+        self.assertEqual(params, ("alice", "last-id", 2))
+        self.assertEqual([result.id for result in page], [str(self.test_ids[0]), str(self.test_ids[1])])
+        self.assertEqual(cursor, str(self.test_ids[1]))
+
+    @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
+    @patch('mem0.vector_stores.pgvector.ConnectionPool')
+    @patch.object(PGVector, '_get_cursor')
+    def test_delete_by_filter_runs_one_statement(self, mock_get_cursor, mock_connection_pool):
+        """Test that delete_by_filter deletes all matching rows with one DELETE."""
+        mock_get_cursor.return_value.__enter__.return_value = self.mock_cursor
+        mock_get_cursor.return_value.__exit__.return_value = None
+
+        pgvector = PGVector(
+            dbname="test_db",
+            collection_name="test_collection",
+            embedding_model_dims=3,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            diskann=False,
+            hnsw=False,
+            minconn=1,
+            maxconn=4
+        )
+        self.mock_cursor.execute.reset_mock()
+
+        pgvector.delete_by_filter({"user_id": "alice", "agent_id": "agent1"})
+
+        query, params = self.mock_cursor.execute.call_args[0]
+        self.assertEqual(self.mock_cursor.execute.call_count, 1)
+        self.assertIn("DELETE FROM test_collection WHERE user_id = %s AND agent_id = %s", query)
+        self.assertEqual(params, ["alice", "agent1"])
+        with self.assertRaises(ValueError):
+            pgvector.delete_by_filter({})
+
+    @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
+    @patch('mem0.vector_stores.pgvector.ConnectionPool')
+    @patch.object(PGVector, '_get_cursor')
+    def test_filters_use_columns_and_payload_containment(self, mock_get_cursor, mock_connection_pool):
+        """Test that scoping ids are compared on their columns and other keys with one containment test."""
+        mock_get_cursor.return_value.__enter__.return_value = self.mock_cursor
+        mock_get_cursor.return_value.__exit__.return_value = None
+        self.mock_cursor.fetchall.return_value = []
+
+        pgvector = PGVector(
+            dbname="test_db",
+            collection_name="test_collection",
+            embedding_model_dims=3,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            diskann=False,
+            hnsw=False,
+        )
+
+        clause, params = pgvector._build_filter_clause({"user_id": "alice", "category": "food", "priority": 2})
+
+        self.assertEqual(clause, "WHERE user_id = %s AND payload->>%s = %s AND payload @> %s::jsonb")
+        self.assertEqual(params[:3], ["alice", "priority", "2"])
+        self.assertEqual(params[3].obj, {"category": "food"})
+
+    @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
+    @patch('mem0.vector_stores.pgvector.ConnectionPool')
+    @patch.object(PGVector, '_get_cursor')
+    def test_create_col_adds_filter_columns_and_indexes(self, mock_get_cursor, mock_connection_pool):
+        """Test that new collections get generated filter columns with B-tree indexes and a GIN payload index."""
+        mock_get_cursor.return_value.__enter__.return_value = self.mock_cursor
+        mock_get_cursor.return_value.__exit__.return_value = None
+        self.mock_cursor.fetchall.return_value = []
+
+        PGVector(
+            dbname="test_db",
+            collection_name="test_collection",
+            embedding_model_dims=3,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            diskann=False,
+            hnsw=True,
+        )
+
+        statements = [call.args[0] for call in self.mock_cursor.execute.call_args_list]
+        create_table = next(sql for sql in statements if "CREATE TABLE" in sql)
+        self.assertIn("user_id TEXT GENERATED ALWAYS AS (payload->>'user_id') STORED", create_table)
+        self.assertIn("actor_id TEXT GENERATED ALWAYS AS (payload->>'actor_id') STORED", create_table)
+        self.assertIn(
+            "CREATE INDEX IF NOT EXISTS test_collection_user_id_idx ON test_collection (user_id)", statements
+        )
+        self.assertTrue(any("USING gin (payload jsonb_path_ops)" in sql for sql in statements))
+        self.assertFalse(any("ALTER TABLE" in sql for sql in statements))
+
+    @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
+    @patch('mem0.vector_stores.pgvector.ConnectionPool')
+    @patch.object(PGVector, '_get_cursor')
+    def test_existing_collection_without_columns_filters_on_payload(self, mock_get_cursor, mock_connection_pool):
+        """Test that opening an older collection runs no DDL and filters its missing columns on the payload."""
+        mock_get_cursor.return_value.__enter__.return_value = self.mock_cursor
+        mock_get_cursor.return_value.__exit__.return_value = None
+        self.mock_cursor.fetchall.side_effect = [
+            [("test_collection",)],
+            [("id",), ("vector",), ("payload",), ("user_id",)],
+        ]
+
+        pgvector = PGVector(
+            dbname="test_db",
+            collection_name="test_collection",
+            embedding_model_dims=3,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            diskann=False,
+            hnsw=True,
+        )
+
+        statements = [call.args[0] for call in self.mock_cursor.execute.call_args_list]
+        self.assertFalse(any(sql.startswith(("ALTER TABLE", "CREATE")) for sql in statements))
+        self.assertEqual(pgvector.filter_columns, ("user_id",))
+        clause, params = pgvector._build_filter_clause({"user_id": "alice", "agent_id": "bot"})
+        self.assertEqual(clause, "WHERE user_id = %s AND payload->>%s = %s")
+        self.assertEqual(params, ["alice", "agent_id", "bot"])
+
+    @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
+    @patch('mem0.vector_stores.pgvector.ConnectionPool')
+    @patch.object(PGVector, '_get_cursor')
+    def test_migrate_filter_indexes_builds_indexes_concurrently(self, mock_get_cursor, mock_connection_pool):
+        """Test that the opt-in migration builds expression indexes concurrently outside a transaction."""
+        mock_get_cursor.return_value.__enter__.return_value = self.mock_cursor
+        mock_get_cursor.return_value.__exit__.return_value = None
+        self.mock_cursor.fetchall.side_effect = [
+            [("test_collection",)],
+            [("id",), ("vector",), ("payload",), ("user_id",)],
+        ]
+        migration_cursor = MagicMock()
+        migration_conn = mock_connection_pool.return_value.connection.return_value.__enter__.return_value
+        migration_conn.cursor.return_value.__enter__.return_value = migration_cursor
+
+        pgvector = PGVector(
+            dbname="test_db",
+            collection_name="test_collection",
+            embedding_model_dims=3,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            diskann=False,
+            hnsw=True,
+        )
+        pgvector.migrate_filter_indexes()
+
+        statements = [call.args[0] for call in migration_cursor.execute.call_args_list]
+        self.assertEqual(len(statements), 4)
+        self.assertTrue(all(sql.startswith("CREATE INDEX CONCURRENTLY IF NOT EXISTS") for sql in statements))
+        self.assertIn("test_collection_agent_id_expr_idx ON test_collection ((payload->>'agent_id'))", statements[0])
+        self.assertFalse(any("user_id" in sql for sql in statements))
+        self.assertFalse(migration_conn.autocommit)
+
+    @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
+    @patch('mem0.vector_stores.pgvector.ConnectionPool')
+    @patch.object(PGVector, '_get_cursor')
+    def test_search_tunes_hnsw_scan(self, mock_get_cursor, mock_connection_pool):
+        """Test that HNSW searches raise ef_search to the limit and enable iterative scans on pgvector 0.8."""
+        mock_get_cursor.return_value.__enter__.return_value = self.mock_cursor
+        mock_get_cursor.return_value.__exit__.return_value = None
+        self.mock_cursor.fetchall.return_value = []
+        self.mock_cursor.fetchone.return_value = ("0.8.0",)
+
+        pgvector = PGVector(
+            dbname="test_db",
+            collection_name="test_collection",
+            embedding_model_dims=3,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            diskann=False,
+            hnsw=True,
+        )
+        self.mock_cursor.execute.reset_mock()
+
+        pgvector.search("test query", [0.1, 0.2, 0.3], limit=100, filters={"user_id": "alice"})
+
+        settings_call, search_call = self.mock_cursor.execute.call_args_list
+        self.assertEqual(
+            settings_call.args,
+            (
+                "SELECT set_config(%s, %s, true), set_config(%s, %s, true)",
+                ["hnsw.ef_search", "100", "hnsw.iterative_scan", "strict_order"],
+            ),
+        )
+        self.assertIn("ORDER BY distance", search_call.args[0])
+
+        pgvector.pgvector_version = (0, 7)
+        self.mock_cursor.execute.reset_mock()
+        pgvector.search("test query", [0.1, 0.2, 0.3], limit=5)
+
+        self.assertEqual(
+            self.mock_cursor.execute.call_args_list[0].args,
+            ("SELECT set_config(%s, %s, true)", ["hnsw.ef_search", "40"]),
+        )
+
+    @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
+    @patch('mem0.vector_stores.pgvector.ConnectionPool')
+    @patch.object(PGVector, '_get_cursor')
+    def test_large_insert_uses_binary_copy(self, mock_get_cursor, mock_connection_pool):
+        """Test that inserts above the threshold are streamed with COPY in binary format."""
+        mock_get_cursor.return_value.__enter__.return_value = self.mock_cursor
+        mock_get_cursor.return_value.__exit__.return_value = None
+        self.mock_cursor.fetchall.return_value = []
+        mock_copy = self.mock_cursor.copy.return_value.__enter__.return_value
+
+        pgvector = PGVector(
+            dbname="test_db",
+            collection_name="test_collection",
+            embedding_model_dims=3,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            diskann=False,
+            hnsw=False,
+            copy_threshold=2,
+        )
+
+        pgvector.insert(self.test_vectors, self.test_payloads, self.test_ids)
+
+        self.mock_cursor.executemany.assert_not_called()
+        self.mock_cursor.copy.assert_called_once_with(
+            "COPY test_collection (id, vector, payload) FROM STDIN (FORMAT BINARY)"
+        )
+        mock_copy.set_types.assert_called_once_with(["uuid", "bytea", "jsonb"])
+        rows = [call.args[0] for call in mock_copy.write_row.call_args_list]
+        self.assertEqual([str(row[0]) for row in rows], self.test_ids)
+        self.assertEqual(rows[0][1], struct.pack(">HH3f", 3, 0, 0.1, 0.2, 0.3))
+        self.assertEqual(rows[1][2], {"key": "value2"})
+
+        pgvector.copy_threshold = None
+        pgvector.insert(self.test_vectors, self.test_payloads, self.test_ids)
+        self.mock_cursor.executemany.assert_called_once()
+
     def tearDown(self):
         """Clean up after each test."""
         pass
@@ -6,6 +6,7 @@ from qdrant_client import QdrantClient
 from qdrant_client.models import (
     Distance,
     Filter,
+    FilterSelector,
     PointIdsList,
     PointStruct,
     VectorParams,
@@ -70,6 +71,26 @@ class TestQdrant(unittest.TestCase):
         self.assertEqual(results[0].payload, {"key": "value"})
         self.assertEqual(results[0].score, 0.95)
 
+    def test_search_batch(self):
+        vectors = [[0.1, 0.2], [0.3, 0.4]]
+        first_point = MagicMock(id=str(uuid.uuid4()), score=0.95, payload={"key": "value1"})
+        second_point = MagicMock(id=str(uuid.uuid4()), score=0.85, payload={"key": "value2"})
+        self.client_mock.query_batch_points.return_value = [
+            MagicMock(points=[first_point]),
+            MagicMock(points=[second_point]),
+        ]
+
+        results = self.qdrant.search_batch(queries=["a", "b"], vectors=vectors, limit=1, filters={"user_id": "alice"})
+
+        self.client_mock.query_batch_points.assert_called_once()
+        self.client_mock.query_points.assert_not_called()
+        requests = self.client_mock.query_batch_points.call_args[1]["requests"]
+        self.assertEqual([request.query for request in requests], vectors)
+        self.assertTrue(all(request.limit == 1 and request.with_payload for request in requests))
+        self.assertIsInstance(requests[0].filter, Filter)
+
+        self.assertEqual(results, [[first_point], [second_point]])
+
     def test_search_with_filters(self):
         """Test search with agent_id and run_id filters."""
         vectors = [[0.1, 0.2]]
@@ -194,6 +215,15 @@ class TestQdrant(unittest.TestCase):
             points_selector=PointIdsList(points=[vector_id]),
         )
 
+    def test_delete_by_filter(self):
+        self.qdrant.delete_by_filter({"user_id": "alice"})
+
+        call_args = self.client_mock.delete.call_args[1]
+        self.assertEqual(call_args["collection_name"], "test_collection")
+        selector = call_args["points_selector"]
+        self.assertIsInstance(selector, FilterSelector)
+        self.assertEqual(selector.filter.must[0].key, "user_id")
+
     def test_update(self):
         vector_id = str(uuid.uuid4())
         updated_vector = [0.2, 0.3]
@@ -288,6 +318,20 @@ class TestQdrant(unittest.TestCase):
         # The list method returns the result directly
         self.assertEqual(len(results), 1)
 
+    def test_list_page_resumes_from_scroll_offset(self):
+        """Test that list_page passes the cursor as the scroll offset and returns the next one."""
+        mock_point = MagicMock(id=str(uuid.uuid4()), payload={"user_id": "alice"})
+        self.client_mock.scroll.return_value = ([mock_point], "next-offset")
+
+        page, cursor = self.qdrant.list_page(filters={"user_id": "alice"}, limit=1, cursor="offset")
+
+        call_args = self.client_mock.scroll.call_args[1]
+        self.assertEqual(call_args["offset"], "offset")
+        self.assertEqual(call_args["limit"], 1)
+        self.assertFalse(call_args["with_vectors"])
+        self.assertEqual(page, [mock_point])
+        self.assertEqual(cursor, "next-offset")
+
     def test_delete_col(self):
         self.qdrant.delete_col()
         self.client_mock.delete_collection.assert_called_once_with(collection_name="test_collection")
@@ -0,0 +1,127 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from redis.commands.search.aggregation import Cursor
+from redis.commands.search.document import Document
+
+from mem0.vector_stores.redis import RedisDB
+
+
+@pytest.fixture
+def redis_db():
+    with (
+        patch("mem0.vector_stores.redis.redis.Redis.from_url"),
+        patch("mem0.vector_stores.redis.SearchIndex") as mock_index_class,
+    ):
+        mock_index_class.from_dict.return_value = MagicMock()
+        db = RedisDB(redis_url="redis://localhost:6379", collection_name="test", embedding_model_dims=3)
+        yield db
+
+
+def _stored_fields(memory_id, **extra):
+    fields = {
+        "memory_id": memory_id,
+        "hash": "abc",
+        "memory": "likes tea",
+        "created_at": "1735718400",
+        "user_id": "alice",
+        "metadata": json.dumps({"category": "food"}),
+    }
+    fields.update(extra)
+    return fields
+
+
+def test_insert_loads_all_hashes_at_once(redis_db):
+    payloads = [
+        {"hash": "h1", "data": "likes tea", "created_at": "2025-01-01T00:00:00-08:00", "user_id": "alice", "x": 1},
+        {"hash": "h2", "data": "likes jazz", "created_at": "2025-01-01T00:00:00-08:00", "agent_id": "bot"},
+    ]
+
+    redis_db.insert([[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]], payloads, ["id1", "id2"])
+
+    redis_db.index.load.assert_called_once()
+    data = redis_db.index.load.call_args.args[0]
+    assert [entry["memory_id"] for entry in data] == ["id1", "id2"]
+    assert data[0]["embedding"] == np.array([0.1, 0.2, 0.3], dtype=np.float32).tobytes()
+    assert data[0]["user_id"] == "alice"
+    assert json.loads(data[0]["metadata"]) == {"x": 1}
+    assert data[1]["agent_id"] == "bot"
+
+
+def test_search_decodes_payloads_and_scores(redis_db):
+    redis_db.index.query.return_value = [
+        {**_stored_fields("id1"), "vector_distance": "0.25"},
+        {**_stored_fields("id2", updated_at="1735804800"), "vector_distance": "0.5"},
+    ]
+
+    results = redis_db.search("tea", [0.1, 0.2, 0.3], limit=2, filters={"user_id": "alice"})
+
+    assert [result.id for result in results] == ["id1", "id2"]
+    assert results[0].score == 0.25
+    assert results[0].payload["data"] == "likes tea"
+    assert results[0].payload["category"] == "food"
+    assert results[0].payload["user_id"] == "alice"
+    assert "updated_at" not in results[0].payload
+    assert results[1].payload["updated_at"] == "2025-01-02T00:00:00.000000-08:00"
+
+
+def test_get_and_list_share_payload_decoding(redis_db):
+    redis_db.index.fetch.return_value = _stored_fields("id1")
+    redis_db.index.search.return_value = MagicMock(docs=[Document("mem0:test:id1", **_stored_fields("id1"))])
+
+    memory = redis_db.get("id1")
+    listed = redis_db.list(filters={"user_id": "alice"}, limit=10)
+
+    assert memory.payload == listed[0][0].payload
+    assert memory.payload["category"] == "food"
+
+
+def test_delete_by_filter_unlinks_pages_of_keys(redis_db):
+    redis_db.index.search.side_effect = [
+        MagicMock(docs=[Document("mem0:test:id1"), Document("mem0:test:id2")]),
+        MagicMock(docs=[Document("mem0:test:id3")]),
+        MagicMock(docs=[]),
+    ]
+
+    redis_db.delete_by_filter({"user_id": "alice"})
+
+    assert [call.args[0] for call in redis_db.index.drop_keys.call_args_list] == [
+        ["mem0:test:id1", "mem0:test:id2"],
+        ["mem0:test:id3"],
+    ]
+    query = redis_db.index.search.call_args.args[0]
+    assert query._no_content
+    with pytest.raises(ValueError):
+        redis_db.delete_by_filter({})
+
+
+def test_list_page_reads_an_aggregate_cursor(redis_db):
+    def row(memory_id):
+        return [part.encode() for item in _stored_fields(memory_id).items() for part in item]
+
+    search = redis_db.client.ft.return_value
+    search.aggregate.side_effect = [
+        MagicMock(rows=[row("id1"), row("id2")], cursor=Cursor(7)),
+        MagicMock(rows=[row("id3")], cursor=Cursor(0)),
+    ]
+
+    page, cursor = redis_db.list_page(filters={"user_id": "alice"}, limit=2)
+    last_page, last_cursor = redis_db.list_page(filters={"user_id": "alice"}, limit=2, cursor=cursor)
+
+    assert [memory.id for memory in page] == ["id1", "id2"]
+    assert page[0].payload["category"] == "food"
+    assert cursor == 7
+    assert [memory.id for memory in last_page] == ["id3"]
+    assert last_cursor is None
+    first_request, read_request = [call.args[0] for call in search.aggregate.call_args_list]
+    assert first_request.build_args()[0] == "@user_id:{alice}"
+    assert "WITHCURSOR" in first_request.build_args()
+    assert read_request.build_args() == ["7", "COUNT", "2"]
+
+
+def test_delete_batch_unlinks_all_keys_at_once(redis_db):
+    redis_db.delete_batch(["id1", "id2"])
+
+    redis_db.index.drop_keys.assert_called_once_with(["mem0:test:id1", "mem0:test:id2"])